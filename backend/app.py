@@ -3,6 +3,17 @@ import os
 from flask import Flask, request, g
 from config import get_config
 from extensions import db, cors, jwt
+from utils.zip_index import indices_zip
+from services.cronograma_service import cronogramas
+from services.bootstrap_service import secoes_bootstrap
+from data_sources.fila_eventos import FilaEventos
+from utils.pubsub import barramento_eventos
+from utils.structured_logging import configurar_logging, instalar_log_de_requisicoes
+from utils.metrics import instalar_metricas
+from utils.query_budget import instalar_orcamento_requisicoes
+from utils.slow_queries import configurar_consultas_lentas
+from utils.profiling import instalar_perfis
+from utils.memory_diagnostics import instalar_diagnostico_memoria
 
 # Importa a função que registra as rotas
 from routes import register_routes
@@ -10,13 +21,15 @@ from routes import register_routes
 # CORS configurado diretamente no app
 
 
-def create_app(config_name=None):
+def create_app(config_name=None, config_overrides=None):
     """
     Application Factory: cria e configura a instância do app Flask.
     
     Args:
         config_name: Nome da configuração a ser usada (development, testing, production)
                     Se None, usa a configuração baseada em FLASK_ENV
+        config_overrides: Dicionário opcional de valores que sobrescrevem a
+                    configuração antes da inicialização das extensões (ex: testes)
     """
     app = Flask(__name__)
     
@@ -28,18 +41,32 @@ def create_app(config_name=None):
         config_class = get_config()
     
     app.config.from_object(config_class)
+    if config_overrides:
+        app.config.update(config_overrides)
     
     # Chama init_app se existir (para configurações específicas de produção)
     if hasattr(config_class, 'init_app'):
         config_class.init_app(app)
 
+    # --- CONFIGURAÇÃO DO LOGGING ---
+    # Antes de tudo, para que a inicialização também passe pela fila
+    configurar_logging(app)
+
     # --- GARANTIR QUE A PASTA DE UPLOAD EXISTA ---
     if not os.path.exists(app.config['UPLOAD_FOLDER']):
         os.makedirs(app.config['UPLOAD_FOLDER'])
-        app.logger.info(f"Pasta de upload criada em: {app.config['UPLOAD_FOLDER']}")
+        app.logger.info("Pasta de upload criada em: %s", app.config['UPLOAD_FOLDER'])
 
     # --- INICIALIZAÇÃO DAS EXTENSÕES ---
     db.init_app(app)
+    indices_zip.capacidade = app.config.get('ZIP_INDEX_CACHE_SIZE', 64)
+    cronogramas.capacidade = app.config.get('CRONOGRAMA_CACHE_SIZE', 128)
+    secoes_bootstrap.capacidade = app.config.get('BOOTSTRAP_CACHE_SIZE', 256)
+    secoes_bootstrap.ttl = app.config.get('BOOTSTRAP_CACHE_TTL', 30)
+    secoes_bootstrap.limpar()
+    barramento_eventos.max_assinantes = app.config.get('SSE_MAX_CLIENTES', 500)
+    barramento_eventos.usar_fila(FilaEventos(db.engine), intervalo=app.config.get('SSE_INTERVALO', 0.5),
+                                 retencao=app.config.get('SSE_RETENCAO', 10000))
     
     # CORS muito permissivo (igual ao simple_server.py)
     cors.init_app(
@@ -53,14 +80,9 @@ def create_app(config_name=None):
     
     jwt.init_app(app)
 
-    # --- CONFIGURAÇÃO DO LOGGING ---
-    logging.basicConfig(
-        level=getattr(logging, app.config['LOG_LEVEL']), 
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
     logger = logging.getLogger(__name__)
-    logger.info(f"Aplicação Flask criada. Ambiente: {app.config.get('FLASK_ENV', 'development')}")
-    logger.info(f"Banco de dados: {app.config['DATABASE_URL']}")
+    logger.info("Aplicação Flask criada. Ambiente: %s", app.config.get('FLASK_ENV', 'development'))
+    logger.info("Banco de dados: %s", app.config['DATABASE_URL'])
 
     # --- HOOKS DE GERENCIAMENTO DE SESSÃO ---
     @app.teardown_appcontext
@@ -83,15 +105,25 @@ def create_app(config_name=None):
             "cors": "enabled"
         })
 
-    # --- DEBUGGING HOOK (igual ao simple_server.py) ---
-    @app.before_request
-    def log_request():
-        print(f"📥 {request.method} {request.path} - Origin: {request.headers.get('Origin', 'None')}")
+    # --- LOG DE ACESSO (X-Request-ID, amostragem por rota) ---
+    instalar_log_de_requisicoes(app)
+
+    # --- MÉTRICAS (GET /metrics) ---
+    caches = (('zip', indices_zip), ('cronograma', cronogramas), ('bootstrap', secoes_bootstrap))
+    if app.config.get('METRICAS_ATIVAS', True):
+        instalar_metricas(app, caches=caches)
 
-    @app.after_request
-    def after_request(response):
-        print(f"📤 Response: {response.status_code}")
-        return response
+    # --- ORÇAMENTO DE CONSULTAS (amostragem de N+1 em produção) ---
+    instalar_orcamento_requisicoes(app)
+
+    # --- CONSULTAS LENTAS (com EXPLAIN QUERY PLAN) ---
+    configurar_consultas_lentas(app)
+
+    # --- PERFIL SOB DEMANDA (X-Profile) ---
+    instalar_perfis(app)
+
+    # --- DIAGNÓSTICO DE MEMÓRIA (/api/admin/memoria) ---
+    instalar_diagnostico_memoria(app, caches=caches)
 
     # --- TRATAMENTO DE ERROS GLOBAL ---
     @app.errorhandler(400)
@@ -110,9 +142,13 @@ def create_app(config_name=None):
     def not_found(error):
         return {'error': 'Recurso não encontrado', 'message': str(error.description)}, 404
 
+    @app.errorhandler(503)
+    def service_unavailable(error):
+        return {'error': 'Serviço indisponível', 'message': str(error.description)}, 503
+
     @app.errorhandler(500)
     def internal_error(error):
-        app.logger.error(f"Erro interno do servidor: {error}")
+        app.logger.error("Erro interno do servidor: %s", error)
         return {'error': 'Erro interno do servidor', 'message': 'Algo deu errado. Tente novamente mais tarde.'}, 500
 
     return app
@@ -32,7 +32,7 @@ def create_app(config_name=None):
     # --- GARANTIR QUE A PASTA DE UPLOAD EXISTA ---
     if not os.path.exists(app.config['UPLOAD_FOLDER']):
         os.makedirs(app.config['UPLOAD_FOLDER'])
-        app.logger.info(f"Pasta de upload criada em: {app.config['UPLOAD_FOLDER']}")
+        app.logger.info("Pasta de upload criada em: %s", app.config['UPLOAD_FOLDER'])
 
     # --- INICIALIZAÇÃO DAS EXTENSÕES ---
     db.init_app(app)
@@ -54,8 +54,8 @@ def create_app(config_name=None):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     logger = logging.getLogger(__name__)
-    logger.info(f"Aplicação Flask criada. Ambiente: {app.config.get('FLASK_ENV', 'development')}")
-    logger.info(f"Banco de dados: {app.config['DATABASE_URL']}")
+    logger.info("Aplicação Flask criada. Ambiente: %s", app.config.get('FLASK_ENV', 'development'))
+    logger.info("Banco de dados: %s", app.config['DATABASE_URL'])
 
     # --- HOOKS DE GERENCIAMENTO DE SESSÃO ---
     @app.teardown_appcontext
@@ -96,7 +96,7 @@ def create_app(config_name=None):
 
     @app.errorhandler(500)
     def internal_error(error):
-        app.logger.error(f"Erro interno do servidor: {error}")
+        app.logger.error("Erro interno do servidor: %s", error)
         return {'error': 'Erro interno do servidor', 'message': 'Algo deu errado. Tente novamente mais tarde.'}, 500
 
     return app
@@ -0,0 +1,202 @@
+# backend/asgi.py
+"""
+Ponto de entrada ASGI (uvicorn/Starlette).
+
+As leituras mais frequentes (listas, relatórios, testes do ciclo) e o canal
+de eventos são atendidos aqui de forma assíncrona; todo o resto é repassado
+ao app Flask, montado como aplicação WSGI. As leituras reaproveitam as mesmas
+funções das rotas Flask (services/leituras.py) e o mesmo serializador JSON.
+
+As rotas nativas também têm o id de requisição (X-Request-ID), a linha do log
+de acesso, as métricas e o orçamento de consultas do app Flask. O perfil sob
+demanda (X-Profile) depende dos ganchos do Flask: requisições com esse
+cabeçalho são repassadas ao app Flask, que atende os mesmos caminhos.
+
+O SQLite não tem I/O de rede para sobrepor: um driver "assíncrono" como o
+aiosqlite apenas executa as consultas em uma thread. Por isso as leituras
+rodam nos serviços síncronos existentes, em um pool limitado de threads
+(ASGI_DB_THREADS), enquanto o laço de eventos fica livre para as conexões
+abertas; o canal de eventos espera no próprio laço, sem thread por cliente.
+
+Uso:
+    uvicorn --factory asgi:create_asgi_app --port 5000
+    gunicorn 'asgi:create_asgi_app()' -k uvicorn_worker.UvicornWorker
+    python asgi.py
+"""
+
+import functools
+import logging
+import re
+import time
+
+import anyio
+from flask_jwt_extended import decode_token
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from uvicorn.middleware.wsgi import WSGIMiddleware
+
+from app import create_app
+from security import Permissions, carregar_usuario
+from services.leituras import LEITURAS, ErroLeitura
+from utils.metrics import EstatisticasRequisicao, registrar_requisicao, requisicao_atual
+from utils.pubsub import LimiteAssinaturasError, barramento_eventos, formatar_sse
+from utils.query_budget import amostrar_requisicao, monitorar_consultas, verificar_orcamento_requisicao
+from utils.structured_logging import id_requisicao, novo_id_requisicao, registrar_acesso
+
+logger = logging.getLogger(__name__)
+
+
+def _erro(status: int, erro: str, mensagem: str) -> JSONResponse:
+    # Mesmo formato dos errorhandlers do app Flask
+    return JSONResponse({'error': erro, 'message': mensagem}, status_code=status)
+
+
+_ERROS = {
+    400: 'Requisição inválida',
+    401: 'Não autorizado',
+    403: 'Acesso negado',
+    404: 'Recurso não encontrado',
+    503: 'Serviço indisponível',
+}
+
+
+def create_asgi_app(config_name=None, config_overrides=None) -> Starlette:
+    """
+    Cria o app ASGI sobre o app Flask da fábrica (mesma configuração, banco e extensões).
+    """
+    flask_app = create_app(config_name, config_overrides)
+    limitador = anyio.CapacityLimiter(flask_app.config.get('ASGI_DB_THREADS', 8))
+
+    async def usuario_da_requisicao(request: Request, aceitar_query: bool = False):
+        """Valida o token JWT (cabeçalho ou, se permitido, '?jwt=') e carrega o usuário."""
+        cabecalho = request.headers.get('Authorization', '')
+        token = cabecalho[7:] if cabecalho.startswith('Bearer ') else None
+        if token is None and aceitar_query:
+            token = request.query_params.get('jwt')
+        if not token:
+            return None
+        try:
+            with flask_app.app_context():
+                identidade = decode_token(token)[flask_app.config['JWT_IDENTITY_CLAIM']]
+            id_usuario = int(identidade)
+        except Exception:
+            return None
+        return await anyio.to_thread.run_sync(carregar_usuario, id_usuario, limiter=limitador)
+
+    def endpoint_de_leitura(caminho, leitura):
+        # Mesmo rótulo de rota das métricas do Flask ('{id:int}' -> '<int:id>')
+        rota = re.sub(r'\{(\w+):(\w+)\}', r'<\2:\1>', caminho)
+
+        async def endpoint(request: Request) -> Response:
+            inicio = time.perf_counter()
+            estatisticas = EstatisticasRequisicao()
+            id_da_requisicao = novo_id_requisicao(request.headers.get('X-Request-ID', ''))
+            # O contexto é copiado para a thread do limitador, que soma as consultas aqui
+            # e inclui o id da requisição nos registros de log
+            token = requisicao_atual.set(estatisticas)
+            token_id = id_requisicao.set(id_da_requisicao)
+            try:
+                if amostrar_requisicao(flask_app):
+                    with monitorar_consultas() as monitor:
+                        resposta = await responder(request)
+                    verificar_orcamento_requisicao(flask_app, monitor, 'GET', request.url.path, rota)
+                else:
+                    resposta = await responder(request)
+                duracao = time.perf_counter() - inicio
+                resposta.headers['X-Request-ID'] = id_da_requisicao
+                registrar_acesso(flask_app, 'GET', request.url.path, rota, resposta.status_code, duracao * 1000,
+                                 request.headers.get('Origin'))
+            finally:
+                id_requisicao.reset(token_id)
+                requisicao_atual.reset(token)
+            registrar_requisicao('GET', rota, resposta.status_code, duracao, estatisticas)
+            return resposta
+
+        async def responder(request: Request) -> Response:
+            usuario = await usuario_da_requisicao(request)
+            if usuario is None:
+                return _erro(401, _ERROS[401], 'Token de acesso inválido ou expirado')
+            executar = functools.partial(leitura, usuario, request.query_params, **request.path_params)
+            try:
+                dados = await anyio.to_thread.run_sync(executar, limiter=limitador)
+            except ErroLeitura as e:
+                return _erro(e.status, _ERROS.get(e.status, 'Erro'), str(e))
+            except Exception as e:
+                logger.error("Erro em GET %s: %s", request.url.path, e, exc_info=True)
+                return _erro(500, 'Erro interno do servidor', 'Algo deu errado. Tente novamente mais tarde.')
+            return Response(flask_app.json.dumps(dados), media_type='application/json')
+        return endpoint
+
+    async def eventos(request: Request) -> Response:
+        """Mesmo canal de /api/eventos do routes.py, esperando no laço de eventos."""
+        usuario = await usuario_da_requisicao(request, aceitar_query=True)
+        if usuario is None:
+            return _erro(401, _ERROS[401], 'Token de acesso inválido ou expirado')
+        ultimo_id = request.headers.get('Last-Event-ID', '')
+        try:
+            assinatura = barramento_eventos.assinar(
+                Permissions.filtro_eventos_visiveis(usuario),
+                capacidade=flask_app.config.get('SSE_BUFFER', 100),
+                desde=int(ultimo_id) if ultimo_id.isdigit() else None,
+            )
+        except LimiteAssinaturasError as e:
+            return _erro(503, _ERROS[503], str(e))
+        heartbeat = flask_app.config.get('SSE_HEARTBEAT', 15)
+
+        async def transmitir():
+            try:
+                yield "retry: 3000\n\n"
+                while True:
+                    evento = await assinatura.proximo_async(timeout=heartbeat)
+                    yield formatar_sse(evento) if evento else ": heartbeat\n\n"
+            finally:
+                barramento_eventos.cancelar(assinatura)
+
+        return StreamingResponse(transmitir(), media_type='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+
+    wsgi = WSGIMiddleware(flask_app, workers=flask_app.config.get('ASGI_WSGI_THREADS', 10))
+    rotas = [Route(caminho, endpoint_de_leitura(caminho, leitura), methods=['GET']) for caminho, leitura in LEITURAS]
+    rotas.append(Route('/api/eventos', eventos, methods=['GET']))
+    # Os demais métodos e caminhos (inclusive POST em /api/projetos) seguem para o Flask
+    rotas.append(Mount('/', app=wsgi))
+
+    asgi_app = Starlette(routes=rotas, middleware=[
+        # Mesma política de CORS do app Flask
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_headers=['*'], allow_credentials=True,
+                   allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
+                   expose_headers=["Content-Type", "Authorization"]),
+        Middleware(PerfilPeloFlask, wsgi=wsgi),
+    ])
+    asgi_app.state.flask_app = flask_app
+    return asgi_app
+
+
+class PerfilPeloFlask:
+    """Repassa ao app Flask as requisições com 'X-Profile', para que sejam perfiladas."""
+
+    def __init__(self, app, wsgi):
+        self.app = app
+        self.wsgi = wsgi
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and dict(scope['headers']).get(b'x-profile', b'0') != b'0':
+            await self.wsgi(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+# --- PONTO DE ENTRADA DA APLICAÇÃO ---
+if __name__ == "__main__":
+    import uvicorn
+
+    # O logging é configurado pela fábrica do app
+    asgi_app = create_asgi_app()
+    logger.info("Iniciando servidor ASGI em http://localhost:5000")
+    uvicorn.run(asgi_app, host='0.0.0.0', port=5000)
@@ -0,0 +1,116 @@
+# backend/benchmark_gunicorn.py
+"""
+Mede o tempo até o servidor ficar pronto e a memória por worker do gunicorn
+(gunicorn.conf.py) com e sem preload_app e gc.freeze().
+
+Uso:
+    python benchmark_gunicorn.py [--workers 4] [--requisicoes 200]
+
+Para cada variante, sobe o gunicorn sobre uma cópia temporária do banco,
+mede o tempo até a primeira resposta HTTP, faz algumas requisições de
+leitura em cada worker (o que toca os objetos herdados do master) e lê de
+/proc a memória de cada worker. A coluna 'privada' é o custo real de cada
+worker a mais; RSS conta também as páginas compartilhadas com o master.
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils.process_memory import memoria_do_processo, processos_filhos
+
+VARIANTES = (
+    ('sem preload', {'GUNICORN_PRELOAD': 'false'}),
+    ('preload', {'GUNICORN_PRELOAD': 'true', 'GUNICORN_GC_FREEZE': 'false'}),
+    ('preload + gc.freeze', {'GUNICORN_PRELOAD': 'true', 'GUNICORN_GC_FREEZE': 'true'}),
+)
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _primeira_resposta(porta: int, limite: float = 60.0) -> float:
+    inicio = time.monotonic()
+    while time.monotonic() - inicio < limite:
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+            conexao.request('GET', '/api/auth/me')
+            conexao.getresponse().read()
+            conexao.close()
+            return time.monotonic() - inicio
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.05)
+    raise RuntimeError(f"gunicorn na porta {porta} não respondeu.")
+
+
+def _carga(porta: int, token: str, quantidade: int):
+    # Conexões novas a cada requisição, para distribuir a carga entre os workers
+    for i in range(quantidade):
+        conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+        conexao.request('GET', ('/api/projetos', '/api/relatorios/portfolio')[i % 2],
+                        headers={'Authorization': f'Bearer {token}'})
+        conexao.getresponse().read()
+        conexao.close()
+
+
+def medir(nome: str, ambiente: dict, token: str, workers: int, requisicoes: int):
+    porta = _porta_livre()
+    env = {**os.environ, **ambiente, 'GUNICORN_BIND': f'127.0.0.1:{porta}', 'GUNICORN_WORKERS': str(workers),
+           'GUNICORN_WORKER_CLASS': 'gthread'}
+    # Executado na pasta do backend, onde o gunicorn encontra o gunicorn.conf.py
+    processo = subprocess.Popen([sys.executable, '-m', 'gunicorn'], env=env,
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        pronto = _primeira_resposta(porta)
+        _carga(porta, token, requisicoes)
+        pids = processos_filhos(processo.pid)
+        memorias = [m for m in (memoria_do_processo(pid) for pid in pids) if m]
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+
+    if not memorias:
+        print(f"{nome:<20} | {pronto:>9.2f} | memória indisponível (requer /proc)")
+        return
+    mib = 1024 * 1024
+    media = {campo: sum(m[campo] for m in memorias) / len(memorias) / mib for campo in ('rss', 'pss', 'privada')}
+    print(f"{nome:<20} | {pronto:>9.2f} | {len(memorias):>7} | {media['rss']:>8.1f} | "
+          f"{media['pss']:>8.1f} | {media['privada']:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requisicoes', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        os.environ['DATABASE_URL'] = os.path.join(pasta, 'benchmark.db')
+        os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key')
+        os.environ['LOG_LEVEL'] = 'WARNING'
+
+        from flask_jwt_extended import create_access_token
+        from app import create_app
+        app = create_app()
+        with app.app_context():
+            token = create_access_token(identity='1')
+
+        print(f"{args.workers} workers gthread, {args.requisicoes} requisições antes da leitura da memória")
+        print(f"{'variante':<20} | {'pronto (s)':>9} | {'workers':>7} | {'RSS MiB':>8} | {'PSS MiB':>8} | "
+              f"{'privada MiB':>12}")
+        print('-' * 80)
+        for nome, ambiente in VARIANTES:
+            medir(nome, ambiente, token, args.workers, args.requisicoes)
+
+
+if __name__ == '__main__':
+    main()
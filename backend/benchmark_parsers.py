@@ -0,0 +1,87 @@
+# backend/benchmark_parsers.py
+"""
+Compara o parser Allure e o parser JUnit com o mesmo número de testes.
+
+Uso:
+    python benchmark_parsers.py [quantidade ...]   (padrão: 1000 10000 50000)
+
+Para cada quantidade, gera os dois relatórios em um diretório temporário e
+mede o tempo de parsing e o pico de memória alocada (tracemalloc).
+O pico inclui a lista de testes devolvida, que é igual nos dois formatos.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+from parsers import parse_allure_zip, parse_junit_xml
+
+STATUS = ('passed', 'passed', 'passed', 'failed', 'broken', 'skipped')
+
+
+def gerar_allure(caminho: str, quantidade: int):
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for i in range(quantidade):
+            status = STATUS[i % len(STATUS)]
+            zipf.writestr(f"{i:08d}-result.json", json.dumps({
+                "uuid": f"{i:08d}", "historyId": f"hist-{i}", "name": f"teste_{i}",
+                "fullName": f"com.example.Suite{i % 50}.teste_{i}", "status": status,
+                "statusDetails": {"message": "AssertionError: falhou"} if status in ('failed', 'broken') else {},
+                "labels": [{"name": "feature", "value": f"Feature {i % 50}"}, {"name": "severity", "value": "normal"}],
+            }))
+
+
+def gerar_junit(caminho: str, quantidade: int):
+    filhos = {'failed': 'failure', 'broken': 'error', 'skipped': 'skipped'}
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+        for suite in range(0, quantidade, 1000):
+            arquivo.write(f'<testsuite name="Feature {suite // 1000}">\n')
+            for i in range(suite, min(suite + 1000, quantidade)):
+                status = STATUS[i % len(STATUS)]
+                abertura = f'<testcase classname="com.example.Suite{i % 50}" name="teste_{i}" time="0.01"'
+                filho = filhos.get(status)
+                if filho:
+                    arquivo.write(f'{abertura}><{filho} message="AssertionError: falhou">trace</{filho}></testcase>\n')
+                else:
+                    arquivo.write(f'{abertura}/>\n')
+            arquivo.write('</testsuite>\n')
+        arquivo.write('</testsuites>\n')
+
+
+def medir(parser, caminho: str):
+    """Tempo e pico de memória em execuções separadas (o tracemalloc distorce o tempo)."""
+    inicio = time.perf_counter()
+    resultado = parser(caminho)
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    parser(caminho)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico, resultado['metricas']['total_testes']
+
+
+def main(quantidades):
+    print(f"{'testes':>8} | {'formato':<7} | {'arquivo (KiB)':>13} | {'tempo (s)':>9} | {'pico mem (MiB)':>14}")
+    print('-' * 64)
+    with tempfile.TemporaryDirectory() as pasta:
+        for quantidade in quantidades:
+            casos = (
+                ('allure', gerar_allure, parse_allure_zip, os.path.join(pasta, f'allure-{quantidade}.zip')),
+                ('junit', gerar_junit, parse_junit_xml, os.path.join(pasta, f'junit-{quantidade}.xml')),
+            )
+            for formato, gerar, parser, caminho in casos:
+                gerar(caminho, quantidade)
+                duracao, pico, total = medir(parser, caminho)
+                assert total == quantidade, f"{formato}: {total} testes lidos, esperados {quantidade}"
+                print(f"{quantidade:>8} | {formato:<7} | {os.path.getsize(caminho) / 1024:>13.0f} | "
+                      f"{duracao:>9.3f} | {pico / 1024 / 1024:>14.1f}")
+
+
+if __name__ == '__main__':
+    main([int(q) for q in sys.argv[1:]] or [1000, 10000, 50000])
@@ -0,0 +1,169 @@
+# backend/benchmark_servidores.py
+"""
+Compara o servidor Flask com threads (app.run(threaded=True)) e o servidor
+ASGI (asgi.py, uvicorn) nos endpoints de leitura.
+
+Uso:
+    python benchmark_servidores.py [--clientes 32] [--segundos 10] [--sse 50]
+
+Cada servidor sobe em um processo próprio, sobre uma cópia temporária do
+banco com os dados iniciais. 'clientes' threads fazem requisições em
+sequência (conexões persistentes) por 'segundos', alternando entre os
+endpoints abaixo, enquanto 'sse' conexões ficam abertas em /api/eventos
+(como abas esperando o fim de um ciclo). Mede a vazão e as latências
+p50/p95/p99 de cada servidor.
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ENDPOINTS = (
+    '/api/projetos',
+    '/api/me/tarefas',
+    '/api/me/projetos',
+    '/api/relatorios/portfolio',
+    '/api/relatorios/qa',
+)
+
+
+def servir(modo: str, porta: int):
+    """Executado no processo filho: sobe o servidor pedido."""
+    if modo == 'wsgi':
+        from app import create_app
+        create_app().run(host='127.0.0.1', port=porta, debug=False, use_reloader=False, threaded=True)
+    else:
+        import uvicorn
+        from asgi import create_asgi_app
+        uvicorn.run(create_asgi_app(), host='127.0.0.1', port=porta, log_level='warning')
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _aguardar(porta: int, limite: float = 30.0):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        try:
+            socket.create_connection(('127.0.0.1', porta), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Servidor na porta {porta} não respondeu.")
+
+
+def _abrir_sse(porta: int, token: str, parar: threading.Event):
+    conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=60)
+    try:
+        conexao.request('GET', f'/api/eventos?jwt={token}')
+        resposta = conexao.getresponse()
+        while not parar.is_set() and resposta.fp.readline():
+            pass
+    except OSError:
+        pass
+    finally:
+        conexao.close()
+
+
+def _cliente(porta: int, token: str, ate: float, latencias: list, erros: list):
+    conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+    cabecalhos = {'Authorization': f'Bearer {token}'}
+    i = 0
+    while time.monotonic() < ate:
+        caminho = ENDPOINTS[i % len(ENDPOINTS)]
+        i += 1
+        inicio = time.perf_counter()
+        try:
+            conexao.request('GET', caminho, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            resposta.read()
+            if resposta.status != 200:
+                erros.append(resposta.status)
+        except (OSError, http.client.HTTPException) as e:
+            erros.append(type(e).__name__)
+            conexao.close()
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+            continue
+        latencias.append(time.perf_counter() - inicio)
+    conexao.close()
+
+
+def _percentil(valores, p):
+    return valores[min(int(len(valores) * p), len(valores) - 1)] if valores else float('nan')
+
+
+def medir(modo: str, token: str, clientes: int, segundos: float, sse: int):
+    porta = _porta_livre()
+    # O log de cada requisição iria para o terminal junto com a tabela
+    processo = subprocess.Popen([sys.executable, __file__, '--servir', modo, '--porta', str(porta)],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    parar = threading.Event()
+    try:
+        _aguardar(porta)
+        abertas = [threading.Thread(target=_abrir_sse, args=(porta, token, parar), daemon=True) for _ in range(sse)]
+        for t in abertas:
+            t.start()
+
+        latencias, erros = [], []
+        ate = time.monotonic() + segundos
+        threads = [threading.Thread(target=_cliente, args=(porta, token, ate, latencias, erros))
+                   for _ in range(clientes)]
+        inicio = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracao = time.perf_counter() - inicio
+    finally:
+        parar.set()
+        processo.terminate()
+        processo.wait(timeout=10)
+
+    latencias.sort()
+    print(f"{modo:<5} | {len(latencias) / duracao:>8.0f} | {_percentil(latencias, 0.50) * 1000:>8.1f} | "
+          f"{_percentil(latencias, 0.95) * 1000:>8.1f} | {_percentil(latencias, 0.99) * 1000:>8.1f} | {len(erros):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clientes', type=int, default=32)
+    parser.add_argument('--segundos', type=float, default=10)
+    parser.add_argument('--sse', type=int, default=50)
+    parser.add_argument('--servir', choices=('wsgi', 'asgi'), help=argparse.SUPPRESS)
+    parser.add_argument('--porta', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        servir(args.servir, args.porta)
+        return
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Mesmo banco e mesma chave de assinatura para os dois servidores
+        os.environ['DATABASE_URL'] = os.path.join(pasta, 'benchmark.db')
+        os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key')
+        os.environ['LOG_LEVEL'] = 'WARNING'
+
+        from flask_jwt_extended import create_access_token
+        from app import create_app
+        app = create_app()
+        with app.app_context():
+            token = create_access_token(identity='1')
+
+        print(f"{args.clientes} clientes, {args.sse} conexões SSE abertas, {args.segundos:.0f}s por servidor")
+        print(f"{'modo':<5} | {'req/s':>8} | {'p50 (ms)':>8} | {'p95 (ms)':>8} | {'p99 (ms)':>8} | {'erros':>6}")
+        print('-' * 58)
+        for modo in ('wsgi', 'asgi'):
+            medir(modo, token, args.clientes, args.segundos, args.sse)
+
+
+if __name__ == '__main__':
+    main()
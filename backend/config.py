@@ -12,6 +12,15 @@ dotenv_path = os.path.join(basedir, '..', '.env')
 load_dotenv(dotenv_path=dotenv_path)
 
 
+def _taxas_amostragem(texto: str) -> dict:
+    """'/api/changes=0.1,/api/eventos=0' -> {'/api/changes': 0.1, '/api/eventos': 0.0}"""
+    taxas = {}
+    for item in filter(None, (parte.strip() for parte in texto.split(','))):
+        rota, _, taxa = item.rpartition('=')
+        taxas[rota.strip()] = float(taxa)
+    return taxas
+
+
 class Config:
     """
     Classe de configuração base para a aplicação.
@@ -23,6 +32,45 @@ class Config:
     
     # Configuração de Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    # 'texto' ou 'json' (uma linha JSON por registro, com o request_id)
+    LOG_FORMATO = os.environ.get('LOG_FORMATO', 'texto').lower()
+    # Arquivo rotativo, além do stderr (escrito pela thread do listener)
+    LOG_ARQUIVO = os.environ.get('LOG_ARQUIVO')
+    # Registros aguardando a thread do listener; acima disso são descartados
+    LOG_FILA_MAX = int(os.environ.get('LOG_FILA_MAX', 10000))
+    # Fração do log de acesso mantida por rota ("rota=taxa,..."); erros e
+    # requisições acima de LOG_REQUISICAO_LENTA_MS são sempre registrados
+    LOG_AMOSTRAGEM = _taxas_amostragem(os.environ.get('LOG_AMOSTRAGEM', '/api/changes=0.1'))
+    LOG_REQUISICAO_LENTA_MS = float(os.environ.get('LOG_REQUISICAO_LENTA_MS', 1000))
+
+    # Métricas no formato do Prometheus em GET /metrics; com METRICAS_TOKEN
+    # definido, a coleta precisa enviar 'Authorization: Bearer <token>'
+    METRICAS_ATIVAS = os.environ.get('METRICAS_ATIVAS', 'true').lower() in ('1', 'true', 'sim')
+    METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN')
+
+    # Orçamento de consultas SQL por requisição (0 desliga): uma fração das
+    # requisições é monitorada e as que passam do limite vão para o log com
+    # os comandos repetidos (sinal de N+1)
+    ORCAMENTO_CONSULTAS = int(os.environ.get('ORCAMENTO_CONSULTAS', 0))
+    ORCAMENTO_CONSULTAS_AMOSTRAGEM = float(os.environ.get('ORCAMENTO_CONSULTAS_AMOSTRAGEM', 0.05))
+
+    # Consultas acima de CONSULTAS_LENTAS_MS (0 desliga) são gravadas com o
+    # EXPLAIN QUERY PLAN em um arquivo rotativo; ver GET /api/admin/consultas-lentas
+    CONSULTAS_LENTAS_MS = float(os.environ.get('CONSULTAS_LENTAS_MS', 0))
+    CONSULTAS_LENTAS_ARQUIVO = os.environ.get('CONSULTAS_LENTAS_ARQUIVO', os.path.join(basedir, 'logs', 'consultas_lentas.jsonl'))
+    CONSULTAS_LENTAS_MAX_BYTES = int(os.environ.get('CONSULTAS_LENTAS_MAX_BYTES', 5 * 1024 * 1024))
+    CONSULTAS_LENTAS_BACKUPS = int(os.environ.get('CONSULTAS_LENTAS_BACKUPS', 3))
+
+    # Perfil sob demanda ('X-Profile: 1' enviado por um Admin); os arquivos
+    # ficam em PERFIS_PASTA e são servidos em /api/admin/perfis/<id>/<formato>
+    PERFIS_PASTA = os.environ.get('PERFIS_PASTA', os.path.join(basedir, 'logs', 'perfis'))
+    PERFIS_MAX = int(os.environ.get('PERFIS_MAX', 50))
+    PERFIS_INTERVALO_MS = float(os.environ.get('PERFIS_INTERVALO_MS', 1))
+
+    # Diagnóstico de memória em /api/admin/memoria: profundidade das pilhas
+    # guardadas pelo tracemalloc e quantos snapshots cada worker mantém
+    MEMORIA_TRACEMALLOC_QUADROS = int(os.environ.get('MEMORIA_TRACEMALLOC_QUADROS', 10))
+    MEMORIA_MAX_SNAPSHOTS = int(os.environ.get('MEMORIA_MAX_SNAPSHOTS', 5))
     
     # --- CONFIGURAÇÕES DE SEGURANÇA MELHORADAS ---
     # Gera uma chave secreta aleatória se não estiver definida
@@ -42,6 +90,37 @@ class Config:
     UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
     ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'zip', 'json'}
     
+    # Quantos índices (diretório central) de ZIPs de relatório manter em memória
+    ZIP_INDEX_CACHE_SIZE = int(os.environ.get('ZIP_INDEX_CACHE_SIZE', 64))
+    # Quantos projetos manter com o grafo de dependências e o caminho crítico em memória
+    CRONOGRAMA_CACHE_SIZE = int(os.environ.get('CRONOGRAMA_CACHE_SIZE', 128))
+    # Tempo (s) que o navegador pode reutilizar um anexo sem revalidar
+    ANEXO_CACHE_MAX_AGE = int(os.environ.get('ANEXO_CACHE_MAX_AGE', 3600))
+    # Seções do /api/bootstrap em memória e por quanto tempo (s) no máximo
+    BOOTSTRAP_CACHE_SIZE = int(os.environ.get('BOOTSTRAP_CACHE_SIZE', 256))
+    BOOTSTRAP_CACHE_TTL = float(os.environ.get('BOOTSTRAP_CACHE_TTL', 30))
+    # Canal de eventos (/api/eventos): intervalo (s) entre heartbeats, eventos
+    # guardados por cliente antes de descartar os mais antigos e conexões simultâneas
+    SSE_HEARTBEAT = float(os.environ.get('SSE_HEARTBEAT', 15))
+    SSE_BUFFER = int(os.environ.get('SSE_BUFFER', 100))
+    SSE_MAX_CLIENTES = int(os.environ.get('SSE_MAX_CLIENTES', 500))
+    # Cada processo lê os eventos gravados no banco por todos os workers a cada
+    # SSE_INTERVALO segundos; a tabela guarda os últimos SSE_RETENCAO eventos
+    SSE_INTERVALO = float(os.environ.get('SSE_INTERVALO', 0.5))
+    SSE_RETENCAO = int(os.environ.get('SSE_RETENCAO', 10000))
+    # Servidor ASGI (asgi.py): threads para as leituras no banco e para o app Flask montado
+    ASGI_DB_THREADS = int(os.environ.get('ASGI_DB_THREADS', 8))
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 10))
+
+    # Servidor de produção (gunicorn.conf.py): classe de worker e threads por
+    # worker de cada perfil; GUNICORN_WORKERS vazio usa 2 x CPUs + 1. Vários
+    # workers são suportados: os eventos do SSE passam pela tabela 'eventos' e
+    # os caches do cronograma e do bootstrap conferem a versão gravada no banco.
+    # Só as métricas e o diagnóstico de memória são de cada worker.
+    GUNICORN_WORKER_CLASS = 'gthread'
+    GUNICORN_THREADS = 4
+    GUNICORN_WORKERS = None
+    
     # Configurações de sessão
     PERMANENT_SESSION_LIFETIME = int(os.environ.get('SESSION_LIFETIME', 3600))  # 1 hora
     
@@ -71,6 +150,9 @@ class DevelopmentConfig(Config):
     # CORS mais permissivo em desenvolvimento
     CORS_ORIGINS = ['http://localhost:3000', 'http://127.0.0.1:3000', 'http://localhost:5173']
 
+    # Um worker basta para desenvolver; as threads atendem o canal de eventos
+    GUNICORN_WORKERS = 1
+
 
 class TestingConfig(Config):
     """Configuração para ambiente de testes."""
@@ -91,25 +173,23 @@ class ProductionConfig(Config):
     """Configuração para ambiente de produção."""
     DEBUG = False
     TESTING = False
+
+    # Em um worker gthread cada conexão SSE ocupa uma das GUNICORN_THREADS; no
+    # uvicorn ela só espera no laço de eventos. Os eventos de todos os workers
+    # chegam a cada um pelo retransmissor de utils/pubsub.py
+    GUNICORN_WORKER_CLASS = 'uvicorn_worker.UvicornWorker'
+
+    # Log em JSON, também em arquivo (escrito fora das threads das requisições)
+    LOG_FORMATO = os.environ.get('LOG_FORMATO', 'json').lower()
+    LOG_ARQUIVO = os.environ.get('LOG_ARQUIVO', os.path.join(basedir, 'logs', 'projectflow.log'))
+
+    # Nenhuma rota da API precisa de mais consultas que isso com o carregamento correto
+    ORCAMENTO_CONSULTAS = int(os.environ.get('ORCAMENTO_CONSULTAS', 25))
     
     # Em produção, validações mais rigorosas
     @classmethod
     def init_app(cls, app):
         Config.validate_config()
-        
-        # Log para arquivo em produção
-        import logging
-        from logging.handlers import RotatingFileHandler
-        
-        if not app.debug:
-            file_handler = RotatingFileHandler(
-                'logs/projectflow.log', maxBytes=10240, backupCount=10
-            )
-            file_handler.setFormatter(logging.Formatter(
-                '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-            ))
-            file_handler.setLevel(logging.INFO)
-            app.logger.addHandler(file_handler)
 
 
 # Mapeamento de configurações por ambiente
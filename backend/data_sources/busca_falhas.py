@@ -0,0 +1,32 @@
+# backend/data_sources/busca_falhas.py
+"""
+Índice de busca textual (FTS5) das falhas de teste.
+
+O índice é feito sobre as assinaturas de falha (uma linha por causa distinta),
+não sobre cada teste executado: as mensagens se repetem muito entre testes e
+ciclos, e a assinatura normalizada preserva todas as palavras da mensagem.
+É uma tabela de conteúdo externo ('assinaturas_falha'); como assinaturas nunca
+mudam depois de criadas, basta um trigger de inserção.
+"""
+
+from sqlalchemy.engine import Connection
+
+TABELA_BUSCA_FALHAS = 'falhas_busca'
+
+
+def criar_indice_falhas(conn: Connection):
+    """Cria (se preciso) a tabela FTS5 e o trigger, e reconstrói o índice."""
+    conn.exec_driver_sql(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_BUSCA_FALHAS} USING fts5(
+            assinatura, exemplo_mensagem,
+            content = 'assinaturas_falha', content_rowid = 'id_assinatura',
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_busca_falha_insert AFTER INSERT ON assinaturas_falha BEGIN
+            INSERT INTO {TABELA_BUSCA_FALHAS} (rowid, assinatura, exemplo_mensagem)
+            VALUES (NEW.id_assinatura, NEW.assinatura, NEW.exemplo_mensagem);
+        END
+    """)
+    conn.exec_driver_sql(f"INSERT INTO {TABELA_BUSCA_FALHAS} ({TABELA_BUSCA_FALHAS}) VALUES ('rebuild')")
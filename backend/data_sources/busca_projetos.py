@@ -0,0 +1,81 @@
+# backend/data_sources/busca_projetos.py
+"""
+Índice de busca textual (FTS5) dos projetos.
+
+A tabela virtual 'projetos_busca' guarda, por projeto (rowid = id_projeto),
+o nome, a descrição, o número do TopDesk e os nomes relacionados (responsável,
+área solicitante e equipe). Triggers no próprio SQLite mantêm o índice
+atualizado a cada alteração, inclusive as feitas fora do ORM.
+"""
+
+from sqlalchemy.engine import Connection
+
+TABELA_BUSCA = 'projetos_busca'
+
+# Colunas do índice, na ordem usada por highlight()/snippet()/bm25()
+COLUNAS_BUSCA = ('nome_projeto', 'descricao', 'numero_topdesk', 'nomes_relacionados')
+
+_CRIAR_TABELA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_BUSCA} USING fts5(
+        {', '.join(COLUNAS_BUSCA)},
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+# Documento indexado de cada projeto que satisfaz {condicao} (alias 'p')
+_DOCUMENTO = f"""
+    INSERT INTO {TABELA_BUSCA} (rowid, {', '.join(COLUNAS_BUSCA)})
+    SELECT p.id_projeto, p.nome_projeto, p.descricao, p.numero_topdesk,
+           coalesce(u.nome_completo, '') || ' ' || coalesce(a.nome_area, '') || ' ' || coalesce((
+               SELECT group_concat(ue.nome_completo, ' ')
+               FROM projeto_equipe pe JOIN usuarios ue ON ue.id_usuario = pe.usuario_id
+               WHERE pe.projeto_id = p.id_projeto
+           ), '')
+    FROM projetos p
+    LEFT JOIN usuarios u ON u.id_usuario = p.id_responsavel
+    LEFT JOIN areas a ON a.id_area = p.id_area_solicitante
+    WHERE {{condicao}};
+"""
+
+
+def _reindexar(condicao: str) -> str:
+    """Comandos que removem e regravam os projetos que satisfazem a condição."""
+    return (
+        f"DELETE FROM {TABELA_BUSCA} WHERE rowid IN (SELECT p.id_projeto FROM projetos p WHERE {condicao});"
+        + _DOCUMENTO.format(condicao=condicao)
+    )
+
+
+# (nome, evento, corpo) de cada trigger
+_TRIGGERS = (
+    ('trg_busca_projeto_insert', "AFTER INSERT ON projetos",
+     _reindexar("p.id_projeto = NEW.id_projeto")),
+    ('trg_busca_projeto_update',
+     "AFTER UPDATE OF nome_projeto, descricao, numero_topdesk, id_responsavel, id_area_solicitante ON projetos",
+     f"DELETE FROM {TABELA_BUSCA} WHERE rowid = OLD.id_projeto;" + _reindexar("p.id_projeto = NEW.id_projeto")),
+    ('trg_busca_projeto_delete', "AFTER DELETE ON projetos",
+     f"DELETE FROM {TABELA_BUSCA} WHERE rowid = OLD.id_projeto;"),
+    ('trg_busca_usuario_update', "AFTER UPDATE OF nome_completo ON usuarios",
+     _reindexar("p.id_responsavel = NEW.id_usuario OR p.id_projeto IN "
+                "(SELECT projeto_id FROM projeto_equipe WHERE usuario_id = NEW.id_usuario)")),
+    ('trg_busca_area_update', "AFTER UPDATE OF nome_area ON areas",
+     _reindexar("p.id_area_solicitante = NEW.id_area")),
+    ('trg_busca_equipe_insert', "AFTER INSERT ON projeto_equipe",
+     _reindexar("p.id_projeto = NEW.projeto_id")),
+    ('trg_busca_equipe_delete', "AFTER DELETE ON projeto_equipe",
+     _reindexar("p.id_projeto = OLD.projeto_id")),
+)
+
+
+def criar_indice_busca(conn: Connection):
+    """Cria (se preciso) a tabela FTS5 e os triggers, e reconstrói o índice."""
+    conn.exec_driver_sql(_CRIAR_TABELA)
+    for nome, evento, corpo in _TRIGGERS:
+        conn.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {nome} {evento} BEGIN {corpo} END")
+    reconstruir_indice_busca(conn)
+
+
+def reconstruir_indice_busca(conn: Connection):
+    """Regrava o índice de todos os projetos."""
+    conn.exec_driver_sql(f"DELETE FROM {TABELA_BUSCA}")
+    conn.exec_driver_sql(_DOCUMENTO.format(condicao="1 = 1"))
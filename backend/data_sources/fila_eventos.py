@@ -0,0 +1,71 @@
+# backend/data_sources/fila_eventos.py
+"""
+Fila dos eventos do canal de Server-Sent Events no banco ('eventos').
+
+É o que permite ao barramento (utils/pubsub.py) funcionar com vários
+processos: a escrita grava o evento na própria transação e o retransmissor
+de cada processo lê os eventos posteriores ao último que já distribuiu.
+"""
+
+import datetime
+import json
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Engine
+
+from models import EventoPublicado
+
+
+def _agora() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _serializar(dados: Dict) -> str:
+    return json.dumps(dados, separators=(',', ':'), default=str)
+
+
+class FilaEventos:
+    """Grava e lê os eventos publicados, em ordem de id."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def gravar(self, session, eventos: Iterable[Tuple[str, Dict]]):
+        """
+        Grava os eventos (tipo, dados) na transação da sessão, em um único
+        comando: eles só existem se ela for confirmada.
+        """
+        data = _agora()
+        session.execute(insert(EventoPublicado), [
+            {"tipo": tipo, "dados": _serializar(dados), "data": data} for tipo, dados in eventos
+        ])
+
+    def gravar_agora(self, tipo: str, dados: Dict) -> int:
+        """Grava o evento em uma transação própria; devolve o seu id."""
+        with self.engine.begin() as conn:
+            return conn.execute(
+                insert(EventoPublicado).values(tipo=tipo, dados=_serializar(dados), data=_agora())
+            ).inserted_primary_key[0]
+
+    def ultimo_id(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.scalar(select(func.coalesce(func.max(EventoPublicado.id_evento), 0)))
+
+    def ler(self, desde: int, limite: int = 500) -> List[Dict]:
+        """Eventos com id maior que 'desde', no formato publicado pelo barramento."""
+        with self.engine.connect() as conn:
+            linhas = conn.execute(
+                select(EventoPublicado.id_evento, EventoPublicado.tipo, EventoPublicado.dados)
+                .where(EventoPublicado.id_evento > desde)
+                .order_by(EventoPublicado.id_evento)
+                .limit(limite)
+            ).all()
+        return [{"id": id_evento, "tipo": tipo, **json.loads(dados)} for id_evento, tipo, dados in linhas]
+
+    def descartar_ate(self, id_evento: int) -> int:
+        """Apaga os eventos com id até 'id_evento'; devolve quantos foram apagados."""
+        if id_evento <= 0:
+            return 0
+        with self.engine.begin() as conn:
+            return conn.execute(delete(EventoPublicado).where(EventoPublicado.id_evento <= id_evento)).rowcount
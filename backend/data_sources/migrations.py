@@ -0,0 +1,342 @@
+# backend/data_sources/migrations.py
+"""
+Migrações incrementais do esquema SQLite.
+
+O 'Base.metadata.create_all' cria tabelas novas, mas não altera tabelas que
+já existem em bancos antigos (índices, colunas, reestruturações). Cada migração
+abaixo cobre esse intervalo e é aplicada uma única vez, controlada pelo
+'PRAGMA user_version' do próprio arquivo do banco.
+
+Toda migração deve ser idempotente: em um banco novo o create_all já deixou o
+esquema no formato final e a migração só precisa não fazer nada.
+
+Na inicialização, 'esquema_em_dia' evita o create_all (que inspeciona cada
+tabela) e as migrações quando o banco já está na versão atual e a impressão
+do esquema gravada nele coincide com a dos modelos.
+"""
+
+import hashlib
+import logging
+from typing import Callable, List, Tuple
+
+from sqlalchemy import MetaData
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+
+def _m001_indice_caminho_relatorio(conn: Connection):
+    """Índice usado na contagem de referências dos relatórios armazenados."""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_homologacoes_caminho_relatorio_zip "
+        "ON homologacoes (caminho_relatorio_zip)"
+    )
+
+
+def _colunas(conn: Connection, tabela: str) -> List[str]:
+    return [linha[1] for linha in conn.exec_driver_sql(f"PRAGMA table_info({tabela})")]
+
+
+def _m002_normalizar_testes_executados(conn: Connection):
+    """
+    Converte 'testes_executados' do formato antigo (texto completo por ciclo)
+    para dimensão 'definicoes_teste' + fato compacto.
+
+    Os dados antigos não guardam o historyId do Allure, então a identidade das
+    definições migradas é o próprio nome do teste (ou o uuid, sem nome). Como
+    na ingestão, execuções repetidas do mesmo teste em um ciclo se reduzem à
+    última; as demais são registradas no log uma a uma. Após a migração, um
+    'VACUUM' manual devolve ao sistema de arquivos o espaço liberado.
+    """
+    # Import local: a migração precisa das definições de tabela atuais
+    from models.teste_executado_model import (
+        TesteExecutado, codificar_status, comprimir_mensagem
+    )
+
+    if 'uuid' not in _colunas(conn, 'testes_executados'):
+        return  # Banco novo: o create_all já criou o formato normalizado
+
+    conn.exec_driver_sql("ALTER TABLE testes_executados RENAME TO testes_executados_legado")
+    TesteExecutado.__table__.create(conn)
+
+    conn.exec_driver_sql("""
+        INSERT OR IGNORE INTO definicoes_teste (chave_identidade, nome_teste, feature, severity)
+        SELECT COALESCE(nome_teste, uuid), COALESCE(nome_teste, uuid), MAX(feature), MAX(severity)
+        FROM testes_executados_legado
+        WHERE COALESCE(nome_teste, uuid) IS NOT NULL
+        GROUP BY COALESCE(nome_teste, uuid)
+    """)
+    # Última execução de cada teste em cada ciclo
+    conn.exec_driver_sql("""
+        CREATE TEMP TABLE execucoes_mantidas AS
+        SELECT MAX(id_execucao) AS id_execucao
+        FROM testes_executados_legado
+        WHERE COALESCE(nome_teste, uuid) IS NOT NULL
+        GROUP BY id_homologacao, COALESCE(nome_teste, uuid)
+    """)
+
+    cursor = conn.exec_driver_sql("""
+        SELECT l.id_execucao, l.id_homologacao, d.id_definicao, l.status, l.mensagem_erro
+        FROM testes_executados_legado l
+        JOIN execucoes_mantidas m ON m.id_execucao = l.id_execucao
+        JOIN definicoes_teste d ON d.chave_identidade = COALESCE(l.nome_teste, l.uuid)
+        ORDER BY l.id_execucao
+    """)
+    total = 0
+    while True:
+        linhas = cursor.fetchmany(1000)
+        if not linhas:
+            break
+        conn.exec_driver_sql(
+            "INSERT INTO testes_executados "
+            "(id_execucao, id_homologacao, id_definicao, status_codigo, mensagem_erro_comprimida) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (id_execucao, id_homologacao, id_definicao, codificar_status(status), comprimir_mensagem(mensagem))
+                for id_execucao, id_homologacao, id_definicao, status, mensagem in linhas
+            ]
+        )
+        total += len(linhas)
+
+    descartados = 0
+    for id_execucao, id_homologacao, nome_teste, uuid, status in conn.exec_driver_sql("""
+        SELECT id_execucao, id_homologacao, nome_teste, uuid, status
+        FROM testes_executados_legado
+        WHERE id_execucao NOT IN (SELECT id_execucao FROM execucoes_mantidas)
+        ORDER BY id_execucao
+    """):
+        descartados += 1
+        logger.warning(
+            "Execução %s (ciclo %s, teste %r, uuid %s, status %s) não migrada: "
+            "o ciclo tem uma execução mais recente do mesmo teste ou ela não tem nome nem uuid.",
+            id_execucao, id_homologacao, nome_teste, uuid, status
+        )
+
+    conn.exec_driver_sql("DROP TABLE execucoes_mantidas")
+    conn.exec_driver_sql("DROP TABLE testes_executados_legado")
+    logger.info("%d testes executados migrados para o formato normalizado; %d descartados.", total, descartados)
+
+
+def _m003_estatisticas_teste(conn: Connection):
+    """Preenche 'estatisticas_teste' a partir do histórico já existente."""
+    from sqlalchemy.orm import Session
+    from services.ingestao_testes import recalcular_estatisticas_projeto
+
+    ids_projetos = [linha[0] for linha in conn.exec_driver_sql(
+        "SELECT DISTINCT h.id_projeto FROM homologacoes h "
+        "JOIN testes_executados t ON t.id_homologacao = h.id_homologacao"
+    )]
+    session = Session(bind=conn)
+    for id_projeto in ids_projetos:
+        recalcular_estatisticas_projeto(session, id_projeto)
+    session.flush()
+
+
+def _m004_indice_testes_por_status(conn: Connection):
+    """Índice da listagem paginada de testes de um ciclo filtrada por status."""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_testes_executados_ciclo_status "
+        "ON testes_executados (id_homologacao, status_codigo, id_definicao)"
+    )
+
+
+def _m005_busca_projetos(conn: Connection):
+    """Índice FTS5 de busca textual dos projetos e triggers de atualização."""
+    from .busca_projetos import criar_indice_busca
+    criar_indice_busca(conn)
+
+
+def _m006_assinaturas_falha(conn: Connection):
+    """
+    Adiciona a assinatura de falha aos testes executados, calcula-a para o
+    histórico existente, preenche os agrupamentos por ciclo e cria o índice
+    FTS das falhas.
+    """
+    from sqlalchemy.orm import Session
+    from models.teste_executado_model import CODIGOS_REPROVADOS, descomprimir_mensagem
+    from services.ingestao_testes import assinatura_da_falha, resolver_assinaturas
+    from .busca_falhas import criar_indice_falhas
+
+    if 'id_assinatura' not in _colunas(conn, 'testes_executados'):
+        conn.exec_driver_sql(
+            "ALTER TABLE testes_executados ADD COLUMN id_assinatura INTEGER "
+            "REFERENCES assinaturas_falha (id_assinatura)"
+        )
+
+    reprovados = ', '.join(str(c) for c in CODIGOS_REPROVADOS)
+    linhas = conn.exec_driver_sql(
+        "SELECT id_execucao, status_codigo, mensagem_erro_comprimida FROM testes_executados "
+        f"WHERE id_assinatura IS NULL AND status_codigo IN ({reprovados}) "
+        "AND mensagem_erro_comprimida IS NOT NULL"
+    ).all()
+
+    hash_por_execucao = {}
+    novas = {}
+    for id_execucao, status_codigo, comprimida in linhas:
+        mensagem = descomprimir_mensagem(comprimida)
+        resultado = assinatura_da_falha(status_codigo, mensagem)
+        if resultado:
+            hash_por_execucao[id_execucao] = resultado[0]
+            novas.setdefault(resultado[0], (resultado[1], mensagem))
+
+    if novas:
+        session = Session(bind=conn)
+        ids = resolver_assinaturas(session, novas)
+        session.flush()
+        conn.exec_driver_sql(
+            "UPDATE testes_executados SET id_assinatura = ? WHERE id_execucao = ?",
+            [(ids[h], id_execucao) for id_execucao, h in hash_por_execucao.items()]
+        )
+
+    conn.exec_driver_sql("DELETE FROM falhas_por_ciclo")
+    conn.exec_driver_sql(
+        "INSERT INTO falhas_por_ciclo (id_homologacao, id_assinatura, quantidade) "
+        "SELECT id_homologacao, id_assinatura, COUNT(*) FROM testes_executados "
+        "WHERE id_assinatura IS NOT NULL GROUP BY id_homologacao, id_assinatura"
+    )
+    criar_indice_falhas(conn)
+    logger.info("%d falhas históricas associadas a %d assinaturas.", len(hash_por_execucao), len(novas))
+
+
+def _m007_dependencias_tarefa(conn: Connection):
+    """
+    Converte o texto livre de 'tarefas.dependencias' em arestas de
+    'dependencias_tarefa'. Ids inválidos, de outro projeto ou que fechariam
+    um ciclo são descartados, e o texto é regravado no formato canônico.
+    """
+    from utils.task_graph import DependenciaInvalidaError, alcanca, formatar_dependencias, parse_dependencias
+
+    if conn.exec_driver_sql("SELECT COUNT(*) FROM dependencias_tarefa").scalar():
+        return
+
+    projeto_da_tarefa = dict(conn.exec_driver_sql("SELECT id_tarefa, id_projeto FROM tarefas").all())
+    linhas = conn.exec_driver_sql(
+        "SELECT id_tarefa, id_projeto, dependencias FROM tarefas "
+        "WHERE dependencias IS NOT NULL AND TRIM(dependencias) != '' ORDER BY id_tarefa"
+    ).all()
+
+    sucessores = {}
+    arestas, textos, descartadas = [], [], 0
+    for id_tarefa, id_projeto, texto in linhas:
+        try:
+            candidatas = parse_dependencias(texto)
+        except DependenciaInvalidaError:
+            candidatas = []
+        aceitas = []
+        for predecessora in candidatas:
+            if (projeto_da_tarefa.get(predecessora) != id_projeto or predecessora == id_tarefa
+                    or alcanca(sucessores, id_tarefa, {predecessora})):
+                continue
+            sucessores.setdefault(predecessora, []).append(id_tarefa)
+            aceitas.append(predecessora)
+            arestas.append((predecessora, id_tarefa, id_projeto))
+        descartadas += len(candidatas) - len(aceitas)
+        textos.append((formatar_dependencias(aceitas), id_tarefa))
+
+    if arestas:
+        conn.exec_driver_sql(
+            "INSERT INTO dependencias_tarefa (id_predecessora, id_tarefa, id_projeto) VALUES (?, ?, ?)", arestas
+        )
+    if textos:
+        conn.exec_driver_sql("UPDATE tarefas SET dependencias = ? WHERE id_tarefa = ?", textos)
+    logger.info("%d dependências de tarefas migradas (%d descartadas).", len(arestas), descartadas)
+
+
+def _m008_registro_alteracoes(conn: Connection):
+    """Triggers do registro de alterações (change feed) de projetos e tarefas."""
+    from .registro_alteracoes import criar_registro_alteracoes
+    criar_registro_alteracoes(conn)
+
+
+def _m009_versoes_tabelas(conn: Connection):
+    """Triggers que mantêm as versões de tabela usadas pelos caches em memória."""
+    from .versoes_tabelas import criar_versoes_tabelas
+    criar_versoes_tabelas(conn)
+
+
+def _m010_responsavel_anterior(conn: Connection):
+    """Responsável anterior nas alterações de projeto que trocam o responsável."""
+    from .registro_alteracoes import criar_registro_alteracoes
+
+    if 'id_responsavel_anterior' not in _colunas(conn, 'alteracoes'):
+        conn.exec_driver_sql("ALTER TABLE alteracoes ADD COLUMN id_responsavel_anterior INTEGER")
+    # O trigger de atualização de projetos passou a gravar a nova coluna
+    conn.exec_driver_sql("DROP TRIGGER IF EXISTS trg_alteracao_projeto_update")
+    criar_registro_alteracoes(conn)
+
+
+# (versão, descrição, função) — sempre em ordem crescente de versão
+MIGRACOES: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "índice de referências de relatórios", _m001_indice_caminho_relatorio),
+    (2, "normalização de testes executados", _m002_normalizar_testes_executados),
+    (3, "estatísticas de instabilidade por teste", _m003_estatisticas_teste),
+    (4, "índice de testes por ciclo e status", _m004_indice_testes_por_status),
+    (5, "busca textual de projetos (FTS5)", _m005_busca_projetos),
+    (6, "assinaturas e agrupamento de falhas", _m006_assinaturas_falha),
+    (7, "grafo de dependências entre tarefas", _m007_dependencias_tarefa),
+    (8, "registro de alterações de projetos e tarefas", _m008_registro_alteracoes),
+    (9, "versões de tabela para os caches", _m009_versoes_tabelas),
+    (10, "responsável anterior no registro de alterações", _m010_responsavel_anterior),
+]
+
+
+def versao_esquema_atual() -> int:
+    """Versão do esquema esperada pelo código."""
+    return MIGRACOES[-1][0] if MIGRACOES else 0
+
+
+def aplicar_migracoes(engine: Engine) -> int:
+    """
+    Aplica, em ordem, as migrações ainda não executadas neste banco.
+
+    Returns:
+        Versão do esquema após a execução
+    """
+    with engine.begin() as conn:
+        versao = conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+        for numero, descricao, migracao in MIGRACOES:
+            if numero <= versao:
+                continue
+            logger.info("Aplicando migração %d: %s", numero, descricao)
+            migracao(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(numero)}")
+            versao = numero
+    return versao
+
+
+def impressao_esquema(metadata: MetaData) -> str:
+    """
+    Resumo das tabelas, colunas, chaves e índices declarados nos modelos e da
+    versão das migrações. Muda sempre que um modelo ganha ou altera algo que
+    o create_all precisaria criar.
+    """
+    partes = [f"versao={versao_esquema_atual()}"]
+    for tabela in sorted(metadata.tables.values(), key=lambda t: t.name):
+        partes.append(f"tabela={tabela.name}")
+        for coluna in tabela.columns:
+            estrangeiras = ','.join(sorted(fk.target_fullname for fk in coluna.foreign_keys))
+            partes.append(f"{coluna.name}:{coluna.type!r}:{coluna.nullable}:{coluna.primary_key}:{estrangeiras}")
+        for indice in sorted(tabela.indexes, key=lambda i: i.name or ''):
+            partes.append(f"indice={indice.name}:{indice.unique}:{','.join(c.name for c in indice.columns)}")
+    return hashlib.sha256('\n'.join(partes).encode('utf-8')).hexdigest()
+
+
+def esquema_em_dia(engine: Engine, impressao: str) -> bool:
+    """True se o banco está na versão atual e foi criado a partir do mesmo esquema dos modelos."""
+    with engine.connect() as conn:
+        if (conn.exec_driver_sql("PRAGMA user_version").scalar() or 0) != versao_esquema_atual():
+            return False
+        try:
+            gravada = conn.exec_driver_sql("SELECT impressao FROM esquema_impressao").scalar()
+        except OperationalError:
+            return False  # Banco anterior ao registro da impressão
+    return gravada == impressao
+
+
+def registrar_impressao(engine: Engine, impressao: str):
+    """Grava a impressão do esquema depois do create_all e das migrações."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS esquema_impressao (impressao TEXT NOT NULL)")
+        conn.exec_driver_sql("DELETE FROM esquema_impressao")
+        conn.exec_driver_sql("INSERT INTO esquema_impressao (impressao) VALUES (?)", (impressao,))
@@ -0,0 +1,60 @@
+# backend/data_sources/registro_alteracoes.py
+"""
+Registro de alterações (change feed) de projetos e tarefas.
+
+Triggers no SQLite gravam uma linha em 'alteracoes' a cada INSERT, UPDATE ou
+DELETE em projetos e tarefas, na mesma transação da escrita. Assim os comandos
+em massa dos serviços (UPDATE/INSERT em lote, exclusões em cascata) entram no
+registro sem que cada serviço precise lembrar de gravá-lo. Mudanças na equipe
+e nos objetivos de um projeto contam como atualização do projeto.
+
+Quando a atualização troca o responsável do projeto, a linha guarda também o
+responsável anterior: é por ele que o Membro que perdeu o acesso fica sabendo
+que o projeto saiu da sua lista.
+"""
+
+from sqlalchemy.engine import Connection
+
+_AGORA = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+
+_RESPONSAVEL_TROCADO = "CASE WHEN OLD.id_responsavel IS NOT NEW.id_responsavel THEN OLD.id_responsavel END"
+
+
+def _registrar(entidade: str, id_entidade: str, id_projeto: str, operacao: str,
+               id_responsavel_anterior: str = 'NULL') -> str:
+    return (
+        "INSERT INTO alteracoes (entidade, id_entidade, id_projeto, operacao, data, id_responsavel_anterior) "
+        f"VALUES ('{entidade}', {id_entidade}, {id_projeto}, '{operacao}', {_AGORA}, {id_responsavel_anterior});"
+    )
+
+
+# (nome, evento, corpo) de cada trigger
+_TRIGGERS = (
+    ('trg_alteracao_projeto_insert', "AFTER INSERT ON projetos",
+     _registrar('projeto', 'NEW.id_projeto', 'NEW.id_projeto', 'insert')),
+    ('trg_alteracao_projeto_update', "AFTER UPDATE ON projetos",
+     _registrar('projeto', 'NEW.id_projeto', 'NEW.id_projeto', 'update', _RESPONSAVEL_TROCADO)),
+    ('trg_alteracao_projeto_delete', "AFTER DELETE ON projetos",
+     _registrar('projeto', 'OLD.id_projeto', 'OLD.id_projeto', 'delete')),
+    ('trg_alteracao_equipe_insert', "AFTER INSERT ON projeto_equipe",
+     _registrar('projeto', 'NEW.projeto_id', 'NEW.projeto_id', 'update')),
+    ('trg_alteracao_equipe_delete', "AFTER DELETE ON projeto_equipe",
+     _registrar('projeto', 'OLD.projeto_id', 'OLD.projeto_id', 'update')),
+    ('trg_alteracao_objetivo_insert', "AFTER INSERT ON projeto_objetivo",
+     _registrar('projeto', 'NEW.projeto_id', 'NEW.projeto_id', 'update')),
+    ('trg_alteracao_objetivo_delete', "AFTER DELETE ON projeto_objetivo",
+     _registrar('projeto', 'OLD.projeto_id', 'OLD.projeto_id', 'update')),
+    ('trg_alteracao_tarefa_insert', "AFTER INSERT ON tarefas",
+     _registrar('tarefa', 'NEW.id_tarefa', 'NEW.id_projeto', 'insert')),
+    ('trg_alteracao_tarefa_update', "AFTER UPDATE ON tarefas",
+     _registrar('tarefa', 'NEW.id_tarefa', 'NEW.id_projeto', 'update')),
+    ('trg_alteracao_tarefa_delete', "AFTER DELETE ON tarefas",
+     _registrar('tarefa', 'OLD.id_tarefa', 'OLD.id_projeto', 'delete')),
+)
+
+
+def criar_registro_alteracoes(conn: Connection):
+    """Cria (se preciso) os triggers que alimentam a tabela 'alteracoes'."""
+    for nome, evento, corpo in _TRIGGERS:
+        conn.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {nome} {evento} BEGIN {corpo} END")
@@ -1,6 +1,6 @@
 import os
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, joinedload, subqueryload
+from sqlalchemy.orm import sessionmaker, joinedload, selectinload, subqueryload
 
 # --- IMPORTAÇÃO CENTRALIZADA DE TODOS OS MODELOS ---
 # Importamos a Base e todas as classes de modelo do nosso ponto de entrada.
@@ -8,6 +8,7 @@ from models import (
     Base, Usuario, Area, Projeto, StatusLog, 
     Homologacao, Tarefa, ObjetivoEstrategico
 )
+from .migrations import aplicar_migracoes, esquema_em_dia, impressao_esquema, registrar_impressao
 
 class Database:
     """
@@ -26,15 +27,22 @@ class Database:
         """
         self.app = app
         db_file = self.app.config.get('DATABASE_URL', 'fallback_projectflow.db')
-        self.app.logger.info(f"Inicializando banco de dados em: {db_file}")
+        self.app.logger.info("Inicializando banco de dados em: %s", db_file)
         
         db_exists = os.path.exists(db_file)
         self.engine = create_engine(f'sqlite:///{db_file}')
         
         # --- LÓGICA SIMPLIFICADA ---
         # Base.metadata já conhece todas as tabelas e seus relacionamentos
-        # definidos diretamente nas classes de modelo.
-        Base.metadata.create_all(self.engine)
+        # definidos diretamente nas classes de modelo. Se o banco já foi
+        # criado a partir deste mesmo esquema, não há nada a criar ou migrar.
+        impressao = impressao_esquema(Base.metadata)
+        if db_exists and esquema_em_dia(self.engine, impressao):
+            self.app.logger.info("Esquema do banco em dia; create_all e migrações dispensados.")
+        else:
+            Base.metadata.create_all(self.engine)
+            aplicar_migracoes(self.engine)
+            registrar_impressao(self.engine, impressao)
         
         self.Session = sessionmaker(bind=self.engine)
         
@@ -106,10 +114,25 @@ def get_projeto_by_id(session, id_projeto: int):
         subqueryload(Projeto.tarefas)
     ).filter_by(id_projeto=id_projeto).first()
 
-def get_all_projetos(session):
-    """Busca todos os projetos, carregando os relacionamentos principais."""
-    return session.query(Projeto).options(
+def colecoes_do_projeto():
+    """
+    Carregamento das coleções que Projeto.para_dicionario percorre: uma
+    consulta por coleção para a lista inteira, em vez de uma por projeto.
+    """
+    return (
+        selectinload(Projeto.historico_status),
+        selectinload(Projeto.ciclos_homologacao),
+        selectinload(Projeto.tarefas),
+    )
+
+def get_all_projetos(session, ids=None):
+    """Busca todos os projetos (ou só os de 'ids'), carregando os relacionamentos principais."""
+    consulta = session.query(Projeto).options(
         joinedload(Projeto.responsavel),
         joinedload(Projeto.area_solicitante),
-        joinedload(Projeto.equipe)
-    ).all()
\ No newline at end of file
+        joinedload(Projeto.equipe),
+        *colecoes_do_projeto()
+    )
+    if ids is not None:
+        consulta = consulta.filter(Projeto.id_projeto.in_(ids))
+    return consulta.all()
\ No newline at end of file
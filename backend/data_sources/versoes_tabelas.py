@@ -0,0 +1,27 @@
+# backend/data_sources/versoes_tabelas.py
+"""
+Versões das tabelas lidas pelos caches em memória (utils/table_versions.py).
+
+Triggers no SQLite incrementam a linha da tabela em 'versoes_tabelas' a cada
+INSERT, UPDATE ou DELETE, na mesma transação da escrita. Assim a versão vale
+para todos os processos que usam o banco e também cobre escritas feitas
+direto na conexão.
+"""
+
+from sqlalchemy.engine import Connection
+
+TABELAS_VERSIONADAS = ('projetos', 'projeto_equipe', 'projeto_objetivo', 'status_logs', 'homologacoes',
+                       'tarefas', 'usuarios', 'areas', 'objetivos_estrategicos')
+
+_OPERACOES = ('insert', 'update', 'delete')
+
+
+def criar_versoes_tabelas(conn: Connection):
+    """Cria (se preciso) os triggers que incrementam 'versoes_tabelas'."""
+    for tabela in TABELAS_VERSIONADAS:
+        for operacao in _OPERACOES:
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS trg_versao_{tabela}_{operacao} AFTER {operacao.upper()} ON {tabela} "
+                f"BEGIN INSERT INTO versoes_tabelas (tabela, versao) VALUES ('{tabela}', 1) "
+                "ON CONFLICT (tabela) DO UPDATE SET versao = versao + 1; END"
+            )
@@ -0,0 +1,80 @@
+# backend/gunicorn.conf.py
+"""
+Configuração do gunicorn (lida automaticamente quando ele é iniciado nesta pasta).
+
+Uso:
+    gunicorn                                  (perfil de FLASK_ENV, ver config.py)
+    GUNICORN_WORKER_CLASS=sync gunicorn       (qualquer ajuste pelo ambiente)
+
+O app é carregado uma única vez no master (preload_app): criação do esquema,
+migrações e dados iniciais rodam só ali. Antes do primeiro fork, gc.freeze()
+move os objetos já importados para uma geração permanente, que o coletor não
+percorre: sem isso, cada coleta nos workers escreve nos cabeçalhos desses
+objetos e copia as páginas que deveriam continuar compartilhadas.
+
+O tempo até ficar pronto (master e cada worker) e a memória de cada worker
+(RSS, PSS e privada) vão para o log; benchmark_gunicorn.py compara as variantes.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+import time
+
+# O script 'gunicorn' não coloca a pasta do backend no sys.path antes de ler este arquivo
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import get_config
+from utils.lazy_import import carregar_modulos_sob_demanda
+from utils.process_memory import formatar_memoria, memoria_do_processo
+
+_inicio = time.monotonic()
+_perfil = get_config()
+
+
+def _ativado(nome: str, padrao: bool = True) -> bool:
+    return os.environ.get(nome, str(padrao)).lower() in ('1', 'true', 'yes')
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS') or _perfil.GUNICORN_WORKERS or multiprocessing.cpu_count() * 2 + 1)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', _perfil.GUNICORN_WORKER_CLASS)
+threads = int(os.environ.get('GUNICORN_THREADS', _perfil.GUNICORN_THREADS))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+preload_app = _ativado('GUNICORN_PRELOAD')
+congelar_gc = preload_app and _ativado('GUNICORN_GC_FREEZE')
+
+# Workers uvicorn servem o app ASGI (asgi.py); os demais, o app Flask
+wsgi_app = 'asgi:create_asgi_app()' if 'uvicorn' in worker_class.lower() else 'wsgi:app'
+
+
+def when_ready(server):
+    if preload_app:
+        # Os workers herdam os módulos importados sob demanda em vez de
+        # importá-los cada um na primeira requisição
+        carregar_modulos_sob_demanda()
+    if congelar_gc:
+        gc.collect()
+        gc.freeze()
+    server.log.info(
+        f"Master pronto em {time.monotonic() - _inicio:.2f}s ({worker_class}, {workers} workers, "
+        f"{threads} threads, preload={preload_app}, gc.freeze={congelar_gc}); "
+        f"{formatar_memoria(memoria_do_processo())}"
+    )
+
+
+def post_fork(server, worker):
+    worker.inicio_fork = time.monotonic()
+    if preload_app:
+        # As conexões SQLite abertas pelo master não podem ser usadas pelo worker
+        from extensions import db
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    worker.log.info(
+        f"Worker {worker.pid} pronto em {time.monotonic() - worker.inicio_fork:.2f}s após o fork; "
+        f"{formatar_memoria(memoria_do_processo())}"
+    )
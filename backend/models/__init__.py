@@ -8,10 +8,15 @@ from .usuario_model import Usuario
 from .area_model import Area
 from .projeto_model import Projeto, StatusLog
 from .homologacao_model import Homologacao
-from .tarefa_model import Tarefa
+from .tarefa_model import Tarefa, DependenciaTarefa
 from .objetivo_model import ObjetivoEstrategico
 
 # --- ADICIONE ESTAS IMPORTAÇÕES ---
 # Importa as tabelas de associação para que fiquem disponíveis no pacote 'models'
 from .projeto_model import projeto_equipe_association, projeto_objetivo_association
-from .teste_executado_model import TesteExecutado
\ No newline at end of file
+from .teste_executado_model import TesteExecutado, DefinicaoTeste, EstatisticaTeste
+from .relatorio_model import RelatorioArmazenado
+from .falha_model import AssinaturaFalha, FalhaPorCiclo
+from .alteracao_model import Alteracao
+from .versao_tabela_model import VersaoTabela
+from .evento_model import EventoPublicado
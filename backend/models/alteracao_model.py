@@ -0,0 +1,31 @@
+from typing import Optional
+
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Importa a classe Base do nosso modelo principal de usuário
+from .usuario_model import Base
+
+
+class Alteracao(Base):
+    """
+    Registro de alterações em projetos e tarefas (change feed), gravado por
+    triggers na mesma transação da escrita (ver data_sources/registro_alteracoes.py).
+    O id é o cursor da sincronização incremental: AUTOINCREMENT garante que
+    ele nunca é reutilizado.
+    """
+    __tablename__ = 'alteracoes'
+    __table_args__ = (
+        Index('ix_alteracoes_projeto', 'id_projeto', 'id_alteracao'),
+        {'sqlite_autoincrement': True},
+    )
+
+    id_alteracao: Mapped[int] = mapped_column(primary_key=True)
+    entidade: Mapped[str]                # 'projeto' ou 'tarefa'
+    id_entidade: Mapped[int]
+    # Sem chave estrangeira: o registro sobrevive à exclusão do projeto
+    id_projeto: Mapped[int]
+    operacao: Mapped[str]                # 'insert', 'update' ou 'delete'
+    data: Mapped[str]
+    # Só em atualizações de projeto que trocaram o responsável
+    id_responsavel_anterior: Mapped[Optional[int]]
@@ -0,0 +1,20 @@
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Importa a classe Base do nosso modelo principal de usuário
+from .usuario_model import Base
+
+
+class EventoPublicado(Base):
+    """
+    Evento do canal de Server-Sent Events, gravado na transação da escrita que
+    o gerou. Cada processo lê os novos eventos e os entrega aos seus clientes
+    (ver utils/pubsub.py). O id é o 'id' do evento no fluxo e o Last-Event-ID
+    da reconexão: AUTOINCREMENT garante que ele nunca é reutilizado.
+    """
+    __tablename__ = 'eventos'
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id_evento: Mapped[int] = mapped_column(primary_key=True)
+    tipo: Mapped[str]
+    dados: Mapped[str]                   # JSON, incluindo 'responsaveis' (usado pelo filtro)
+    data: Mapped[str]
@@ -0,0 +1,52 @@
+from sqlalchemy import ForeignKey, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+# Importa a classe Base do nosso modelo principal de usuário
+from .usuario_model import Base
+
+
+class AssinaturaFalha(Base):
+    """
+    Causa de falha normalizada (ver utils/failure_signature.py). Falhas cuja
+    mensagem difere apenas em números, ids ou caminhos compartilham a mesma
+    assinatura. É também o conteúdo do índice FTS 'falhas_busca'.
+    """
+    __tablename__ = 'assinaturas_falha'
+
+    id_assinatura: Mapped[int] = mapped_column(primary_key=True)
+    hash_assinatura: Mapped[str] = mapped_column(unique=True)
+    assinatura: Mapped[str] = mapped_column(Text)
+    # Primeira mensagem original encontrada, para exibição
+    exemplo_mensagem: Mapped[str] = mapped_column(Text)
+
+    def para_dicionario(self):
+        return {
+            "id_assinatura": self.id_assinatura,
+            "assinatura": self.assinatura,
+            "exemplo_mensagem": self.exemplo_mensagem
+        }
+
+
+class FalhaPorCiclo(Base):
+    """
+    Agrupamento pré-calculado na ingestão: quantos testes de um ciclo falharam
+    com cada assinatura. Os painéis de triagem leem daqui, sem percorrer os
+    testes executados.
+    """
+    __tablename__ = 'falhas_por_ciclo'
+    __table_args__ = (
+        Index('ix_falhas_por_ciclo_assinatura', 'id_assinatura'),
+    )
+
+    id_homologacao: Mapped[int] = mapped_column(ForeignKey('homologacoes.id_homologacao', ondelete="CASCADE"), primary_key=True)
+    id_assinatura: Mapped[int] = mapped_column(ForeignKey('assinaturas_falha.id_assinatura'), primary_key=True)
+    quantidade: Mapped[int]
+
+    assinatura: Mapped[AssinaturaFalha] = relationship(lazy='joined')
+
+    def para_dicionario(self):
+        return {
+            "id_homologacao": self.id_homologacao,
+            **self.assinatura.para_dicionario(),
+            "quantidade": self.quantidade
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Text, Integer, Float
+from sqlalchemy import ForeignKey, Text, Integer, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List, TYPE_CHECKING
 
@@ -6,6 +6,7 @@ from typing import Optional, List, TYPE_CHECKING
 # Importa a Base e o Usuario para o relacionamento
 from .usuario_model import Base, Usuario
 from .teste_executado_model import TesteExecutado
+from .falha_model import FalhaPorCiclo
 
 # Usa TYPE_CHECKING para evitar importação circular
 if TYPE_CHECKING:
@@ -13,6 +14,11 @@ if TYPE_CHECKING:
 
 class Homologacao(Base):
     __tablename__ = 'homologacoes'
+
+    # Usado na contagem de referências dos relatórios armazenados por conteúdo
+    __table_args__ = (
+        Index('ix_homologacoes_caminho_relatorio_zip', 'caminho_relatorio_zip'),
+    )
     
     id_homologacao: Mapped[int] = mapped_column(primary_key=True)
     id_projeto: Mapped[int] = mapped_column(ForeignKey('projetos.id_projeto', ondelete="CASCADE"))
@@ -41,6 +47,7 @@ class Homologacao(Base):
     responsavel_teste: Mapped[Optional[Usuario]] = relationship(lazy='joined')
     # --- NOVO RELACIONAMENTO COM TESTES EXECUTADOS ---
     testes_executados: Mapped[List[TesteExecutado]] = relationship(cascade="all, delete-orphan")
+    falhas_agrupadas: Mapped[List[FalhaPorCiclo]] = relationship(cascade="all, delete-orphan")
     projeto: Mapped["Projeto"] = relationship(back_populates="ciclos_homologacao")
 
     def para_dicionario(self):
@@ -64,7 +71,6 @@ class Homologacao(Base):
             "testes_reprovados": self.testes_reprovados,
             "testes_bloqueados": self.testes_bloqueados,
             "taxa_sucesso": self.taxa_sucesso,
-            "responsavel_teste": self.responsavel_teste.para_dicionario() if self.responsavel_teste else None,
-            # --- ADICIONA OS TESTES À RESPOSTA DA API ---
-            "testes_executados": [t.para_dicionario() for t in self.testes_executados]
+            "responsavel_teste": self.responsavel_teste.para_dicionario() if self.responsavel_teste else None
+            # Os testes executados não entram aqui: são paginados em GET /api/homologacoes/<id>/testes
         }
\ No newline at end of file
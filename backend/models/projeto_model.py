@@ -1,19 +1,58 @@
 import datetime
-from typing import List, Optional, Dict, TYPE_CHECKING
+from typing import Iterable, List, Optional, Dict, TYPE_CHECKING
 from sqlalchemy import ForeignKey, Text, Table, Column, Float
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
 
 # Importa a Base e as classes que não causam ciclo
 from .usuario_model import Base, Usuario
 from .area_model import Area
 from .homologacao_model import Homologacao
 from .objetivo_model import ObjetivoEstrategico
+from utils.pubsub import barramento_eventos
 
 # Usa TYPE_CHECKING para importar 'Tarefa' apenas para análise de tipo,
 # evitando o erro de importação circular em tempo de execução.
 if TYPE_CHECKING:
     from .tarefa_model import Tarefa
 
+# --- FLUXO DE STATUS ---
+# Etapas do fluxo de trabalho, na ordem em que o projeto deve percorrê-las.
+FLUXO_STATUS = (
+    "Em Definição", "Em Especificação", "Espeficação Aprovada", "Em Desenvolvimento",
+    "Em Homologação", "Pendente de Implantação", "Pós GMUD", "Projeto concluído", "Cancelado"
+)
+STATUS_FINAIS = ("Projeto concluído", "Cancelado")
+# Status que podem ser visitados mais de uma vez (ciclos de retrabalho).
+STATUS_CICLICOS = ("Em Desenvolvimento", "Em Homologação")
+
+
+def proximos_status(status_atual: Optional[str]) -> List[str]:
+    """Próximos status a partir de 'status_atual': a etapa seguinte do fluxo ou o cancelamento."""
+    # Se o projeto já está em um estado final, não há próximos status.
+    if status_atual in STATUS_FINAIS or status_atual not in FLUXO_STATUS:
+        return []
+    proximos = [FLUXO_STATUS[FLUXO_STATUS.index(status_atual) + 1]]
+    # Permite cancelar o projeto de qualquer etapa (exceto se já for o próximo passo).
+    if "Cancelado" not in proximos:
+        proximos.append("Cancelado")
+    return proximos
+
+
+def erro_transicao(novo_status: str, status_visitados: Iterable[str]) -> Optional[str]:
+    """
+    Valida a mudança para 'novo_status' dado o histórico do projeto.
+
+    Returns:
+        A mensagem de erro, ou None se a transição for permitida
+    """
+    if novo_status not in FLUXO_STATUS:
+        return f"Status '{novo_status}' não é válido."
+    # A verificação de status repetido só se aplica se o novo status NÃO for cíclico.
+    if novo_status not in STATUS_CICLICOS and novo_status in set(status_visitados):
+        return f"Projeto já passou pelo status '{novo_status}'."
+    return None
+
+
 # --- TABELAS DE ASSOCIAÇÃO ---
 projeto_equipe_association = Table(
     'projeto_equipe', Base.metadata,
@@ -90,51 +129,19 @@ class Projeto(Base):
         """
         Retorna uma lista de próximos status válidos com base no status atual.
         """
-        STATUS_VALIDOS = [
-            "Em Definição", "Em Especificação", "Espeficação Aprovada", "Em Desenvolvimento", 
-            "Em Homologação", "Pendente de Implantação", "Pós GMUD", "Projeto concluído", "Cancelado"
-        ]
-        
-        # Se o projeto já está em um estado final, não há próximos status.
-        if self.status_atual in ["Projeto concluído", "Cancelado"]:
-            return []
-        
-        try:
-            # Encontra o índice do status atual na lista de fluxo de trabalho.
-            indice_atual = STATUS_VALIDOS.index(self.status_atual)
-            
-            # O próximo status é o item seguinte na lista.
-            proximos = [STATUS_VALIDOS[indice_atual + 1]]
-            
-            # Permite cancelar o projeto de qualquer etapa (exceto se já for o próximo passo).
-            if "Cancelado" not in proximos:
-                proximos.append("Cancelado")
-                
-            return proximos
-        except ValueError:
-            # Caso o status atual não seja encontrado na lista (não deve acontecer).
-            return []
+        return proximos_status(self.status_atual)
 
     def mudar_status(self, novo_status: str, id_usuario: int, observacao: str = ""):
         """
         Muda o status do projeto, validando a transição e adicionando um novo log ao histórico.
+        A mudança é notificada no canal de eventos quando a transação for confirmada.
         """
-        STATUS_VALIDOS = [
-            "Em Definição", "Em Especificação", "Espeficação Aprovada", "Em Desenvolvimento", 
-            "Em Homologação", "Pendente de Implantação", "Pós GMUD", "Projeto concluído", "Cancelado"
-        ]
-        if novo_status not in STATUS_VALIDOS:
-            raise ValueError(f"Status '{novo_status}' não é válido.")
-        
-        # Status que podem ser visitados mais de uma vez (ciclos de retrabalho).
-        STATUS_CICLICOS = ["Em Desenvolvimento", "Em Homologação"]
-
-        # A verificação de status repetido só se aplica se o novo status NÃO for cíclico.
-        if novo_status not in STATUS_CICLICOS:
-            if any(h.status == novo_status for h in self.historico_status):
-                raise ValueError(f"Projeto já passou pelo status '{novo_status}'.")
+        erro = erro_transicao(novo_status, (h.status for h in self.historico_status))
+        if erro:
+            raise ValueError(erro)
 
         # Atualiza o status principal do projeto.
+        status_anterior = self.status_atual
         self.status_atual = novo_status
         
         # Cria um novo objeto de log para registrar esta mudança.
@@ -152,6 +159,12 @@ class Projeto(Base):
         if novo_status == "Projeto concluído":
             self.data_fim_real = novo_log.data
 
+        barramento_eventos.publicar_apos_commit(
+            object_session(self), 'status_projeto',
+            id_projeto=self.id_projeto, responsaveis=[self.id_responsavel],
+            status=novo_status, status_anterior=status_anterior
+        )
+
     def para_dicionario(self) -> Dict:
         return {
             "id_projeto": self.id_projeto,
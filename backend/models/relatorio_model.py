@@ -0,0 +1,53 @@
+import datetime
+import json
+import zlib
+from typing import Optional, Dict
+from sqlalchemy import String, Text, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Importa a classe Base do nosso modelo principal de usuário
+from .usuario_model import Base
+
+
+class RelatorioArmazenado(Base):
+    """
+    Arquivo de relatório guardado por conteúdo (SHA-256) junto com o
+    resultado do parsing, para que uploads repetidos não sejam processados de novo.
+
+    As referências a este arquivo são as homologações cujo
+    'caminho_relatorio_zip' aponta para 'caminho_arquivo'.
+    """
+    __tablename__ = 'relatorios_armazenados'
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    caminho_arquivo: Mapped[str] = mapped_column(unique=True)
+    tamanho_bytes: Mapped[int]
+    data_criacao: Mapped[str] = mapped_column(default=lambda: datetime.datetime.now(datetime.timezone.utc).isoformat())
+
+    # --- CACHE DO RESULTADO DO PARSER ---
+    metricas_cache: Mapped[Optional[str]] = mapped_column(Text)
+    testes_cache: Mapped[Optional[bytes]] = mapped_column(LargeBinary)  # JSON comprimido com zlib
+
+    def possui_cache(self) -> bool:
+        return self.metricas_cache is not None and self.testes_cache is not None
+
+    def salvar_resultado(self, dados: Dict):
+        """Guarda o retorno do parser (métricas + testes) de forma compacta."""
+        self.metricas_cache = json.dumps(dados['metricas'])
+        self.testes_cache = zlib.compress(
+            json.dumps(dados['testes'], separators=(',', ':')).encode('utf-8')
+        )
+
+    def carregar_resultado(self) -> Dict:
+        """Reconstrói o retorno do parser a partir do cache."""
+        return {
+            "metricas": json.loads(self.metricas_cache),
+            "testes": json.loads(zlib.decompress(self.testes_cache).decode('utf-8'))
+        }
+
+    def para_dicionario(self):
+        return {
+            "sha256": self.sha256,
+            "tamanho_bytes": self.tamanho_bytes,
+            "data_criacao": self.data_criacao
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, TYPE_CHECKING
 
@@ -44,4 +44,21 @@ class Tarefa(Base):
             "responsavel": self.responsavel.para_dicionario() if self.responsavel else None,
             "id_projeto": self.id_projeto,
             "nome_projeto": self.projeto.nome_projeto if self.projeto else "Projeto não encontrado"
-        }
\ No newline at end of file
+        }
+
+
+class DependenciaTarefa(Base):
+    """
+    Aresta do grafo de dependências: 'id_tarefa' só começa depois do término
+    de 'id_predecessora'. É a forma validada do texto de 'Tarefa.dependencias',
+    mantida em sincronia pelo TarefaService.
+    """
+    __tablename__ = 'dependencias_tarefa'
+    __table_args__ = (
+        Index('ix_dependencias_tarefa_projeto', 'id_projeto'),
+    )
+
+    id_predecessora: Mapped[int] = mapped_column(ForeignKey('tarefas.id_tarefa', ondelete="CASCADE"), primary_key=True)
+    id_tarefa: Mapped[int] = mapped_column(ForeignKey('tarefas.id_tarefa', ondelete="CASCADE"), primary_key=True)
+    # Redundante com as tarefas, mas permite carregar o grafo de um projeto em uma consulta
+    id_projeto: Mapped[int] = mapped_column(ForeignKey('projetos.id_projeto', ondelete="CASCADE"))
\ No newline at end of file
@@ -1,38 +1,147 @@
-from sqlalchemy import ForeignKey, Text, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column
+import zlib
+from sqlalchemy import ForeignKey, UniqueConstraint, Index, SmallInteger, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
 # Importa a classe Base do nosso modelo principal de usuário
 from .usuario_model import Base
 
+# Status do Allure armazenados como inteiros. A ordem é alfabética para que
+# ordenar pelo código continue equivalente a ordenar pelo texto do status.
+STATUS_TESTE = ('broken', 'failed', 'passed', 'skipped', 'unknown')
+CODIGO_STATUS = {status: codigo for codigo, status in enumerate(STATUS_TESTE)}
+CODIGOS_REPROVADOS = (CODIGO_STATUS['broken'], CODIGO_STATUS['failed'])
+
+
+def codificar_status(status: Optional[str]) -> int:
+    """Converte o texto do status no código armazenado ('unknown' se desconhecido)."""
+    return CODIGO_STATUS.get((status or '').lower(), CODIGO_STATUS['unknown'])
+
+
+def comprimir_mensagem(mensagem: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(mensagem.encode('utf-8')) if mensagem else None
+
+
+def descomprimir_mensagem(dados: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(dados).decode('utf-8') if dados else None
+
+
+class DefinicaoTeste(Base):
+    """
+    Dimensão dos testes: os dados que se repetem em todos os ciclos
+    (nome, feature, severidade) ficam aqui uma única vez.
+
+    A identidade é o 'historyId' do Allure (ou o 'fullName'/nome quando ausente).
+    """
+    __tablename__ = 'definicoes_teste'
+
+    id_definicao: Mapped[int] = mapped_column(primary_key=True)
+    chave_identidade: Mapped[str] = mapped_column(unique=True)
+    nome_teste: Mapped[str]
+    full_name: Mapped[Optional[str]]
+    feature: Mapped[Optional[str]]
+    severity: Mapped[Optional[str]]
+
+    def para_dicionario(self):
+        return {
+            "id_definicao": self.id_definicao,
+            "chave_identidade": self.chave_identidade,
+            "nome_teste": self.nome_teste,
+            "full_name": self.full_name,
+            "feature": self.feature,
+            "severity": self.severity
+        }
+
+
 @Base.registry.mapped
 class TesteExecutado:
+    """
+    Fato compacto: uma linha por teste executado em um ciclo, apenas com ids,
+    o código do status e a mensagem de erro comprimida.
+    """
     __tablename__ = 'testes_executados'
-  
-  # Garante que a combinação de um ciclo e um teste seja única
+
+    # Garante que a combinação de um ciclo e um teste seja única.
+    # O índice por definição atende as consultas de histórico de um teste e o
+    # índice por ciclo + status atende a listagem paginada filtrada por status.
     __table_args__ = (
-        UniqueConstraint('id_homologacao', 'uuid', name='_homologacao_uuid_uc'),
+        UniqueConstraint('id_homologacao', 'id_definicao', name='_homologacao_definicao_uc'),
+        Index('ix_testes_executados_definicao', 'id_definicao', 'id_homologacao'),
+        Index('ix_testes_executados_ciclo_status', 'id_homologacao', 'status_codigo', 'id_definicao'),
     )
-    
+
     id_execucao: Mapped[int] = mapped_column(primary_key=True)
     id_homologacao: Mapped[int] = mapped_column(ForeignKey('homologacoes.id_homologacao', ondelete="CASCADE"))
-    
-    uuid: Mapped[str]
-    nome_teste: Mapped[str]
-    status: Mapped[str] # ex: passed, failed, broken, skipped
-    
-    mensagem_erro: Mapped[Optional[str]] = mapped_column(Text)
-    feature: Mapped[Optional[str]]
-    severity: Mapped[Optional[str]]
+    id_definicao: Mapped[int] = mapped_column(ForeignKey('definicoes_teste.id_definicao'))
+
+    status_codigo: Mapped[int] = mapped_column(SmallInteger)
+    mensagem_erro_comprimida: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    # Assinatura da falha (só para reprovados com mensagem)
+    id_assinatura: Mapped[Optional[int]] = mapped_column(ForeignKey('assinaturas_falha.id_assinatura'))
+
+    definicao: Mapped[DefinicaoTeste] = relationship(lazy='joined')
+
+    @property
+    def status(self) -> str:
+        return STATUS_TESTE[self.status_codigo]
+
+    @property
+    def mensagem_erro(self) -> Optional[str]:
+        return descomprimir_mensagem(self.mensagem_erro_comprimida)
 
     def para_dicionario(self):
         return {
             "id_execucao": self.id_execucao,
             "id_homologacao": self.id_homologacao,
-            "uuid": self.uuid,
-            "nome_teste": self.nome_teste,
+            "id_definicao": self.id_definicao,
+            "uuid": self.definicao.chave_identidade,
+            "nome_teste": self.definicao.nome_teste,
             "status": self.status,
             "mensagem_erro": self.mensagem_erro,
-            "feature": self.feature,
-            "severity": self.severity
-        }
\ No newline at end of file
+            "id_assinatura": self.id_assinatura,
+            "feature": self.definicao.feature,
+            "severity": self.definicao.severity
+        }
+
+
+class EstatisticaTeste(Base):
+    """
+    Estatísticas acumuladas de um teste dentro de um projeto, mantidas de forma
+    incremental a cada ingestão de relatório (ver services/ingestao_testes.py).
+
+    'transicoes' conta as trocas entre aprovado e reprovado em ciclos
+    consecutivos; o score de instabilidade é a fração de trocas possíveis que
+    de fato aconteceram.
+    """
+    __tablename__ = 'estatisticas_teste'
+    __table_args__ = (
+        Index('ix_estatisticas_teste_instabilidade', 'id_projeto', 'score_instabilidade'),
+    )
+
+    id_projeto: Mapped[int] = mapped_column(ForeignKey('projetos.id_projeto', ondelete="CASCADE"), primary_key=True)
+    id_definicao: Mapped[int] = mapped_column(ForeignKey('definicoes_teste.id_definicao'), primary_key=True)
+
+    execucoes: Mapped[int] = mapped_column(default=0)
+    aprovacoes: Mapped[int] = mapped_column(default=0)
+    reprovacoes: Mapped[int] = mapped_column(default=0)
+    transicoes: Mapped[int] = mapped_column(default=0)
+    ultimo_resultado_codigo: Mapped[Optional[int]] = mapped_column(SmallInteger)
+    id_ultima_homologacao: Mapped[int]
+    score_instabilidade: Mapped[float] = mapped_column(default=0.0)
+
+    definicao: Mapped[DefinicaoTeste] = relationship(lazy='joined')
+
+    def para_dicionario(self):
+        return {
+            "id_projeto": self.id_projeto,
+            "id_definicao": self.id_definicao,
+            "nome_teste": self.definicao.nome_teste,
+            "feature": self.definicao.feature,
+            "execucoes": self.execucoes,
+            "aprovacoes": self.aprovacoes,
+            "reprovacoes": self.reprovacoes,
+            "transicoes": self.transicoes,
+            "ultimo_resultado": STATUS_TESTE[self.ultimo_resultado_codigo] if self.ultimo_resultado_codigo is not None else None,
+            "id_ultima_homologacao": self.id_ultima_homologacao,
+            "score_instabilidade": round(self.score_instabilidade, 4)
+        }
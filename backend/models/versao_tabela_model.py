@@ -0,0 +1,15 @@
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Importa a classe Base do nosso modelo principal de usuário
+from .usuario_model import Base
+
+
+class VersaoTabela(Base):
+    """
+    Versão de uma tabela: incrementada por triggers a cada linha inserida,
+    alterada ou excluída (ver data_sources/versoes_tabelas.py).
+    """
+    __tablename__ = 'versoes_tabelas'
+
+    tabela: Mapped[str] = mapped_column(primary_key=True)
+    versao: Mapped[int] = mapped_column(default=0)
@@ -2,10 +2,34 @@
 import zipfile
 import json
 import logging
-from typing import Dict, List
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, IO, List
 
 logger = logging.getLogger(__name__)
 
+# Extensões de arquivo aceitas no upload de relatórios
+EXTENSOES_RELATORIO = ('.zip', '.xml')
+
+
+def _metricas_vazias() -> Dict:
+    return {
+        'total_testes': 0,
+        'testes_aprovados': 0,
+        'testes_reprovados': 0, # failed + broken
+        'testes_bloqueados': 0  # skipped
+    }
+
+
+def _contabilizar(metricas: Dict, status: str):
+    """Soma um teste às métricas agregadas do relatório JUnit."""
+    metricas['total_testes'] += 1
+    if status == 'passed':
+        metricas['testes_aprovados'] += 1
+    elif status in ['failed', 'broken']:
+        metricas['testes_reprovados'] += 1
+    elif status == 'skipped':
+        metricas['testes_bloqueados'] += 1
+
 def _extrair_label(labels: List[Dict], nome_label: str) -> str | None:
     """Função helper para encontrar o valor de um label específico na lista."""
     for label in labels:
@@ -18,14 +42,9 @@ def parse_allure_zip(zip_file_path: str) -> Dict:
     Analisa um arquivo .zip do Allure, extrai métricas agregadas e os detalhes
     de cada teste individual.
     """
-    logger.info(f"Iniciando parsing detalhado do arquivo Allure: {zip_file_path}")
+    logger.info("Iniciando parsing detalhado do arquivo Allure: %s", zip_file_path)
     
-    metricas = {
-        'total_testes': 0,
-        'testes_aprovados': 0,
-        'testes_reprovados': 0, # failed + broken
-        'testes_bloqueados': 0  # skipped
-    }
+    metricas = _metricas_vazias()
     testes_detalhados = []
     
     try:
@@ -55,6 +74,8 @@ def parse_allure_zip(zip_file_path: str) -> Dict:
                         # Extrai os detalhes do teste individual
                         detalhes_teste = {
                             "uuid": data.get('uuid'),
+                            "history_id": data.get('historyId'),
+                            "full_name": data.get('fullName'),
                             "nome_teste": data.get('name'),
                             "status": status,
                             "mensagem_erro": data.get('statusDetails', {}).get('message'),
@@ -64,14 +85,158 @@ def parse_allure_zip(zip_file_path: str) -> Dict:
                         testes_detalhados.append(detalhes_teste)
                             
                     except (json.JSONDecodeError, KeyError) as e:
-                        logger.warning(f"Não foi possível analisar o arquivo {filename} no ZIP: {e}")
+                        logger.warning("Não foi possível analisar o arquivo %s no ZIP: %s", filename, e)
                         continue
     
     except (FileNotFoundError, zipfile.BadZipFile) as e:
-        logger.error(f"Erro ao abrir o arquivo ZIP: {e}")
+        logger.error("Erro ao abrir o arquivo ZIP: %s", e)
         raise ValueError("Arquivo de relatório inválido ou não encontrado.")
 
     return {
         "metricas": metricas,
         "testes": testes_detalhados
-    }
\ No newline at end of file
+    }
+
+
+# --- JUNIT XML ---
+
+def _nome_local(tag: str) -> str:
+    """Remove o namespace ('{ns}testcase' -> 'testcase')."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _resultado_junit(testcase) -> tuple:
+    """Status e mensagem de um <testcase> a partir de seus filhos."""
+    for filho in testcase:
+        tag = _nome_local(filho.tag)
+        if tag in ('failure', 'error'):
+            status = 'failed' if tag == 'failure' else 'broken'
+            mensagem = filho.get('message') or (filho.text or '').strip() or None
+            return status, mensagem
+        if tag == 'skipped':
+            return 'skipped', filho.get('message')
+    return 'passed', None
+
+
+def _parse_junit_stream(stream: IO[bytes], metricas: Dict, testes: List[Dict]):
+    """
+    Lê um XML JUnit com 'iterparse'. Cada <testcase> é convertido e removido
+    da árvore assim que termina, então a memória usada não cresce com o
+    tamanho do arquivo (apenas com a lista de testes devolvida).
+    """
+    suites: List[str] = []
+    pilha = []
+    for evento, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = _nome_local(elem.tag)
+        if evento == 'start':
+            pilha.append(elem)
+            if tag == 'testsuite':
+                suites.append(elem.get('name'))
+            continue
+
+        pilha.pop()
+        if tag == 'testcase':
+            status, mensagem = _resultado_junit(elem)
+            nome = elem.get('name')
+            classe = elem.get('classname')
+            _contabilizar(metricas, status)
+            testes.append({
+                "uuid": None,
+                "history_id": None,
+                "full_name": f"{classe}.{nome}" if classe else nome,
+                "nome_teste": nome,
+                "status": status,
+                "mensagem_erro": mensagem,
+                "feature": suites[-1] if suites else classe,
+                "severity": None
+            })
+        elif tag == 'testsuite':
+            suites.pop()
+        else:
+            continue
+
+        elem.clear()
+        if pilha:
+            pilha[-1].remove(elem)
+
+
+def parse_junit_xml(caminho_arquivo: str) -> Dict:
+    """
+    Analisa um relatório JUnit XML, seja um único arquivo .xml ou um .zip com
+    vários deles, no mesmo formato de saída de parse_allure_zip.
+
+    A identidade do teste entre ciclos é 'classname.name' (full_name), já que
+    o JUnit não tem um equivalente ao historyId do Allure.
+    """
+    logger.info("Iniciando parsing do relatório JUnit: %s", caminho_arquivo)
+
+    metricas = _metricas_vazias()
+    testes_detalhados: List[Dict] = []
+
+    try:
+        if zipfile.is_zipfile(caminho_arquivo):
+            with zipfile.ZipFile(caminho_arquivo, 'r') as zip_ref:
+                arquivos_xml = [f for f in zip_ref.namelist() if f.lower().endswith('.xml')]
+                if not arquivos_xml:
+                    raise ValueError("O arquivo ZIP não contém relatórios JUnit (.xml).")
+                for filename in arquivos_xml:
+                    with zip_ref.open(filename) as xml_file:
+                        try:
+                            _parse_junit_stream(xml_file, metricas, testes_detalhados)
+                        except ET.ParseError as e:
+                            logger.warning("Não foi possível analisar o arquivo %s no ZIP: %s", filename, e)
+        else:
+            with open(caminho_arquivo, 'rb') as xml_file:
+                _parse_junit_stream(xml_file, metricas, testes_detalhados)
+    except FileNotFoundError as e:
+        logger.error("Erro ao abrir o relatório JUnit: %s", e)
+        raise ValueError("Arquivo de relatório inválido ou não encontrado.")
+    except (ET.ParseError, zipfile.BadZipFile) as e:
+        logger.error("Relatório JUnit inválido: %s", e)
+        raise ValueError("Arquivo de relatório JUnit inválido.")
+
+    return {
+        "metricas": metricas,
+        "testes": testes_detalhados
+    }
+
+
+# --- DETECÇÃO DE FORMATO ---
+
+# Todos os parsers recebem o caminho do arquivo e devolvem {"metricas", "testes"}
+PARSERS_RELATORIO: Dict[str, Callable[[str], Dict]] = {
+    'allure': parse_allure_zip,
+    'junit': parse_junit_xml,
+}
+
+
+def detectar_formato(caminho_arquivo: str) -> str:
+    """
+    Identifica o formato do relatório pelo conteúdo, não pela extensão:
+    ZIP com '*-result.json' é Allure; ZIP de .xml ou XML com <testsuite> é JUnit.
+    """
+    try:
+        if zipfile.is_zipfile(caminho_arquivo):
+            with zipfile.ZipFile(caminho_arquivo, 'r') as zip_ref:
+                nomes = zip_ref.namelist()
+            if any(n.endswith('-result.json') for n in nomes):
+                return 'allure'
+            if any(n.lower().endswith('.xml') for n in nomes):
+                return 'junit'
+        else:
+            with open(caminho_arquivo, 'rb') as arquivo:
+                inicio = arquivo.read(4096)
+            if b'<testsuite' in inicio:
+                return 'junit'
+    except (FileNotFoundError, zipfile.BadZipFile) as e:
+        logger.error("Erro ao abrir o relatório: %s", e)
+        raise ValueError("Arquivo de relatório inválido ou não encontrado.")
+
+    raise ValueError("Formato de relatório não reconhecido (esperado Allure .zip ou JUnit .xml).")
+
+
+def parse_relatorio(caminho_arquivo: str) -> Dict:
+    """Detecta o formato do relatório e delega ao parser correspondente."""
+    formato = detectar_formato(caminho_arquivo)
+    logger.info("Relatório %s detectado como '%s'.", caminho_arquivo, formato)
+    return PARSERS_RELATORIO[formato](caminho_arquivo)
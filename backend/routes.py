@@ -1,36 +1,71 @@
 import logging
-from flask import jsonify, abort, request, current_app
-from pydantic import ValidationError
+from flask import jsonify, abort, request, current_app, Response, send_file
 from sqlalchemy import inspect
 
 # Importa as ferramentas de autenticação
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
+import hmac
 import os
+import zipfile
 
 # Importa os modelos
-from models import Projeto, Usuario, Area
+from models import Projeto, Usuario, Area, Homologacao
 from models.objetivo_model import ObjetivoEstrategico
 
 # Importa as CLASSES de serviço e os schemas
 from services.projeto_service import ProjetoService
 from services.homologacao_service import HomologacaoService
 from services.usuario_service import UsuarioService
-from services.tarefa_service import TarefaService
-
-
-from schemas.projeto_schema import ProjetoCreateSchema, StatusUpdateSchema, ProjetoUpdateSchema
-from schemas.homologacao_schema import HomologacaoStartSchema, HomologacaoEndSchema
-from schemas.usuario_schema import UserRoleUpdateSchema, ProfileUpdateSchema
-from schemas.tarefa_schema import TarefaCreateSchema, TarefaUpdateSchema
+from services.tarefa_service import TarefaService, LoteInvalidoError
+from services.analise_testes_service import AnaliseTestesService
+from services.busca_service import BuscaService
+from services.timeline_service import TimelineService
+from services.cronograma_service import CronogramaService
+from services.bootstrap_service import BootstrapService, SECOES_BOOTSTRAP
+from services.alteracoes_service import AlteracoesService, LIMITE_ALTERACOES
+from services import leituras
+
+
+# Pydantic, os schemas e o parser de relatórios só são importados na primeira
+# requisição que os usa (ver utils/lazy_import.py)
+from utils.lazy_import import sob_demanda
+pydantic = sob_demanda('pydantic')
+schemas_projeto = sob_demanda('schemas.projeto_schema')
+schemas_homologacao = sob_demanda('schemas.homologacao_schema')
+schemas_usuario = sob_demanda('schemas.usuario_schema')
+schemas_tarefa = sob_demanda('schemas.tarefa_schema')
+parsers = sob_demanda('parsers')
 
 # Importa a instância do banco de dados e as ferramentas de segurança
 from extensions import db
 from security import get_usuario_atual, Permissions
+from utils.zip_index import indices_zip, resposta_membro_zip
+from utils.http_cache import resposta_json_condicional
+from utils.task_graph import DependenciaInvalidaError
+from utils.pubsub import LimiteAssinaturasError, barramento_eventos, formatar_sse
+from utils.metrics import metricas
+from utils.slow_queries import armazem_atual
+from utils.profiling import FORMATOS_PERFIL, caminho_perfil
+from utils.memory_diagnostics import AGRUPAMENTOS, SnapshotInexistenteError, diagnostico_memoria
 
 logger = logging.getLogger(__name__)
 
 
+def _responder_leitura(leitura, **caminho):
+    """Executa uma leitura compartilhada com o asgi.py (services/leituras.py)."""
+    try:
+        return jsonify(leitura(get_usuario_atual(), request.args, **caminho))
+    except leituras.ErroLeitura as e:
+        abort(e.status, description=str(e))
+
+
+def _exigir_diagnosticos():
+    """Rotas de /api/admin de desempenho: só para quem pode ver diagnósticos."""
+    if not Permissions.pode_ver_diagnosticos(get_usuario_atual()):
+        abort(403, description="Apenas administradores podem ver os diagnósticos.")
+
+
 def register_routes(app):
     """Registra todas as rotas da API na instância do app Flask."""
 
@@ -57,7 +92,7 @@ def register_routes(app):
             session.add(novo_usuario)
             session.commit()
             
-            logger.info(f"Novo usuário registrado: {dados['email']}")
+            logger.info("Novo usuário registrado: %s", dados['email'])
             return jsonify(novo_usuario.para_dicionario()), 201
         finally:
             session.close()
@@ -75,10 +110,10 @@ def register_routes(app):
             if usuario and usuario.verificar_senha(dados['senha']):
                 identity = str(usuario.id_usuario)
                 access_token = create_access_token(identity=identity)
-                logger.info(f"Login bem-sucedido para o usuário: {dados['email']}")
+                logger.info("Login bem-sucedido para o usuário: %s", dados['email'])
                 return jsonify(access_token=access_token)
             
-            logger.warning(f"Tentativa de login falhou para o email: {dados['email']}")
+            logger.warning("Tentativa de login falhou para o email: %s", dados['email'])
             abort(401, description="Credenciais inválidas.")
         finally:
             session.close()
@@ -91,6 +126,103 @@ def register_routes(app):
             abort(401, description="Usuário não encontrado a partir do token.")
         return jsonify(usuario_atual.para_dicionario())
 
+    @app.route("/api/bootstrap", methods=['GET'])
+    @jwt_required()
+    def get_bootstrap_route():
+        """
+        Dados da primeira tela em uma só requisição: usuário, projetos visíveis,
+        minhas tarefas abertas, meus projetos ativos, contagem por status e versões
+        das listas auxiliares. 'secoes' (separadas por vírgula) limita a resposta.
+        """
+        usuario_atual = get_usuario_atual()
+        if not usuario_atual:
+            abort(401, description="Usuário não encontrado a partir do token.")
+        secoes = [s.strip() for s in request.args.get('secoes', '').split(',') if s.strip()] or SECOES_BOOTSTRAP
+
+        try:
+            with BootstrapService() as service:
+                dados = service.get_bootstrap(usuario_atual, secoes)
+        except ValueError as e:
+            abort(400, description=str(e))
+        return resposta_json_condicional(dados)
+
+    @app.route("/api/changes", methods=['GET'])
+    @jwt_required()
+    def get_alteracoes_route():
+        """
+        Alterações de projetos e tarefas desde o cursor 'since' (inseridos,
+        atualizados e excluídos). 'dados=1' inclui os cartões atuais; sem 'since'
+        devolve apenas o cursor atual.
+        """
+        usuario_atual = get_usuario_atual()
+        if not usuario_atual:
+            abort(401, description="Usuário não encontrado a partir do token.")
+        desde = request.args.get('since')
+        if desde is not None and not desde.isdigit():
+            abort(400, description="O cursor 'since' deve ser um inteiro não negativo.")
+
+        with AlteracoesService() as service:
+            resultado = service.listar(
+                usuario_atual,
+                desde=int(desde) if desde is not None else None,
+                limite=request.args.get('limite', LIMITE_ALTERACOES, type=int),
+                incluir_dados=request.args.get('dados', '').lower() in ('1', 'true'),
+            )
+        return jsonify(resultado)
+
+    @app.route("/api/eventos", methods=['GET'])
+    @jwt_required(locations=['headers', 'query_string'])
+    def get_eventos_route():
+        """
+        Canal de Server-Sent Events com mudanças de status, ciclos de homologação,
+        andamento do processamento de relatórios e escritas de tarefas dos projetos
+        visíveis ao usuário. O EventSource do navegador não envia cabeçalhos, então
+        o token também é aceito em '?jwt='. Sem eventos, um comentário é enviado a
+        cada SSE_HEARTBEAT segundos para manter a conexão (e detectar a queda do cliente).
+        """
+        usuario_atual = get_usuario_atual()
+        if not usuario_atual:
+            abort(401, description="Usuário não encontrado a partir do token.")
+        ultimo_id = request.headers.get('Last-Event-ID', '')
+        try:
+            assinatura = barramento_eventos.assinar(
+                Permissions.filtro_eventos_visiveis(usuario_atual),
+                capacidade=current_app.config.get('SSE_BUFFER', 100),
+                desde=int(ultimo_id) if ultimo_id.isdigit() else None,
+            )
+        except LimiteAssinaturasError as e:
+            abort(503, description=str(e))
+        heartbeat = current_app.config.get('SSE_HEARTBEAT', 15)
+
+        def transmitir():
+            try:
+                yield "retry: 3000\n\n"
+                while True:
+                    evento = assinatura.proximo(timeout=heartbeat)
+                    yield formatar_sse(evento) if evento else ": heartbeat\n\n"
+            finally:
+                barramento_eventos.cancelar(assinatura)
+
+        resposta = Response(transmitir(), mimetype='text/event-stream')
+        resposta.headers['Cache-Control'] = 'no-cache'
+        # Impede que um proxy (nginx) segure os eventos em buffer
+        resposta.headers['X-Accel-Buffering'] = 'no'
+        resposta.call_on_close(lambda: barramento_eventos.cancelar(assinatura))
+        return resposta
+
+    @app.route("/metrics", methods=['GET'])
+    def get_metricas_route():
+        """
+        Métricas do processo no formato texto do Prometheus (utils/metrics.py).
+        Fica fora do JWT, para o coletor; METRICAS_TOKEN restringe o acesso.
+        """
+        if not current_app.config.get('METRICAS_ATIVAS', True):
+            abort(404, description="Métricas desativadas.")
+        token = current_app.config.get('METRICAS_TOKEN')
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            abort(401)
+        return Response(metricas.exportar(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
     # --- ROTAS DE DADOS AUXILIARES (PROTEGIDAS) ---
     @app.route("/api/usuarios", methods=['GET'])
     @jwt_required()
@@ -159,14 +291,24 @@ def register_routes(app):
     @app.route("/api/projetos", methods=['GET'])
     @jwt_required()
     def get_todos_projetos():
+        return _responder_leitura(leituras.listar_projetos)
+
+    @app.route("/api/busca", methods=['GET'])
+    @jwt_required()
+    def buscar_projetos_route():
+        """
+        Busca textual de projetos ('q'), ordenada por relevância.
+        Aceita 'status', 'limite' e 'offset'.
+        """
         usuario_atual = get_usuario_atual()
-        try:
-            with ProjetoService() as service:
-                projetos_dict = service.get_all_for_user(usuario_atual)
-            return jsonify(projetos_dict)
-        except Exception as e:
-            logger.error(f"Erro em GET /api/projetos: {e}", exc_info=True)
-            abort(500)
+        termo = request.args.get('q', '').strip()
+        limite = min(max(request.args.get('limite', 20, type=int), 1), 100)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+
+        with BuscaService() as service:
+            resultado = service.buscar_projetos(termo, usuario_atual, limite, offset,
+                                                status=request.args.get('status'))
+        return jsonify(resultado)
 
     @app.route("/api/projetos/<int:id_projeto>", methods=['GET'])
     @jwt_required()
@@ -194,23 +336,22 @@ def register_routes(app):
         if not dados_brutos:
             abort(400, description="Corpo da requisição não pode ser vazio.")
         try:
-            dados_validados = ProjetoCreateSchema(**dados_brutos)
+            dados_validados = schemas_projeto.ProjetoCreateSchema(**dados_brutos)
             with ProjetoService() as service:
                 projeto_final_dict = service.criar_projeto(
                     dados_validados.dict(), 
                     usuario_atual
                 )
             return jsonify(projeto_final_dict), 201
-        except ValidationError as e:
+        except pydantic.ValidationError as e:
             return jsonify({"detail": e.errors()}), 422
         except Exception as e:
-            logger.error(f"Erro inesperado ao criar projeto: {e}", exc_info=True)
+            logger.error("Erro inesperado ao criar projeto: %s", e, exc_info=True)
             abort(500)
 
     @app.route("/api/projetos/<int:id_projeto>", methods=['PUT'])
     @jwt_required()
     def editar_projeto_route(id_projeto):
-        logger.info(f"Requisição recebida: PUT /api/projetos/{id_projeto}")
         usuario_atual = get_usuario_atual()
         
         try:
@@ -218,7 +359,7 @@ def register_routes(app):
             if not dados_brutos:
                 abort(400, description="Corpo da requisição não pode ser vazio.")
             
-            dados_validados = ProjetoUpdateSchema(**dados_brutos)
+            dados_validados = schemas_projeto.ProjetoUpdateSchema(**dados_brutos)
             dados_para_atualizar = dados_validados.dict(exclude_unset=True)
             if not dados_para_atualizar:
                 abort(400, description="Nenhum dado válido para atualização foi fornecido.")
@@ -229,21 +370,21 @@ def register_routes(app):
                     abort(404, description="Projeto não encontrado.")
                 
                 if not Permissions.pode_editar_projeto(usuario_atual, projeto_obj):
-                    logger.warning(f"Usuário ID {usuario_atual.id_usuario} ({usuario_atual.role}) tentou editar projeto ID {id_projeto} sem permissão.")
+                    logger.warning("Usuário ID %s (%s) tentou editar projeto ID %s sem permissão.", usuario_atual.id_usuario, usuario_atual.role, id_projeto)
                     abort(403, description="Você não tem permissão para editar este projeto.")
 
                 projeto_atualizado_dict = service.editar_projeto(id_projeto, dados_para_atualizar)
             
             return jsonify(projeto_atualizado_dict)
 
-        except ValidationError as e:
-            logger.warning(f"Erro de validação ao editar projeto {id_projeto}: {e.errors()}")
+        except pydantic.ValidationError as e:
+            logger.warning("Erro de validação ao editar projeto %s: %s", id_projeto, e.errors())
             return jsonify({"detail": e.errors()}), 422
         except ValueError as e:
-            logger.warning(f"Erro de valor ao editar projeto {id_projeto}: {e}")
+            logger.warning("Erro de valor ao editar projeto %s: %s", id_projeto, e)
             abort(404, description=str(e))
         except Exception as e:
-            logger.error(f"Erro inesperado ao editar projeto {id_projeto}: {e}", exc_info=True)
+            logger.error("Erro inesperado ao editar projeto %s: %s", id_projeto, e, exc_info=True)
             abort(500)
 
     @app.route("/api/projetos/<int:id_projeto>/status", methods=['PUT'])
@@ -256,7 +397,7 @@ def register_routes(app):
             if not dados_brutos:
                 abort(400, description="Corpo da requisição não pode ser vazio.")
             
-            dados_validados = StatusUpdateSchema(**dados_brutos)
+            dados_validados = schemas_projeto.StatusUpdateSchema(**dados_brutos)
 
             with ProjetoService() as service:
                 projeto_obj = service.session.query(Projeto).get(id_projeto)
@@ -273,12 +414,40 @@ def register_routes(app):
                     observacao=dados_validados.observacao
                 )
             return jsonify(projeto_atualizado_dict)
-        except ValidationError as e:
+        except pydantic.ValidationError as e:
             return jsonify({"detail": e.errors()}), 422
         except ValueError as e: 
             abort(400, description=str(e))
         except Exception as e:
-            logger.error(f"Erro inesperado ao atualizar status: {e}", exc_info=True)
+            logger.error("Erro inesperado ao atualizar status: %s", e, exc_info=True)
+            abort(500)
+
+    @app.route("/api/projetos/batch", methods=['POST'])
+    @jwt_required()
+    def aplicar_lote_projetos_route():
+        """
+        Muda o status e/ou edita vários projetos com um único commit.
+        Corpo: {"ids": [...], "status": "...", "observacao": "...", "dados": {...}}.
+        Os projetos que não puderem ser alterados são listados em 'falhas'.
+        """
+        usuario_atual = get_usuario_atual()
+        try:
+            dados_validados = schemas_projeto.ProjetoLoteSchema(**(request.get_json(silent=True) or {}))
+        except pydantic.ValidationError as e:
+            return jsonify({"detail": e.errors(include_context=False)}), 422
+
+        try:
+            with ProjetoService() as service:
+                resultado = service.aplicar_lote(
+                    usuario_atual,
+                    dados_validados.ids,
+                    novo_status=dados_validados.status,
+                    observacao=dados_validados.observacao,
+                    dados=dados_validados.dados.model_dump(exclude_unset=True) if dados_validados.dados else None,
+                )
+            return jsonify(resultado)
+        except Exception as e:
+            logger.error("Erro inesperado ao aplicar lote de projetos: %s", e, exc_info=True)
             abort(500)
 
     @app.route("/api/projetos/<int:id_projeto>", methods=['DELETE'])
@@ -301,7 +470,7 @@ def register_routes(app):
         except ValueError as e:
             abort(404, description=str(e))
         except Exception as e:
-            logger.error(f"Erro inesperado ao deletar projeto {id_projeto}: {e}", exc_info=True)
+            logger.error("Erro inesperado ao deletar projeto %s: %s", id_projeto, e, exc_info=True)
             abort(500)
 
     # --- ROTAS DE HOMOLOGAÇÃO ---
@@ -315,7 +484,7 @@ def register_routes(app):
             if not dados_brutos:
                 abort(400, description="Corpo da requisição não pode ser vazio.")
             
-            dados_validados = HomologacaoStartSchema(**dados_brutos)
+            dados_validados = schemas_homologacao.HomologacaoStartSchema(**dados_brutos)
             
             with HomologacaoService() as service:
                 projeto_obj = service.session.query(Projeto).get(id_projeto)
@@ -327,10 +496,10 @@ def register_routes(app):
                 projeto_atualizado = service.iniciar_ciclo(id_projeto, dados_validados.dict())
             
             return jsonify(projeto_atualizado)
-        except (ValidationError, ValueError) as e:
+        except (pydantic.ValidationError, ValueError) as e:
             abort(400, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao iniciar ciclo de homologação: {e}", exc_info=True)
+            logger.error("Erro ao iniciar ciclo de homologação: %s", e, exc_info=True)
             abort(500)
 
     @app.route("/api/projetos/<int:id_projeto>/homologacao/finalizar", methods=['POST'])
@@ -340,7 +509,6 @@ def register_routes(app):
         Finaliza o ciclo de homologação mais recente de um projeto.
         A lógica de negócio no serviço determinará o próximo status do projeto.
         """
-        logger.info(f"Requisição recebida: POST /api/projetos/{id_projeto}/homologacao/finalizar")
         usuario_atual = get_usuario_atual()
         session = db.get_session()
 
@@ -352,7 +520,7 @@ def register_routes(app):
 
             # 2. VERIFICAÇÃO DE PERMISSÃO
             if not Permissions.pode_mudar_status(usuario_atual, projeto_obj):
-                logger.warning(f"Usuário ID {usuario_atual.id_usuario} tentou finalizar homologação do projeto ID {id_projeto} sem permissão.")
+                logger.warning("Usuário ID %s tentou finalizar homologação do projeto ID %s sem permissão.", usuario_atual.id_usuario, id_projeto)
                 abort(403, description="Você não tem permissão para finalizar a homologação deste projeto.")
 
             # 3. Valida os dados de entrada
@@ -362,7 +530,7 @@ def register_routes(app):
             
             # Adiciona o ID do usuário logado aos dados antes de validar
             dados_brutos['id_usuario'] = usuario_atual.id_usuario
-            dados_validados = HomologacaoEndSchema(**dados_brutos)
+            dados_validados = schemas_homologacao.HomologacaoEndSchema(**dados_brutos)
             
             # 4. Chama o serviço de negócio (sem passar o status alvo)
             with HomologacaoService() as service:
@@ -370,12 +538,12 @@ def register_routes(app):
             
             return jsonify(resposta_servico)
             
-        except ValidationError as e:
+        except pydantic.ValidationError as e:
             return jsonify({"detail": e.errors()}), 422
         except ValueError as e:
             abort(400, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao finalizar ciclo de homologação para o projeto {id_projeto}: {e}", exc_info=True)
+            logger.error("Erro ao finalizar ciclo de homologação para o projeto %s: %s", id_projeto, e, exc_info=True)
             abort(500)
         finally:
             session.close()
@@ -394,7 +562,7 @@ def register_routes(app):
             abort(400)
         
         try:
-            dados_validados = UserRoleUpdateSchema(**dados_brutos)
+            dados_validados = schemas_usuario.UserRoleUpdateSchema(**dados_brutos)
             
             with UsuarioService() as service:
                 usuario_atualizado_dict = service.atualizar_role_usuario(
@@ -404,14 +572,101 @@ def register_routes(app):
             
             return jsonify(usuario_atualizado_dict)
 
-        except ValidationError as e:
+        except pydantic.ValidationError as e:
             return jsonify({"detail": e.errors()}), 422
         except ValueError as e:
             abort(404, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao atualizar role do usuário {id_usuario}: {e}", exc_info=True)
+            logger.error("Erro ao atualizar role do usuário %s: %s", id_usuario, e, exc_info=True)
             abort(500)
 
+    @app.route("/api/admin/consultas-lentas", methods=['GET'])
+    @jwt_required()
+    def get_consultas_lentas_route():
+        """
+        Consultas acima de CONSULTAS_LENTAS_MS agrupadas por comando, da que mais
+        somou tempo à que menos, com o plano de execução da última ocorrência.
+        Aceita 'limite'.
+        """
+        _exigir_diagnosticos()
+        armazem = armazem_atual()
+        if armazem is None:
+            abort(404, description="Registro de consultas lentas desativado (CONSULTAS_LENTAS_MS).")
+
+        limite = min(max(request.args.get('limite', 20, type=int), 1), 200)
+        return jsonify({
+            'limite_ms': current_app.config['CONSULTAS_LENTAS_MS'],
+            'ofensores': armazem.maiores_ofensores(limite),
+        })
+
+    @app.route("/api/admin/perfis/<id_perfil>/<formato>", methods=['GET'])
+    @jwt_required()
+    def get_perfil_requisicao_route(id_perfil, formato):
+        """
+        Arquivo de um perfil gravado com 'X-Profile' (utils/profiling.py):
+        'collapsed' (flame graph), 'txt' (resumo) ou 'prof' (pstats).
+        """
+        _exigir_diagnosticos()
+        caminho = caminho_perfil(current_app.config['PERFIS_PASTA'], id_perfil, formato)
+        if caminho is None:
+            abort(404, description="Perfil não encontrado.")
+        return send_file(caminho, mimetype=FORMATOS_PERFIL[formato], as_attachment=formato == 'prof',
+                         download_name=f"{id_perfil}.{formato}")
+
+    @app.route("/api/admin/memoria", methods=['GET'])
+    @jwt_required()
+    def get_diagnostico_memoria_route():
+        """
+        Memória, sessões do SQLAlchemy, instâncias ORM e caches do worker que
+        respondeu ('pid'). Com 'bytes=1', mede também o tamanho dos caches (lento).
+        """
+        _exigir_diagnosticos()
+        return jsonify(diagnostico_memoria.resumo(medir_bytes=request.args.get('bytes') == '1'))
+
+    @app.route("/api/admin/memoria/snapshots", methods=['POST'])
+    @jwt_required()
+    def tirar_snapshot_memoria_route():
+        """Tira um snapshot do tracemalloc (ligando-o, se preciso) e compara com o anterior."""
+        _exigir_diagnosticos()
+        limite = min(max(request.args.get('limite', 20, type=int), 1), 200)
+        id_snapshot, anterior = diagnostico_memoria.tirar_snapshot()
+        resposta = diagnostico_memoria.maiores_alocacoes(id_snapshot, limite=limite)
+        resposta['anterior'] = anterior
+        if anterior is not None:
+            try:
+                resposta['comparacao'] = diagnostico_memoria.comparar(id_snapshot, anterior, limite=limite)
+            except SnapshotInexistenteError:
+                pass
+        return jsonify(resposta), 201
+
+    @app.route("/api/admin/memoria/snapshots/<int:id_snapshot>", methods=['GET'])
+    @jwt_required()
+    def get_snapshot_memoria_route(id_snapshot):
+        """
+        Maiores alocações de um snapshot ou, com 'base=<id>', o que cresceu desde
+        aquele snapshot. Aceita 'agrupar' (lineno, filename, traceback) e 'limite'.
+        """
+        _exigir_diagnosticos()
+        agrupar = request.args.get('agrupar', 'lineno')
+        if agrupar not in AGRUPAMENTOS:
+            abort(400, description=f"'agrupar' deve ser um de: {', '.join(AGRUPAMENTOS)}.")
+        limite = min(max(request.args.get('limite', 20, type=int), 1), 200)
+        base = request.args.get('base', type=int)
+        try:
+            if base is not None:
+                return jsonify(diagnostico_memoria.comparar(id_snapshot, base, agrupar, limite))
+            return jsonify(diagnostico_memoria.maiores_alocacoes(id_snapshot, agrupar, limite))
+        except SnapshotInexistenteError as e:
+            abort(404, description=str(e))
+
+    @app.route("/api/admin/memoria/snapshots", methods=['DELETE'])
+    @jwt_required()
+    def descartar_snapshots_memoria_route():
+        """Descarta os snapshots deste worker e desliga o tracemalloc."""
+        _exigir_diagnosticos()
+        diagnostico_memoria.descartar_snapshots()
+        return '', 204
+
     # --- ROTA PARA ATUALIZAR O PERFIL DO PRÓPRIO USUÁRIO ---
     @app.route("/api/profile", methods=['PUT'])
     @jwt_required()
@@ -423,7 +678,7 @@ def register_routes(app):
             abort(400)
         
         try:
-            dados_validados = ProfileUpdateSchema(**dados_brutos)
+            dados_validados = schemas_usuario.ProfileUpdateSchema(**dados_brutos)
             dados_para_atualizar = dados_validados.dict(exclude_unset=True)
 
             if not dados_para_atualizar:
@@ -434,12 +689,12 @@ def register_routes(app):
             
             return jsonify(usuario_atualizado_dict)
 
-        except ValidationError as e:
+        except pydantic.ValidationError as e:
             return jsonify({"detail": e.errors()}), 422
         except ValueError as e:
             abort(404, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao atualizar perfil do usuário {id_usuario_logado}: {e}", exc_info=True)
+            logger.error("Erro ao atualizar perfil do usuário %s: %s", id_usuario_logado, e, exc_info=True)
             abort(500)
             
     # Em routes.py
@@ -451,23 +706,60 @@ def register_routes(app):
         """
         Retorna os dados agregados para a visão de portfólio.
         """
+        return _responder_leitura(leituras.relatorio_portfolio)
+
+    @app.route("/api/timeline", methods=['GET'])
+    @jwt_required()
+    def get_timeline_route():
+        """
+        Dados colunares para o roadmap e o Gantt. Aceita 'inicio' e 'fim'
+        (AAAA-MM-DD), 'id_projeto' e 'incluir' (projetos,tarefas).
+        Responde 304 quando o 'If-None-Match' ainda corresponde aos dados.
+        """
         usuario_atual = get_usuario_atual()
-        try:
-            # --- CORREÇÃO AQUI: Usa ProjetoService ---
-            with ProjetoService() as service:
-                portfolio_data = service.get_relatorio_portfolio(usuario_atual)
-            return jsonify(portfolio_data)
-        except Exception as e:
-            logger.error(f"Erro em GET /api/relatorios/portfolio: {e}", exc_info=True)
-            abort(500)        
-            
+        id_projeto = request.args.get('id_projeto', type=int)
+        incluir = [e.strip() for e in request.args.get('incluir', 'projetos').split(',') if e.strip()]
+
+        with TimelineService() as service:
+            if id_projeto is not None:
+                projeto = service.session.get(Projeto, id_projeto)
+                if not projeto:
+                    abort(404, description="Projeto não encontrado.")
+                if not Permissions.pode_ver_projeto(usuario_atual, projeto):
+                    abort(403, description="Você não tem permissão para ver este projeto.")
+            try:
+                resultado = service.get_timeline(
+                    usuario_atual,
+                    inicio=request.args.get('inicio'),
+                    fim=request.args.get('fim'),
+                    id_projeto=id_projeto,
+                    incluir=incluir
+                )
+            except ValueError as e:
+                abort(400, description=str(e))
+        return resposta_json_condicional(resultado)
+
+    @app.route("/api/projetos/<int:id_projeto>/cronograma", methods=['GET'])
+    @jwt_required()
+    def get_cronograma_route(id_projeto):
+        """Caminho crítico e folgas das tarefas do projeto, a partir do grafo de dependências."""
+        usuario_atual = get_usuario_atual()
+
+        with CronogramaService() as service:
+            projeto = service.session.get(Projeto, id_projeto)
+            if not projeto:
+                abort(404, description="Projeto não encontrado.")
+            if not Permissions.pode_ver_projeto(usuario_atual, projeto):
+                abort(403, description="Você não tem permissão para ver este projeto.")
+            cronograma = service.get_cronograma(id_projeto)
+        return jsonify(cronograma)
+
     @app.route("/api/projetos/<int:id_projeto>/tarefas", methods=['POST'])
     @jwt_required()
     def criar_tarefa_route(id_projeto):
         """
         Cria uma nova tarefa associada a um projeto específico.
         """
-        logger.info(f"Requisição recebida: POST /api/projetos/{id_projeto}/tarefas")
         usuario_atual = get_usuario_atual()
         session = db.get_session()
         
@@ -481,7 +773,7 @@ def register_routes(app):
             # Reutilizamos a regra 'pode_editar_projeto', pois quem pode editar
             # o projeto também pode adicionar tarefas a ele.
             if not Permissions.pode_editar_projeto(usuario_atual, projeto_obj):
-                logger.warning(f"Usuário ID {usuario_atual.id_usuario} tentou criar tarefa no projeto ID {id_projeto} sem permissão.")
+                logger.warning("Usuário ID %s tentou criar tarefa no projeto ID %s sem permissão.", usuario_atual.id_usuario, id_projeto)
                 abort(403, description="Você não tem permissão para adicionar tarefas a este projeto.")
 
             # 3. Valida os dados de entrada
@@ -489,7 +781,7 @@ def register_routes(app):
             if not dados_brutos:
                 abort(400, description="Corpo da requisição não pode ser vazio.")
             
-            dados_validados = TarefaCreateSchema(**dados_brutos)
+            dados_validados = schemas_tarefa.TarefaCreateSchema(**dados_brutos)
             
             # 4. Chama o serviço de negócio
             with TarefaService() as service:
@@ -498,16 +790,57 @@ def register_routes(app):
             # Retorna a tarefa recém-criada com o status 201 (Created)
             return jsonify(nova_tarefa_dict), 201
 
-        except ValidationError as e:
+        except pydantic.ValidationError as e:
             return jsonify({"detail": e.errors()}), 422
         except ValueError as e:
             abort(400, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao criar tarefa para o projeto {id_projeto}: {e}", exc_info=True)
+            logger.error("Erro ao criar tarefa para o projeto %s: %s", id_projeto, e, exc_info=True)
             abort(500)
         finally:
             session.close()        
             
+    @app.route("/api/projetos/<int:id_projeto>/tarefas/batch", methods=['POST'])
+    @jwt_required()
+    def aplicar_lote_tarefas_route(id_projeto):
+        """
+        Aplica um lote de operações sobre as tarefas do projeto (ex.: arrastar
+        várias barras do Gantt) em uma única transação. Corpo:
+        {"operacoes": [{"op": "create"|"update"|"delete", "id": ..., "dados": {...}}]}
+        """
+        usuario_atual = get_usuario_atual()
+        dados_brutos = request.get_json(silent=True)
+        if not dados_brutos:
+            abort(400, description="Corpo da requisição não pode ser vazio.")
+        try:
+            lote = schemas_tarefa.TarefaLoteSchema(**dados_brutos)
+        except pydantic.ValidationError as e:
+            return jsonify({"detail": e.errors(include_context=False)}), 422
+
+        operacoes = [
+            {
+                "op": item.op,
+                "id": getattr(item, 'id', None),
+                "dados": item.dados.model_dump(exclude_unset=item.op == 'update') if item.op != 'delete' else {},
+            }
+            for item in lote.operacoes
+        ]
+
+        # Os erros do lote são tratados fora do 'with' para que a transação seja desfeita
+        try:
+            with TarefaService() as service:
+                projeto = service.session.get(Projeto, id_projeto)
+                if not projeto:
+                    abort(404, description="Projeto não encontrado.")
+                if not Permissions.pode_editar_projeto(usuario_atual, projeto):
+                    abort(403, description="Você não tem permissão para alterar as tarefas deste projeto.")
+                resultado = service.aplicar_lote(id_projeto, operacoes)
+        except LoteInvalidoError as e:
+            return jsonify({"detail": str(e), "erros": e.erros}), 400
+        except DependenciaInvalidaError as e:
+            abort(400, description=str(e))
+        return jsonify(resultado)
+
     # --- NOVA ROTA PARA EDITAR TAREFA ---
     @app.route("/api/tarefas/<int:id_tarefa>", methods=['PUT'])
     @jwt_required()
@@ -520,7 +853,7 @@ def register_routes(app):
             abort(400)
         
         try:
-            dados_validados = TarefaUpdateSchema(**dados_brutos)
+            dados_validados = schemas_tarefa.TarefaUpdateSchema(**dados_brutos)
             dados_para_atualizar = dados_validados.dict(exclude_unset=True)
 
             if not dados_para_atualizar:
@@ -531,12 +864,14 @@ def register_routes(app):
             
             return jsonify(tarefa_atualizada_dict)
 
-        except ValidationError as e:
+        except pydantic.ValidationError as e:
             return jsonify({"detail": e.errors()}), 422
+        except DependenciaInvalidaError as e:
+            abort(400, description=str(e))
         except ValueError as e:
             abort(404, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao atualizar tarefa {id_tarefa}: {e}", exc_info=True)
+            logger.error("Erro ao atualizar tarefa %s: %s", id_tarefa, e, exc_info=True)
             abort(500)        
             
     # --- NOVA ROTA PARA DELETAR TAREFA ---
@@ -546,7 +881,6 @@ def register_routes(app):
         usuario_atual = get_usuario_atual()
         # TODO: Adicionar verificação de permissão (usuário pode deletar tarefas neste projeto?)
         
-        logger.info(f"Requisição recebida: DELETE /api/tarefas/{id_tarefa}")
         try:
             with TarefaService() as service:
                 sucesso = service.deletar_tarefa(id_tarefa)
@@ -561,7 +895,7 @@ def register_routes(app):
         except ValueError as e:
             abort(404, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao deletar tarefa {id_tarefa}: {e}", exc_info=True)
+            logger.error("Erro ao deletar tarefa %s: %s", id_tarefa, e, exc_info=True)
             abort(500)        
             
     # Em routes.py, dentro da função register_routes(app)
@@ -573,34 +907,14 @@ def register_routes(app):
     @jwt_required()
     def get_minhas_tarefas_route():
         """Retorna a lista de tarefas abertas para o usuário logado."""
-        usuario_atual = get_usuario_atual()
-        if not usuario_atual:
-            abort(401)
+        return _responder_leitura(leituras.minhas_tarefas)
 
-        try:
-            with TarefaService() as service:
-                tarefas_dict = service.get_tarefas_por_usuario(usuario_atual.id_usuario)
-            return jsonify(tarefas_dict)
-        except Exception as e:
-            logger.error(f"Erro ao buscar tarefas para o usuário {usuario_atual.id_usuario}: {e}", exc_info=True)
-            abort(500)        
-            
     # --- NOVA ROTA PARA "MEUS PROJETOS" ---
     @app.route("/api/me/projetos", methods=['GET'])
     @jwt_required()
     def get_meus_projetos_route():
         """Retorna a lista de projetos ativos para o usuário logado."""
-        usuario_atual = get_usuario_atual()
-        if not usuario_atual:
-            abort(401)
-
-        try:
-            with ProjetoService() as service:
-                projetos_dict = service.get_projetos_por_responsavel(usuario_atual.id_usuario)
-            return jsonify(projetos_dict)
-        except Exception as e:
-            logger.error(f"Erro ao buscar projetos para o usuário {usuario_atual.id_usuario}: {e}", exc_info=True)
-            abort(500)        
+        return _responder_leitura(leituras.meus_projetos)
 
     @app.route("/api/homologacoes/<int:id_homologacao>/upload-zip", methods=['POST'])
     @jwt_required()
@@ -612,8 +926,8 @@ def register_routes(app):
             abort(400, description="Nenhum arquivo enviado.")
         
         file = request.files['reportFile']
-        if file.filename == '' or not file.filename.endswith('.zip'):
-            abort(400, description="Nenhum arquivo .zip selecionado.")
+        if file.filename == '' or not file.filename.lower().endswith(parsers.EXTENSOES_RELATORIO):
+            abort(400, description="Nenhum arquivo .zip ou .xml selecionado.")
 
         try:
             with HomologacaoService() as service:
@@ -627,7 +941,7 @@ def register_routes(app):
         except ValueError as e:
             abort(400, description=str(e))
         except Exception as e:
-            logger.error(f"Erro no upload para o ciclo {id_homologacao}: {e}", exc_info=True)
+            logger.error("Erro no upload para o ciclo %s: %s", id_homologacao, e, exc_info=True)
             abort(500)
           
     @app.route("/api/homologacoes/<int:id_homologacao>/processar-relatorio", methods=['POST'])
@@ -644,7 +958,7 @@ def register_routes(app):
         except ValueError as e:
             abort(400, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao processar relatório para homologação {id_homologacao}: {e}", exc_info=True)
+            logger.error("Erro ao processar relatório para homologação %s: %s", id_homologacao, e, exc_info=True)
             abort(500)
             
     # --- NOVA ROTA PARA OBTER TESTES DE UM CICLO ---
@@ -652,43 +966,154 @@ def register_routes(app):
     @jwt_required()
     def get_testes_do_ciclo_route(id_homologacao):
         """
-        Retorna a lista de testes executados para um ciclo de homologação específico.
+        Retorna uma página dos testes executados de um ciclo de homologação.
+
+        Filtros: 'status' (lista separada por vírgula), 'feature', 'severity',
+        'q' (trecho do nome) e 'assinatura' (id da causa de falha). Paginação: 'limite' e o 'cursor' devolvido em
+        'proximo_cursor' pela página anterior.
+        """
+        return _responder_leitura(leituras.testes_do_ciclo, id_homologacao=id_homologacao)
+
+    # --- ROTA PARA SERVIR UM ANEXO DO RELATÓRIO (SCREENSHOTS, LOGS) ---
+    @app.route("/api/homologacoes/<int:id_homologacao>/anexos/<path:nome_anexo>", methods=['GET'])
+    @jwt_required()
+    def get_anexo_do_ciclo_route(id_homologacao, nome_anexo):
+        """
+        Transmite um único anexo (attachments[].source do Allure) direto do ZIP
+        armazenado, sem extraí-lo em disco. Suporta Range e ETag.
         """
-        logger.info(f"Requisição recebida: GET /api/homologacoes/{id_homologacao}/testes")
         usuario_atual = get_usuario_atual()
-        
-        # TODO: Adicionar uma verificação de permissão mais granular.
-        # Por exemplo, buscar o ciclo, pegar o projeto dele e verificar
-        # se o usuário pode ver aquele projeto.
-        # if not Permissions.pode_ver_projeto(...): abort(403)
+        session = db.get_session()
+        try:
+            ciclo = session.get(Homologacao, id_homologacao)
+            if not ciclo:
+                abort(404, description="Ciclo de homologação não encontrado.")
+            if not Permissions.pode_ver_projeto(usuario_atual, ciclo.projeto):
+                abort(403, description="Você não tem permissão para ver este projeto.")
+            caminho_relatorio = ciclo.caminho_relatorio_zip
+        finally:
+            session.close()
+
+        if not caminho_relatorio:
+            abort(404, description="Este ciclo não possui relatório anexado.")
 
         try:
-            with HomologacaoService() as service:
-                testes_dict = service.get_testes_por_ciclo(id_homologacao)
-            
-            return jsonify(testes_dict)
+            indice = indices_zip.obter(caminho_relatorio)
+        except (FileNotFoundError, zipfile.BadZipFile) as e:
+            logger.error("Relatório do ciclo %s indisponível: %s", id_homologacao, e)
+            abort(404, description="Arquivo de relatório não encontrado.")
+
+        info = indice.localizar(nome_anexo)
+        if not info:
+            abort(404, description="Anexo não encontrado no relatório.")
+
+        return resposta_membro_zip(caminho_relatorio, info, current_app.config.get('ANEXO_CACHE_MAX_AGE', 3600))
+
+    # --- ROTAS DE ANÁLISE DE TESTES ENTRE CICLOS ---
+    @app.route("/api/testes/<int:id_definicao>/historico", methods=['GET'])
+    @jwt_required()
+    def get_historico_teste_route(id_definicao):
+        """Linha do tempo de um teste nos últimos ciclos (padrão: 50)."""
+        usuario_atual = get_usuario_atual()
+        limite = min(max(request.args.get('limite', 50, type=int), 1), 500)
+        id_projeto = request.args.get('id_projeto', type=int)
 
+        try:
+            with AnaliseTestesService() as service:
+                historico = service.get_historico_teste(id_definicao, usuario_atual, limite, id_projeto)
+            return jsonify(historico)
         except ValueError as e:
-            # Captura o erro se o ciclo de homologação não for encontrado
             abort(404, description=str(e))
         except Exception as e:
-            logger.error(f"Erro ao buscar testes para o ciclo {id_homologacao}: {e}", exc_info=True)
-            abort(500)        
-          
+            logger.error("Erro ao buscar histórico do teste %s: %s", id_definicao, e, exc_info=True)
+            abort(500)
+
+    @app.route("/api/projetos/<int:id_projeto>/testes/instaveis", methods=['GET'])
+    @jwt_required()
+    def get_testes_instaveis_route(id_projeto):
+        """Testes que mais alternam entre aprovado e reprovado no projeto."""
+        usuario_atual = get_usuario_atual()
+        limite = min(max(request.args.get('limite', 20, type=int), 1), 200)
+        min_execucoes = max(request.args.get('min_execucoes', 3, type=int), 2)
+
+        with AnaliseTestesService() as service:
+            projeto_obj = service.session.get(Projeto, id_projeto)
+            if not projeto_obj:
+                abort(404, description="Projeto não encontrado.")
+            if not Permissions.pode_ver_projeto(usuario_atual, projeto_obj):
+                abort(403, description="Você não tem permissão para ver este projeto.")
+            testes = service.get_testes_instaveis(id_projeto, limite, min_execucoes)
+        return jsonify(testes)
+
+    @app.route("/api/homologacoes/<int:id_homologacao>/testes/novas-falhas", methods=['GET'])
+    @jwt_required()
+    def get_novas_falhas_route(id_homologacao):
+        """Testes que passavam no ciclo anterior do projeto e falharam neste."""
+        usuario_atual = get_usuario_atual()
+
+        with AnaliseTestesService() as service:
+            ciclo = service.session.get(Homologacao, id_homologacao)
+            if not ciclo:
+                abort(404, description="Ciclo de homologação não encontrado.")
+            if not Permissions.pode_ver_projeto(usuario_atual, ciclo.projeto):
+                abort(403, description="Você não tem permissão para ver este projeto.")
+            resultado = service.get_novas_falhas(id_homologacao)
+        return jsonify(resultado)
+
+    @app.route("/api/homologacoes/<int:id_homologacao>/diff", methods=['GET'])
+    @jwt_required()
+    def get_diff_ciclos_route(id_homologacao):
+        """
+        Diff de resultados contra outro ciclo ('against'; padrão: o anterior do projeto).
+        Aceita 'categoria', 'limite' e 'offset' para paginar.
+        """
+        usuario_atual = get_usuario_atual()
+        id_comparado = request.args.get('against', type=int)
+        categoria = request.args.get('categoria')
+        limite = min(max(request.args.get('limite', 100, type=int), 1), 1000)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+
+        with AnaliseTestesService() as service:
+            for id_ciclo in filter(None, (id_homologacao, id_comparado)):
+                ciclo = service.session.get(Homologacao, id_ciclo)
+                if not ciclo:
+                    abort(404, description=f"Ciclo de homologação {id_ciclo} não encontrado.")
+                if not Permissions.pode_ver_projeto(usuario_atual, ciclo.projeto):
+                    abort(403, description="Você não tem permissão para ver este projeto.")
+            try:
+                resultado = service.get_diff_ciclos(id_homologacao, id_comparado, categoria, limite, offset)
+            except ValueError as e:
+                abort(400, description=str(e))
+        return jsonify(resultado)
+
+    @app.route("/api/homologacoes/<int:id_homologacao>/falhas/agrupamentos", methods=['GET'])
+    @jwt_required()
+    def get_agrupamentos_falha_ciclo_route(id_homologacao):
+        """Falhas do ciclo agrupadas por causa (assinatura normalizada da mensagem)."""
+        usuario_atual = get_usuario_atual()
+        limite = min(max(request.args.get('limite', 50, type=int), 1), 500)
+
+        with AnaliseTestesService() as service:
+            ciclo = service.session.get(Homologacao, id_homologacao)
+            if not ciclo:
+                abort(404, description="Ciclo de homologação não encontrado.")
+            if not Permissions.pode_ver_projeto(usuario_atual, ciclo.projeto):
+                abort(403, description="Você não tem permissão para ver este projeto.")
+            grupos = service.get_agrupamentos_falha_ciclo(id_homologacao, limite)
+        return jsonify(grupos)
+
+    @app.route("/api/relatorios/qa/falhas", methods=['GET'])
+    @jwt_required()
+    def get_agrupamentos_falha_route():
+        """
+        Principais causas de falha entre ciclos e projetos visíveis.
+        Aceita 'id_projeto', 'q' (busca textual nas mensagens) e 'limite'.
+        """
+        return _responder_leitura(leituras.agrupamentos_falha)
+
     # --- NOVA ROTA PARA O DASHBOARD DE QA ---
     @app.route("/api/relatorios/qa", methods=['GET'])
     @jwt_required()
     def get_relatorio_qa_route():
         """Retorna os dados agregados para o dashboard de Qualidade."""
-        usuario_atual = get_usuario_atual()
-        # Apenas Admins e Gerentes podem ver os relatórios completos de QA
-        if not Permissions.pode_ver_relatorios_completos(usuario_atual):
-            abort(403, description="Você não tem permissão para acessar os relatórios de qualidade.")
-
-        try:
-            with HomologacaoService() as service:
-                qa_data = service.get_relatorio_qa_geral()
-            return jsonify(qa_data)
-        except Exception as e:
-            logger.error(f"Erro em GET /api/relatorios/qa: {e}", exc_info=True)
-            abort(500)        
+        return _responder_leitura(leituras.relatorio_qa)
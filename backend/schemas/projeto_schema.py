@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
 
 # ===================================================================
@@ -78,4 +78,38 @@ class StatusUpdateSchema(BaseModel):
     """
     status: str
     usuario: str = "Usuário Padrão"
-    observacao: str = ""
\ No newline at end of file
+    observacao: str = ""
+
+# ===================================================================
+# 5. SCHEMAS DE OPERAÇÕES EM LOTE (fechamento de trimestre do portfólio)
+# ===================================================================
+MAX_PROJETOS_LOTE = 500
+
+class ProjetoLoteEdicaoSchema(BaseModel):
+    """
+    Campos que fazem sentido aplicar a vários projetos de uma vez.
+    Nome, descrição, equipe e objetivos continuam sendo editados projeto a projeto.
+    """
+    id_responsavel: Optional[int] = None
+    id_area_solicitante: Optional[int] = None
+    prioridade: Optional[str] = None
+    complexidade: Optional[str] = None
+    risco: Optional[str] = None
+    data_inicio_prevista: Optional[str] = None
+    data_fim_prevista: Optional[str] = None
+
+class ProjetoLoteSchema(BaseModel):
+    """
+    Transição de status e/ou edição aplicadas a uma lista de projetos.
+    Cada projeto é validado individualmente; os que falharem são reportados.
+    """
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_PROJETOS_LOTE)
+    status: Optional[str] = None
+    observacao: str = ""
+    dados: Optional[ProjetoLoteEdicaoSchema] = None
+
+    @model_validator(mode="after")
+    def exige_alguma_alteracao(self):
+        if self.status is None and not (self.dados and self.dados.model_dump(exclude_unset=True)):
+            raise ValueError("Informe 'status' e/ou 'dados' para alterar os projetos.")
+        return self
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
 
 class TarefaCreateSchema(BaseModel):
     nome_tarefa: str
@@ -7,6 +7,7 @@ class TarefaCreateSchema(BaseModel):
     data_inicio: str # Espera "YYYY-MM-DD"
     data_fim: str    # Espera "YYYY-MM-DD"
     id_responsavel_tarefa: Optional[int] = None
+    dependencias: Optional[str] = None  # Ids das predecessoras: "3, 5"
     
 class TarefaUpdateSchema(BaseModel):
     """Schema para validar os dados ao ATUALIZAR uma tarefa."""
@@ -16,4 +17,30 @@ class TarefaUpdateSchema(BaseModel):
     data_fim: Optional[str] = None
     id_responsavel_tarefa: Optional[int] = None
     progresso: Optional[int] = Field(None, ge=0, le=100) # ge=greater or equal, le=less or equal
-    dependencias: Optional[str] = None    
\ No newline at end of file
+    dependencias: Optional[str] = None    
+
+# --- OPERAÇÕES EM LOTE (arrastar barras / deslocar fases no Gantt) ---
+MAX_OPERACOES_LOTE = 500
+
+class CriarTarefaOperacao(BaseModel):
+    op: Literal["create"]
+    dados: TarefaCreateSchema
+
+class AtualizarTarefaOperacao(BaseModel):
+    op: Literal["update"]
+    id: int = Field(..., gt=0)
+    dados: TarefaUpdateSchema
+
+class ExcluirTarefaOperacao(BaseModel):
+    op: Literal["delete"]
+    id: int = Field(..., gt=0)
+
+class TarefaLoteSchema(BaseModel):
+    """
+    Lote de operações sobre as tarefas de um projeto, validado de uma vez.
+    O campo 'op' escolhe o schema de cada item; os erros apontam o índice.
+    """
+    operacoes: List[Annotated[
+        Union[CriarTarefaOperacao, AtualizarTarefaOperacao, ExcluirTarefaOperacao],
+        Field(discriminator="op")
+    ]] = Field(..., min_length=1, max_length=MAX_OPERACOES_LOTE)
@@ -1,6 +1,7 @@
 import logging
 from functools import wraps
 from flask import abort
+from sqlalchemy import true
 from flask_jwt_extended import get_jwt_identity
 
 # Importa os modelos necessários para as verificações
@@ -24,11 +25,18 @@ def get_usuario_atual() -> Usuario | None:
     except (ValueError, TypeError):
         # Acontece se o token estiver ausente ou malformado
         return None
+    return carregar_usuario(id_usuario_logado)
 
+
+def carregar_usuario(id_usuario: int) -> Usuario | None:
+    """
+    Busca o usuário pelo ID, fora de qualquer contexto do Flask
+    (usado também pelo servidor ASGI, que valida o token por conta própria).
+    """
     session = db.get_session()
     try:
         # Busca o usuário no banco de dados pelo ID
-        usuario = session.query(Usuario).get(id_usuario_logado)
+        usuario = session.get(Usuario, id_usuario)
         return usuario
     finally:
         session.close()
@@ -71,6 +79,32 @@ class Permissions:
         # Se for Membro, verifica se ele é o responsável
         return usuario.id_usuario == projeto.id_responsavel
 
+    @staticmethod
+    def filtro_projetos_visiveis(usuario: Usuario):
+        """
+        Mesma regra de 'pode_ver_projeto', expressa como condição SQL sobre a
+        tabela de projetos, para filtrar listas direto na consulta.
+        """
+        if not usuario:
+            return Projeto.id_projeto.is_(None)
+        if usuario.role in ['Admin', 'Gerente']:
+            return true()
+        return Projeto.id_responsavel == usuario.id_usuario
+
+    @staticmethod
+    def filtro_eventos_visiveis(usuario: Usuario):
+        """
+        Mesma regra de 'pode_ver_projeto', aplicada aos eventos do canal de
+        notificações (utils/pubsub.py), que trazem os 'responsaveis' do projeto.
+        Eventos sem projeto (ex: 'resync') são entregues a todos.
+        """
+        ver_todos = usuario.role in ['Admin', 'Gerente']
+        id_usuario = usuario.id_usuario
+
+        def filtro(evento: dict) -> bool:
+            return ver_todos or 'responsaveis' not in evento or id_usuario in evento['responsaveis']
+        return filtro
+
     @staticmethod
     def pode_editar_projeto(usuario: Usuario, projeto: Projeto):
         """
@@ -108,6 +142,18 @@ class Permissions:
         # A lógica é idêntica à de edição, então podemos reutilizá-la.
         return Permissions.pode_editar_projeto(usuario, projeto)
 
+    @staticmethod
+    def filtro_projetos_editaveis(usuario: Usuario):
+        """
+        Mesma regra de 'pode_editar_projeto' e 'pode_mudar_status', expressa
+        como condição SQL sobre a tabela de projetos (para operações em lote).
+        """
+        if not usuario:
+            return Projeto.id_projeto.is_(None)
+        if usuario.role in ['Admin', 'Gerente']:
+            return true()
+        return Projeto.id_responsavel == usuario.id_usuario
+
     # --- NOVAS REGRAS PARA RELATÓRIOS E CONFIGURAÇÕES ---
 
     @staticmethod
@@ -126,4 +172,13 @@ class Permissions:
         """
         if not usuario:
             return False
-        return usuario.role == 'Admin'
\ No newline at end of file
+        return usuario.role == 'Admin'
+
+    @staticmethod
+    def pode_ver_diagnosticos(usuario: Usuario):
+        """
+        REGRA: Apenas Admins veem os diagnósticos de desempenho (consultas lentas, perfis).
+        """
+        if not usuario:
+            return False
+        return usuario.role == 'Admin'
@@ -0,0 +1,120 @@
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, literal, or_, select
+from sqlalchemy.orm import joinedload
+
+from data_sources.sqlite_source import get_all_projetos
+from models import Alteracao, Projeto, Tarefa, Usuario
+from security import Permissions
+from .projeto_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+LIMITE_ALTERACOES = 500
+MAX_LIMITE_ALTERACOES = 5000
+
+# Nome do bloco da resposta para cada entidade do registro
+_BLOCOS = {'projeto': 'projetos', 'tarefa': 'tarefas'}
+
+
+def cursor_alteracoes(session) -> int:
+    """Id do registro de alteração mais recente (0 se ainda não houver nenhum)."""
+    return session.scalar(select(func.coalesce(func.max(Alteracao.id_alteracao), 0)))
+
+
+def _consolidar(linhas) -> Dict[str, Dict[str, list]]:
+    """
+    Reduz a sequência de operações de cada entidade ao efeito líquido desde o
+    cursor: criada (e não excluída), excluída (e já existente antes) ou atualizada.
+    """
+    efeito = {}
+    for entidade, id_entidade, operacao in linhas:
+        primeira, _ = efeito.get((entidade, id_entidade), (operacao, None))
+        efeito[(entidade, id_entidade)] = (primeira, operacao)
+
+    blocos = {bloco: {"inseridos": [], "atualizados": [], "excluidos": []} for bloco in _BLOCOS.values()}
+    for (entidade, id_entidade), (primeira, ultima) in efeito.items():
+        bloco = blocos[_BLOCOS[entidade]]
+        if ultima == 'delete':
+            # Criada e excluída dentro da janela: o cliente nunca a viu
+            if primeira != 'insert':
+                bloco['excluidos'].append(id_entidade)
+        elif 'insert' in (primeira, ultima):
+            bloco['inseridos'].append(id_entidade)
+        else:
+            bloco['atualizados'].append(id_entidade)
+    for bloco in blocos.values():
+        for ids in bloco.values():
+            ids.sort()
+    return blocos
+
+
+class AlteracoesService(BaseService):
+    """
+    Sincronização incremental (delta) de projetos e tarefas a partir do
+    registro de alterações.
+    """
+
+    def listar(self, usuario: Usuario, desde: Optional[int] = None, limite: int = LIMITE_ALTERACOES,
+               incluir_dados: bool = False) -> Dict:
+        """
+        Alterações visíveis ao usuário posteriores ao cursor 'desde'.
+
+        Sem 'desde', devolve apenas o cursor atual (ponto de partida de quem
+        acabou de carregar as listas completas). Exclusões são sempre
+        entregues; o cliente ignora ids que não conhece. Um projeto que o
+        usuário via e deixou de ver (trocou de responsável) também vem como
+        excluído.
+
+        Returns:
+            Dicionário com 'cursor' (o próximo 'desde'), 'mais' (há outra página),
+            os blocos 'projetos' e 'tarefas' com 'inseridos', 'atualizados' e
+            'excluidos' e, se pedido, 'dados' com os cartões atuais
+        """
+        atual = cursor_alteracoes(self.session)
+        if desde is None:
+            return {"cursor": atual, "mais": False, **_consolidar([])}
+        if desde < 0:
+            raise ValueError("O cursor 'since' não pode ser negativo.")
+        limite = min(max(limite, 1), MAX_LIMITE_ALTERACOES)
+        logger.debug("Serviço: alterações desde %s para o usuário ID %s", desde, usuario.id_usuario)
+
+        visivel = Permissions.filtro_projetos_visiveis(usuario)
+        # Registros de projetos que o usuário já não vê só interessam como exclusão
+        operacao = case((visivel, Alteracao.operacao), else_=literal('delete')).label('operacao')
+        linhas = self.session.execute(
+            select(Alteracao.id_alteracao, Alteracao.entidade, Alteracao.id_entidade, operacao)
+            .outerjoin(Projeto, Projeto.id_projeto == Alteracao.id_projeto)
+            .where(Alteracao.id_alteracao > desde, Alteracao.id_alteracao <= atual,
+                   or_(Alteracao.operacao == 'delete', visivel,
+                       Alteracao.id_responsavel_anterior == usuario.id_usuario))
+            .order_by(Alteracao.id_alteracao)
+            .limit(limite + 1)
+        ).all()
+
+        mais = len(linhas) > limite
+        linhas = linhas[:limite]
+        # Sem mais páginas, o cursor avança até o fim mesmo que os últimos registros não sejam visíveis
+        resultado = {
+            "cursor": linhas[-1].id_alteracao if mais else max(atual, desde),
+            "mais": mais,
+            **_consolidar([(l.entidade, l.id_entidade, l.operacao) for l in linhas]),
+        }
+        if incluir_dados:
+            resultado['dados'] = self._cartoes(resultado)
+        return resultado
+
+    def _cartoes(self, resultado: Dict) -> Dict:
+        """Estado atual dos projetos e tarefas criados ou atualizados, no formato das listas."""
+        ids_projetos = resultado['projetos']['inseridos'] + resultado['projetos']['atualizados']
+        ids_tarefas = resultado['tarefas']['inseridos'] + resultado['tarefas']['atualizados']
+        projetos = get_all_projetos(self.session, ids_projetos) if ids_projetos else []
+        tarefas = (
+            self.session.query(Tarefa).options(joinedload(Tarefa.projeto))
+            .filter(Tarefa.id_tarefa.in_(ids_tarefas)).all()
+        ) if ids_tarefas else []
+        return {
+            "projetos": [p.para_dicionario() for p in sorted(projetos, key=lambda p: p.id_projeto)],
+            "tarefas": [t.para_dicionario() for t in sorted(tarefas, key=lambda t: t.id_tarefa)],
+        }
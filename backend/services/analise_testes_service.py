@@ -0,0 +1,324 @@
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, case, literal, literal_column, null, and_, union_all, table, column
+from sqlalchemy.orm import aliased
+
+from models import (
+    Projeto, Homologacao, Usuario, TesteExecutado, DefinicaoTeste, EstatisticaTeste,
+    AssinaturaFalha, FalhaPorCiclo
+)
+from data_sources.busca_falhas import TABELA_BUSCA_FALHAS
+from models.teste_executado_model import (
+    STATUS_TESTE, CODIGO_STATUS, CODIGOS_REPROVADOS, descomprimir_mensagem
+)
+from security import Permissions
+from .projeto_service import BaseService
+from .busca_service import montar_consulta_fts
+
+logger = logging.getLogger(__name__)
+
+# Categorias do diff entre dois ciclos. 'inalterados' só entra nas contagens.
+CATEGORIAS_DIFF = ('corrigidos', 'novas_falhas', 'continuam_falhando', 'adicionados', 'removidos')
+
+_busca_falhas = table(TABELA_BUSCA_FALHAS, column('rowid'))
+
+
+class AnaliseTestesService(BaseService):
+    """
+    Consultas analíticas sobre o histórico de testes entre ciclos de homologação:
+    linha do tempo de um teste, instabilidade (flaky) e novas falhas.
+
+    Todas as consultas partem dos índices por identidade de teste
+    (id_definicao) e nunca carregam ciclos inteiros em memória.
+    """
+
+    def get_historico_teste(self, id_definicao: int, usuario: Usuario,
+                            limite: int = 50, id_projeto: Optional[int] = None) -> Dict:
+        """Retorna as últimas execuções de um teste nos projetos visíveis ao usuário."""
+        logger.debug("Serviço: histórico do teste %d (limite %d)", id_definicao, limite)
+
+        definicao = self.session.get(DefinicaoTeste, id_definicao)
+        if not definicao:
+            raise ValueError(f"Teste com ID {id_definicao} não encontrado.")
+
+        consulta = (
+            select(
+                TesteExecutado.id_homologacao, TesteExecutado.status_codigo,
+                TesteExecutado.mensagem_erro_comprimida,
+                Homologacao.id_projeto, Homologacao.versao_testada, Homologacao.data_inicio,
+                Projeto.nome_projeto
+            )
+            .join(Homologacao, Homologacao.id_homologacao == TesteExecutado.id_homologacao)
+            .join(Projeto, Projeto.id_projeto == Homologacao.id_projeto)
+            .where(TesteExecutado.id_definicao == id_definicao)
+            .where(Permissions.filtro_projetos_visiveis(usuario))
+            .order_by(TesteExecutado.id_homologacao.desc())
+            .limit(limite)
+        )
+        if id_projeto is not None:
+            consulta = consulta.where(Homologacao.id_projeto == id_projeto)
+
+        execucoes = [
+            {
+                "id_homologacao": linha.id_homologacao,
+                "id_projeto": linha.id_projeto,
+                "nome_projeto": linha.nome_projeto,
+                "versao_testada": linha.versao_testada,
+                "data_inicio": linha.data_inicio,
+                "status": STATUS_TESTE[linha.status_codigo],
+                "mensagem_erro": descomprimir_mensagem(linha.mensagem_erro_comprimida),
+            }
+            for linha in self.session.execute(consulta)
+        ]
+        return {"teste": definicao.para_dicionario(), "execucoes": execucoes}
+
+    def get_testes_instaveis(self, id_projeto: int, limite: int = 20, min_execucoes: int = 3) -> List[Dict]:
+        """
+        Lista os testes que mais alternam entre aprovado e reprovado no projeto.
+        Lê as estatísticas mantidas na ingestão; não percorre o histórico.
+        """
+        logger.debug("Serviço: testes instáveis do projeto %d", id_projeto)
+
+        estatisticas = self.session.query(EstatisticaTeste)\
+            .filter(EstatisticaTeste.id_projeto == id_projeto)\
+            .filter(EstatisticaTeste.transicoes > 0)\
+            .filter(EstatisticaTeste.execucoes >= min_execucoes)\
+            .order_by(EstatisticaTeste.score_instabilidade.desc(), EstatisticaTeste.transicoes.desc())\
+            .limit(limite)\
+            .all()
+        return [e.para_dicionario() for e in estatisticas]
+
+    def get_ciclo_anterior(self, ciclo: Homologacao) -> Optional[int]:
+        """ID do ciclo anterior do mesmo projeto que possui testes registrados."""
+        return self.session.execute(
+            select(func.max(Homologacao.id_homologacao))
+            .where(Homologacao.id_projeto == ciclo.id_projeto)
+            .where(Homologacao.id_homologacao < ciclo.id_homologacao)
+            .where(
+                select(TesteExecutado.id_execucao)
+                .where(TesteExecutado.id_homologacao == Homologacao.id_homologacao)
+                .exists()
+            )
+        ).scalar()
+
+    def get_novas_falhas(self, id_homologacao: int) -> Dict:
+        """
+        Testes reprovados neste ciclo que estavam aprovados no ciclo anterior
+        do mesmo projeto (junção pelo índice único ciclo + teste).
+        """
+        logger.debug("Serviço: novas falhas do ciclo %d", id_homologacao)
+
+        ciclo = self.session.get(Homologacao, id_homologacao)
+        if not ciclo:
+            raise ValueError(f"Ciclo de homologação com ID {id_homologacao} não encontrado.")
+
+        id_anterior = self.get_ciclo_anterior(ciclo)
+        if id_anterior is None:
+            return {"id_homologacao": id_homologacao, "id_homologacao_anterior": None, "testes": []}
+
+        atual = aliased(TesteExecutado)
+        anterior = aliased(TesteExecutado)
+        linhas = self.session.execute(
+            select(atual.id_execucao, atual.status_codigo, atual.mensagem_erro_comprimida,
+                   DefinicaoTeste.id_definicao, DefinicaoTeste.nome_teste,
+                   DefinicaoTeste.feature, DefinicaoTeste.severity)
+            .join(anterior, (anterior.id_definicao == atual.id_definicao)
+                  & (anterior.id_homologacao == id_anterior))
+            .join(DefinicaoTeste, DefinicaoTeste.id_definicao == atual.id_definicao)
+            .where(atual.id_homologacao == id_homologacao)
+            .where(atual.status_codigo.in_(CODIGOS_REPROVADOS))
+            .where(anterior.status_codigo == CODIGO_STATUS['passed'])
+            .order_by(DefinicaoTeste.nome_teste)
+        )
+        testes = [
+            {
+                "id_execucao": linha.id_execucao,
+                "id_definicao": linha.id_definicao,
+                "nome_teste": linha.nome_teste,
+                "feature": linha.feature,
+                "severity": linha.severity,
+                "status": STATUS_TESTE[linha.status_codigo],
+                "mensagem_erro": descomprimir_mensagem(linha.mensagem_erro_comprimida),
+            }
+            for linha in linhas
+        ]
+        return {"id_homologacao": id_homologacao, "id_homologacao_anterior": id_anterior, "testes": testes}
+
+    def _consulta_diff(self, id_homologacao: int, id_comparado: Optional[int]):
+        """
+        Subconsulta com uma linha por teste presente em qualquer um dos dois
+        ciclos e sua categoria. O SQLite não tem FULL OUTER JOIN em todas as
+        versões suportadas, então o diff é a união de duas junções externas
+        pelo índice único (id_homologacao, id_definicao).
+        """
+        atual = aliased(TesteExecutado)
+        comparado = aliased(TesteExecutado)
+        passou = CODIGO_STATUS['passed']
+
+        atual_reprovado = atual.status_codigo.in_(CODIGOS_REPROVADOS)
+        comparado_reprovado = comparado.status_codigo.in_(CODIGOS_REPROVADOS)
+        categoria = case(
+            (comparado.id_execucao.is_(None), 'adicionados'),
+            (atual_reprovado & comparado_reprovado, 'continuam_falhando'),
+            (atual_reprovado, 'novas_falhas'),
+            ((atual.status_codigo == passou) & comparado_reprovado, 'corrigidos'),
+            else_='inalterados'
+        )
+
+        # Sem ciclo de comparação (id_comparado None) a condição vira
+        # "IS NULL", nunca satisfeita: todos os testes aparecem como adicionados.
+        presentes_no_atual = (
+            select(atual.id_definicao,
+                   atual.status_codigo.label('status_atual'),
+                   comparado.status_codigo.label('status_comparado'),
+                   atual.mensagem_erro_comprimida.label('mensagem_erro_comprimida'),
+                   categoria.label('categoria'))
+            .select_from(atual)
+            .outerjoin(comparado, and_(comparado.id_homologacao == id_comparado,
+                                       comparado.id_definicao == atual.id_definicao))
+            .where(atual.id_homologacao == id_homologacao)
+        )
+        removidos = (
+            select(comparado.id_definicao,
+                   null().label('status_atual'),
+                   comparado.status_codigo.label('status_comparado'),
+                   comparado.mensagem_erro_comprimida.label('mensagem_erro_comprimida'),
+                   literal('removidos').label('categoria'))
+            .select_from(comparado)
+            .outerjoin(atual, and_(atual.id_homologacao == id_homologacao,
+                                   atual.id_definicao == comparado.id_definicao))
+            .where(comparado.id_homologacao == id_comparado)
+            .where(atual.id_execucao.is_(None))
+        )
+        return union_all(presentes_no_atual, removidos).subquery('diff')
+
+    def get_diff_ciclos(self, id_homologacao: int, id_comparado: Optional[int] = None,
+                        categoria: Optional[str] = None, limite: int = 100, offset: int = 0) -> Dict:
+        """
+        Compara os resultados de dois ciclos (por padrão, o anterior do mesmo projeto).
+
+        Retorna a contagem de todas as categorias e uma página de testes de cada
+        uma (ou só da categoria pedida). A paginação é feita no banco, com
+        ROW_NUMBER por categoria, então o custo não depende de trazer as duas
+        suítes inteiras para o Python.
+        """
+        logger.debug("Serviço: diff do ciclo %d contra %s", id_homologacao, id_comparado)
+
+        ciclo = self.session.get(Homologacao, id_homologacao)
+        if not ciclo:
+            raise ValueError(f"Ciclo de homologação com ID {id_homologacao} não encontrado.")
+        if categoria is not None and categoria not in CATEGORIAS_DIFF:
+            raise ValueError(f"Categoria inválida. Use uma de: {', '.join(CATEGORIAS_DIFF)}.")
+        if id_comparado is None:
+            id_comparado = self.get_ciclo_anterior(ciclo)
+
+        diff = self._consulta_diff(id_homologacao, id_comparado)
+
+        contagens = dict.fromkeys(CATEGORIAS_DIFF + ('inalterados',), 0)
+        contagens.update(self.session.execute(
+            select(diff.c.categoria, func.count()).group_by(diff.c.categoria)
+        ).all())
+
+        categorias = [categoria] if categoria else list(CATEGORIAS_DIFF)
+        posicao = func.row_number().over(
+            partition_by=diff.c.categoria,
+            order_by=(DefinicaoTeste.nome_teste, DefinicaoTeste.id_definicao)
+        ).label('posicao')
+        paginado = (
+            select(diff, DefinicaoTeste.nome_teste, DefinicaoTeste.feature, DefinicaoTeste.severity, posicao)
+            .join(DefinicaoTeste, DefinicaoTeste.id_definicao == diff.c.id_definicao)
+            .where(diff.c.categoria.in_(categorias))
+            .subquery('paginado')
+        )
+        linhas = self.session.execute(
+            select(paginado)
+            .where(paginado.c.posicao > offset)
+            .where(paginado.c.posicao <= offset + limite)
+            .order_by(paginado.c.categoria, paginado.c.posicao)
+        )
+
+        testes: Dict[str, List[Dict]] = {c: [] for c in categorias}
+        for linha in linhas:
+            testes[linha.categoria].append({
+                "id_definicao": linha.id_definicao,
+                "nome_teste": linha.nome_teste,
+                "feature": linha.feature,
+                "severity": linha.severity,
+                "status": STATUS_TESTE[linha.status_atual] if linha.status_atual is not None else None,
+                "status_anterior": STATUS_TESTE[linha.status_comparado] if linha.status_comparado is not None else None,
+                "mensagem_erro": descomprimir_mensagem(linha.mensagem_erro_comprimida),
+            })
+
+        return {
+            "id_homologacao": id_homologacao,
+            "id_homologacao_comparado": id_comparado,
+            "contagens": contagens,
+            "limite": limite,
+            "offset": offset,
+            "testes": testes,
+        }
+
+    def get_agrupamentos_falha_ciclo(self, id_homologacao: int, limite: int = 50) -> List[Dict]:
+        """Causas de falha do ciclo, da mais frequente para a menos frequente."""
+        logger.debug("Serviço: agrupamentos de falha do ciclo %d", id_homologacao)
+
+        if not self.session.get(Homologacao, id_homologacao):
+            raise ValueError(f"Ciclo de homologação com ID {id_homologacao} não encontrado.")
+
+        grupos = self.session.query(FalhaPorCiclo)\
+            .filter(FalhaPorCiclo.id_homologacao == id_homologacao)\
+            .order_by(FalhaPorCiclo.quantidade.desc(), FalhaPorCiclo.id_assinatura)\
+            .limit(limite)\
+            .all()
+        return [g.para_dicionario() for g in grupos]
+
+    def get_agrupamentos_falha(self, usuario: Usuario, id_projeto: Optional[int] = None,
+                               termo: Optional[str] = None, limite: int = 50) -> List[Dict]:
+        """
+        Causas de falha somadas entre os ciclos dos projetos visíveis ao
+        usuário, opcionalmente restritas a um projeto e/ou às assinaturas que
+        correspondem a uma busca textual (índice FTS 'falhas_busca').
+        """
+        logger.debug("Serviço: agrupamentos de falha (projeto=%s, termo=%s)", id_projeto, termo)
+
+        total = func.sum(FalhaPorCiclo.quantidade).label('total_falhas')
+        consulta = (
+            select(
+                AssinaturaFalha.id_assinatura, AssinaturaFalha.assinatura, AssinaturaFalha.exemplo_mensagem,
+                total,
+                func.count(func.distinct(FalhaPorCiclo.id_homologacao)).label('ciclos'),
+                func.count(func.distinct(Homologacao.id_projeto)).label('projetos'),
+                func.max(FalhaPorCiclo.id_homologacao).label('id_ultima_homologacao'),
+            )
+            .join(FalhaPorCiclo, FalhaPorCiclo.id_assinatura == AssinaturaFalha.id_assinatura)
+            .join(Homologacao, Homologacao.id_homologacao == FalhaPorCiclo.id_homologacao)
+            .join(Projeto, Projeto.id_projeto == Homologacao.id_projeto)
+            .where(Permissions.filtro_projetos_visiveis(usuario))
+            .group_by(AssinaturaFalha.id_assinatura)
+            .order_by(total.desc(), AssinaturaFalha.id_assinatura)
+            .limit(limite)
+        )
+        if id_projeto is not None:
+            consulta = consulta.where(Homologacao.id_projeto == id_projeto)
+        if termo is not None:
+            consulta_fts = montar_consulta_fts(termo)
+            if not consulta_fts:
+                return []
+            consulta = consulta.where(AssinaturaFalha.id_assinatura.in_(
+                select(_busca_falhas.c.rowid)
+                .where(literal_column(TABELA_BUSCA_FALHAS).op('MATCH')(consulta_fts))
+            ))
+
+        return [
+            {
+                "id_assinatura": linha.id_assinatura,
+                "assinatura": linha.assinatura,
+                "exemplo_mensagem": linha.exemplo_mensagem,
+                "total_falhas": linha.total_falhas,
+                "ciclos": linha.ciclos,
+                "projetos": linha.projetos,
+                "id_ultima_homologacao": linha.id_ultima_homologacao,
+            }
+            for linha in self.session.execute(consulta)
+        ]
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Tuple
+
+from sqlalchemy import func, select
+
+from models import Area, ObjetivoEstrategico, Projeto, Usuario
+from security import Permissions
+from utils.table_versions import ler_versoes
+from .alteracoes_service import cursor_alteracoes
+from .projeto_service import BaseService, projetos_ativos_do_responsavel, projetos_visiveis
+from .tarefa_service import tarefas_abertas_do_usuario
+
+logger = logging.getLogger(__name__)
+
+SECOES_BOOTSTRAP = ('usuario', 'projetos', 'minhas_tarefas', 'meus_projetos', 'contagem_status', 'versoes')
+
+# Tabelas lidas ao serializar um projeto (responsável, área, histórico, equipe...)
+_TABELAS_PROJETO = ('projetos', 'projeto_equipe', 'projeto_objetivo', 'status_logs', 'homologacoes',
+                    'tarefas', 'usuarios', 'areas', 'objetivos_estrategicos')
+_TABELAS_LOOKUP = ('usuarios', 'areas', 'objetivos_estrategicos')
+
+_AUSENTE = object()
+
+
+class CacheSecoes:
+    """
+    Cache LRU das seções do bootstrap, com prazo de validade.
+
+    Cada entrada guarda a versão das tabelas de que depende (utils.table_versions)
+    e é descartada quando alguma delas muda, em qualquer processo. O prazo só
+    limita por quanto tempo uma seção pouco pedida ocupa memória.
+    """
+
+    def __init__(self, capacidade: int = 256, ttl: float = 30.0):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._entradas: "OrderedDict[Tuple, Tuple[float, Tuple, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave: Tuple, versao: Tuple):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return _AUSENTE
+            expira_em, versao_guardada, valor = entrada
+            if versao_guardada != versao or expira_em < time.monotonic():
+                del self._entradas[chave]
+                self.falhas += 1
+                return _AUSENTE
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def guardar(self, chave: Tuple, versao: Tuple, valor):
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + self.ttl, versao, valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+secoes_bootstrap = CacheSecoes()
+
+
+def _escopo_visibilidade(usuario: Usuario) -> str:
+    # Admins e Gerentes veem o mesmo conjunto de projetos e compartilham a entrada
+    return 'todos' if usuario.role in ['Admin', 'Gerente'] else f'usuario:{usuario.id_usuario}'
+
+
+def _hash(dados) -> str:
+    return hashlib.sha1(json.dumps(dados, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+class BootstrapService(BaseService):
+    """
+    Dados da primeira tela do usuário, compostos em uma única sessão.
+    """
+
+    def get_bootstrap(self, usuario: Usuario, secoes: Iterable[str] = SECOES_BOOTSTRAP) -> Dict:
+        """
+        Monta as seções pedidas (na ordem de SECOES_BOOTSTRAP), mais o 'cursor'
+        a partir do qual o cliente acompanha as alterações em /api/changes.
+
+        Raises:
+            ValueError: Se alguma seção for desconhecida
+        """
+        secoes = set(secoes)
+        desconhecidas = secoes - set(SECOES_BOOTSTRAP)
+        if desconhecidas:
+            raise ValueError(f"Seções desconhecidas: {', '.join(sorted(desconhecidas))}.")
+        logger.debug("Serviço: bootstrap do usuário ID %s (%s)", usuario.id_usuario, ', '.join(sorted(secoes)))
+
+        construtores = {
+            'projetos': (_escopo_visibilidade(usuario), _TABELAS_PROJETO,
+                         lambda: projetos_visiveis(self.session, usuario)),
+            'minhas_tarefas': (usuario.id_usuario, ('tarefas', 'projetos', 'usuarios'),
+                               lambda: tarefas_abertas_do_usuario(self.session, usuario.id_usuario)),
+            'meus_projetos': (usuario.id_usuario, _TABELAS_PROJETO,
+                              lambda: projetos_ativos_do_responsavel(self.session, usuario.id_usuario)),
+            'contagem_status': (_escopo_visibilidade(usuario), ('projetos',),
+                                lambda: self._contagem_status(usuario)),
+            'versoes': (None, _TABELAS_LOOKUP, self._versoes_lookups),
+        }
+
+        # O cursor do registro de alterações é lido antes dos dados; cada seção
+        # guarda o cursor da sua montagem e a resposta usa o mais antigo, para
+        # que o cliente que sincronizar a partir dele não perca nenhuma alteração
+        cursor = cursor_alteracoes(self.session)
+        # As versões também são lidas antes dos dados: uma escrita no meio da
+        # montagem deixa a entrada com a versão antiga e ela é refeita depois
+        versoes = ler_versoes(self.session, {t for s, (_, tabelas, _) in construtores.items() if s in secoes for t in tabelas})
+        resultado = {}
+        for secao in SECOES_BOOTSTRAP:
+            if secao not in secoes:
+                continue
+            if secao == 'usuario':
+                resultado[secao] = usuario.para_dicionario()
+            else:
+                cursor_secao, resultado[secao] = self._em_cache(secao, cursor, versoes, *construtores[secao])
+                cursor = min(cursor, cursor_secao)
+        resultado['cursor'] = cursor
+        return resultado
+
+    @staticmethod
+    def _em_cache(secao: str, cursor: int, versoes: Dict[str, int], escopo, tabelas: Tuple[str, ...],
+                  construir: Callable):
+        chave, versao = (secao, escopo), tuple(versoes[tabela] for tabela in tabelas)
+        entrada = secoes_bootstrap.obter(chave, versao)
+        if entrada is _AUSENTE:
+            entrada = (cursor, construir())
+            secoes_bootstrap.guardar(chave, versao, entrada)
+        return entrada
+
+    def _contagem_status(self, usuario: Usuario) -> Dict[str, int]:
+        return dict(self.session.execute(
+            select(Projeto.status_atual, func.count())
+            .where(Permissions.filtro_projetos_visiveis(usuario))
+            .group_by(Projeto.status_atual)
+        ).all())
+
+    def _versoes_lookups(self) -> Dict[str, str]:
+        """
+        Hash do conteúdo de cada lista auxiliar (/usuarios, /areas, /objetivos),
+        para o cliente saber se a cópia que guardou ainda vale.
+        """
+        return {
+            'usuarios': _hash([u.para_dicionario() for u in self.session.query(Usuario).order_by(Usuario.id_usuario)]),
+            'areas': _hash([a.para_dicionario() for a in self.session.query(Area).order_by(Area.id_area)]),
+            'objetivos': _hash([o.para_dicionario() for o in
+                                self.session.query(ObjetivoEstrategico).order_by(ObjetivoEstrategico.id_objetivo)]),
+        }
@@ -0,0 +1,113 @@
+import html
+import logging
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, literal_column, select, table, column
+
+from models import Projeto, Usuario
+from data_sources.busca_projetos import TABELA_BUSCA
+from security import Permissions
+from .projeto_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+# Marcadores do highlight()/snippet(); trocados por <mark> depois de escapar o HTML
+_INICIO_DESTAQUE, _FIM_DESTAQUE = '\ue000', '\ue001'
+
+# Pesos do bm25 por coluna: nome > topdesk > pessoas/área > descrição
+_PESOS_BM25 = (10.0, 1.0, 5.0, 2.0)
+
+_busca = table(TABELA_BUSCA, column('rowid'))
+
+
+def montar_consulta_fts(termo: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma expressão MATCH segura: cada palavra vira
+    um termo entre aspas com busca por prefixo, combinados com AND implícito.
+    Operadores e aspas digitados pelo usuário não são interpretados.
+    """
+    palavras = re.findall(r'\w+', termo or '')
+    if not palavras:
+        return None
+    return ' '.join(f'"{p}"*' for p in palavras)
+
+
+def _destacar(texto: Optional[str]) -> Optional[str]:
+    if texto is None:
+        return None
+    return html.escape(texto).replace(_INICIO_DESTAQUE, '<mark>').replace(_FIM_DESTAQUE, '</mark>')
+
+
+class BuscaService(BaseService):
+    """
+    Busca textual de projetos sobre o índice FTS5 'projetos_busca'.
+    """
+
+    def buscar_projetos(self, termo: str, usuario: Usuario, limite: int = 20, offset: int = 0,
+                        status: Optional[str] = None) -> Dict:
+        """
+        Retorna os projetos visíveis ao usuário que correspondem ao termo,
+        ordenados por relevância (bm25), com trechos destacados.
+
+        Returns:
+            Dicionário com 'resultados', 'total', 'limite' e 'offset'
+        """
+        logger.debug("Serviço: busca de projetos por '%s'", termo)
+
+        consulta_fts = montar_consulta_fts(termo)
+        if not consulta_fts:
+            return {"resultados": [], "total": 0, "limite": limite, "offset": offset}
+
+        tabela = literal_column(TABELA_BUSCA)
+        filtros = [
+            tabela.op('MATCH')(consulta_fts),
+            Permissions.filtro_projetos_visiveis(usuario),
+        ]
+        if status:
+            filtros.append(Projeto.status_atual == status)
+
+        base = select(Projeto.id_projeto).join(_busca, _busca.c.rowid == Projeto.id_projeto).where(*filtros)
+        total = self.session.execute(select(func.count()).select_from(base.subquery())).scalar()
+
+        relevancia = func.bm25(tabela, *_PESOS_BM25).label('relevancia')
+        linhas = self.session.execute(
+            select(
+                Projeto.id_projeto, Projeto.nome_projeto, Projeto.descricao, Projeto.numero_topdesk,
+                Projeto.status_atual, Projeto.prioridade, Projeto.risco, Projeto.complexidade,
+                Projeto.data_fim_prevista, Projeto.data_fim_real,
+                Usuario.nome_completo.label('nome_responsavel'),
+                func.highlight(tabela, 0, _INICIO_DESTAQUE, _FIM_DESTAQUE).label('nome_destacado'),
+                func.snippet(tabela, -1, _INICIO_DESTAQUE, _FIM_DESTAQUE, '…', 16).label('trecho'),
+                relevancia,
+            )
+            .join(_busca, _busca.c.rowid == Projeto.id_projeto)
+            .outerjoin(Usuario, Usuario.id_usuario == Projeto.id_responsavel)
+            .where(*filtros)
+            .order_by(relevancia, Projeto.id_projeto)
+            .limit(limite)
+            .offset(offset)
+        )
+
+        resultados: List[Dict] = [
+            {
+                "id_projeto": linha.id_projeto,
+                "nome_projeto": linha.nome_projeto,
+                "descricao": linha.descricao,
+                "numero_topdesk": linha.numero_topdesk,
+                "status_atual": linha.status_atual,
+                "prioridade": linha.prioridade,
+                "risco": linha.risco,
+                "complexidade": linha.complexidade,
+                "data_fim_prevista": linha.data_fim_prevista,
+                "data_fim_real": linha.data_fim_real,
+                "responsavel": {"nome_completo": linha.nome_responsavel} if linha.nome_responsavel else None,
+                "destaques": {
+                    "nome_projeto": _destacar(linha.nome_destacado),
+                    "trecho": _destacar(linha.trecho),
+                },
+                "relevancia": round(-linha.relevancia, 4),
+            }
+            for linha in linhas
+        ]
+        return {"resultados": resultados, "total": total, "limite": limite, "offset": offset}
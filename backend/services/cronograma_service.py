@@ -0,0 +1,249 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, select, update
+
+from models import Alteracao, DependenciaTarefa, Tarefa
+from utils.task_graph import (
+    CicloDependenciasError, DependenciaInvalidaError, GrafoTarefas,
+    formatar_dependencias, para_data, para_ordinal
+)
+from .projeto_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+
+class CacheCronogramas:
+    """
+    Cache LRU e thread-safe do grafo e do caminho crítico de cada projeto,
+    usado apenas nas leituras.
+
+    Cada entrada guarda a versão do cronograma (ver versao_cronograma) com que
+    foi calculada e só vale enquanto ela for a atual: escritas feitas por
+    outro processo invalidam a entrada daqui sem precisar avisá-lo. O
+    TarefaService ainda descarta a entrada local a cada escrita.
+    """
+
+    def __init__(self, capacidade: int = 128):
+        self.capacidade = capacidade
+        self._entradas: "OrderedDict[int, Tuple[int, GrafoTarefas, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, id_projeto: int, versao: Optional[int] = None) -> Optional[Tuple[GrafoTarefas, Dict]]:
+        """Grafo e análise em cache, ou None se não houver ou se a versão for outra."""
+        with self._lock:
+            entrada = self._entradas.get(id_projeto)
+            if entrada is not None and versao is not None and entrada[0] != versao:
+                del self._entradas[id_projeto]
+                entrada = None
+            if entrada is not None:
+                self._entradas.move_to_end(id_projeto)
+                self.acertos += 1
+                return entrada[1:]
+            self.falhas += 1
+            return None
+
+    def guardar(self, id_projeto: int, versao: int, grafo: GrafoTarefas, analise: Dict):
+        with self._lock:
+            self._entradas[id_projeto] = (versao, grafo, analise)
+            self._entradas.move_to_end(id_projeto)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, id_projeto: int):
+        with self._lock:
+            self._entradas.pop(id_projeto, None)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+cronogramas = CacheCronogramas()
+
+
+def periodo_da_tarefa(data_inicio: str, data_fim: str) -> Tuple[int, int]:
+    """
+    Converte as datas da tarefa em ordinais, validando o período.
+
+    Raises:
+        DependenciaInvalidaError: Se as datas forem inválidas ou o fim for anterior ao início
+    """
+    try:
+        inicio, fim = para_ordinal(data_inicio), para_ordinal(data_fim)
+    except (TypeError, ValueError):
+        raise DependenciaInvalidaError(f"Datas inválidas: '{data_inicio}' a '{data_fim}' (use AAAA-MM-DD).")
+    if fim < inicio:
+        raise DependenciaInvalidaError("A data de fim da tarefa não pode ser anterior à de início.")
+    return inicio, fim
+
+
+def montar_grafo(session, id_projeto: int) -> GrafoTarefas:
+    """Lê as tarefas e as arestas do projeto (uma consulta cada) e monta o grafo."""
+    periodos = {}
+    for id_tarefa, data_inicio, data_fim in session.execute(
+        select(Tarefa.id_tarefa, Tarefa.data_inicio, Tarefa.data_fim).where(Tarefa.id_projeto == id_projeto)
+    ):
+        try:
+            periodos[id_tarefa] = periodo_da_tarefa(data_inicio, data_fim)
+        except DependenciaInvalidaError:
+            logger.warning("Tarefa %s ignorada no cronograma: período inválido.", id_tarefa)
+
+    arestas = session.execute(
+        select(DependenciaTarefa.id_predecessora, DependenciaTarefa.id_tarefa)
+        .where(DependenciaTarefa.id_projeto == id_projeto)
+    ).all()
+    return GrafoTarefas(periodos, arestas)
+
+
+def versao_cronograma(session, id_projeto: int) -> int:
+    """
+    Versão do cronograma do projeto: o id da alteração mais recente em suas
+    tarefas. Os triggers do registro de alterações gravam uma linha a cada
+    escrita em tarefas (datas, dependências, exclusões), em qualquer processo,
+    e o id nunca é reutilizado.
+    """
+    return session.scalar(
+        select(func.coalesce(func.max(Alteracao.id_alteracao), 0))
+        .where(Alteracao.id_projeto == id_projeto, Alteracao.entidade == 'tarefa')
+    )
+
+
+def obter_grafo(session, id_projeto: int) -> Tuple[GrafoTarefas, Dict]:
+    """Grafo e caminho crítico do projeto, calculados apenas em caso de falta no cache."""
+    # A versão é lida antes do grafo: se uma escrita entrar no meio, a entrada
+    # fica com a versão antiga e é recalculada na próxima leitura
+    versao = versao_cronograma(session, id_projeto)
+    entrada = cronogramas.obter(id_projeto, versao)
+    if entrada is None:
+        grafo = montar_grafo(session, id_projeto)
+        entrada = (grafo, grafo.caminho_critico())
+        cronogramas.guardar(id_projeto, versao, *entrada)
+    return entrada
+
+
+def invalidar_cronograma(session, id_projeto: int):
+    """
+    Descarta o cronograma em cache do projeto agora e novamente após o commit.
+    A versão já impede que a entrada antiga seja usada; isto só libera a
+    memória mais cedo.
+    """
+    cronogramas.invalidar(id_projeto)
+    event.listen(session, 'after_commit', lambda _: cronogramas.invalidar(id_projeto), once=True)
+
+
+def sincronizar_dependencias(session, tarefa: Tarefa, ids_predecessoras: List[int]):
+    """
+    Valida as predecessoras da tarefa (existentes, do mesmo projeto e sem
+    formar ciclo) e regrava as arestas e o texto canônico de 'dependencias'.
+
+    Raises:
+        DependenciaInvalidaError: Se alguma predecessora for inválida
+        CicloDependenciasError: Se as dependências fecharem um ciclo
+    """
+    if ids_predecessoras:
+        do_projeto = set(session.scalars(
+            select(Tarefa.id_tarefa)
+            .where(Tarefa.id_projeto == tarefa.id_projeto, Tarefa.id_tarefa.in_(ids_predecessoras))
+        ))
+        desconhecidas = [i for i in ids_predecessoras if i not in do_projeto]
+        if desconhecidas:
+            raise DependenciaInvalidaError(
+                f"Tarefas predecessoras inexistentes neste projeto: {formatar_dependencias(desconhecidas)}."
+            )
+        # O grafo vem do banco, dentro da transação da escrita: o cache pode
+        # estar defasado em relação a outro processo
+        ciclo = montar_grafo(session, tarefa.id_projeto).criaria_ciclo(tarefa.id_tarefa, ids_predecessoras)
+        if ciclo:
+            raise CicloDependenciasError(ciclo)
+
+    session.query(DependenciaTarefa).filter_by(id_tarefa=tarefa.id_tarefa).delete(synchronize_session=False)
+    session.add_all([
+        DependenciaTarefa(id_predecessora=p, id_tarefa=tarefa.id_tarefa, id_projeto=tarefa.id_projeto)
+        for p in ids_predecessoras
+    ])
+    tarefa.dependencias = formatar_dependencias(ids_predecessoras)
+
+
+def reprogramar_sucessoras(session, tarefa: Tarefa, grafo: Optional[GrafoTarefas] = None) -> List[int]:
+    """
+    Empurra as sucessoras da tarefa para depois do seu novo término,
+    preservando as durações.
+
+    Args:
+        grafo: Grafo já montado na transação; por padrão é lido do banco
+
+    Returns:
+        Ids das sucessoras reprogramadas
+    """
+    grafo = grafo or montar_grafo(session, tarefa.id_projeto)
+    if tarefa.id_tarefa not in grafo.periodos:
+        return []
+    novos = grafo.propagar(tarefa.id_tarefa, *periodo_da_tarefa(tarefa.data_inicio, tarefa.data_fim))
+    novos.pop(tarefa.id_tarefa)
+    if novos:
+        session.execute(update(Tarefa), [
+            {"id_tarefa": id_tarefa, "data_inicio": para_data(inicio), "data_fim": para_data(fim)}
+            for id_tarefa, (inicio, fim) in novos.items()
+        ])
+    return sorted(novos)
+
+
+def remover_das_dependencias(session, id_tarefa: int):
+    """Apaga as arestas da tarefa e a retira do texto de dependências das sucessoras."""
+    ids_sucessoras = session.scalars(
+        select(DependenciaTarefa.id_tarefa).where(DependenciaTarefa.id_predecessora == id_tarefa)
+    ).all()
+    session.query(DependenciaTarefa).filter(
+        (DependenciaTarefa.id_tarefa == id_tarefa) | (DependenciaTarefa.id_predecessora == id_tarefa)
+    ).delete(synchronize_session=False)
+    for sucessora in session.query(Tarefa).filter(Tarefa.id_tarefa.in_(ids_sucessoras)):
+        restantes = session.scalars(
+            select(DependenciaTarefa.id_predecessora)
+            .where(DependenciaTarefa.id_tarefa == sucessora.id_tarefa)
+            .order_by(DependenciaTarefa.id_predecessora)
+        ).all()
+        sucessora.dependencias = formatar_dependencias(restantes)
+
+
+def _datas(ordinais: List[int]) -> List[str]:
+    return [para_data(o) for o in ordinais]
+
+
+class CronogramaService(BaseService):
+    """
+    Análise do grafo de dependências das tarefas de um projeto.
+    """
+
+    def get_cronograma(self, id_projeto: int) -> Dict:
+        """
+        Caminho crítico e folgas das tarefas do projeto.
+
+        Returns:
+            Dicionário com 'inicio', 'fim', 'duracao_dias', 'caminho_critico'
+            e o bloco colunar 'tarefas' (na ordem topológica)
+        """
+        logger.debug("Serviço: calculando cronograma do projeto ID %s", id_projeto)
+        _, analise = obter_grafo(self.session, id_projeto)
+        return {
+            "id_projeto": id_projeto,
+            "inicio": para_data(analise['inicio']) if analise['inicio'] else None,
+            "fim": para_data(analise['fim']) if analise['fim'] else None,
+            "duracao_dias": analise['fim'] - analise['inicio'] + 1 if analise['inicio'] else 0,
+            "caminho_critico": analise['caminho_critico'],
+            "tarefas": {
+                "ids": analise['ids'],
+                "inicio_cedo": _datas(analise['inicio_cedo']),
+                "fim_cedo": _datas(analise['fim_cedo']),
+                "inicio_tarde": _datas(analise['inicio_tarde']),
+                "fim_tarde": _datas(analise['fim_tarde']),
+                "folga": analise['folga'],
+            },
+        }
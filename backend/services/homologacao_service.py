@@ -1,24 +1,56 @@
+import base64
+import json
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 import datetime
-import os
-from sqlalchemy.orm import joinedload
+from sqlalchemy import event, func, tuple_
+from sqlalchemy.orm import joinedload, contains_eager
 
 from extensions import db
-from models import Projeto, Homologacao, Usuario, TesteExecutado
+from models import Projeto, Homologacao, Usuario, TesteExecutado, DefinicaoTeste, RelatorioArmazenado
+from models.teste_executado_model import STATUS_TESTE, codificar_status
 from .projeto_service import BaseService
-from parsers import parse_allure_zip
+from .ingestao_testes import gravar_testes_do_ciclo
+from utils import content_store
+from utils.lazy_import import sob_demanda
+from utils.metrics import duracao_parse_relatorio, uploads_relatorio
+from utils.pubsub import barramento_eventos
 
 logger = logging.getLogger(__name__)
 
+# O parser (xml.etree, leitores de Allure/JUnit) só é importado no primeiro upload
+parsers = sob_demanda('parsers')
+
+
+def parse_relatorio(caminho_arquivo: str) -> Dict:
+    with duracao_parse_relatorio.cronometrar():
+        return parsers.parse_relatorio(caminho_arquivo)
+
+
+def _codificar_cursor(status_codigo: int, nome_teste: str, id_execucao: int) -> str:
+    """Cursor opaco com a posição do último teste da página."""
+    dados = json.dumps([status_codigo, nome_teste, id_execucao], separators=(',', ':'))
+    return base64.urlsafe_b64encode(dados.encode('utf-8')).decode('ascii')
+
+
+def _decodificar_cursor(cursor: str):
+    try:
+        status_codigo, nome_teste, id_execucao = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return int(status_codigo), str(nome_teste), int(id_execucao)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Cursor de paginação inválido.")
+
 
 class HomologacaoService(BaseService):
     """
     Encapsula a lógica de negócio para os ciclos de homologação.
+
+    Início e fim de ciclo e o andamento do processamento de relatórios são
+    notificados no canal de eventos ('homologacao' e 'ingestao').
     """
     def iniciar_ciclo(self, id_projeto: int, dados_inicio: Dict) -> Dict:
         """Inicia um novo ciclo de homologação para um projeto."""
-        logger.info(f"Serviço: iniciar_ciclo para projeto ID {id_projeto}")
+        logger.debug("Serviço: iniciar_ciclo para projeto ID %s", id_projeto)
 
         projeto = self.session.query(Projeto).get(id_projeto)
         if not projeto:
@@ -36,12 +68,14 @@ class HomologacaoService(BaseService):
             **dados_inicio
         )
         self.session.add(novo_ciclo)
+        self.session.flush()
+        self._notificar(projeto, 'homologacao', acao='iniciado', id_homologacao=novo_ciclo.id_homologacao)
 
         return projeto.para_dicionario()
 
     def finalizar_ciclo(self, id_projeto: int, dados_fim: Dict) -> Dict:
         """Finaliza o ciclo de homologação mais recente de um projeto."""
-        logger.info(f"Serviço: finalizar_ciclo para projeto ID {id_projeto} com dados: {dados_fim}")
+        logger.debug("Serviço: finalizar_ciclo para projeto ID %s (%s)", id_projeto, ', '.join(sorted(dados_fim)))
 
         projeto = self.session.query(Projeto).get(id_projeto)
         if not projeto or projeto.status_atual != "Em Homologação":
@@ -82,6 +116,8 @@ class HomologacaoService(BaseService):
             id_usuario=dados_fim['id_usuario'],
             observacao=f"Fim do ciclo de homologação. Resultado: {resultado_final}."
         )
+        self._notificar(projeto, 'homologacao', acao='finalizado',
+                        id_homologacao=ciclo_ativo.id_homologacao, resultado=resultado_final)
         
         return {
             "projeto": projeto.para_dicionario(),
@@ -89,23 +125,71 @@ class HomologacaoService(BaseService):
         }
         
     # --- NOVO MÉTODO ADICIONADO ---
-    def get_testes_por_ciclo(self, id_homologacao: int) -> List[Dict]:
-        """Busca todos os testes executados de um ciclo de homologação específico."""
-        logger.info(f"Serviço: buscando testes para o ciclo de homologação ID {id_homologacao}")
-        
-        testes = self.session.query(TesteExecutado)\
-            .filter_by(id_homologacao=id_homologacao)\
-            .order_by(TesteExecutado.status.asc(), TesteExecutado.nome_teste.asc())\
-            .all()
-            
-        return [t.para_dicionario() for t in testes]
+    def get_testes_por_ciclo(self, id_homologacao: int, status: Optional[List[str]] = None,
+                             feature: Optional[str] = None, severity: Optional[str] = None,
+                             texto: Optional[str] = None, id_assinatura: Optional[int] = None,
+                             limite: int = 100, cursor: Optional[str] = None) -> Dict:
+        """
+        Busca uma página dos testes executados de um ciclo, ordenados por
+        status e nome.
+
+        A paginação é por cursor (keyset): o cursor guarda (status, nome, id)
+        do último item entregue e a próxima página continua a partir dele,
+        sem OFFSET, com custo constante mesmo no fim de suítes grandes.
+
+        Returns:
+            Dicionário com 'testes', 'total' (após os filtros) e 'proximo_cursor'
+        """
+        logger.debug("Serviço: buscando testes para o ciclo de homologação ID %s", id_homologacao)
+
+        filtros = [TesteExecutado.id_homologacao == id_homologacao]
+        if status:
+            invalidos = [s for s in status if s.lower() not in STATUS_TESTE]
+            if invalidos:
+                raise ValueError(f"Status inválido: {', '.join(invalidos)}.")
+            filtros.append(TesteExecutado.status_codigo.in_({codificar_status(s) for s in status}))
+        if feature:
+            filtros.append(DefinicaoTeste.feature == feature)
+        if severity:
+            filtros.append(DefinicaoTeste.severity == severity)
+        if texto:
+            filtros.append(DefinicaoTeste.nome_teste.contains(texto, autoescape=True))
+        if id_assinatura is not None:
+            filtros.append(TesteExecutado.id_assinatura == id_assinatura)
+
+        total = self.session.query(func.count(TesteExecutado.id_execucao))\
+            .join(TesteExecutado.definicao)\
+            .filter(*filtros)\
+            .scalar()
+
+        ordem = (TesteExecutado.status_codigo, DefinicaoTeste.nome_teste, TesteExecutado.id_execucao)
+        consulta = self.session.query(TesteExecutado)\
+            .join(TesteExecutado.definicao)\
+            .options(contains_eager(TesteExecutado.definicao))\
+            .filter(*filtros)
+        if cursor:
+            consulta = consulta.filter(tuple_(*ordem) > tuple_(*_decodificar_cursor(cursor)))
+        # Busca um item a mais para saber se existe próxima página
+        testes = consulta.order_by(*ordem).limit(limite + 1).all()
+
+        proximo_cursor = None
+        if len(testes) > limite:
+            testes = testes[:limite]
+            ultimo = testes[-1]
+            proximo_cursor = _codificar_cursor(ultimo.status_codigo, ultimo.definicao.nome_teste, ultimo.id_execucao)
+
+        return {
+            "testes": [t.para_dicionario() for t in testes],
+            "total": total,
+            "proximo_cursor": proximo_cursor,
+        }
 
     # --- NOVO MÉTODO PARA O DASHBOARD DE QA ---
     def get_relatorio_qa_geral(self) -> Dict:
         """
         Busca e processa dados de todos os ciclos de homologação para o dashboard de QA.
         """
-        logger.info("Serviço: gerando relatório geral de QA")
+        logger.debug("Serviço: gerando relatório geral de QA")
         
         # Busca todos os ciclos finalizados, carregando o projeto relacionado
         ciclos_finalizados = self.session.query(Homologacao)\
@@ -148,56 +232,178 @@ class HomologacaoService(BaseService):
     # --- NOVO MÉTODO ÚNICO E UNIFICADO ---
     def processar_upload_de_relatorio(self, id_homologacao: int, file_stream, upload_folder: str) -> Dict:
         """
-        Salva o arquivo ZIP, o processa, extrai as métricas e os detalhes dos testes,
-        e atualiza o registro do ciclo de homologação no banco de dados.
+        Salva o relatório (endereçado pelo SHA-256 do conteúdo), o processa,
+        extrai as métricas e os detalhes dos testes, e atualiza o registro do
+        ciclo de homologação no banco de dados.
+
+        Aceita Allure (.zip) e JUnit (.xml ou .zip de .xml); o formato é
+        detectado pelo conteúdo, assim como a extensão do arquivo gravado.
+
+        Se um arquivo idêntico já foi enviado antes, o resultado do parsing
+        guardado em cache é reaproveitado e nenhum byte extra é gravado em disco.
         """
-        logger.info(f"Serviço: processando upload para homologação ID {id_homologacao}")
+        logger.debug("Serviço: processando upload para homologação ID %s", id_homologacao)
         
         ciclo = self.session.query(Homologacao).get(id_homologacao)
         if not ciclo:
             raise ValueError(f"Ciclo de homologação com ID {id_homologacao} não encontrado.")
 
-        # 1. Organiza e salva o arquivo
-        project_folder = os.path.join(upload_folder, str(ciclo.id_projeto))
-        os.makedirs(project_folder, exist_ok=True)
-        novo_filename = f"{id_homologacao}.zip"
-        caminho_arquivo = os.path.join(project_folder, novo_filename)
-        file_stream.save(caminho_arquivo)
-        ciclo.caminho_relatorio_zip = caminho_arquivo
-        logger.info(f"Arquivo salvo em: {caminho_arquivo}")
-
-        # 2. Processa o arquivo salvo
-        try:
-            dados_allure = parse_allure_zip(caminho_arquivo)
-            metricas = dados_allure['metricas']
-            testes_detalhados = dados_allure['testes']
-
-            # 3. Atualiza o ciclo com as métricas
-            ciclo.total_testes = metricas.get('total_testes')
-            ciclo.testes_aprovados = metricas.get('testes_aprovados')
-            ciclo.testes_reprovados = metricas.get('testes_reprovados')
-            ciclo.testes_bloqueados = metricas.get('testes_bloqueados')
-
-            if ciclo.total_testes and ciclo.total_testes > 0 and ciclo.testes_aprovados is not None:
-                ciclo.taxa_sucesso = (ciclo.testes_aprovados / ciclo.total_testes) * 100
-            else:
-                ciclo.taxa_sucesso = 0.0
-            
-            # 4. Atualiza os detalhes dos testes
-            ciclo.testes_executados.clear()
+        caminho_anterior = ciclo.caminho_relatorio_zip
+        # O andamento é publicado na hora; só a conclusão espera o commit
+        self._notificar(ciclo.projeto, 'ingestao', imediato=True,
+                        id_homologacao=id_homologacao, etapa='processando')
+
+        # 1. Salva o arquivo calculando o hash durante a gravação
+        objeto = content_store.salvar_stream(file_stream, upload_folder)
+        if objeto.novo:
+            descartar_objeto_se_desfeito(self.session, objeto.caminho)
+        relatorio = self.session.get(RelatorioArmazenado, objeto.sha256)
+        if relatorio and objeto.novo and relatorio.caminho_arquivo != objeto.caminho:
+            # Mesmo conteúdo já guardado em outro caminho (extensão antiga): a cópia sobra
+            _remover_sem_referencia([objeto.caminho])
+
+        # 2. Reaproveita o parsing em cache ou processa o arquivo salvo
+        if relatorio and relatorio.possui_cache():
+            logger.info("Relatório %s já processado; reutilizando cache.", objeto.sha256)
+            dados_allure = relatorio.carregar_resultado()
+            uploads_relatorio.inc(resultado='cache')
+        else:
+            try:
+                dados_allure = parse_relatorio(objeto.caminho)
+            except ValueError as e:
+                # O rollback da sessão remove o arquivo inválido, se foi gravado agora
+                self._notificar(ciclo.projeto, 'ingestao', imediato=True,
+                                id_homologacao=id_homologacao, etapa='falhou', motivo=str(e))
+                uploads_relatorio.inc(resultado='invalido')
+                raise
+            uploads_relatorio.inc(resultado='processado')
+
+            if not relatorio:
+                relatorio = RelatorioArmazenado(
+                    sha256=objeto.sha256,
+                    caminho_arquivo=objeto.caminho,
+                    tamanho_bytes=objeto.tamanho_bytes
+                )
+                self.session.add(relatorio)
+            relatorio.salvar_resultado(dados_allure)
+
+        ciclo.caminho_relatorio_zip = relatorio.caminho_arquivo
+        metricas = dados_allure['metricas']
+        testes_detalhados = dados_allure['testes']
+
+        # 3. Atualiza o ciclo com as métricas
+        ciclo.total_testes = metricas.get('total_testes')
+        ciclo.testes_aprovados = metricas.get('testes_aprovados')
+        ciclo.testes_reprovados = metricas.get('testes_reprovados')
+        ciclo.testes_bloqueados = metricas.get('testes_bloqueados')
+
+        if ciclo.total_testes and ciclo.total_testes > 0 and ciclo.testes_aprovados is not None:
+            ciclo.taxa_sucesso = (ciclo.testes_aprovados / ciclo.total_testes) * 100
+        else:
+            ciclo.taxa_sucesso = 0.0
+        
+        # 4. Atualiza os detalhes dos testes (dimensão + fato, em lote)
+        self.session.flush()
+        gravar_testes_do_ciclo(self.session, id_homologacao, testes_detalhados)
+        self.session.expire(ciclo, ['testes_executados'])
+
+        # 5. O relatório anterior pode ter ficado sem referências
+        if caminho_anterior and caminho_anterior != ciclo.caminho_relatorio_zip:
             self.session.flush()
-            for teste_data in testes_detalhados:
-                novo_teste = TesteExecutado(**teste_data)
-                ciclo.testes_executados.append(novo_teste)
-            
-            logger.info(f"{len(testes_detalhados)} testes processados para o ciclo {id_homologacao}.")
-            return ciclo.para_dicionario()
+            self.liberar_relatorios([caminho_anterior])
+        
+        logger.info("%s testes processados para o ciclo %s.", len(testes_detalhados), id_homologacao)
+        self._notificar(ciclo.projeto, 'ingestao', id_homologacao=id_homologacao, etapa='concluido',
+                        total_testes=ciclo.total_testes, taxa_sucesso=ciclo.taxa_sucesso)
+        return ciclo.para_dicionario()
+
+    def _notificar(self, projeto: Projeto, tipo: str, imediato: bool = False, **dados):
+        """Publica um evento do projeto no canal de eventos (por padrão, após o commit)."""
+        evento = {"id_projeto": projeto.id_projeto, "responsaveis": [projeto.id_responsavel], **dados}
+        if imediato:
+            barramento_eventos.publicar(tipo, **evento)
+        else:
+            barramento_eventos.publicar_apos_commit(self.session, tipo, **evento)
+
+    def liberar_relatorios(self, caminhos: List[str]) -> int:
+        return liberar_relatorios_sem_referencia(self.session, caminhos)
+
+
+# --- CONTAGEM DE REFERÊNCIAS DOS RELATÓRIOS ARMAZENADOS ---
+# Funções de módulo para que outros serviços (ex: exclusão de projeto) possam
+# liberar relatórios usando a própria sessão.
+
+def contar_referencias_relatorio(session, caminho: str) -> int:
+    """Quantos ciclos de homologação apontam para o arquivo informado."""
+    return session.query(func.count(Homologacao.id_homologacao))\
+        .filter(Homologacao.caminho_relatorio_zip == caminho)\
+        .scalar()
+
+
+def _ainda_sem_referencia(caminhos: List[str]) -> List[str]:
+    """
+    Reconfere, em uma sessão nova (que já enxerga os commits de outras
+    requisições), quais arquivos continuam sem ciclo e sem cache de parsing.
+    Um upload concorrente dos mesmos bytes pode ter passado a usá-los.
+    """
+    session = db.get_session()
+    try:
+        em_uso = {c for (c,) in session.query(Homologacao.caminho_relatorio_zip)
+                  .filter(Homologacao.caminho_relatorio_zip.in_(caminhos))}
+        em_uso.update(c for (c,) in session.query(RelatorioArmazenado.caminho_arquivo)
+                      .filter(RelatorioArmazenado.caminho_arquivo.in_(caminhos)))
+    finally:
+        session.close()
+    return [c for c in caminhos if c not in em_uso]
+
+
+def _remover_sem_referencia(caminhos: List[str]):
+    for caminho in _ainda_sem_referencia(caminhos):
+        content_store.remover_arquivo(caminho)
+
+
+def descartar_objeto_se_desfeito(session, caminho: str):
+    """
+    Remove um arquivo recém-gravado no armazenamento se a transação que o
+    referenciaria for desfeita (parser, ingestão ou commit com erro). Sem
+    isso o arquivo ficaria em disco sem linha nem ciclo que o liberasse.
+    """
+    resolvido = False
+
+    def _apos_rollback(sessao):
+        nonlocal resolvido
+        if not resolvido:
+            resolvido = True
+            _remover_sem_referencia([caminho])
+
+    def _apos_commit(sessao):
+        nonlocal resolvido
+        resolvido = True
+
+    event.listen(session, 'after_rollback', _apos_rollback, once=True)
+    event.listen(session, 'after_commit', _apos_commit, once=True)
+
+
+def liberar_relatorios_sem_referencia(session, caminhos: List[str]) -> int:
+    """
+    Remove os arquivos (e o cache de parsing) que não são mais referenciados
+    por nenhum ciclo. A remoção em disco só acontece depois do commit, para
+    que um rollback nunca deixe um ciclo apontando para um arquivo apagado,
+    e as referências são contadas de novo nessa hora.
+
+    Returns:
+        Quantidade de arquivos agendados para remoção
+    """
+    sem_referencia = [c for c in set(caminhos) if c and contar_referencias_relatorio(session, c) == 0]
+    if not sem_referencia:
+        return 0
+
+    session.query(RelatorioArmazenado)\
+        .filter(RelatorioArmazenado.caminho_arquivo.in_(sem_referencia))\
+        .delete(synchronize_session=False)
 
-        except ValueError as e:
-            # Se o parser falhar, deleta o arquivo inválido
-            if os.path.exists(caminho_arquivo):
-                os.remove(caminho_arquivo)
-            ciclo.caminho_relatorio_zip = None
-            raise e
+    def _remover_apos_commit(sessao_commitada):
+        _remover_sem_referencia(sem_referencia)
 
-    
\ No newline at end of file
+    event.listen(session, 'after_commit', _remover_apos_commit, once=True)
+    return len(sem_referencia)
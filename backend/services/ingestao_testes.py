@@ -0,0 +1,300 @@
+# backend/services/ingestao_testes.py
+"""
+Gravação dos testes executados de um ciclo no modelo normalizado
+(dimensão 'definicoes_teste' + fato 'testes_executados'), manutenção
+incremental das estatísticas por teste ('estatisticas_teste') e agrupamento
+das falhas por assinatura ('assinaturas_falha' + 'falhas_por_ciclo').
+
+As operações são feitas com INSERT/DELETE em lote, sem instanciar um objeto
+ORM por teste, o que mantém a ingestão de suítes grandes rápida.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+
+from models.homologacao_model import Homologacao
+from models.falha_model import AssinaturaFalha, FalhaPorCiclo
+from models.teste_executado_model import (
+    DefinicaoTeste, TesteExecutado, EstatisticaTeste, CODIGO_STATUS, CODIGOS_REPROVADOS,
+    codificar_status, comprimir_mensagem
+)
+from utils.failure_signature import normalizar_mensagem, hash_assinatura
+
+logger = logging.getLogger(__name__)
+
+# Limite seguro de parâmetros por consulta "IN (...)" no SQLite
+TAMANHO_LOTE = 500
+
+
+def chave_identidade(teste: Dict) -> str:
+    """Identidade estável de um teste entre ciclos: historyId > fullName > nome."""
+    return teste.get('history_id') or teste.get('full_name') or teste.get('nome_teste') or teste.get('uuid')
+
+
+def _em_lotes(itens: List, tamanho: int = TAMANHO_LOTE) -> Iterable[List]:
+    for i in range(0, len(itens), tamanho):
+        yield itens[i:i + tamanho]
+
+
+def resolver_definicoes(session, testes_por_chave: Dict[str, Dict]) -> Dict[str, int]:
+    """
+    Retorna o id da definição de cada chave, criando as que ainda não existem.
+
+    Args:
+        session: Sessão do banco
+        testes_por_chave: Dicionário chave_identidade -> dados do teste (saída do parser)
+
+    Returns:
+        Dicionário chave_identidade -> id_definicao
+    """
+    chaves = list(testes_por_chave)
+    ids: Dict[str, int] = {}
+    for lote in _em_lotes(chaves):
+        linhas = session.execute(
+            select(DefinicaoTeste.chave_identidade, DefinicaoTeste.id_definicao)
+            .where(DefinicaoTeste.chave_identidade.in_(lote))
+        )
+        ids.update(dict(linhas.all()))
+
+    novas = [
+        {
+            "chave_identidade": chave,
+            "nome_teste": teste.get('nome_teste') or chave,
+            "full_name": teste.get('full_name'),
+            "feature": teste.get('feature'),
+            "severity": teste.get('severity'),
+        }
+        for chave, teste in testes_por_chave.items() if chave not in ids
+    ]
+    if novas:
+        session.execute(insert(DefinicaoTeste), novas)
+        for lote in _em_lotes([n['chave_identidade'] for n in novas]):
+            linhas = session.execute(
+                select(DefinicaoTeste.chave_identidade, DefinicaoTeste.id_definicao)
+                .where(DefinicaoTeste.chave_identidade.in_(lote))
+            )
+            ids.update(dict(linhas.all()))
+        logger.info("%d novas definições de teste criadas.", len(novas))
+    return ids
+
+
+def assinatura_da_falha(status_codigo: int, mensagem: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(hash, assinatura) da falha, ou None se o teste não reprovou ou não tem mensagem."""
+    if status_codigo not in CODIGOS_REPROVADOS:
+        return None
+    assinatura = normalizar_mensagem(mensagem)
+    if not assinatura:
+        return None
+    return hash_assinatura(assinatura), assinatura
+
+
+def resolver_assinaturas(session, novas: Dict[str, Tuple[str, str]]) -> Dict[str, int]:
+    """
+    Retorna o id de cada assinatura, criando as que ainda não existem.
+
+    Args:
+        novas: Dicionário hash -> (assinatura, mensagem de exemplo)
+
+    Returns:
+        Dicionário hash -> id_assinatura
+    """
+    hashes = list(novas)
+    ids: Dict[str, int] = {}
+    for lote in _em_lotes(hashes):
+        linhas = session.execute(
+            select(AssinaturaFalha.hash_assinatura, AssinaturaFalha.id_assinatura)
+            .where(AssinaturaFalha.hash_assinatura.in_(lote))
+        )
+        ids.update(dict(linhas.all()))
+
+    inserir = [
+        {"hash_assinatura": h, "assinatura": assinatura, "exemplo_mensagem": exemplo}
+        for h, (assinatura, exemplo) in novas.items() if h not in ids
+    ]
+    if inserir:
+        session.execute(insert(AssinaturaFalha), inserir)
+        for lote in _em_lotes([i['hash_assinatura'] for i in inserir]):
+            linhas = session.execute(
+                select(AssinaturaFalha.hash_assinatura, AssinaturaFalha.id_assinatura)
+                .where(AssinaturaFalha.hash_assinatura.in_(lote))
+            )
+            ids.update(dict(linhas.all()))
+        logger.info("%d novas assinaturas de falha criadas.", len(inserir))
+    return ids
+
+
+def gravar_falhas_do_ciclo(session, id_homologacao: int, ids_assinatura: Iterable[Optional[int]]):
+    """Regrava o agrupamento de falhas do ciclo a partir das assinaturas de suas execuções."""
+    session.execute(delete(FalhaPorCiclo).where(FalhaPorCiclo.id_homologacao == id_homologacao))
+    contagem = Counter(i for i in ids_assinatura if i is not None)
+    if contagem:
+        session.execute(insert(FalhaPorCiclo), [
+            {"id_homologacao": id_homologacao, "id_assinatura": id_assinatura, "quantidade": quantidade}
+            for id_assinatura, quantidade in contagem.items()
+        ])
+
+
+def gravar_testes_do_ciclo(session, id_homologacao: int, testes: List[Dict]) -> int:
+    """
+    Substitui os testes executados de um ciclo pelos testes informados.
+
+    Resultados repetidos do mesmo teste no ciclo (retentativas do Allure)
+    são reduzidos a um só; prevalece o último encontrado.
+
+    Returns:
+        Quantidade de execuções gravadas
+    """
+    testes_por_chave: Dict[str, Dict] = {}
+    for teste in testes:
+        chave = chave_identidade(teste)
+        if chave:
+            testes_por_chave[chave] = teste
+
+    ids_definicao = resolver_definicoes(session, testes_por_chave)
+
+    assinaturas_por_chave = {}
+    novas_assinaturas: Dict[str, Tuple[str, str]] = {}
+    for chave, teste in testes_por_chave.items():
+        resultado = assinatura_da_falha(codificar_status(teste.get('status')), teste.get('mensagem_erro'))
+        if resultado:
+            h, assinatura = resultado
+            assinaturas_por_chave[chave] = h
+            novas_assinaturas.setdefault(h, (assinatura, teste.get('mensagem_erro')))
+    ids_assinatura = resolver_assinaturas(session, novas_assinaturas) if novas_assinaturas else {}
+
+    session.execute(delete(TesteExecutado).where(TesteExecutado.id_homologacao == id_homologacao))
+    execucoes = [
+        {
+            "id_homologacao": id_homologacao,
+            "id_definicao": ids_definicao[chave],
+            "status_codigo": codificar_status(teste.get('status')),
+            "mensagem_erro_comprimida": comprimir_mensagem(teste.get('mensagem_erro')),
+            "id_assinatura": ids_assinatura.get(assinaturas_por_chave.get(chave)),
+        }
+        for chave, teste in testes_por_chave.items()
+    ]
+    if execucoes:
+        session.execute(insert(TesteExecutado), execucoes)
+    gravar_falhas_do_ciclo(session, id_homologacao, (e['id_assinatura'] for e in execucoes))
+
+    id_projeto = session.execute(
+        select(Homologacao.id_projeto).where(Homologacao.id_homologacao == id_homologacao)
+    ).scalar()
+    if id_projeto is not None:
+        atualizar_estatisticas(
+            session, id_projeto, id_homologacao,
+            {e['id_definicao']: e['status_codigo'] for e in execucoes}
+        )
+    return len(execucoes)
+
+
+# --- ESTATÍSTICAS INCREMENTAIS POR TESTE ---
+
+CODIGO_APROVADO = CODIGO_STATUS['passed']
+CODIGO_REPROVADO = CODIGO_STATUS['failed']
+
+_CAMPOS_ESTATISTICA = (
+    'execucoes', 'aprovacoes', 'reprovacoes', 'transicoes',
+    'ultimo_resultado_codigo', 'id_ultima_homologacao', 'score_instabilidade'
+)
+
+
+def _nova_estatistica(id_projeto: int, id_definicao: int) -> Dict:
+    return {
+        "id_projeto": id_projeto, "id_definicao": id_definicao,
+        "execucoes": 0, "aprovacoes": 0, "reprovacoes": 0, "transicoes": 0,
+        "ultimo_resultado_codigo": None, "id_ultima_homologacao": 0, "score_instabilidade": 0.0,
+    }
+
+
+def _acumular(estatistica: Dict, status_codigo: int, id_homologacao: int):
+    """Soma uma execução às estatísticas. Só aprovado/reprovado contam como troca."""
+    estatistica['execucoes'] += 1
+    if status_codigo == CODIGO_APROVADO:
+        resultado = CODIGO_APROVADO
+        estatistica['aprovacoes'] += 1
+    elif status_codigo in CODIGOS_REPROVADOS:
+        resultado = CODIGO_REPROVADO
+        estatistica['reprovacoes'] += 1
+    else:
+        resultado = None
+
+    if resultado is not None:
+        anterior = estatistica['ultimo_resultado_codigo']
+        if anterior is not None and anterior != resultado:
+            estatistica['transicoes'] += 1
+        estatistica['ultimo_resultado_codigo'] = resultado
+
+    conclusivas = estatistica['aprovacoes'] + estatistica['reprovacoes']
+    estatistica['score_instabilidade'] = (
+        estatistica['transicoes'] / (conclusivas - 1) if conclusivas > 1 else 0.0
+    )
+    estatistica['id_ultima_homologacao'] = id_homologacao
+
+
+def _gravar_estatisticas(session, estatisticas: Iterable[Dict]):
+    linhas = list(estatisticas)
+    if linhas:
+        session.execute(insert(EstatisticaTeste).prefix_with('OR REPLACE'), linhas)
+
+
+def atualizar_estatisticas(session, id_projeto: int, id_homologacao: int, execucoes: Dict[int, int]):
+    """
+    Incorpora as execuções de um ciclo às estatísticas do projeto.
+
+    O caminho incremental só é válido quando o ciclo é mais novo que todos os
+    já contabilizados. Se o ciclo já foi contado (reenvio de relatório) ou é
+    anterior a outro ciclo contado, as estatísticas do projeto são recalculadas.
+
+    Args:
+        execucoes: Dicionário id_definicao -> status_codigo do ciclo
+    """
+    ja_contabilizado = session.execute(
+        select(EstatisticaTeste.id_definicao)
+        .where(EstatisticaTeste.id_projeto == id_projeto)
+        .where(EstatisticaTeste.id_ultima_homologacao >= id_homologacao)
+        .limit(1)
+    ).first()
+    if ja_contabilizado:
+        recalcular_estatisticas_projeto(session, id_projeto)
+        return
+
+    existentes: Dict[int, Dict] = {}
+    for lote in _em_lotes(list(execucoes)):
+        linhas = session.execute(
+            select(EstatisticaTeste.id_definicao, *[getattr(EstatisticaTeste, c) for c in _CAMPOS_ESTATISTICA])
+            .where(EstatisticaTeste.id_projeto == id_projeto)
+            .where(EstatisticaTeste.id_definicao.in_(lote))
+        )
+        for linha in linhas:
+            estatistica = _nova_estatistica(id_projeto, linha[0])
+            estatistica.update(zip(_CAMPOS_ESTATISTICA, linha[1:]))
+            existentes[linha[0]] = estatistica
+
+    for id_definicao, status_codigo in execucoes.items():
+        estatistica = existentes.setdefault(id_definicao, _nova_estatistica(id_projeto, id_definicao))
+        _acumular(estatistica, status_codigo, id_homologacao)
+
+    _gravar_estatisticas(session, existentes.values())
+
+
+def recalcular_estatisticas_projeto(session, id_projeto: int):
+    """Recalcula do zero as estatísticas de todos os testes de um projeto."""
+    logger.info("Recalculando estatísticas de testes do projeto %d.", id_projeto)
+    session.execute(delete(EstatisticaTeste).where(EstatisticaTeste.id_projeto == id_projeto))
+
+    linhas = session.execute(
+        select(TesteExecutado.id_definicao, TesteExecutado.status_codigo, TesteExecutado.id_homologacao)
+        .join(Homologacao, Homologacao.id_homologacao == TesteExecutado.id_homologacao)
+        .where(Homologacao.id_projeto == id_projeto)
+        .order_by(TesteExecutado.id_homologacao)
+    )
+    estatisticas: Dict[int, Dict] = {}
+    for id_definicao, status_codigo, id_homologacao in linhas:
+        estatistica = estatisticas.setdefault(id_definicao, _nova_estatistica(id_projeto, id_definicao))
+        _acumular(estatistica, status_codigo, id_homologacao)
+
+    _gravar_estatisticas(session, estatisticas.values())
@@ -0,0 +1,116 @@
+import logging
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from models import Homologacao, Usuario
+from security import Permissions
+from .analise_testes_service import AnaliseTestesService
+from .homologacao_service import HomologacaoService
+from .projeto_service import ProjetoService
+from .tarefa_service import TarefaService
+
+logger = logging.getLogger(__name__)
+
+
+class ErroLeitura(Exception):
+    """Leitura recusada; 'status' é o código HTTP da resposta."""
+
+    def __init__(self, status: int, mensagem: str = ""):
+        self.status = status
+        super().__init__(mensagem)
+
+
+# --- LEITURAS COMPARTILHADAS ENTRE O SERVIDOR WSGI (routes.py) E O ASGI (asgi.py) ---
+# Cada leitura recebe o usuário autenticado, os parâmetros da query string
+# (qualquer Mapping com .get) e os parâmetros do caminho, e devolve os dados
+# já serializáveis em JSON. Não dependem de contexto de requisição do Flask.
+
+def _inteiro(params: Mapping, nome: str, padrao: Optional[int] = None) -> Optional[int]:
+    """Mesmo comportamento de request.args.get(nome, padrao, type=int)."""
+    try:
+        return int(params.get(nome))
+    except (TypeError, ValueError):
+        return padrao
+
+
+def _exigir_usuario(usuario: Optional[Usuario]) -> Usuario:
+    if not usuario:
+        raise ErroLeitura(401, "Usuário não encontrado a partir do token.")
+    return usuario
+
+
+def listar_projetos(usuario: Usuario, params: Mapping) -> list:
+    with ProjetoService() as service:
+        return service.get_all_for_user(usuario)
+
+
+def minhas_tarefas(usuario: Usuario, params: Mapping) -> list:
+    usuario = _exigir_usuario(usuario)
+    with TarefaService() as service:
+        return service.get_tarefas_por_usuario(usuario.id_usuario)
+
+
+def meus_projetos(usuario: Usuario, params: Mapping) -> list:
+    usuario = _exigir_usuario(usuario)
+    with ProjetoService() as service:
+        return service.get_projetos_por_responsavel(usuario.id_usuario)
+
+
+def relatorio_portfolio(usuario: Usuario, params: Mapping) -> list:
+    with ProjetoService() as service:
+        return service.get_relatorio_portfolio(usuario)
+
+
+def relatorio_qa(usuario: Usuario, params: Mapping) -> Dict:
+    # Apenas Admins e Gerentes podem ver os relatórios completos de QA
+    if not Permissions.pode_ver_relatorios_completos(usuario):
+        raise ErroLeitura(403, "Você não tem permissão para acessar os relatórios de qualidade.")
+    with HomologacaoService() as service:
+        return service.get_relatorio_qa_geral()
+
+
+def agrupamentos_falha(usuario: Usuario, params: Mapping) -> list:
+    limite = min(max(_inteiro(params, 'limite', 50), 1), 500)
+    with AnaliseTestesService() as service:
+        return service.get_agrupamentos_falha(
+            usuario,
+            id_projeto=_inteiro(params, 'id_projeto'),
+            termo=params.get('q'),
+            limite=limite
+        )
+
+
+def testes_do_ciclo(usuario: Usuario, params: Mapping, id_homologacao: int) -> Dict:
+    status = [s.strip() for s in params.get('status', '').split(',') if s.strip()]
+    limite = min(max(_inteiro(params, 'limite', 100), 1), 1000)
+
+    with HomologacaoService() as service:
+        ciclo = service.session.get(Homologacao, id_homologacao)
+        if not ciclo:
+            raise ErroLeitura(404, "Ciclo de homologação não encontrado.")
+        if not Permissions.pode_ver_projeto(usuario, ciclo.projeto):
+            raise ErroLeitura(403, "Você não tem permissão para ver este projeto.")
+        try:
+            return service.get_testes_por_ciclo(
+                id_homologacao,
+                status=status,
+                feature=params.get('feature'),
+                severity=params.get('severity'),
+                texto=params.get('q'),
+                id_assinatura=_inteiro(params, 'assinatura'),
+                limite=limite,
+                cursor=params.get('cursor'),
+            )
+        except ValueError as e:
+            raise ErroLeitura(400, str(e))
+
+
+# Caminho (sintaxe do Starlette) e leitura de cada endpoint servido também pelo asgi.py
+LEITURAS: Tuple[Tuple[str, Callable], ...] = (
+    ("/api/projetos", listar_projetos),
+    ("/api/me/tarefas", minhas_tarefas),
+    ("/api/me/projetos", meus_projetos),
+    ("/api/relatorios/portfolio", relatorio_portfolio),
+    ("/api/relatorios/qa", relatorio_qa),
+    ("/api/relatorios/qa/falhas", agrupamentos_falha),
+    ("/api/homologacoes/{id_homologacao:int}/testes", testes_do_ciclo),
+)
@@ -1,13 +1,17 @@
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 import datetime
 
 from extensions import db
-from models import Projeto, StatusLog, Usuario, ObjetivoEstrategico
+from models import Projeto, StatusLog, Usuario, ObjetivoEstrategico, EstatisticaTeste, DependenciaTarefa
 from models.usuario_model import Usuario
-from data_sources.sqlite_source import get_all_projetos, get_projeto_by_id
+from data_sources.sqlite_source import colecoes_do_projeto, get_all_projetos, get_projeto_by_id
+from models.projeto_model import STATUS_CICLICOS, erro_transicao
+from security import Permissions
+from sqlalchemy import case, insert, select, update
 from sqlalchemy.orm import joinedload
 from utils.database import get_db_session, with_db_session, DatabaseManager
+from utils.pubsub import barramento_eventos
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +25,7 @@ class BaseService:
     def __init__(self):
         # Não abre sessão no __init__ mais, usa context managers
         self.session = None
-        logger.debug(f"BaseService {self.__class__.__name__} inicializado")
+        logger.debug("BaseService %s inicializado", self.__class__.__name__)
 
     def __enter__(self):
         # Usa o DatabaseManager para gestão automática
@@ -60,7 +64,7 @@ class ProjetoService(BaseService):
         Refatorado para usar o novo sistema de gestão de sessões.
         """
         def _generate_portfolio(session):
-            logger.info(f"Serviço: get_relatorio_portfolio para o usuário ID {usuario.id_usuario}")
+            logger.debug("Serviço: get_relatorio_portfolio para o usuário ID %s", usuario.id_usuario)
             
             objetivos = session.query(ObjetivoEstrategico).filter_by(status='Ativo').all()
             
@@ -108,22 +112,16 @@ class ProjetoService(BaseService):
         Busca todos os projetos, aplicando as regras de permissão.
         Este método utiliza a sessão gerenciada pelo contexto do serviço (with ProjetoService() as service:).
         """
-        logger.info(f"Serviço: get_all_for_user para o usuário ID {usuario.id_usuario} ({usuario.role})")
+        logger.debug("Serviço: get_all_for_user para o usuário ID %s (%s)", usuario.id_usuario, usuario.role)
         
         # Utiliza a sessão da instância do serviço, que é gerenciada pelo context manager
-        todos_projetos = get_all_projetos(self.session)
-
-        if usuario.role in ['Admin', 'Gerente']:
-            projetos_visiveis = todos_projetos
-        else:
-            projetos_visiveis = [p for p in todos_projetos if p.id_responsavel == usuario.id_usuario]
-
-        logger.info(f"Retornando {len(projetos_visiveis)} projetos visíveis para o usuário.")
-        return [p.para_dicionario() for p in projetos_visiveis]
+        projetos = projetos_visiveis(self.session, usuario)
+        logger.debug("Retornando %s projetos visíveis para o usuário.", len(projetos))
+        return projetos
 
     def get_by_id(self, id_projeto: int) -> Dict | None:
         """Busca um projeto por ID."""
-        logger.info(f"Serviço: get_by_id para o ID: {id_projeto}")
+        logger.debug("Serviço: get_by_id para o ID: %s", id_projeto)
         session = db.get_session()
         try:
             projeto = get_projeto_by_id(session, id_projeto)
@@ -135,7 +133,7 @@ class ProjetoService(BaseService):
         """
         Cria um novo projeto completo, construindo o objeto de forma explícita e segura.
         """
-        logger.info(f"Serviço: criar_projeto chamado por {usuario_logado.email}")
+        logger.debug("Serviço: criar_projeto chamado por %s", usuario_logado.email)
         session = db.get_session()
         try:
             # 1. Lógica de permissão (já correta)
@@ -195,7 +193,7 @@ class ProjetoService(BaseService):
             return projeto_final.para_dicionario()
 
         except Exception as e:
-            logger.error(f"Erro no serviço 'criar_projeto': {e}", exc_info=True)
+            logger.error("Erro no serviço 'criar_projeto': %s", e, exc_info=True)
             session.rollback()
             raise e
         finally:
@@ -203,7 +201,7 @@ class ProjetoService(BaseService):
 
     def atualizar_status(self, id_projeto: int, novo_status: str, id_usuario: int, observacao: str) -> Dict:
         """Atualiza o status de um projeto."""
-        logger.info(f"Serviço: atualizar_status para o projeto ID {id_projeto}")
+        logger.debug("Serviço: atualizar_status para o projeto ID %s", id_projeto)
         session = db.get_session()
         try:
             projeto = get_projeto_by_id(session, id_projeto)
@@ -221,15 +219,93 @@ class ProjetoService(BaseService):
             projeto_atualizado = get_projeto_by_id(session, id_projeto)
             return projeto_atualizado.para_dicionario()
         except Exception as e:
-            logger.error(f"Erro no serviço 'atualizar_status': {e}", exc_info=True)
+            logger.error("Erro no serviço 'atualizar_status': %s", e, exc_info=True)
             session.rollback()
             raise e
         finally:
             session.close()
 
+    def aplicar_lote(self, usuario: Usuario, ids: List[int], novo_status: Optional[str] = None,
+                     observacao: str = "", dados: Optional[Dict] = None) -> Dict:
+        """
+        Muda o status e/ou edita vários projetos de uma vez (usa o contexto da BaseService).
+
+        A permissão e o histórico de cada projeto são verificados em uma consulta
+        para todo o lote; os projetos aceitos são gravados com um único UPDATE e um
+        INSERT em lote dos logs de status, confirmados em um só commit. Projetos
+        inexistentes, sem permissão ou com transição inválida ficam de fora.
+
+        Returns:
+            Dicionário com 'aplicados' (ids) e 'falhas' ([{id_projeto, motivo}])
+        """
+        ids = list(dict.fromkeys(ids))
+        logger.debug("Serviço: aplicar_lote em %s projeto(s), status=%r", len(ids), novo_status)
+
+        encontrados = {
+            linha.id_projeto: linha for linha in self.session.execute(
+                select(Projeto.id_projeto, Projeto.id_responsavel, Projeto.status_atual,
+                       case((Permissions.filtro_projetos_editaveis(usuario), True), else_=False).label('permitido'))
+                .where(Projeto.id_projeto.in_(ids))
+            )
+        }
+        permitidos = {id_projeto: linha.permitido for id_projeto, linha in encontrados.items()}
+
+        ja_visitados = set()
+        if novo_status is not None and novo_status not in STATUS_CICLICOS:
+            ja_visitados = set(self.session.scalars(
+                select(StatusLog.id_projeto).distinct()
+                .where(StatusLog.id_projeto.in_([i for i, ok in permitidos.items() if ok]),
+                       StatusLog.status == novo_status)
+            ))
+
+        aplicados, falhas = [], []
+        for id_projeto in ids:
+            if id_projeto not in permitidos:
+                motivo = "Projeto não encontrado."
+            elif not permitidos[id_projeto]:
+                motivo = "Você não tem permissão para alterar este projeto."
+            elif novo_status is not None:
+                motivo = erro_transicao(novo_status, (novo_status,) if id_projeto in ja_visitados else ())
+            else:
+                motivo = None
+            if motivo:
+                falhas.append({"id_projeto": id_projeto, "motivo": motivo})
+            else:
+                aplicados.append(id_projeto)
+
+        if aplicados:
+            valores = dict(dados or {})
+            agora = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            if novo_status is not None:
+                valores['status_atual'] = novo_status
+                # Mesma regra de Projeto.mudar_status
+                if novo_status == "Projeto concluído":
+                    valores['data_fim_real'] = agora
+            self.session.execute(
+                update(Projeto).where(Projeto.id_projeto.in_(aplicados)).values(**valores),
+                execution_options={"synchronize_session": False}
+            )
+            if novo_status is not None:
+                self.session.execute(insert(StatusLog), [
+                    {"id_projeto": id_projeto, "status": novo_status, "data": agora,
+                     "id_usuario": usuario.id_usuario, "observacao": observacao}
+                    for id_projeto in aplicados
+                ])
+                # Mesmo evento de Projeto.mudar_status, para cada projeto do lote
+                novo_responsavel = valores.get('id_responsavel')
+                for id_projeto in aplicados:
+                    linha = encontrados[id_projeto]
+                    barramento_eventos.publicar_apos_commit(
+                        self.session, 'status_projeto', id_projeto=id_projeto,
+                        responsaveis=sorted({linha.id_responsavel, novo_responsavel or linha.id_responsavel}),
+                        status=novo_status, status_anterior=linha.status_atual
+                    )
+
+        return {"aplicados": aplicados, "falhas": falhas}
+
     def editar_projeto(self, id_projeto: int, dados_atualizacao: Dict) -> Dict:
         """Edita um projeto existente (este método usa o contexto da BaseService)."""
-        logger.info(f"Serviço: editar_projeto para o projeto ID {id_projeto}")
+        logger.debug("Serviço: editar_projeto para o projeto ID %s", id_projeto)
 
         # Este método depende da sessão aberta pelo __init__ da BaseService
         projeto = get_projeto_by_id(self.session, id_projeto)
@@ -255,7 +331,7 @@ class ProjetoService(BaseService):
             except (ValueError, TypeError):
                 # Mantém o valor original ou define um padrão se a conversão falhar
                 dados_atualizacao.pop('custo_estimado') 
-                logger.warning(f"Não foi possível converter 'custo_estimado' para float. O campo não será atualizado.")
+                logger.warning("Não foi possível converter 'custo_estimado' para float. O campo não será atualizado.")
 
 
         # Atualiza os outros campos
@@ -271,18 +347,30 @@ class ProjetoService(BaseService):
 
     def deletar_projeto(self, id_projeto: int) -> bool:
         """Deleta um projeto existente."""
-        logger.info(f"Serviço 'deletar_projeto' chamado para o projeto ID {id_projeto}.")
+        logger.debug("Serviço 'deletar_projeto' chamado para o projeto ID %s.", id_projeto)
+        # Imports locais: esses serviços dependem deste módulo (BaseService)
+        from services.homologacao_service import liberar_relatorios_sem_referencia
+        from services.cronograma_service import cronogramas
+
         session = db.get_session()
         try:
             projeto = get_projeto_by_id(session, id_projeto)
             if not projeto:
                 raise ValueError(f"Tentativa de deletar projeto inexistente com ID {id_projeto}.")
 
+            # Os relatórios dos ciclos podem ser compartilhados com outros projetos
+            caminhos_relatorios = [c.caminho_relatorio_zip for c in projeto.ciclos_homologacao]
+
+            session.query(EstatisticaTeste).filter_by(id_projeto=id_projeto).delete(synchronize_session=False)
+            session.query(DependenciaTarefa).filter_by(id_projeto=id_projeto).delete(synchronize_session=False)
             session.delete(projeto)
+            session.flush()
+            liberar_relatorios_sem_referencia(session, caminhos_relatorios)
             session.commit()
+            cronogramas.invalidar(id_projeto)
             return True
         except Exception as e:
-            logger.error(f"Erro no serviço 'deletar_projeto': {e}", exc_info=True)
+            logger.error("Erro no serviço 'deletar_projeto': %s", e, exc_info=True)
             session.rollback()
             raise e
         finally:
@@ -293,17 +381,32 @@ class ProjetoService(BaseService):
         """
         Busca todos os projetos ativos onde um usuário específico é o responsável.
         """
-        logger.info(f"Serviço: buscando projetos onde o usuário ID {id_usuario} é responsável.")
-        
-        # Status que indicam que um projeto não está mais "ativo"
-        status_finalizados = ["Pós GMUD", "Projeto concluído", "Cancelado"]
-        
-        # Filtra os projetos pelo ID do responsável e que não estejam em um status final
-        projetos = self.session.query(Projeto)\
-            .options(joinedload(Projeto.responsavel), joinedload(Projeto.area_solicitante))\
-            .filter(Projeto.id_responsavel == id_usuario)\
-            .filter(Projeto.status_atual.notin_(status_finalizados))\
-            .order_by(Projeto.data_fim_prevista.asc())\
-            .all()
-            
-        return [p.para_dicionario() for p in projetos]          
+        logger.debug("Serviço: buscando projetos onde o usuário ID %s é responsável.", id_usuario)
+        return projetos_ativos_do_responsavel(self.session, id_usuario)
+
+
+def projetos_visiveis(session, usuario: Usuario) -> List[Dict]:
+    """Todos os projetos que o usuário pode ver, já serializados."""
+    todos_projetos = get_all_projetos(session)
+
+    if usuario.role in ['Admin', 'Gerente']:
+        visiveis = todos_projetos
+    else:
+        visiveis = [p for p in todos_projetos if p.id_responsavel == usuario.id_usuario]
+    return [p.para_dicionario() for p in visiveis]
+
+
+def projetos_ativos_do_responsavel(session, id_usuario: int) -> List[Dict]:
+    """Projetos do responsável que ainda não chegaram a um status final, por prazo."""
+    # Status que indicam que um projeto não está mais "ativo"
+    status_finalizados = ["Pós GMUD", "Projeto concluído", "Cancelado"]
+
+    # Filtra os projetos pelo ID do responsável e que não estejam em um status final
+    projetos = session.query(Projeto)\
+        .options(joinedload(Projeto.responsavel), joinedload(Projeto.area_solicitante), *colecoes_do_projeto())\
+        .filter(Projeto.id_responsavel == id_usuario)\
+        .filter(Projeto.status_atual.notin_(status_finalizados))\
+        .order_by(Projeto.data_fim_prevista.asc())\
+        .all()
+
+    return [p.para_dicionario() for p in projetos]
@@ -1,87 +1,310 @@
 import logging
-from typing import Dict, List
+from typing import Dict, Iterable, List
+from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.orm import joinedload
 
 # Importa a instância 'db' e a BaseService para gerenciamento de sessão
 from extensions import db
 from .projeto_service import BaseService
+from .cronograma_service import (
+    invalidar_cronograma, montar_grafo, periodo_da_tarefa, remover_das_dependencias,
+    reprogramar_sucessoras, sincronizar_dependencias
+)
 
 # Importa os modelos necessários
-from models.tarefa_model import Tarefa
+from models.tarefa_model import Tarefa, DependenciaTarefa
 from models.projeto_model import Projeto
+from utils.pubsub import barramento_eventos
+from utils.task_graph import DependenciaInvalidaError, formatar_dependencias, para_data, parse_dependencias
 
 logger = logging.getLogger(__name__)
 
+
+class LoteInvalidoError(ValueError):
+    """Operações de um lote que não podem ser aplicadas; 'erros' traz o índice de cada uma."""
+
+    def __init__(self, erros: List[Dict]):
+        self.erros = erros
+        super().__init__(f"{len(erros)} operação(ões) do lote inválida(s); nenhuma foi aplicada.")
+
+
 class TarefaService(BaseService):
     """
     Encapsula toda a lógica de negócio para a entidade Tarefa.
     Herda de BaseService para obter o gerenciamento de sessão com 'with'.
+
+    As dependências informadas em texto são validadas e gravadas também no
+    grafo 'dependencias_tarefa' (ver cronograma_service.py); toda escrita
+    invalida o cronograma em cache do projeto e é notificada no canal de
+    eventos ('tarefas_alteradas') após o commit.
     """
 
     def get_tarefas_por_projeto(self, id_projeto: int) -> List[Dict]:
         """Busca todas as tarefas de um projeto específico."""
-        logger.info(f"Serviço: buscando tarefas para o projeto ID {id_projeto}")
+        logger.debug("Serviço: buscando tarefas para o projeto ID %s", id_projeto)
         
         tarefas = self.session.query(Tarefa).filter_by(id_projeto=id_projeto).all()
         return [t.para_dicionario() for t in tarefas]
 
     def criar_tarefa(self, id_projeto: int, dados_tarefa: Dict) -> Dict:
         """Cria uma nova tarefa para um projeto."""
-        logger.info(f"Serviço: criando nova tarefa para o projeto ID {id_projeto}")
+        logger.debug("Serviço: criando nova tarefa para o projeto ID %s", id_projeto)
         
-        projeto = self.session.query(Projeto).get(id_projeto)
+        projeto = self.session.get(Projeto, id_projeto)
         if not projeto:
             raise ValueError(f"Projeto com ID {id_projeto} não encontrado.")
 
+        dados_tarefa = dict(dados_tarefa)
+        ids_predecessoras = parse_dependencias(dados_tarefa.pop('dependencias', None))
+        periodo_da_tarefa(dados_tarefa['data_inicio'], dados_tarefa['data_fim'])
+
         nova_tarefa = Tarefa(id_projeto=id_projeto, **dados_tarefa)
         
         self.session.add(nova_tarefa)
+        self.session.flush()  # Gera o id usado nas arestas do grafo
+        sincronizar_dependencias(self.session, nova_tarefa, ids_predecessoras)
+        invalidar_cronograma(self.session, id_projeto)
+        notificar_tarefas(self.session, id_projeto, criadas=[nova_tarefa.id_tarefa])
         # O commit é feito automaticamente pelo __exit__ da BaseService
         
         return nova_tarefa.para_dicionario()
 
     def atualizar_tarefa(self, id_tarefa: int, dados_atualizacao: Dict) -> Dict:
-        """Atualiza os dados de uma tarefa existente."""
-        logger.info(f"Serviço: atualizando tarefa ID {id_tarefa}")
+        """
+        Atualiza os dados de uma tarefa existente. Se o período mudar, as
+        sucessoras que passariam a começar antes do novo término são empurradas.
+        """
+        logger.debug("Serviço: atualizando tarefa ID %s", id_tarefa)
         
         tarefa = self.session.query(Tarefa).get(id_tarefa)
         if not tarefa:
             raise ValueError(f"Tarefa com ID {id_tarefa} não encontrada.")
 
+        dados_atualizacao = dict(dados_atualizacao)
+        mudou_dependencias = 'dependencias' in dados_atualizacao
+        ids_predecessoras = parse_dependencias(dados_atualizacao.pop('dependencias', None))
+        periodo_anterior = (tarefa.data_inicio, tarefa.data_fim)
+
         for key, value in dados_atualizacao.items():
             if hasattr(tarefa, key):
                 setattr(tarefa, key, value)
-        
+
+        if mudou_dependencias:
+            sincronizar_dependencias(self.session, tarefa, ids_predecessoras)
+
+        reprogramadas = []
+        if (tarefa.data_inicio, tarefa.data_fim) != periodo_anterior:
+            periodo_da_tarefa(tarefa.data_inicio, tarefa.data_fim)
+            self.session.flush()
+            reprogramadas = reprogramar_sucessoras(self.session, tarefa)
+
+        invalidar_cronograma(self.session, tarefa.id_projeto)
+        notificar_tarefas(self.session, tarefa.id_projeto, atualizadas=[tarefa.id_tarefa, *reprogramadas])
         # O commit é feito automaticamente pelo __exit__ da BaseService
-        return tarefa.para_dicionario()
+        return {**tarefa.para_dicionario(), "tarefas_reprogramadas": reprogramadas}
 
     def deletar_tarefa(self, id_tarefa: int) -> bool:
         """Deleta uma tarefa existente."""
-        logger.info(f"Serviço: deletando tarefa ID {id_tarefa}")
+        logger.debug("Serviço: deletando tarefa ID %s", id_tarefa)
         
         tarefa = self.session.query(Tarefa).get(id_tarefa)
         if not tarefa:
             raise ValueError(f"Tarefa com ID {id_tarefa} não encontrada.")
         
+        remover_das_dependencias(self.session, id_tarefa)
+        invalidar_cronograma(self.session, tarefa.id_projeto)
+        notificar_tarefas(self.session, tarefa.id_projeto, excluidas=[id_tarefa])
         self.session.delete(tarefa)
         # O commit é feito automaticamente pelo __exit__
         
         return True
         
+    def aplicar_lote(self, id_projeto: int, operacoes: List[Dict]) -> Dict:
+        """
+        Aplica um lote de operações ('create', 'update', 'delete') sobre as
+        tarefas do projeto em uma única transação, com um comando em massa
+        por tipo de operação. O lote é atômico: qualquer operação inválida
+        (ou um ciclo de dependências no resultado) desfaz todas.
+
+        Args:
+            operacoes: Itens {"op", "id", "dados"}; 'dados' já validado pelos
+                schemas de criação/atualização
+
+        Returns:
+            Dicionário com 'resultados' (um por operação, na ordem recebida)
+            e 'tarefas_reprogramadas' (sucessoras empurradas pelas novas datas)
+
+        Raises:
+            LoteInvalidoError: Se alguma operação for inválida
+            CicloDependenciasError: Se as dependências resultantes formarem um ciclo
+        """
+        logger.debug("Serviço: aplicando lote de %s operações no projeto ID %s", len(operacoes), id_projeto)
+
+        ids_do_projeto = set(self.session.scalars(select(Tarefa.id_tarefa).where(Tarefa.id_projeto == id_projeto)))
+        excluidas = {op['id'] for op in operacoes if op['op'] == 'delete'}
+        erros = []
+        for indice, op in enumerate(operacoes):
+            dados = op['dados'] = dict(op.get('dados') or {})
+            try:
+                if op['op'] != 'create' and op['id'] not in ids_do_projeto:
+                    raise ValueError(f"Tarefa com ID {op['id']} não encontrada neste projeto.")
+                if op['op'] == 'update' and op['id'] in excluidas:
+                    raise ValueError(f"A tarefa {op['id']} é excluída no mesmo lote.")
+                if 'dependencias' in dados:
+                    predecessoras = parse_dependencias(dados.pop('dependencias'))
+                    if predecessoras or op['op'] == 'update':
+                        op['predecessoras'] = predecessoras
+                if op['op'] == 'create':
+                    periodo_da_tarefa(dados['data_inicio'], dados['data_fim'])
+            except ValueError as e:
+                erros.append({"indice": indice, "detail": str(e)})
+        if erros:
+            raise LoteInvalidoError(erros)
+
+        # 1. Exclusões (e as arestas que tocam as tarefas excluídas)
+        sucessoras_afetadas = set()
+        if excluidas:
+            sucessoras_afetadas = set(self.session.scalars(
+                select(DependenciaTarefa.id_tarefa).where(DependenciaTarefa.id_predecessora.in_(excluidas))
+            )) - excluidas
+            self.session.execute(delete(DependenciaTarefa).where(or_(
+                DependenciaTarefa.id_tarefa.in_(excluidas), DependenciaTarefa.id_predecessora.in_(excluidas)
+            )))
+            self.session.execute(delete(Tarefa).where(Tarefa.id_tarefa.in_(excluidas)))
+
+        # 2. Criações: um INSERT em massa. O SQLite atribui os rowids em ordem
+        # crescente às linhas de um mesmo INSERT (a transação tem o único
+        # escritor), então os ids ordenados correspondem à ordem dos parâmetros.
+        criacoes = [op for op in operacoes if op['op'] == 'create']
+        if criacoes:
+            ids_criados = sorted(self.session.scalars(
+                insert(Tarefa).returning(Tarefa.id_tarefa),
+                [{**op['dados'], "id_projeto": id_projeto} for op in criacoes]
+            ).all())
+            for op, id_tarefa in zip(criacoes, ids_criados):
+                op['id'] = id_tarefa
+
+        # 3. Atualizações: as de uma mesma tarefa são combinadas na ordem do lote
+        mudancas: Dict[int, Dict] = {}
+        ultima_operacao: Dict[int, int] = {}
+        for indice, op in enumerate(operacoes):
+            if op['op'] == 'update' and op['dados']:
+                mudancas.setdefault(op['id'], {}).update(op['dados'])
+                ultima_operacao[op['id']] = indice
+
+        com_datas = [t for t, dados in mudancas.items() if {'data_inicio', 'data_fim'} & dados.keys()]
+        movidas = []
+        if com_datas:
+            for id_tarefa, inicio, fim in self.session.execute(
+                select(Tarefa.id_tarefa, Tarefa.data_inicio, Tarefa.data_fim).where(Tarefa.id_tarefa.in_(com_datas))
+            ):
+                novo = (mudancas[id_tarefa].get('data_inicio', inicio), mudancas[id_tarefa].get('data_fim', fim))
+                try:
+                    periodo_da_tarefa(*novo)
+                except DependenciaInvalidaError as e:
+                    erros.append({"indice": ultima_operacao[id_tarefa], "detail": str(e)})
+                if novo != (inicio, fim):
+                    movidas.append(id_tarefa)
+        if mudancas:
+            self.session.execute(update(Tarefa), [{"id_tarefa": t, **dados} for t, dados in mudancas.items()])
+
+        # 4. Dependências: valida contra as tarefas que existem após criações e exclusões
+        validas = (ids_do_projeto - excluidas) | {op['id'] for op in criacoes}
+        novas_dependencias = {}
+        for indice, op in enumerate(operacoes):
+            if 'predecessoras' not in op:
+                continue
+            desconhecidas = [p for p in op['predecessoras'] if p not in validas]
+            if desconhecidas:
+                erros.append({"indice": indice, "detail": "Tarefas predecessoras inexistentes neste projeto: "
+                                                          f"{formatar_dependencias(desconhecidas)}."})
+            novas_dependencias[op['id']] = op['predecessoras']
+        if erros:
+            raise LoteInvalidoError(erros)
+
+        if novas_dependencias:
+            self.session.execute(delete(DependenciaTarefa).where(DependenciaTarefa.id_tarefa.in_(novas_dependencias)))
+            arestas = [
+                {"id_predecessora": p, "id_tarefa": t, "id_projeto": id_projeto}
+                for t, predecessoras in novas_dependencias.items() for p in predecessoras
+            ]
+            if arestas:
+                self.session.execute(insert(DependenciaTarefa), arestas)
+        # O texto das sucessoras de tarefas excluídas é refeito com as arestas restantes
+        restantes = {t: [] for t in sucessoras_afetadas - novas_dependencias.keys()}
+        if restantes:
+            for id_tarefa, id_predecessora in self.session.execute(
+                select(DependenciaTarefa.id_tarefa, DependenciaTarefa.id_predecessora)
+                .where(DependenciaTarefa.id_tarefa.in_(restantes))
+                .order_by(DependenciaTarefa.id_predecessora)
+            ):
+                restantes[id_tarefa].append(id_predecessora)
+        textos = {t: formatar_dependencias(p) for t, p in {**restantes, **novas_dependencias}.items()}
+        if textos:
+            self.session.execute(update(Tarefa), [{"id_tarefa": t, "dependencias": d} for t, d in textos.items()])
+
+        # 5. Um único grafo do resultado: detecta ciclos e empurra as sucessoras das tarefas movidas
+        grafo = montar_grafo(self.session, id_projeto)
+        novos = grafo.propagar_varios({t: grafo.periodos[t] for t in movidas if t in grafo.periodos})
+        reprogramadas = sorted(set(novos) - set(movidas))
+        if reprogramadas:
+            self.session.execute(update(Tarefa), [
+                {"id_tarefa": t, "data_inicio": para_data(novos[t][0]), "data_fim": para_data(novos[t][1])}
+                for t in reprogramadas
+            ])
+        invalidar_cronograma(self.session, id_projeto)
+        notificar_tarefas(
+            self.session, id_projeto,
+            criadas=[op['id'] for op in criacoes],
+            atualizadas=set(mudancas) | set(textos) | set(reprogramadas),
+            excluidas=excluidas,
+        )
+
+        tarefas = {
+            t.id_tarefa: t for t in self.session.query(Tarefa).populate_existing()
+            .filter(Tarefa.id_tarefa.in_([op['id'] for op in operacoes if op['op'] != 'delete']))
+        }
+        resultados = [
+            {"indice": indice, "op": op['op'], "id": op['id'],
+             "tarefa": tarefas[op['id']].para_dicionario() if op['op'] != 'delete' else None}
+            for indice, op in enumerate(operacoes)
+        ]
+        return {"resultados": resultados, "tarefas_reprogramadas": reprogramadas}
+
     def get_tarefas_por_usuario(self, id_usuario: int) -> List[Dict]:
         """
         Busca todas as tarefas abertas de um usuário, incluindo o nome do projeto.
         """
-        logger.info(f"Serviço: buscando tarefas para o usuário ID {id_usuario}")
-        
-        # Envolve a consulta em parênteses para permitir quebras de linha limpas
-        tarefas = (
-            self.session.query(Tarefa)
-            .options(joinedload(Tarefa.projeto)) # Carrega o projeto relacionado
-            .filter(Tarefa.id_responsavel_tarefa == id_usuario)
-            .filter(Tarefa.progresso < 100)
-            .order_by(Tarefa.data_fim.asc())
-            .all()
-        )
-            
-        return [t.para_dicionario() for t in tarefas]
\ No newline at end of file
+        logger.debug("Serviço: buscando tarefas para o usuário ID %s", id_usuario)
+        return tarefas_abertas_do_usuario(self.session, id_usuario)
+
+
+def notificar_tarefas(session, id_projeto: int, criadas: Iterable[int] = (),
+                      atualizadas: Iterable[int] = (), excluidas: Iterable[int] = ()):
+    """
+    Publica no canal de eventos, quando a transação for confirmada, as
+    tarefas do projeto criadas, atualizadas e excluídas.
+    """
+    criadas, excluidas = set(criadas), set(excluidas)
+    projeto = session.get(Projeto, id_projeto)
+    barramento_eventos.publicar_apos_commit(
+        session, 'tarefas_alteradas', id_projeto=id_projeto,
+        responsaveis=[projeto.id_responsavel] if projeto else [],
+        criadas=sorted(criadas), atualizadas=sorted(set(atualizadas) - criadas - excluidas),
+        excluidas=sorted(excluidas),
+    )
+
+
+def tarefas_abertas_do_usuario(session, id_usuario: int) -> List[Dict]:
+    """Tarefas não concluídas do usuário, das mais próximas do prazo às mais distantes."""
+    # Envolve a consulta em parênteses para permitir quebras de linha limpas
+    tarefas = (
+        session.query(Tarefa)
+        .options(joinedload(Tarefa.projeto)) # Carrega o projeto relacionado
+        .filter(Tarefa.id_responsavel_tarefa == id_usuario)
+        .filter(Tarefa.progresso < 100)
+        .order_by(Tarefa.data_fim.asc())
+        .all()
+    )
+
+    return [t.para_dicionario() for t in tarefas]
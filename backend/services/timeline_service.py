@@ -0,0 +1,133 @@
+import datetime
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, func, select
+
+from models import Projeto, Tarefa, Usuario
+from security import Permissions
+from .projeto_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+ENTIDADES_TIMELINE = ('projetos', 'tarefas')
+
+
+def _dia(coluna):
+    """Parte 'AAAA-MM-DD' de uma data ISO armazenada como texto."""
+    return func.substr(coluna, 1, 10)
+
+
+def _validar_data(valor: Optional[str]) -> Optional[str]:
+    if not valor:
+        return None
+    try:
+        return datetime.date.fromisoformat(valor).isoformat()
+    except ValueError:
+        raise ValueError(f"Data inválida: '{valor}' (use AAAA-MM-DD).")
+
+
+def _na_janela(coluna_inicio, coluna_fim, inicio: Optional[str], fim: Optional[str]) -> List:
+    """Condições de sobreposição entre o período [início, fim] e a janela pedida."""
+    condicoes = [coluna_inicio.isnot(None), coluna_fim.isnot(None)]
+    if inicio:
+        condicoes.append(_dia(coluna_fim) >= inicio)
+    if fim:
+        condicoes.append(_dia(coluna_inicio) <= fim)
+    return condicoes
+
+
+def _colunas(linhas: Sequence, nomes: Iterable[str]) -> Dict[str, List]:
+    """Transpõe as linhas da consulta em um vetor por coluna."""
+    nomes = list(nomes)
+    if not linhas:
+        return {nome: [] for nome in nomes}
+    return {nome: list(valores) for nome, valores in zip(nomes, zip(*linhas))}
+
+
+class TimelineService(BaseService):
+    """
+    Dados enxutos para o roadmap e os gráficos de Gantt.
+
+    Cada entidade é lida com uma única consulta de colunas (sem carregar os
+    objetos ORM e seus relacionamentos) e devolvida em formato colunar: um
+    vetor por campo, alinhados pela posição.
+    """
+
+    def get_timeline(self, usuario: Usuario, inicio: Optional[str] = None, fim: Optional[str] = None,
+                     id_projeto: Optional[int] = None,
+                     incluir: Iterable[str] = ('projetos',)) -> Dict:
+        """
+        Retorna os projetos e/ou tarefas visíveis ao usuário cujo período
+        intercepta a janela [inicio, fim] (datas 'AAAA-MM-DD', ambas opcionais).
+
+        Returns:
+            Dicionário com a 'janela' e um bloco colunar por entidade pedida
+        """
+        incluir = [entidade for entidade in ENTIDADES_TIMELINE if entidade in set(incluir)]
+        inicio, fim = _validar_data(inicio), _validar_data(fim)
+        if inicio and fim and inicio > fim:
+            raise ValueError("O início da janela deve ser anterior ao fim.")
+        logger.debug("Serviço: timeline de %s (%s a %s)", ', '.join(incluir), inicio, fim)
+
+        resultado = {"janela": {"inicio": inicio, "fim": fim}}
+        if 'projetos' in incluir:
+            resultado['projetos'] = self._projetos(usuario, inicio, fim, id_projeto)
+        if 'tarefas' in incluir:
+            resultado['tarefas'] = self._tarefas(usuario, inicio, fim, id_projeto)
+        return resultado
+
+    def _projetos(self, usuario: Usuario, inicio: Optional[str], fim: Optional[str],
+                  id_projeto: Optional[int]) -> Dict[str, List]:
+        # Progresso do projeto = média do progresso das suas tarefas
+        progresso = (
+            select(Tarefa.id_projeto, func.avg(Tarefa.progresso).label('media'))
+            .group_by(Tarefa.id_projeto)
+            .subquery()
+        )
+        consulta = (
+            select(
+                Projeto.id_projeto,
+                Projeto.nome_projeto,
+                _dia(Projeto.data_inicio_prevista),
+                _dia(Projeto.data_fim_prevista),
+                Projeto.status_atual,
+                func.round(progresso.c.media),
+            )
+            .outerjoin(progresso, progresso.c.id_projeto == Projeto.id_projeto)
+            .where(Permissions.filtro_projetos_visiveis(usuario))
+            .where(and_(*_na_janela(Projeto.data_inicio_prevista, Projeto.data_fim_prevista, inicio, fim)))
+            .order_by(Projeto.data_inicio_prevista, Projeto.id_projeto)
+        )
+        if id_projeto is not None:
+            consulta = consulta.where(Projeto.id_projeto == id_projeto)
+
+        colunas = _colunas(self.session.execute(consulta).all(),
+                           ('ids', 'nomes', 'inicios', 'fins', 'status', 'progresso'))
+        colunas['progresso'] = [int(p) if p is not None else None for p in colunas['progresso']]
+        return colunas
+
+    def _tarefas(self, usuario: Usuario, inicio: Optional[str], fim: Optional[str],
+                 id_projeto: Optional[int]) -> Dict[str, List]:
+        consulta = (
+            select(
+                Tarefa.id_tarefa,
+                Tarefa.id_projeto,
+                Tarefa.nome_tarefa,
+                _dia(Tarefa.data_inicio),
+                _dia(Tarefa.data_fim),
+                Tarefa.progresso,
+                Tarefa.dependencias,
+                Tarefa.id_responsavel_tarefa,
+            )
+            .join(Projeto, Projeto.id_projeto == Tarefa.id_projeto)
+            .where(Permissions.filtro_projetos_visiveis(usuario))
+            .where(and_(*_na_janela(Tarefa.data_inicio, Tarefa.data_fim, inicio, fim)))
+            .order_by(Tarefa.id_projeto, Tarefa.data_inicio, Tarefa.id_tarefa)
+        )
+        if id_projeto is not None:
+            consulta = consulta.where(Tarefa.id_projeto == id_projeto)
+
+        return _colunas(self.session.execute(consulta).all(),
+                        ('ids', 'id_projeto', 'nomes', 'inicios', 'fins', 'progresso',
+                         'dependencias', 'id_responsavel'))
@@ -17,7 +17,7 @@ class UsuarioService(BaseService):
         """
         Atualiza o papel (role) de um usuário existente e retorna seus dados como um dicionário.
         """
-        logger.info(f"Serviço: atualizando role do usuário ID {id_usuario} para '{novo_role}'")
+        logger.debug("Serviço: atualizando role do usuário ID %s para '%s'", id_usuario, novo_role)
         
         # O objeto 'usuario' está ligado à sessão gerenciada pela BaseService
         usuario = self.session.query(Usuario).get(id_usuario)
@@ -40,7 +40,7 @@ class UsuarioService(BaseService):
 
     def atualizar_perfil(self, id_usuario: int, dados_atualizacao: Dict) -> Dict:
         """Atualiza os dados do perfil de um usuário."""
-        logger.info(f"Serviço: atualizando perfil do usuário ID {id_usuario}")
+        logger.debug("Serviço: atualizando perfil do usuário ID %s", id_usuario)
         
         usuario = self.session.query(Usuario).get(id_usuario)
         if not usuario:
@@ -17,6 +17,9 @@ from models import Usuario, Projeto, Area, ObjetivoEstrategico
 from utils.database import get_db_session
 from flask_jwt_extended import create_access_token
 
+# Usuários dos dados iniciais (sqlite_source._seed_data)
+ID_GERENTE, ID_MEMBRO, ID_ADMIN = 1, 2, 3
+
 
 @pytest.fixture(scope='session')
 def app():
@@ -54,6 +57,50 @@ def app():
         os.unlink(db_path)
 
 
+@pytest.fixture
+def isolated_app(tmp_path):
+    """
+    Fixture que cria a aplicação com um banco SQLite próprio do teste
+    (com os dados iniciais de exemplo) e uma pasta de uploads temporária.
+    """
+    test_app = create_app('testing', config_overrides={
+        'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+    })
+
+    with test_app.app_context():
+        yield test_app
+
+
+@pytest.fixture
+def isolated_client(isolated_app):
+    """Cliente de teste da aplicação isolada."""
+    return isolated_app.test_client()
+
+
+@pytest.fixture
+def gerente_headers(isolated_app):
+    """Headers de autenticação do Gerente dos dados iniciais."""
+    return auth_headers_for(isolated_app, ID_GERENTE)
+
+
+@pytest.fixture
+def orcamento_consultas():
+    """
+    Limite de consultas SQL para um trecho do teste:
+    'with orcamento_consultas(5): client.get(...)' falha listando os comandos repetidos.
+    """
+    from utils.query_budget import orcamento_consultas as _orcamento
+    return _orcamento
+
+
+def auth_headers_for(app, id_usuario):
+    """Monta os headers de autenticação para um usuário existente."""
+    with app.app_context():
+        access_token = create_access_token(identity=str(id_usuario))
+    return {'Authorization': f'Bearer {access_token}'}
+
+
 @pytest.fixture
 def client(app):
     """
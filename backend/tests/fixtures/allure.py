@@ -0,0 +1,46 @@
+# backend/tests/fixtures/allure.py
+"""
+Geração de relatórios Allure (.zip) em memória para os testes de ingestão.
+"""
+
+import io
+import json
+import uuid as uuid_lib
+import zipfile
+from typing import Dict, List, Optional
+
+
+def resultado_allure(nome: str, status: str = 'passed', mensagem: Optional[str] = None,
+                     feature: str = 'Geral', severity: str = 'normal',
+                     history_id: Optional[str] = None, anexos: Optional[List[Dict]] = None) -> Dict:
+    """Monta o JSON de um '<uuid>-result.json' no formato do Allure."""
+    return {
+        "uuid": str(uuid_lib.uuid4()),
+        "historyId": history_id or f"hist-{nome}",
+        "name": nome,
+        "fullName": f"com.example.{nome}",
+        "status": status,
+        "statusDetails": {"message": mensagem} if mensagem else {},
+        "attachments": anexos or [],
+        "labels": [
+            {"name": "feature", "value": feature},
+            {"name": "severity", "value": severity},
+        ],
+    }
+
+
+def criar_zip_allure(resultados: List[Dict], anexos: Optional[Dict[str, bytes]] = None) -> bytes:
+    """
+    Cria o conteúdo de um .zip de resultados Allure.
+
+    Args:
+        resultados: Lista de dicionários gerados por resultado_allure()
+        anexos: Arquivos extras do relatório (nome -> conteúdo)
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for resultado in resultados:
+            zipf.writestr(f"{resultado['uuid']}-result.json", json.dumps(resultado))
+        for nome, conteudo in (anexos or {}).items():
+            zipf.writestr(nome, conteudo)
+    return buffer.getvalue()
@@ -0,0 +1,41 @@
+# backend/tests/fixtures/junit.py
+"""
+Geração de relatórios JUnit XML em memória para os testes de ingestão.
+"""
+
+import io
+import zipfile
+from typing import Dict, List, Optional
+from xml.sax.saxutils import quoteattr
+
+
+def caso_junit(nome: str, classe: str = 'com.example.Suite', status: str = 'passed',
+               mensagem: Optional[str] = None) -> Dict:
+    """Dados de um <testcase>; status em 'passed', 'failed', 'broken' ou 'skipped'."""
+    return {"nome": nome, "classe": classe, "status": status, "mensagem": mensagem}
+
+
+def criar_xml_junit(casos: List[Dict], nome_suite: str = 'Suite') -> bytes:
+    """Monta um XML <testsuites> com uma única <testsuite>."""
+    filhos = {'failed': 'failure', 'broken': 'error', 'skipped': 'skipped'}
+    linhas = ['<?xml version="1.0" encoding="UTF-8"?>', '<testsuites>',
+              f'<testsuite name={quoteattr(nome_suite)} tests="{len(casos)}">']
+    for caso in casos:
+        abertura = f'<testcase classname={quoteattr(caso["classe"])} name={quoteattr(caso["nome"])} time="0.01"'
+        filho = filhos.get(caso["status"])
+        if filho:
+            mensagem = f' message={quoteattr(caso["mensagem"])}' if caso["mensagem"] else ''
+            linhas.append(f'{abertura}><{filho}{mensagem}>stacktrace</{filho}></testcase>')
+        else:
+            linhas.append(f'{abertura}/>')
+    linhas += ['</testsuite>', '</testsuites>']
+    return '\n'.join(linhas).encode('utf-8')
+
+
+def criar_zip_junit(arquivos: Dict[str, bytes]) -> bytes:
+    """Compacta vários XML JUnit (nome -> conteúdo) em um .zip."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for nome, conteudo in arquivos.items():
+            zipf.writestr(nome, conteudo)
+    return buffer.getvalue()
@@ -0,0 +1,127 @@
+# backend/tests/integration/test_alteracoes_api.py
+"""
+Testes de integração do registro de alterações e da sincronização
+incremental (GET /api/changes).
+"""
+
+import pytest
+
+from services.cronograma_service import cronogramas
+from tests.conftest import ID_GERENTE, ID_MEMBRO, auth_headers_for
+
+
+@pytest.fixture(autouse=True)
+def cronogramas_vazios():
+    cronogramas.limpar()
+
+
+def _alteracoes(client, headers, status=200, **params):
+    response = client.get('/api/changes', headers=headers, query_string=params)
+    assert response.status_code == status, response.get_json()
+    return response.get_json()
+
+
+def _criar_tarefa(client, headers, nome, id_projeto=1):
+    response = client.post(f'/api/projetos/{id_projeto}/tarefas', headers=headers, json={
+        "nome_tarefa": nome, "data_inicio": "2025-01-01", "data_fim": "2025-01-02",
+    })
+    return int(response.get_json()['id'])
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestAlteracoesAPI:
+    """Testes para GET /api/changes."""
+
+    def test_sem_cursor_devolve_apenas_o_ponto_de_partida(self, isolated_client, gerente_headers):
+        inicial = _alteracoes(isolated_client, gerente_headers)
+        assert inicial['projetos'] == {"inseridos": [], "atualizados": [], "excluidos": []}
+
+        _criar_tarefa(isolated_client, gerente_headers, "A")
+        assert _alteracoes(isolated_client, gerente_headers)['cursor'] > inicial['cursor']
+
+    def test_efeito_liquido_desde_o_cursor(self, isolated_client, gerente_headers):
+        a = _criar_tarefa(isolated_client, gerente_headers, "A")
+        b = _criar_tarefa(isolated_client, gerente_headers, "B")
+        cursor = _alteracoes(isolated_client, gerente_headers)['cursor']
+
+        c = _criar_tarefa(isolated_client, gerente_headers, "C")
+        isolated_client.put(f'/api/tarefas/{c}', headers=gerente_headers, json={"progresso": 10})
+        isolated_client.put(f'/api/tarefas/{a}', headers=gerente_headers, json={"progresso": 20})
+        isolated_client.delete(f'/api/tarefas/{b}', headers=gerente_headers)
+        temporaria = _criar_tarefa(isolated_client, gerente_headers, "Temporária")
+        isolated_client.delete(f'/api/tarefas/{temporaria}', headers=gerente_headers)
+        isolated_client.put('/api/projetos/1/status', headers=gerente_headers, json={"status": "Em Especificação"})
+
+        delta = _alteracoes(isolated_client, gerente_headers, since=cursor)
+
+        assert delta['tarefas'] == {"inseridos": [c], "atualizados": [a], "excluidos": [b]}
+        assert delta['projetos'] == {"inseridos": [], "atualizados": [1], "excluidos": []}
+        assert _alteracoes(isolated_client, gerente_headers, since=delta['cursor'])['tarefas']['atualizados'] == []
+
+    def test_comandos_em_massa_e_exclusao_em_cascata(self, isolated_client, gerente_headers):
+        a = _criar_tarefa(isolated_client, gerente_headers, "A")
+        b = _criar_tarefa(isolated_client, gerente_headers, "B", id_projeto=2)
+        cursor = _alteracoes(isolated_client, gerente_headers)['cursor']
+
+        isolated_client.post('/api/projetos/1/tarefas/batch', headers=gerente_headers, json={"operacoes": [
+            {"op": "update", "id": a, "dados": {"progresso": 80}},
+        ]})
+        isolated_client.post('/api/projetos/batch', headers=gerente_headers, json={"ids": [1], "status": "Em Especificação"})
+        isolated_client.delete('/api/projetos/2', headers=gerente_headers)
+
+        delta = _alteracoes(isolated_client, gerente_headers, since=cursor)
+        assert delta['tarefas']['atualizados'] == [a]
+        assert delta['tarefas']['excluidos'] == [b]
+        assert delta['projetos'] == {"inseridos": [], "atualizados": [1], "excluidos": [2]}
+
+    def test_visibilidade_e_cartoes(self, isolated_client, gerente_headers, isolated_app):
+        cursor = _alteracoes(isolated_client, gerente_headers)['cursor']
+        a = _criar_tarefa(isolated_client, gerente_headers, "No projeto 1")
+        b = _criar_tarefa(isolated_client, gerente_headers, "No projeto 2", id_projeto=2)
+
+        # O Membro só vê o projeto 2
+        delta = _alteracoes(isolated_client, auth_headers_for(isolated_app, ID_MEMBRO), since=cursor, dados=1)
+
+        assert delta['tarefas']['inseridos'] == [b]
+        assert [t['name'] for t in delta['dados']['tarefas']] == ["No projeto 2"]
+        assert a not in [int(t['id']) for t in delta['dados']['tarefas']]
+
+    def test_projeto_que_deixou_de_ser_visivel_vem_como_excluido(self, isolated_client, gerente_headers, isolated_app):
+        membro = auth_headers_for(isolated_app, ID_MEMBRO)
+        cursor = _alteracoes(isolated_client, membro)['cursor']
+
+        resposta = isolated_client.put('/api/projetos/2', headers=gerente_headers, json={"id_responsavel": ID_GERENTE})
+        assert resposta.status_code == 200, resposta.get_json()
+
+        delta = _alteracoes(isolated_client, membro, since=cursor, dados=1)
+        assert delta['projetos']['excluidos'] == [2]
+        assert delta['dados']['projetos'] == []
+        # Quem continua vendo o projeto recebe a atualização normalmente
+        assert _alteracoes(isolated_client, gerente_headers, since=cursor)['projetos']['atualizados'] == [2]
+
+    def test_paginacao(self, isolated_client, gerente_headers):
+        cursor = _alteracoes(isolated_client, gerente_headers)['cursor']
+        ids = [_criar_tarefa(isolated_client, gerente_headers, f"T{i}") for i in range(3)]
+
+        vistos = []
+        while True:
+            pagina = _alteracoes(isolated_client, gerente_headers, since=cursor, limite=2)
+            vistos += pagina['tarefas']['inseridos']
+            cursor = pagina['cursor']
+            if not pagina['mais']:
+                break
+        assert vistos == ids
+
+    def test_cursor_do_bootstrap(self, isolated_client, gerente_headers):
+        bootstrap = isolated_client.get('/api/bootstrap?secoes=projetos', headers=gerente_headers).get_json()
+        assert _alteracoes(isolated_client, gerente_headers, since=bootstrap['cursor'])['projetos']['atualizados'] == []
+
+        isolated_client.put('/api/projetos/2', headers=gerente_headers, json={"prioridade": "Crítica"})
+        delta = _alteracoes(isolated_client, gerente_headers, since=bootstrap['cursor'], dados='true')
+        assert delta['projetos']['atualizados'] == [2]
+        assert delta['dados']['projetos'][0]['prioridade'] == "Crítica"
+
+    def test_cursor_invalido(self, isolated_client, gerente_headers):
+        _alteracoes(isolated_client, gerente_headers, status=400, since='abc')
+        _alteracoes(isolated_client, gerente_headers, status=400, since='-1')
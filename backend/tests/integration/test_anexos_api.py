@@ -0,0 +1,101 @@
+# backend/tests/integration/test_anexos_api.py
+"""
+Testes de integração da rota que serve anexos direto do ZIP do relatório.
+"""
+
+import io
+
+import pytest
+
+from models import Homologacao
+from services.homologacao_service import HomologacaoService
+from utils.database import get_db_session
+from tests.conftest import ID_MEMBRO, ID_ADMIN, auth_headers_for
+from tests.fixtures.allure import criar_zip_allure, resultado_allure
+
+SCREENSHOT = bytes(range(256)) * 40
+PAGINA_HTML = b"<script>fetch('/api/projetos')</script>"
+
+
+@pytest.fixture
+def ciclo_com_anexo(isolated_app):
+    with get_db_session() as session:
+        ciclo = Homologacao(id_projeto=1, data_inicio="2025-01-01T00:00:00", id_responsavel_teste=1,
+                            ambiente="HML", versao_testada="1.0")
+        session.add(ciclo)
+        session.flush()
+        id_ciclo = ciclo.id_homologacao
+
+    conteudo = criar_zip_allure(
+        [resultado_allure("login", status="failed", mensagem="Falhou",
+                          anexos=[{"name": "Screenshot", "source": "abc-attachment.png", "type": "image/png"},
+                                  {"name": "Página", "source": "def-attachment.html", "type": "text/html"}])],
+        anexos={"allure-results/abc-attachment.png": SCREENSHOT,
+                "allure-results/def-attachment.html": PAGINA_HTML},
+    )
+    with HomologacaoService() as service:
+        service.processar_upload_de_relatorio(id_ciclo, io.BytesIO(conteudo), isolated_app.config['UPLOAD_FOLDER'])
+    return id_ciclo
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestAnexosAPI:
+    """Testes para GET /api/homologacoes/<id>/anexos/<nome>."""
+
+    def test_serve_anexo_completo(self, isolated_app, ciclo_com_anexo):
+        client = isolated_app.test_client()
+        response = client.get(f'/api/homologacoes/{ciclo_com_anexo}/anexos/abc-attachment.png',
+                              headers=auth_headers_for(isolated_app, ID_ADMIN))
+
+        assert response.status_code == 200
+        assert response.mimetype == 'image/png'
+        assert response.headers['Accept-Ranges'] == 'bytes'
+        assert 'Content-Disposition' not in response.headers
+        assert response.data == SCREENSHOT
+
+    def test_html_do_relatorio_vai_como_download_isolado(self, isolated_app, ciclo_com_anexo):
+        client = isolated_app.test_client()
+        response = client.get(f'/api/homologacoes/{ciclo_com_anexo}/anexos/def-attachment.html',
+                              headers=auth_headers_for(isolated_app, ID_ADMIN))
+
+        assert response.status_code == 200
+        assert response.headers['Content-Disposition'] == 'attachment; filename=def-attachment.html'
+        assert response.headers['X-Content-Type-Options'] == 'nosniff'
+        assert response.headers['Content-Security-Policy'] == 'sandbox'
+
+    def test_range_retorna_conteudo_parcial(self, isolated_app, ciclo_com_anexo):
+        client = isolated_app.test_client()
+        headers = auth_headers_for(isolated_app, ID_ADMIN)
+        headers['Range'] = 'bytes=100-299'
+        response = client.get(f'/api/homologacoes/{ciclo_com_anexo}/anexos/abc-attachment.png', headers=headers)
+
+        assert response.status_code == 206
+        assert response.headers['Content-Range'] == f'bytes 100-299/{len(SCREENSHOT)}'
+        assert response.data == SCREENSHOT[100:300]
+
+    def test_etag_retorna_304(self, isolated_app, ciclo_com_anexo):
+        client = isolated_app.test_client()
+        url = f'/api/homologacoes/{ciclo_com_anexo}/anexos/abc-attachment.png'
+        primeira = client.get(url, headers=auth_headers_for(isolated_app, ID_ADMIN))
+
+        headers = auth_headers_for(isolated_app, ID_ADMIN)
+        headers['If-None-Match'] = primeira.headers['ETag']
+        segunda = client.get(url, headers=headers)
+
+        assert segunda.status_code == 304
+        assert segunda.data == b''
+
+    def test_anexo_inexistente(self, isolated_app, ciclo_com_anexo):
+        client = isolated_app.test_client()
+        response = client.get(f'/api/homologacoes/{ciclo_com_anexo}/anexos/nao-existe.png',
+                              headers=auth_headers_for(isolated_app, ID_ADMIN))
+
+        assert response.status_code == 404
+
+    def test_membro_sem_acesso_ao_projeto(self, isolated_app, ciclo_com_anexo):
+        client = isolated_app.test_client()
+        response = client.get(f'/api/homologacoes/{ciclo_com_anexo}/anexos/abc-attachment.png',
+                              headers=auth_headers_for(isolated_app, ID_MEMBRO))
+
+        assert response.status_code == 403
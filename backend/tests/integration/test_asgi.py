@@ -0,0 +1,83 @@
+# backend/tests/integration/test_asgi.py
+"""
+Testes de integração do ponto de entrada ASGI (asgi.py): as leituras
+atendidas pelo Starlette devem responder como as rotas Flask equivalentes.
+"""
+
+import pytest
+
+pytest.importorskip('starlette')
+pytest.importorskip('uvicorn')
+pytest.importorskip('httpx')
+
+from starlette.testclient import TestClient
+
+from asgi import create_asgi_app
+from tests.conftest import ID_GERENTE, ID_MEMBRO, ID_ADMIN, auth_headers_for
+
+
+@pytest.fixture
+def asgi_app(tmp_path):
+    return create_asgi_app('testing', config_overrides={
+        'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'PERFIS_PASTA': str(tmp_path / 'perfis'),
+    })
+
+
+@pytest.fixture
+def clientes(asgi_app):
+    flask_app = asgi_app.state.flask_app
+    with TestClient(asgi_app) as cliente_asgi:
+        yield cliente_asgi, flask_app.test_client(), flask_app
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestAsgi:
+    """Testes para asgi.py."""
+
+    @pytest.mark.parametrize('caminho', [
+        '/api/projetos', '/api/me/tarefas', '/api/me/projetos',
+        '/api/relatorios/portfolio', '/api/relatorios/qa', '/api/relatorios/qa/falhas',
+    ])
+    def test_mesma_resposta_do_flask(self, clientes, caminho):
+        cliente_asgi, cliente_flask, flask_app = clientes
+        headers = auth_headers_for(flask_app, ID_GERENTE)
+
+        resposta = cliente_asgi.get(caminho, headers=headers)
+        assert resposta.status_code == 200
+        assert resposta.json() == cliente_flask.get(caminho, headers=headers).get_json()
+
+    def test_erros_no_formato_do_flask(self, clientes):
+        cliente_asgi, _, flask_app = clientes
+
+        assert cliente_asgi.get('/api/projetos').status_code == 401
+        proibido = cliente_asgi.get('/api/relatorios/qa', headers=auth_headers_for(flask_app, ID_MEMBRO))
+        assert proibido.status_code == 403
+        assert set(proibido.json()) == {'error', 'message'}
+        ausente = cliente_asgi.get('/api/homologacoes/999/testes', headers=auth_headers_for(flask_app, ID_GERENTE))
+        assert ausente.status_code == 404
+
+    def test_demais_rotas_seguem_para_o_flask(self, clientes):
+        cliente_asgi, _, flask_app = clientes
+        headers = auth_headers_for(flask_app, ID_GERENTE)
+
+        criado = cliente_asgi.post('/api/projetos/1/tarefas', headers=headers, json={
+            "nome_tarefa": "Via ASGI", "data_inicio": "2025-01-01", "data_fim": "2025-01-02",
+            "id_responsavel_tarefa": ID_GERENTE,
+        })
+        assert criado.status_code == 201
+        assert [t['name'] for t in cliente_asgi.get('/api/me/tarefas', headers=headers).json()] == ["Via ASGI"]
+
+    def test_rotas_nativas_com_id_de_requisicao_e_perfil(self, clientes):
+        cliente_asgi, _, flask_app = clientes
+        admin = auth_headers_for(flask_app, ID_ADMIN)
+
+        resposta = cliente_asgi.get('/api/projetos', headers={**admin, 'X-Request-ID': 'req-asgi-1'})
+        assert resposta.headers['X-Request-ID'] == 'req-asgi-1'
+
+        # Com X-Profile a leitura é atendida pelo Flask, onde o perfil é gravado
+        perfilada = cliente_asgi.get('/api/projetos', headers={**admin, 'X-Profile': 'amostragem'})
+        assert perfilada.status_code == 200
+        assert 'X-Profile-Id' in perfilada.headers
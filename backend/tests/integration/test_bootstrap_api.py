@@ -0,0 +1,84 @@
+# backend/tests/integration/test_bootstrap_api.py
+"""
+Testes de integração do endpoint que entrega a primeira tela em uma
+requisição (GET /api/bootstrap) e da invalidação das seções em cache.
+"""
+
+import sqlite3
+
+import pytest
+
+from models import Area
+from services.bootstrap_service import SECOES_BOOTSTRAP
+from utils.database import get_db_session
+from tests.conftest import ID_GERENTE, ID_MEMBRO, auth_headers_for
+
+
+def _bootstrap(client, headers, **params):
+    response = client.get('/api/bootstrap', headers=headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestBootstrapAPI:
+    """Testes para GET /api/bootstrap."""
+
+    def test_compoe_as_mesmas_respostas_das_rotas_separadas(self, isolated_client, gerente_headers):
+        dados = _bootstrap(isolated_client, gerente_headers)
+
+        assert set(dados) == {*SECOES_BOOTSTRAP, 'cursor'}
+        assert dados['usuario'] == isolated_client.get('/api/auth/me', headers=gerente_headers).get_json()
+        assert dados['projetos'] == isolated_client.get('/api/projetos', headers=gerente_headers).get_json()
+        assert dados['minhas_tarefas'] == isolated_client.get('/api/me/tarefas', headers=gerente_headers).get_json()
+        assert dados['meus_projetos'] == isolated_client.get('/api/me/projetos', headers=gerente_headers).get_json()
+        assert dados['contagem_status'] == {"Em Definição": 2}
+        assert set(dados['versoes']) == {'usuarios', 'areas', 'objetivos'}
+
+    def test_respeita_a_visibilidade_do_usuario(self, isolated_client, isolated_app):
+        dados = _bootstrap(isolated_client, auth_headers_for(isolated_app, ID_MEMBRO), secoes='projetos,contagem_status')
+
+        assert set(dados) == {'projetos', 'contagem_status', 'cursor'}
+        assert [p['id_projeto'] for p in dados['projetos']] == [2]
+        assert dados['contagem_status'] == {"Em Definição": 1}
+
+    def test_secao_desconhecida(self, isolated_client, gerente_headers):
+        response = isolated_client.get('/api/bootstrap?secoes=usuario,graficos', headers=gerente_headers)
+        assert response.status_code == 400
+
+    def test_escritas_invalidam_as_secoes(self, isolated_client, gerente_headers):
+        antes = _bootstrap(isolated_client, gerente_headers)
+
+        isolated_client.post('/api/projetos/1/tarefas', headers=gerente_headers, json={
+            "nome_tarefa": "Revisar escopo", "data_inicio": "2025-01-01", "data_fim": "2025-01-02",
+            "id_responsavel_tarefa": ID_GERENTE,
+        })
+        isolated_client.post('/api/projetos/batch', headers=gerente_headers, json={"ids": [2], "status": "Em Especificação"})
+        with get_db_session() as session:
+            session.get(Area, 1).nome_area = "Área renomeada"
+
+        depois = _bootstrap(isolated_client, gerente_headers)
+        assert [t['name'] for t in depois['minhas_tarefas']] == ["Revisar escopo"]
+        assert depois['contagem_status'] == {"Em Definição": 1, "Em Especificação": 1}
+        assert depois['versoes']['areas'] != antes['versoes']['areas']
+        assert depois['versoes']['usuarios'] == antes['versoes']['usuarios']
+
+    def test_escrita_de_outro_processo_invalida_as_secoes(self, isolated_client, gerente_headers, isolated_app):
+        _bootstrap(isolated_client, gerente_headers, secoes='contagem_status')
+
+        # Outra conexão, fora do ORM deste processo (como um segundo worker)
+        conexao = sqlite3.connect(isolated_app.config['DATABASE_URL'])
+        with conexao:
+            conexao.execute("UPDATE projetos SET status_atual = 'Em Especificação' WHERE id_projeto = 2")
+        conexao.close()
+
+        assert _bootstrap(isolated_client, gerente_headers, secoes='contagem_status')['contagem_status'] == {
+            "Em Definição": 1, "Em Especificação": 1
+        }
+
+    def test_etag(self, isolated_client, gerente_headers):
+        response = isolated_client.get('/api/bootstrap', headers=gerente_headers)
+
+        revalidacao = isolated_client.get('/api/bootstrap', headers={**gerente_headers, 'If-None-Match': response.headers['ETag']})
+        assert revalidacao.status_code == 304
@@ -0,0 +1,72 @@
+# backend/tests/integration/test_busca_api.py
+"""
+Testes de integração da busca textual de projetos (FTS5).
+"""
+
+import pytest
+
+from models import Projeto, Usuario
+from utils.database import get_db_session
+from tests.conftest import ID_GERENTE, ID_MEMBRO, auth_headers_for
+
+
+def _buscar(app, termo, id_usuario=ID_GERENTE, **params):
+    client = app.test_client()
+    response = client.get('/api/busca', query_string={'q': termo, **params},
+                          headers=auth_headers_for(app, id_usuario))
+    assert response.status_code == 200
+    return response.get_json()
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestBuscaAPI:
+    """Testes para GET /api/busca."""
+
+    def test_busca_por_prefixo_sem_acento_com_destaque(self, isolated_app):
+        resultado = _buscar(isolated_app, "otimizacao infra")
+
+        assert resultado['total'] == 1
+        projeto = resultado['resultados'][0]
+        assert projeto['nome_projeto'] == "Otimização de Infraestrutura Cloud"
+        assert projeto['destaques']['nome_projeto'] == "<mark>Otimização</mark> de <mark>Infraestrutura</mark> Cloud"
+
+    def test_busca_por_topdesk_e_nomes_relacionados(self, isolated_app):
+        assert [p['id_projeto'] for p in _buscar(isolated_app, "TD-PROJ-01")['resultados']] == [1]
+        # Área solicitante do projeto 1
+        assert [p['id_projeto'] for p in _buscar(isolated_app, "marketing")['resultados']] == [1]
+        # Bruno é responsável pelo projeto 2 e membro da equipe do 1
+        assert sorted(p['id_projeto'] for p in _buscar(isolated_app, "bruno")['resultados']) == [1, 2]
+
+    def test_filtra_por_permissao(self, isolated_app):
+        resultado = _buscar(isolated_app, "proj", id_usuario=ID_MEMBRO)
+
+        assert [p['id_projeto'] for p in resultado['resultados']] == [2]
+
+    def test_paginacao(self, isolated_app):
+        primeira = _buscar(isolated_app, "proj", limite=1)
+        segunda = _buscar(isolated_app, "proj", limite=1, offset=1)
+
+        assert primeira['total'] == segunda['total'] == 2
+        assert {primeira['resultados'][0]['id_projeto'], segunda['resultados'][0]['id_projeto']} == {1, 2}
+
+    def test_entrada_com_sintaxe_fts_nao_quebra(self, isolated_app):
+        assert _buscar(isolated_app, '"portal" (fidel')['total'] == 1
+        assert _buscar(isolated_app, '*** ---')['total'] == 0
+
+    def test_triggers_mantem_indice_atualizado(self, isolated_app):
+        with get_db_session() as session:
+            projeto = session.get(Projeto, 1)
+            projeto.nome_projeto = "Portal <b>Renovado</b>"
+            session.get(Usuario, 2).nome_completo = "Bruna Costa"
+
+        assert _buscar(isolated_app, "fidelidade")['total'] == 0
+        renovado = _buscar(isolated_app, "renovado")['resultados'][0]
+        assert renovado['destaques']['nome_projeto'] == "Portal &lt;b&gt;<mark>Renovado</mark>&lt;/b&gt;"
+        assert _buscar(isolated_app, "bruno")['total'] == 0
+        assert _buscar(isolated_app, "bruna")['total'] == 2
+
+        with get_db_session() as session:
+            session.delete(session.get(Projeto, 1))
+
+        assert _buscar(isolated_app, "renovado")['total'] == 0
@@ -0,0 +1,109 @@
+# backend/tests/integration/test_consultas_lentas_api.py
+"""
+Testes do registro de consultas lentas (utils/slow_queries.py) e de
+GET /api/admin/consultas-lentas.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from app import create_app
+from tests.conftest import ID_GERENTE, ID_ADMIN, auth_headers_for
+from utils.slow_queries import ArmazemConsultasLentas, configurar_consultas_lentas, plano_de_execucao, redigir_parametros
+
+
+@pytest.fixture
+def app_lentas(tmp_path):
+    """App que registra todas as consultas (limite de um nanossegundo)."""
+    app = create_app('testing', config_overrides={
+        'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'CONSULTAS_LENTAS_MS': 0.000001,
+        'CONSULTAS_LENTAS_ARQUIVO': str(tmp_path / 'logs' / 'consultas_lentas.jsonl'),
+    })
+    yield app
+    app.config['CONSULTAS_LENTAS_MS'] = 0
+    configurar_consultas_lentas(app)
+
+
+@pytest.mark.unit
+class TestRegistroConsultasLentas:
+    """Testes para o plano, a redação dos parâmetros e o armazém."""
+
+    def test_plano_indentado_pela_hierarquia(self):
+        conexao = sqlite3.connect(':memory:')
+        conexao.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, nome TEXT)")
+
+        plano = plano_de_execucao(
+            conexao, "SELECT nome FROM t WHERE id IN (SELECT id FROM t WHERE nome = ?)", ('x',))
+
+        assert any(linha.startswith('SEARCH t USING INTEGER PRIMARY KEY') for linha in plano)
+        assert any(linha.startswith('  ') for linha in plano)
+        assert plano_de_execucao(conexao, "PRAGMA user_version", ()) is None
+
+    def test_textos_ocultados_e_ids_mantidos(self):
+        assert redigir_parametros((7, 'ana@empresa.com', None, b'\x00\x01', 1.5)) == [
+            7, '<str:15>', None, '<bytes:2>', 1.5
+        ]
+        assert redigir_parametros({'senha': 'segredo'}) == {'senha': '<str:7>'}
+
+    def test_rotacao_e_agregacao_entre_arquivos(self, tmp_path):
+        armazem = ArmazemConsultasLentas(str(tmp_path / 'lentas.jsonl'), max_bytes=120, backups=2)
+        for i in range(12):
+            armazem.gravar({'sql': 'SELECT a' if i % 3 else 'SELECT b', 'duracao_ms': 10.0 + i})
+
+        arquivos = sorted(p.name for p in tmp_path.iterdir())
+        assert arquivos == ['lentas.jsonl', 'lentas.jsonl.1', 'lentas.jsonl.2']
+        mantidos = list(armazem.registros())
+        assert 0 < len(mantidos) < 12
+        # Do mais antigo ao mais recente, atravessando os arquivos rotacionados
+        assert [r['duracao_ms'] for r in mantidos] == sorted(r['duracao_ms'] for r in mantidos)
+
+        ofensores = armazem.maiores_ofensores()
+        assert [o['sql'] for o in ofensores][0] == 'SELECT a'
+        assert sum(o['ocorrencias'] for o in ofensores) == len(mantidos)
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestConsultasLentasAPI:
+    """Testes para GET /api/admin/consultas-lentas."""
+
+    def test_ofensores_com_plano_e_rota(self, app_lentas):
+        client = app_lentas.test_client()
+        headers = auth_headers_for(app_lentas, ID_ADMIN)
+        client.get('/api/projetos/1', headers=headers)
+        client.get('/api/projetos/2', headers=headers)
+
+        resposta = client.get('/api/admin/consultas-lentas?limite=5', headers=headers)
+
+        assert resposta.status_code == 200
+        dados = resposta.get_json()
+        ofensores = dados['ofensores']
+        assert 0 < len(ofensores) <= 5
+        assert [o['total_ms'] for o in ofensores] == sorted((o['total_ms'] for o in ofensores), reverse=True)
+        do_projeto = next(o for o in ofensores if o['sql'].startswith('SELECT projetos.'))
+        assert do_projeto['rotas'] == ['/api/projetos/<int:id_projeto>']
+        assert do_projeto['ultimo']['plano']
+        assert do_projeto['ultimo']['parametros'][0] == 2
+
+    def test_parametros_de_texto_nao_vao_para_o_arquivo(self, app_lentas):
+        client = app_lentas.test_client()
+        client.get('/api/busca?q=segredo-do-cliente', headers=auth_headers_for(app_lentas, ID_ADMIN))
+
+        with open(app_lentas.config['CONSULTAS_LENTAS_ARQUIVO'], encoding='utf-8') as arquivo:
+            registros = [json.loads(linha) for linha in arquivo]
+        assert any(r['rota'] == '/api/busca' for r in registros)
+        assert not any('segredo-do-cliente' in json.dumps(r) for r in registros)
+
+    def test_apenas_admin(self, app_lentas):
+        resposta = app_lentas.test_client().get(
+            '/api/admin/consultas-lentas', headers=auth_headers_for(app_lentas, ID_GERENTE))
+        assert resposta.status_code == 403
+
+    def test_desativado_por_padrao(self, isolated_app):
+        resposta = isolated_app.test_client().get(
+            '/api/admin/consultas-lentas', headers=auth_headers_for(isolated_app, ID_ADMIN))
+        assert resposta.status_code == 404
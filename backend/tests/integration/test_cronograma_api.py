@@ -0,0 +1,143 @@
+# backend/tests/integration/test_cronograma_api.py
+"""
+Testes de integração das dependências entre tarefas: validação na escrita,
+reprogramação das sucessoras e caminho crítico do projeto.
+"""
+
+import pytest
+
+from models import DependenciaTarefa, Tarefa
+from services.cronograma_service import cronogramas
+from utils.database import get_db_session
+from tests.conftest import ID_MEMBRO, auth_headers_for
+
+
+@pytest.fixture(autouse=True)
+def cronogramas_vazios():
+    cronogramas.limpar()
+
+
+def _criar(client, headers, nome, inicio, fim, dependencias=None, id_projeto=1, status=201):
+    response = client.post(f'/api/projetos/{id_projeto}/tarefas', headers=headers, json={
+        "nome_tarefa": nome, "data_inicio": inicio, "data_fim": fim, "dependencias": dependencias,
+    })
+    assert response.status_code == status, response.get_json()
+    return response.get_json()
+
+
+@pytest.fixture
+def tarefas(isolated_client, gerente_headers):
+    """Levantamento → (Desenvolvimento, Documentação) → Implantação."""
+    levantamento = _criar(isolated_client, gerente_headers, "Levantamento", "2025-01-01", "2025-01-05")
+    desenvolvimento = _criar(isolated_client, gerente_headers, "Desenvolvimento", "2025-01-06", "2025-01-15", levantamento['id'])
+    documentacao = _criar(isolated_client, gerente_headers, "Documentação", "2025-01-06", "2025-01-08", levantamento['id'])
+    implantacao = _criar(isolated_client, gerente_headers, "Implantação", "2025-01-16", "2025-01-20",
+                         f"{desenvolvimento['id']};{documentacao['id']}")
+    return [int(t['id']) for t in (levantamento, desenvolvimento, documentacao, implantacao)]
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestDependenciasTarefas:
+    """Testes da escrita de tarefas com dependências."""
+
+    def test_dependencias_gravadas_no_formato_canonico(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+        with get_db_session() as session:
+            assert session.get(Tarefa, imp).dependencias == f"{dev}, {doc}"
+            assert session.query(DependenciaTarefa).filter_by(id_tarefa=imp).count() == 2
+
+    def test_rejeita_ciclo_e_ids_desconhecidos(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+
+        response = isolated_client.put(f'/api/tarefas/{lev}', headers=gerente_headers, json={"dependencias": str(imp)})
+        assert response.status_code == 400
+        assert "circular" in response.get_json()['message']
+
+        _criar(isolated_client, gerente_headers, "Outra", "2025-01-01", "2025-01-02", "9999", status=400)
+        # Tarefas de outro projeto também não podem ser predecessoras
+        _criar(isolated_client, gerente_headers, "Outra", "2025-01-01", "2025-01-02", str(lev), id_projeto=2, status=400)
+
+    def test_mover_tarefa_empurra_sucessoras(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+
+        response = isolated_client.put(f'/api/tarefas/{lev}', headers=gerente_headers, json={"data_fim": "2025-01-08"})
+
+        assert response.status_code == 200
+        assert response.get_json()['tarefas_reprogramadas'] == [dev, doc, imp]
+        with get_db_session() as session:
+            periodos = {t.id_tarefa: (t.data_inicio, t.data_fim) for t in session.query(Tarefa)}
+        assert periodos[dev] == ("2025-01-09", "2025-01-18")
+        assert periodos[doc] == ("2025-01-09", "2025-01-11")
+        assert periodos[imp] == ("2025-01-19", "2025-01-23")
+
+    def test_excluir_tarefa_remove_das_sucessoras(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+
+        assert isolated_client.delete(f'/api/tarefas/{doc}', headers=gerente_headers).status_code == 204
+
+        with get_db_session() as session:
+            assert session.get(Tarefa, imp).dependencias == str(dev)
+            assert session.query(DependenciaTarefa).filter(
+                (DependenciaTarefa.id_tarefa == doc) | (DependenciaTarefa.id_predecessora == doc)
+            ).count() == 0
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestCronogramaAPI:
+    """Testes para GET /api/projetos/<id>/cronograma."""
+
+    def test_caminho_critico_e_folgas(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+
+        cronograma = isolated_client.get('/api/projetos/1/cronograma', headers=gerente_headers).get_json()
+
+        assert cronograma['caminho_critico'] == [lev, dev, imp]
+        assert cronograma['inicio'] == "2025-01-01" and cronograma['fim'] == "2025-01-20"
+        assert cronograma['duracao_dias'] == 20
+        folgas = dict(zip(cronograma['tarefas']['ids'], cronograma['tarefas']['folga']))
+        assert folgas[doc] == 7
+
+    def test_cache_invalidado_pelas_escritas(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+        isolated_client.get('/api/projetos/1/cronograma', headers=gerente_headers)
+        assert cronogramas.obter(1) is not None
+
+        # Documentação passa a durar mais que o Desenvolvimento
+        isolated_client.put(f'/api/tarefas/{doc}', headers=gerente_headers, json={"data_fim": "2025-01-18"})
+        assert cronogramas.obter(1) is None
+
+        cronograma = isolated_client.get('/api/projetos/1/cronograma', headers=gerente_headers).get_json()
+        assert cronograma['caminho_critico'] == [lev, doc, imp]
+
+    def test_cache_segue_escritas_de_outro_processo(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+        isolated_client.get('/api/projetos/1/cronograma', headers=gerente_headers)
+
+        # Escrita direta no banco, sem passar pela invalidação deste processo
+        with get_db_session() as session:
+            session.get(Tarefa, doc).data_fim = "2025-01-18"
+            session.commit()
+
+        cronograma = isolated_client.get('/api/projetos/1/cronograma', headers=gerente_headers).get_json()
+        assert cronograma['caminho_critico'] == [lev, doc, imp]
+
+    def test_ciclo_verificado_no_banco_e_nao_no_cache(self, isolated_client, gerente_headers, tarefas):
+        lev, dev, doc, imp = tarefas
+        preparacao = int(_criar(isolated_client, gerente_headers, "Preparação", "2024-12-20", "2024-12-31")['id'])
+        isolated_client.get('/api/projetos/1/cronograma', headers=gerente_headers)
+
+        # Outro processo faz o Levantamento depender da Preparação
+        with get_db_session() as session:
+            session.add(DependenciaTarefa(id_predecessora=preparacao, id_tarefa=lev, id_projeto=1))
+            session.get(Tarefa, lev).dependencias = str(preparacao)
+            session.commit()
+
+        response = isolated_client.put(f'/api/tarefas/{preparacao}', headers=gerente_headers, json={"dependencias": str(imp)})
+        assert response.status_code == 400
+        assert "circular" in response.get_json()['message']
+
+    def test_permissao(self, isolated_client, tarefas, isolated_app):
+        response = isolated_client.get('/api/projetos/1/cronograma', headers=auth_headers_for(isolated_app, ID_MEMBRO))
+        assert response.status_code == 403
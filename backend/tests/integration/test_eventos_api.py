@@ -0,0 +1,130 @@
+# backend/tests/integration/test_eventos_api.py
+"""
+Testes de integração do canal de Server-Sent Events (GET /api/eventos).
+"""
+
+import io
+import json
+
+import pytest
+
+from models import Homologacao
+from utils.database import get_db_session
+from utils.pubsub import barramento_eventos
+from tests.conftest import ID_MEMBRO, auth_headers_for
+from tests.fixtures.allure import criar_zip_allure, resultado_allure
+
+
+@pytest.fixture(autouse=True)
+def barramento_limpo(isolated_app):
+    isolated_app.config['SSE_HEARTBEAT'] = 0.01
+    barramento_eventos.limpar()
+    yield
+    barramento_eventos.limpar()
+
+
+def _abrir(client, headers, **params):
+    response = client.get('/api/eventos', headers=headers, query_string=params, buffered=False)
+    assert response.status_code == 200
+    return response
+
+
+def _eventos(response, quantidade):
+    """Lê o fluxo até receber 'quantidade' eventos (heartbeats são ignorados)."""
+    eventos = []
+    for bloco in response.response:
+        bloco = bloco.decode() if isinstance(bloco, bytes) else bloco
+        if bloco.startswith('event:') or bloco.startswith('id:'):
+            campos = dict(linha.split(': ', 1) for linha in bloco.strip().split('\n'))
+            eventos.append((campos['event'], json.loads(campos['data'])))
+            if len(eventos) == quantidade:
+                break
+    return eventos
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestEventosAPI:
+    """Testes para GET /api/eventos."""
+
+    def test_cabecalhos_e_heartbeat(self, isolated_client, gerente_headers):
+        response = _abrir(isolated_client, gerente_headers)
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+        fluxo = iter(response.response)
+        assert next(fluxo).startswith(b'retry:')
+        assert next(fluxo) == b': heartbeat\n\n'
+        response.close()
+        assert barramento_eventos.assinantes == 0
+
+    def test_status_e_tarefas(self, isolated_client, gerente_headers):
+        response = _abrir(isolated_client, gerente_headers)
+        isolated_client.put('/api/projetos/1/status', headers=gerente_headers, json={"status": "Em Especificação"})
+        isolated_client.post('/api/projetos/1/tarefas', headers=gerente_headers, json={
+            "nome_tarefa": "A", "data_inicio": "2025-01-01", "data_fim": "2025-01-02",
+        })
+
+        (tipo_status, status), (tipo_tarefas, tarefas) = _eventos(response, 2)
+        response.close()
+
+        assert tipo_status == 'status_projeto'
+        assert (status['id_projeto'], status['status']) == (1, "Em Especificação")
+        assert 'responsaveis' not in status
+        assert tipo_tarefas == 'tarefas_alteradas'
+        assert len(tarefas['criadas']) == 1 and tarefas['excluidas'] == []
+
+    def test_andamento_do_processamento_de_relatorio(self, isolated_client, gerente_headers):
+        with get_db_session() as session:
+            ciclo = Homologacao(id_projeto=1, data_inicio="2025-01-01T00:00:00", id_responsavel_teste=1,
+                                ambiente="HML", versao_testada="1.0")
+            session.add(ciclo)
+            session.flush()
+            id_homologacao = ciclo.id_homologacao
+        response = _abrir(isolated_client, gerente_headers)
+
+        conteudo = criar_zip_allure([resultado_allure("login"), resultado_allure("logout", "failed")])
+        isolated_client.post(f'/api/homologacoes/{id_homologacao}/upload-zip', headers=gerente_headers,
+                    data={'reportFile': (io.BytesIO(conteudo), 'relatorio.zip')})
+        isolated_client.post(f'/api/homologacoes/{id_homologacao}/upload-zip', headers=gerente_headers,
+                    data={'reportFile': (io.BytesIO(b'nao e zip'), 'quebrado.zip')})
+
+        eventos = _eventos(response, 4)
+        response.close()
+        assert [(tipo, e['etapa']) for tipo, e in eventos] == [
+            ('ingestao', 'processando'), ('ingestao', 'concluido'), ('ingestao', 'processando'), ('ingestao', 'falhou'),
+        ]
+        assert eventos[1][1]['total_testes'] == 2
+
+    def test_filtra_pela_visibilidade(self, isolated_client, gerente_headers, isolated_app):
+        # O Membro só vê o projeto 2; o token vai na query, como no EventSource
+        token = auth_headers_for(isolated_app, ID_MEMBRO)['Authorization'].split()[1]
+        response = _abrir(isolated_client, {}, jwt=token)
+        isolated_client.post('/api/projetos/batch', headers=gerente_headers, json={"ids": [1, 2], "status": "Em Especificação"})
+
+        eventos = _eventos(response, 1)
+        response.close()
+        assert [e['id_projeto'] for _, e in eventos] == [2]
+        assert barramento_eventos.assinantes == 0
+
+    def test_escrita_invalida_nao_publica(self, isolated_client, gerente_headers):
+        response = _abrir(isolated_client, gerente_headers)
+        isolated_client.put('/api/projetos/1/status', headers=gerente_headers, json={"status": "Em Especificação"})
+        # Voltar a um status já visitado é recusado e a transação é desfeita
+        invalida = isolated_client.put('/api/projetos/1/status', headers=gerente_headers, json={"status": "Em Especificação"})
+        isolated_client.put('/api/projetos/2/status', headers=gerente_headers, json={"status": "Em Especificação"})
+
+        eventos = _eventos(response, 2)
+        response.close()
+        assert invalida.status_code == 400
+        assert [e['id_projeto'] for _, e in eventos] == [1, 2]
+
+    def test_limite_de_conexoes(self, isolated_client, gerente_headers):
+        barramento_eventos.max_assinantes = 0
+        try:
+            assert isolated_client.get('/api/eventos', headers=gerente_headers).status_code == 503
+        finally:
+            barramento_eventos.max_assinantes = 500
+
+    def test_sem_token(self, isolated_client):
+        assert isolated_client.get('/api/eventos').status_code == 401
@@ -0,0 +1,121 @@
+# backend/tests/integration/test_memoria_api.py
+"""
+Testes do diagnóstico de memória (utils/memory_diagnostics.py) e das rotas
+/api/admin/memoria.
+"""
+
+import os
+import tracemalloc
+
+import pytest
+
+from extensions import db
+from models import Projeto
+from tests.conftest import ID_ADMIN, auth_headers_for
+from utils.memory_diagnostics import DiagnosticoMemoria, SnapshotInexistenteError, diagnostico_memoria, tamanho_profundo
+
+
+@pytest.fixture(autouse=True)
+def snapshots_descartados():
+    yield
+    # O tracemalloc ligado deixaria o resto da suíte mais lento
+    diagnostico_memoria.descartar_snapshots()
+
+
+@pytest.fixture
+def admin(isolated_app):
+    return auth_headers_for(isolated_app, ID_ADMIN)
+
+
+def _reter_blocos(quantidade: int) -> list:
+    return [bytearray(1024) for _ in range(quantidade)]
+
+
+@pytest.mark.unit
+class TestDiagnosticoMemoria:
+    """Testes para DiagnosticoMemoria e tamanho_profundo."""
+
+    def test_tamanho_profundo_segue_as_referencias(self):
+        assert tamanho_profundo({'a': [b'x' * 10_000]}) > 10_000
+        assert tamanho_profundo([os, Projeto]) < 1000
+
+    def test_guarda_apenas_os_snapshots_mais_recentes(self):
+        diagnostico = DiagnosticoMemoria()
+        diagnostico.max_snapshots = 2
+        try:
+            ids = [diagnostico.tirar_snapshot()[0] for _ in range(3)]
+            assert [s['id'] for s in diagnostico.listar_snapshots()] == ids[1:]
+            with pytest.raises(SnapshotInexistenteError):
+                diagnostico.maiores_alocacoes(ids[0])
+        finally:
+            diagnostico.descartar_snapshots()
+        assert not tracemalloc.is_tracing()
+
+    def test_nao_desliga_tracemalloc_ligado_de_fora(self):
+        diagnostico = DiagnosticoMemoria()
+        tracemalloc.start()
+        try:
+            diagnostico.tirar_snapshot()
+            diagnostico.descartar_snapshots()
+            assert tracemalloc.is_tracing()
+            assert diagnostico.listar_snapshots() == []
+        finally:
+            tracemalloc.stop()
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestMemoriaAPI:
+    """Testes para /api/admin/memoria."""
+
+    def test_resumo_com_sessoes_e_caches(self, isolated_app, isolated_client, admin):
+        isolated_client.get('/api/projetos/1/cronograma', headers=admin)
+        esquecida = db.get_session()
+        projetos = esquecida.query(Projeto).all()
+        try:
+            dados = isolated_client.get('/api/admin/memoria?bytes=1', headers=admin).get_json()
+        finally:
+            esquecida.close()
+
+        assert dados['pid'] == os.getpid()
+        assert dados['sessoes']['abertas'] >= 1
+        assert dados['sessoes']['identity_map']['maiores'][0] >= len(projetos)
+        assert dados['sessoes']['instancias_orm']['Projeto'] >= len(projetos)
+        assert set(dados['caches']) == {'zip', 'cronograma', 'bootstrap'}
+        assert dados['caches']['cronograma']['itens'] >= 1
+        assert dados['caches']['cronograma']['bytes_aproximados'] > 0
+        assert dados['tracemalloc']['ativo'] is False
+
+    def test_snapshots_mostram_onde_a_memoria_cresceu(self, isolated_client, admin):
+        primeiro = isolated_client.post('/api/admin/memoria/snapshots', headers=admin)
+        assert primeiro.status_code == 201
+        assert primeiro.get_json()['anterior'] is None
+
+        retidos = _reter_blocos(2000)
+        segundo = isolated_client.post('/api/admin/memoria/snapshots', headers=admin).get_json()
+
+        id_base, id_snapshot = primeiro.get_json()['id'], segundo['id']
+        assert segundo['anterior'] == id_base
+        maior = segundo['comparacao']['alocacoes'][0]
+        assert 'test_memoria_api.py' in maior['local'][0]
+        assert maior['bytes_diferenca'] >= 2000 * 1024
+
+        por_arquivo = isolated_client.get(f'/api/admin/memoria/snapshots/{id_snapshot}?base={id_base}&agrupar=filename&limite=3',
+                                 headers=admin).get_json()
+        assert len(por_arquivo['alocacoes']) <= 3
+        assert any('test_memoria_api.py' in a['local'][0] for a in por_arquivo['alocacoes'])
+        assert len(retidos) == 2000
+
+    def test_erros_e_descarte(self, isolated_client, admin):
+        id_snapshot = isolated_client.post('/api/admin/memoria/snapshots', headers=admin).get_json()['id']
+
+        assert isolated_client.get(f'/api/admin/memoria/snapshots/{id_snapshot}?agrupar=modulo', headers=admin).status_code == 400
+        assert isolated_client.get(f'/api/admin/memoria/snapshots/{id_snapshot + 100}', headers=admin).status_code == 404
+        assert isolated_client.delete('/api/admin/memoria/snapshots', headers=admin).status_code == 204
+        assert not tracemalloc.is_tracing()
+        assert isolated_client.get(f'/api/admin/memoria/snapshots/{id_snapshot}', headers=admin).status_code == 404
+
+    def test_apenas_admin(self, isolated_client, gerente_headers):
+        assert isolated_client.get('/api/admin/memoria', headers=gerente_headers).status_code == 403
+        assert isolated_client.post('/api/admin/memoria/snapshots', headers=gerente_headers).status_code == 403
+        assert not tracemalloc.is_tracing()
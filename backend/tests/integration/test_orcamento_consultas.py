@@ -0,0 +1,153 @@
+# backend/tests/integration/test_orcamento_consultas.py
+"""
+Testes do orçamento de consultas SQL (utils/query_budget.py): o número de
+consultas das rotas de listagem não pode crescer com a quantidade de dados
+(N+1), e o modo de produção registra as requisições que passam do limite.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from models import Homologacao, Projeto, Tarefa, Usuario
+from services.ingestao_testes import gravar_testes_do_ciclo
+from tests.conftest import ID_GERENTE, ID_MEMBRO, auth_headers_for
+from utils.database import get_db_session
+from utils.query_budget import OrcamentoConsultasExcedido, monitorar_consultas, orcamento_consultas as orcamento
+
+
+# Limites por rota: folga pequena sobre o medido, independente do volume de dados
+ORCAMENTOS = [
+    ('/api/projetos', ID_GERENTE, 6),
+    ('/api/projetos', ID_MEMBRO, 6),
+    ('/api/me/projetos', ID_GERENTE, 6),
+    ('/api/me/tarefas', ID_MEMBRO, 3),
+    ('/api/projetos/1', ID_GERENTE, 6),
+    ('/api/bootstrap', ID_GERENTE, 16),
+    ('/api/bootstrap', ID_MEMBRO, 13),
+    ('/api/relatorios/portfolio', ID_GERENTE, 7),
+]
+
+
+def _semear_projetos(quantidade: int):
+    """Projetos com equipe, tarefas, histórico de status e um ciclo com testes."""
+    with get_db_session() as session:
+        usuarios = session.query(Usuario).order_by(Usuario.id_usuario).all()
+        for i in range(quantidade):
+            projeto = Projeto(
+                nome_projeto=f"Carga {i}", descricao="Projeto de carga", numero_topdesk=f"TD-C{i}",
+                id_responsavel=usuarios[i % len(usuarios)].id_usuario, id_area_solicitante=1,
+                prioridade="Média", complexidade="Média", risco="Baixo",
+            )
+            projeto.equipe.extend(usuarios[:2])
+            session.add(projeto)
+            session.flush()
+            for j in range(3):
+                session.add(Tarefa(
+                    id_projeto=projeto.id_projeto, nome_tarefa=f"Tarefa {j}",
+                    data_inicio="2025-01-01", data_fim="2025-01-05", progresso=0,
+                    id_responsavel_tarefa=usuarios[j % len(usuarios)].id_usuario,
+                ))
+            ciclo = Homologacao(
+                id_projeto=projeto.id_projeto, data_inicio="2025-01-01T00:00:00",
+                id_responsavel_teste=usuarios[0].id_usuario, ambiente="HML", versao_testada="1.0",
+            )
+            session.add(ciclo)
+            session.flush()
+            gravar_testes_do_ciclo(session, ciclo.id_homologacao, [
+                {'history_id': f"c{i}-t{k}", 'nome_teste': f"teste {k}", 'status': 'passed'} for k in range(3)
+            ])
+            projeto.mudar_status("Em Especificação", id_usuario=usuarios[0].id_usuario)
+
+
+def _consultas(client, rota, headers) -> int:
+    with monitorar_consultas() as monitor:
+        response = client.get(rota, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return monitor.total
+
+
+@pytest.mark.integration
+@pytest.mark.database
+class TestOrcamentoPorRota:
+    """As rotas de listagem fazem um número fixo de consultas."""
+
+    @pytest.mark.parametrize('rota, id_usuario, maximo', ORCAMENTOS)
+    def test_consultas_nao_crescem_com_os_dados(self, isolated_app, orcamento_consultas, rota, id_usuario, maximo):
+        client = isolated_app.test_client()
+        headers = auth_headers_for(isolated_app, id_usuario)
+        # Primeira chamada aquece caches que dependem de versão (ex: bootstrap)
+        client.get(rota, headers=headers)
+        _semear_projetos(2)
+        antes = _consultas(client, rota, headers)
+
+        _semear_projetos(8)
+        with orcamento_consultas(maximo) as monitor:
+            response = client.get(rota, headers=headers)
+
+        assert response.status_code == 200
+        assert monitor.total == antes, monitor.relatorio()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestOrcamentoConsultas:
+    """Testes para orcamento_consultas e MonitorConsultas."""
+
+    def test_excesso_lista_os_comandos_repetidos(self, isolated_app):
+        with get_db_session() as session:
+            with pytest.raises(OrcamentoConsultasExcedido) as erro:
+                with orcamento(2):
+                    for id_projeto in (1, 2, 3):
+                        session.execute(text("SELECT nome_projeto FROM projetos WHERE id_projeto = :id"),
+                                        {'id': id_projeto})
+
+        assert "Orçamento de 2 consultas excedido: 3 consultas" in str(erro.value)
+        assert "3x SELECT nome_projeto FROM projetos WHERE id_projeto = ?" in str(erro.value)
+
+    def test_decorador_e_monitores_aninhados(self, isolated_app):
+        @orcamento(1)
+        def uma_consulta(session):
+            session.execute(text("SELECT 1"))
+
+        with get_db_session() as session, monitorar_consultas() as externo:
+            uma_consulta(session)
+            session.execute(text("SELECT id_usuario FROM usuarios WHERE id_usuario IN (1, 2)"))
+
+        assert externo.total == 2
+        assert externo.repetidas() == []
+
+    def test_listas_de_parametros_contam_como_o_mesmo_comando(self, isolated_app):
+        with get_db_session() as session, monitorar_consultas() as monitor:
+            for ids in ([1], [1, 2], [1, 2, 3]):
+                session.query(Usuario).filter(Usuario.id_usuario.in_(ids)).all()
+
+        ((sql, vezes),) = monitor.repetidas()
+        assert vezes == 3
+        assert sql.count('?') == 1
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestOrcamentoEmProducao:
+    """Requisições amostradas acima do orçamento vão para o log."""
+
+    def test_requisicao_acima_do_orcamento_registrada(self, tmp_path, caplog):
+        app = create_app('testing', config_overrides={
+            'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+            'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+            'ORCAMENTO_CONSULTAS': 2,
+            'ORCAMENTO_CONSULTAS_AMOSTRAGEM': 1.0,
+        })
+        client = app.test_client()
+
+        with caplog.at_level(logging.WARNING, logger='utils.query_budget'):
+            client.get('/api/auth/me', headers=auth_headers_for(app, ID_GERENTE))
+            client.get('/api/projetos/1', headers=auth_headers_for(app, ID_GERENTE))
+
+        (registro,) = [r for r in caplog.records if r.name == 'utils.query_budget']
+        assert registro.consultas['rota'] == '/api/projetos/<int:id_projeto>'
+        assert registro.consultas['total'] > 2
+        assert registro.consultas['orcamento'] == 2
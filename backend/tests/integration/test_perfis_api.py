@@ -0,0 +1,96 @@
+# backend/tests/integration/test_perfis_api.py
+"""
+Testes do perfil sob demanda (utils/profiling.py): cabeçalho X-Profile,
+arquivos gravados e GET /api/admin/perfis/<id>/<formato>.
+"""
+
+import os
+import pstats
+import re
+
+import pytest
+
+from app import create_app
+from tests.conftest import ID_GERENTE, ID_ADMIN, auth_headers_for
+
+
+@pytest.fixture
+def app_perfis(tmp_path):
+    return create_app('testing', config_overrides={
+        'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'PERFIS_PASTA': str(tmp_path / 'perfis'),
+        'PERFIS_MAX': 2,
+        'PERFIS_INTERVALO_MS': 0.1,
+    })
+
+
+def _links(response):
+    return dict((formato, url) for url, formato in re.findall(r'<(/api/admin/perfis/[^/]+/(\w+))>', response.headers['Link']))
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestPerfilSobDemanda:
+    """Testes para o cabeçalho X-Profile."""
+
+    def test_admin_recebe_links_para_stats_e_pilhas(self, app_perfis, tmp_path):
+        client = app_perfis.test_client()
+        headers = auth_headers_for(app_perfis, ID_ADMIN)
+
+        resposta = client.get('/api/bootstrap', headers={**headers, 'X-Profile': '1'})
+
+        assert resposta.status_code == 200
+        links = _links(resposta)
+        assert set(links) == {'collapsed', 'txt', 'prof'}
+        assert resposta.headers['X-Profile-Id'] in links['prof']
+
+        colapsado = client.get(links['collapsed'], headers=headers).get_data(as_text=True)
+        linhas = colapsado.splitlines()
+        assert linhas and all(re.match(r'^\S.*;.* \d+$', linha) for linha in linhas)
+        assert any('flask.app:full_dispatch_request' in linha for linha in linhas)
+
+        prof = client.get(links['prof'], headers=headers)
+        assert prof.headers['Content-Disposition'].startswith('attachment')
+        arquivo_prof = tmp_path / 'baixado.prof'
+        arquivo_prof.write_bytes(prof.data)
+        funcoes = {funcao for _, _, funcao in pstats.Stats(str(arquivo_prof)).stats}
+        assert 'get_bootstrap_route' in funcoes
+
+        resumo = client.get(links['txt'], headers=headers).get_data(as_text=True)
+        assert 'amostras' in resumo and 'cumulative' in resumo
+
+    def test_somente_amostragem_sem_cprofile(self, app_perfis):
+        resposta = app_perfis.test_client().get(
+            '/api/projetos', headers={**auth_headers_for(app_perfis, ID_ADMIN), 'X-Profile': 'amostragem'})
+        assert set(_links(resposta)) == {'collapsed', 'txt'}
+
+    def test_ignorado_sem_permissao_ou_sem_cabecalho(self, app_perfis):
+        client = app_perfis.test_client()
+
+        do_gerente = client.get('/api/projetos', headers={**auth_headers_for(app_perfis, ID_GERENTE), 'X-Profile': '1'})
+        sem_token = client.get('/api/projetos', headers={'X-Profile': '1'})
+        sem_cabecalho = client.get('/api/projetos', headers=auth_headers_for(app_perfis, ID_ADMIN))
+
+        assert do_gerente.status_code == 200
+        assert sem_token.status_code == 401
+        for resposta in (do_gerente, sem_token, sem_cabecalho):
+            assert 'X-Profile-Id' not in resposta.headers
+        assert not os.path.exists(app_perfis.config['PERFIS_PASTA'])
+
+    def test_mantem_apenas_os_mais_recentes(self, app_perfis):
+        client = app_perfis.test_client()
+        headers = {**auth_headers_for(app_perfis, ID_ADMIN), 'X-Profile': 'amostragem'}
+        ids = [client.get('/api/areas', headers=headers).headers['X-Profile-Id'] for _ in range(3)]
+
+        restantes = {nome.rpartition('.')[0] for nome in os.listdir(app_perfis.config['PERFIS_PASTA'])}
+        assert restantes == set(ids[1:])
+
+    def test_download_restrito_e_validado(self, app_perfis):
+        client = app_perfis.test_client()
+        admin = auth_headers_for(app_perfis, ID_ADMIN)
+        id_perfil = client.get('/api/areas', headers={**admin, 'X-Profile': '1'}).headers['X-Profile-Id']
+
+        assert client.get(f'/api/admin/perfis/{id_perfil}/txt', headers=auth_headers_for(app_perfis, ID_GERENTE)).status_code == 403
+        assert client.get(f'/api/admin/perfis/{id_perfil}/exe', headers=admin).status_code == 404
+        assert client.get('/api/admin/perfis/..%2Fconfig/txt', headers=admin).status_code == 404
@@ -0,0 +1,102 @@
+# backend/tests/integration/test_projetos_lote_api.py
+"""
+Testes de integração das transições de status e edições em lote
+(POST /api/projetos/batch).
+"""
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from models import Projeto, StatusLog
+from utils.database import get_db_session
+from tests.conftest import ID_GERENTE, ID_MEMBRO, auth_headers_for
+
+
+def _lote(client, headers, corpo, status=200):
+    response = client.post('/api/projetos/batch', headers=headers, json=corpo)
+    assert response.status_code == status, response.get_json()
+    return response.get_json()
+
+
+def _projetos():
+    with get_db_session() as session:
+        return {p.id_projeto: (p.status_atual, p.prioridade, p.data_fim_real) for p in session.query(Projeto)}
+
+
+def _logs():
+    with get_db_session() as session:
+        return [(log.id_projeto, log.status, log.id_usuario) for log in session.query(StatusLog).order_by(StatusLog.id_log)]
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestLoteProjetosAPI:
+    """Testes para POST /api/projetos/batch."""
+
+    def test_transicao_em_lote_grava_logs(self, isolated_client, gerente_headers):
+        resultado = _lote(isolated_client, gerente_headers, {"ids": [1, 2], "status": "Em Especificação", "observacao": "Q3"})
+
+        assert resultado == {"aplicados": [1, 2], "falhas": []}
+        assert {status for status, _, _ in _projetos().values()} == {"Em Especificação"}
+        assert _logs() == [(1, "Em Especificação", ID_GERENTE), (2, "Em Especificação", ID_GERENTE)]
+
+    def test_falhas_parciais_nao_impedem_os_demais(self, isolated_client, gerente_headers):
+        _lote(isolated_client, gerente_headers, {"ids": [1], "status": "Em Especificação"})
+
+        resultado = _lote(isolated_client, gerente_headers, {"ids": [1, 2, 999], "status": "Em Especificação"})
+
+        assert resultado['aplicados'] == [2]
+        assert [(f['id_projeto'], f['motivo']) for f in resultado['falhas']] == [
+            (1, "Projeto já passou pelo status 'Em Especificação'."),
+            (999, "Projeto não encontrado."),
+        ]
+
+    def test_status_ciclico_pode_repetir_e_conclusao_registra_fim(self, isolated_client, gerente_headers):
+        _lote(isolated_client, gerente_headers, {"ids": [1], "status": "Em Desenvolvimento"})
+        assert _lote(isolated_client, gerente_headers, {"ids": [1], "status": "Em Desenvolvimento"})['aplicados'] == [1]
+
+        _lote(isolated_client, gerente_headers, {"ids": [1], "status": "Projeto concluído"})
+        assert _projetos()[1][2] is not None
+
+        resultado = _lote(isolated_client, gerente_headers, {"ids": [1, 2], "status": "Arquivado"})
+        assert resultado['aplicados'] == [] and len(resultado['falhas']) == 2
+
+    def test_permissao_aplicada_na_consulta(self, isolated_client, isolated_app):
+        # O Membro só é responsável pelo projeto 2
+        resultado = _lote(isolated_client, auth_headers_for(isolated_app, ID_MEMBRO),
+                          {"ids": [1, 2], "dados": {"prioridade": "Crítica"}})
+
+        assert resultado['aplicados'] == [2]
+        assert resultado['falhas'][0]['id_projeto'] == 1
+        projetos = _projetos()
+        assert projetos[2][1] == "Crítica" and projetos[1][1] != "Crítica"
+        assert _logs() == []
+
+    def test_validacao(self, isolated_client, gerente_headers):
+        _lote(isolated_client, gerente_headers, {"ids": []}, status=422)
+        _lote(isolated_client, gerente_headers, {"ids": [1]}, status=422)
+        _lote(isolated_client, gerente_headers, {"ids": [1], "dados": {}}, status=422)
+
+    def test_numero_de_comandos_nao_cresce_com_o_lote(self, isolated_client, gerente_headers):
+        with get_db_session() as session:
+            session.add_all([
+                Projeto(nome_projeto=f"Projeto {i}", descricao="", numero_topdesk=str(i), id_responsavel=1,
+                        id_area_solicitante=1, prioridade="Baixa", complexidade="Baixa", risco="Baixo",
+                        status_atual="Em Definição", data_criacao="2025-01-01")
+                for i in range(60)
+            ])
+        ids = sorted(_projetos())
+
+        def contar(ids_lote):
+            comandos = []
+            ouvinte = lambda *args: comandos.append(args[2])
+            event.listen(db.engine, "before_cursor_execute", ouvinte)
+            try:
+                resultado = _lote(isolated_client, gerente_headers, {"ids": ids_lote, "status": "Em Especificação"})
+            finally:
+                event.remove(db.engine, "before_cursor_execute", ouvinte)
+            assert len(resultado['aplicados']) == len(ids_lote)
+            return len(comandos)
+
+        assert contar(ids[:5]) == contar(ids[5:])
@@ -0,0 +1,158 @@
+# backend/tests/integration/test_tarefas_lote_api.py
+"""
+Testes de integração do lote de operações sobre tarefas
+(POST /api/projetos/<id>/tarefas/batch).
+"""
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from models import DependenciaTarefa, Tarefa
+from services.cronograma_service import cronogramas
+from utils.database import get_db_session
+from tests.conftest import ID_MEMBRO, auth_headers_for
+
+
+@pytest.fixture(autouse=True)
+def cronogramas_vazios():
+    cronogramas.limpar()
+
+
+@pytest.fixture
+def tarefas(isolated_client, gerente_headers):
+    """Três tarefas em sequência: A → B → C."""
+    ids = []
+    for nome, inicio, fim in (("A", "2025-01-01", "2025-01-05"), ("B", "2025-01-06", "2025-01-10"),
+                              ("C", "2025-01-11", "2025-01-15")):
+        response = isolated_client.post('/api/projetos/1/tarefas', headers=gerente_headers, json={
+            "nome_tarefa": nome, "data_inicio": inicio, "data_fim": fim,
+            "dependencias": str(ids[-1]) if ids else None,
+        })
+        ids.append(int(response.get_json()['id']))
+    return ids
+
+
+def _lote(client, headers, operacoes, status=200, id_projeto=1):
+    response = client.post(f'/api/projetos/{id_projeto}/tarefas/batch', headers=headers,
+                           json={"operacoes": operacoes})
+    assert response.status_code == status, response.get_json()
+    return response.get_json()
+
+
+def _periodos():
+    with get_db_session() as session:
+        return {t.nome_tarefa: (t.data_inicio, t.data_fim, t.dependencias) for t in session.query(Tarefa)}
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestLoteTarefasAPI:
+    """Testes para POST /api/projetos/<id>/tarefas/batch."""
+
+    def test_aplica_operacoes_mistas(self, isolated_client, gerente_headers, tarefas):
+        a, b, c = tarefas
+
+        resultado = _lote(isolated_client, gerente_headers, [
+            {"op": "update", "id": a, "dados": {"data_fim": "2025-01-07"}},
+            {"op": "create", "dados": {"nome_tarefa": "D", "data_inicio": "2025-01-16",
+                                       "data_fim": "2025-01-20", "dependencias": str(c)}},
+            {"op": "delete", "id": b},
+            {"op": "update", "id": c, "dados": {"dependencias": str(a), "progresso": 50}},
+        ])
+
+        assert [r['op'] for r in resultado['resultados']] == ["update", "create", "delete", "update"]
+        id_d = resultado['resultados'][1]['id']
+        assert resultado['resultados'][1]['tarefa']['name'] == "D"
+        assert resultado['resultados'][2]['tarefa'] is None
+        assert resultado['resultados'][3]['tarefa']['progress'] == 50
+        # C passa a depender de A, que agora termina em 07/01; D vem depois de C
+        assert resultado['tarefas_reprogramadas'] == []
+        assert _periodos() == {
+            "A": ("2025-01-01", "2025-01-07", None),
+            "C": ("2025-01-11", "2025-01-15", str(a)),
+            "D": ("2025-01-16", "2025-01-20", str(c)),
+        }
+        with get_db_session() as session:
+            assert session.query(DependenciaTarefa).filter_by(id_tarefa=id_d).count() == 1
+
+    def test_deslocar_fase_empurra_sucessoras_uma_vez(self, isolated_client, gerente_headers, tarefas):
+        a, b, c = tarefas
+
+        resultado = _lote(isolated_client, gerente_headers, [
+            {"op": "update", "id": a, "dados": {"data_inicio": "2025-01-03", "data_fim": "2025-01-12"}},
+        ])
+
+        assert resultado['tarefas_reprogramadas'] == [b, c]
+        periodos = _periodos()
+        assert periodos["B"][:2] == ("2025-01-13", "2025-01-17")
+        assert periodos["C"][:2] == ("2025-01-18", "2025-01-22")
+
+    def test_excluir_predecessora_atualiza_texto_da_sucessora(self, isolated_client, gerente_headers, tarefas):
+        a, b, c = tarefas
+        _lote(isolated_client, gerente_headers, [{"op": "update", "id": c, "dados": {"dependencias": f"{a}, {b}"}}])
+
+        _lote(isolated_client, gerente_headers, [{"op": "delete", "id": b}])
+
+        assert _periodos()["C"][2] == str(a)
+
+    def test_lote_atomico_com_erros_por_operacao(self, isolated_client, gerente_headers, tarefas):
+        a, b, c = tarefas
+
+        resultado = _lote(isolated_client, gerente_headers, [
+            {"op": "create", "dados": {"nome_tarefa": "D", "data_inicio": "2025-02-01", "data_fim": "2025-02-02"}},
+            {"op": "delete", "id": 9999},
+            {"op": "update", "id": a, "dados": {"data_fim": "2024-12-01"}},
+        ], status=400)
+
+        assert [e['indice'] for e in resultado['erros']] == [1]
+        assert "D" not in _periodos()
+
+        resultado = _lote(isolated_client, gerente_headers, [
+            {"op": "create", "dados": {"nome_tarefa": "D", "data_inicio": "2025-02-01", "data_fim": "2025-02-02"}},
+            {"op": "update", "id": a, "dados": {"data_fim": "2024-12-01"}},
+        ], status=400)
+
+        assert [e['indice'] for e in resultado['erros']] == [1]
+        assert "D" not in _periodos()
+
+    def test_ciclo_desfaz_o_lote(self, isolated_client, gerente_headers, tarefas):
+        a, b, c = tarefas
+
+        response = isolated_client.post('/api/projetos/1/tarefas/batch', headers=gerente_headers, json={"operacoes": [
+            {"op": "update", "id": b, "dados": {"nome_tarefa": "B2"}},
+            {"op": "update", "id": a, "dados": {"dependencias": str(c)}},
+        ]})
+
+        assert response.status_code == 400
+        assert "circular" in response.get_json()['message']
+        assert "B" in _periodos()
+
+    def test_validacao_em_massa_dos_schemas(self, isolated_client, gerente_headers, tarefas):
+        resultado = _lote(isolated_client, gerente_headers, [
+            {"op": "create", "dados": {"nome_tarefa": "D", "data_inicio": "2025-02-01"}},
+            {"op": "update", "id": tarefas[0], "dados": {"progresso": 150}},
+            {"op": "mover"},
+        ], status=422)
+
+        assert sorted({erro['loc'][1] for erro in resultado['detail']}) == [0, 1, 2]
+
+    def test_permissao(self, isolated_client, tarefas, isolated_app):
+        _lote(isolated_client, auth_headers_for(isolated_app, ID_MEMBRO),
+              [{"op": "delete", "id": tarefas[0]}], status=403)
+
+    def test_numero_de_comandos_nao_cresce_com_o_lote(self, isolated_client, gerente_headers, tarefas, isolated_app):
+        def contar(operacoes):
+            comandos = []
+            engine = db.engine
+            ouvinte = lambda *args: comandos.append(args[2])
+            event.listen(engine, "before_cursor_execute", ouvinte)
+            try:
+                _lote(isolated_client, gerente_headers, operacoes)
+            finally:
+                event.remove(engine, "before_cursor_execute", ouvinte)
+            return len(comandos)
+
+        criar = lambda n: [{"op": "create", "dados": {"nome_tarefa": f"T{i}", "data_inicio": "2025-03-01",
+                                                      "data_fim": "2025-03-02"}} for i in range(n)]
+        assert contar(criar(5)) == contar(criar(50))
@@ -0,0 +1,87 @@
+# backend/tests/integration/test_testes_ciclo_api.py
+"""
+Testes de integração da listagem paginada de testes de um ciclo.
+"""
+
+import pytest
+
+from models import Homologacao
+from services.ingestao_testes import gravar_testes_do_ciclo
+from utils.database import get_db_session
+from tests.conftest import ID_MEMBRO, ID_ADMIN, auth_headers_for
+
+
+@pytest.fixture
+def ciclo_com_testes(isolated_app):
+    with get_db_session() as session:
+        ciclo = Homologacao(id_projeto=1, data_inicio="2025-01-01T00:00:00", id_responsavel_teste=1,
+                            ambiente="HML", versao_testada="1.0")
+        session.add(ciclo)
+        session.flush()
+        testes = [
+            {"history_id": f"h{i}", "nome_teste": f"teste_{i:02d}", "status": "failed" if i % 3 == 0 else "passed",
+             "feature": "Login" if i % 2 else "Busca", "severity": "critical"}
+            for i in range(10)
+        ]
+        gravar_testes_do_ciclo(session, ciclo.id_homologacao, testes)
+        return ciclo.id_homologacao
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestTestesDoCicloAPI:
+    """Testes para GET /api/homologacoes/<id>/testes."""
+
+    def test_paginacao_por_cursor_percorre_tudo_em_ordem(self, isolated_app, ciclo_com_testes):
+        client = isolated_app.test_client()
+        headers = auth_headers_for(isolated_app, ID_ADMIN)
+
+        nomes, cursor = [], None
+        while True:
+            url = f'/api/homologacoes/{ciclo_com_testes}/testes?limite=3' + (f'&cursor={cursor}' if cursor else '')
+            pagina = client.get(url, headers=headers).get_json()
+            assert pagina['total'] == 10
+            nomes += [(t['status'], t['nome_teste']) for t in pagina['testes']]
+            cursor = pagina['proximo_cursor']
+            if not cursor:
+                break
+
+        assert len(nomes) == 10
+        assert nomes == sorted(nomes)
+        assert nomes[0] == ('failed', 'teste_00')
+
+    def test_filtros(self, isolated_app, ciclo_com_testes):
+        client = isolated_app.test_client()
+        headers = auth_headers_for(isolated_app, ID_ADMIN)
+
+        pagina = client.get(f'/api/homologacoes/{ciclo_com_testes}/testes?status=failed,broken&feature=Busca',
+                            headers=headers).get_json()
+        assert [t['nome_teste'] for t in pagina['testes']] == ['teste_00', 'teste_06']
+
+        pagina = client.get(f'/api/homologacoes/{ciclo_com_testes}/testes?q=_0', headers=headers).get_json()
+        assert pagina['total'] == 10
+        pagina = client.get(f'/api/homologacoes/{ciclo_com_testes}/testes?q=e_07', headers=headers).get_json()
+        assert [t['nome_teste'] for t in pagina['testes']] == ['teste_07']
+
+    def test_parametros_invalidos(self, isolated_app, ciclo_com_testes):
+        client = isolated_app.test_client()
+        headers = auth_headers_for(isolated_app, ID_ADMIN)
+
+        assert client.get(f'/api/homologacoes/{ciclo_com_testes}/testes?status=quebrado',
+                          headers=headers).status_code == 400
+        assert client.get(f'/api/homologacoes/{ciclo_com_testes}/testes?cursor=xyz',
+                          headers=headers).status_code == 400
+
+    def test_permissao_e_ciclo_inexistente(self, isolated_app, ciclo_com_testes):
+        client = isolated_app.test_client()
+
+        assert client.get(f'/api/homologacoes/{ciclo_com_testes}/testes',
+                          headers=auth_headers_for(isolated_app, ID_MEMBRO)).status_code == 403
+        assert client.get('/api/homologacoes/999/testes',
+                          headers=auth_headers_for(isolated_app, ID_ADMIN)).status_code == 404
+
+    def test_payload_do_ciclo_nao_embute_testes(self, isolated_app, ciclo_com_testes):
+        with get_db_session() as session:
+            dados = session.get(Homologacao, ciclo_com_testes).para_dicionario()
+
+        assert 'testes_executados' not in dados
@@ -0,0 +1,84 @@
+# backend/tests/integration/test_timeline_api.py
+"""
+Testes de integração da timeline colunar (roadmap e Gantt).
+"""
+
+import pytest
+
+from models import Projeto, Tarefa
+from utils.database import get_db_session
+from tests.conftest import ID_GERENTE, ID_MEMBRO, auth_headers_for
+
+
+@pytest.fixture
+def cronograma(isolated_app):
+    """Datas previstas nos dois projetos e três tarefas no projeto 1."""
+    with get_db_session() as session:
+        session.get(Projeto, 1).data_inicio_prevista = "2025-01-01T00:00:00"
+        session.get(Projeto, 1).data_fim_prevista = "2025-06-30T00:00:00"
+        session.get(Projeto, 2).data_inicio_prevista = "2025-08-01"
+        session.get(Projeto, 2).data_fim_prevista = "2025-12-31"
+        session.add_all([
+            Tarefa(id_projeto=1, nome_tarefa="Levantamento", data_inicio="2025-01-01", data_fim="2025-01-31", progresso=100),
+            Tarefa(id_projeto=1, nome_tarefa="Desenvolvimento", data_inicio="2025-02-01", data_fim="2025-05-31",
+                   progresso=50, dependencias="1", id_responsavel_tarefa=2),
+            Tarefa(id_projeto=1, nome_tarefa="Implantação", data_inicio="2025-06-01", data_fim="2025-06-30", progresso=0),
+        ])
+    return isolated_app
+
+
+def _timeline(app, id_usuario=ID_GERENTE, status=200, headers=None, **params):
+    client = app.test_client()
+    response = client.get('/api/timeline', query_string=params,
+                          headers={**auth_headers_for(app, id_usuario), **(headers or {})})
+    assert response.status_code == status
+    return response
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestTimelineAPI:
+    """Testes para GET /api/timeline."""
+
+    def test_projetos_em_formato_colunar(self, cronograma):
+        projetos = _timeline(cronograma).get_json()['projetos']
+
+        assert projetos == {
+            "ids": [1, 2],
+            "nomes": ["Implementar Portal de Fidelidade", "Otimização de Infraestrutura Cloud"],
+            "inicios": ["2025-01-01", "2025-08-01"],
+            "fins": ["2025-06-30", "2025-12-31"],
+            "status": ["Em Definição", "Em Definição"],
+            "progresso": [50, None],
+        }
+
+    def test_tarefas_filtradas_pela_janela(self, cronograma):
+        dados = _timeline(cronograma, incluir='tarefas', inicio='2025-03-01', fim='2025-06-15').get_json()
+
+        assert 'projetos' not in dados
+        assert dados['janela'] == {"inicio": "2025-03-01", "fim": "2025-06-15"}
+        assert dados['tarefas']['nomes'] == ["Desenvolvimento", "Implantação"]
+        assert dados['tarefas']['dependencias'] == ["1", None]
+        assert dados['tarefas']['id_responsavel'] == [2, None]
+
+    def test_filtra_por_permissao(self, cronograma):
+        dados = _timeline(cronograma, id_usuario=ID_MEMBRO, incluir='projetos,tarefas').get_json()
+
+        assert dados['projetos']['ids'] == [2]
+        assert dados['tarefas']['ids'] == []
+        _timeline(cronograma, id_usuario=ID_MEMBRO, status=403, id_projeto=1)
+
+    def test_janela_invalida(self, cronograma):
+        _timeline(cronograma, status=400, inicio='01/02/2025')
+        _timeline(cronograma, status=400, inicio='2025-06-01', fim='2025-01-01')
+
+    def test_revalidacao_por_etag(self, cronograma):
+        primeira = _timeline(cronograma)
+        etag = primeira.headers['ETag']
+        assert 'private' in primeira.headers['Cache-Control']
+
+        _timeline(cronograma, status=304, headers={'If-None-Match': etag})
+
+        with get_db_session() as session:
+            session.get(Projeto, 2).nome_projeto = "Migração Cloud"
+        assert _timeline(cronograma, headers={'If-None-Match': etag}).headers['ETag'] != etag
@@ -0,0 +1,233 @@
+# backend/tests/unit/test_analise_testes.py
+"""
+Testes unitários das estatísticas incrementais e das consultas de análise de testes.
+"""
+
+import pytest
+
+from models import Homologacao, Usuario, EstatisticaTeste
+from services.analise_testes_service import AnaliseTestesService
+from services.homologacao_service import HomologacaoService
+from services.ingestao_testes import gravar_testes_do_ciclo, recalcular_estatisticas_projeto
+from utils.database import get_db_session
+
+
+def _teste(nome, status):
+    return {"history_id": f"hist-{nome}", "nome_teste": nome, "status": status,
+            "mensagem_erro": "falhou" if status == 'failed' else None}
+
+
+def _novo_ciclo(session, id_projeto=1):
+    ciclo = Homologacao(id_projeto=id_projeto, data_inicio="2025-01-01T00:00:00", id_responsavel_teste=1,
+                        ambiente="HML", versao_testada="1.0")
+    session.add(ciclo)
+    session.flush()
+    return ciclo.id_homologacao
+
+
+def _estatisticas(session):
+    return {
+        e.definicao.nome_teste: (e.execucoes, e.aprovacoes, e.reprovacoes, e.transicoes, round(e.score_instabilidade, 4))
+        for e in session.query(EstatisticaTeste).filter_by(id_projeto=1)
+    }
+
+
+@pytest.fixture
+def tres_ciclos(isolated_app):
+    """'instavel' alterna a cada ciclo; 'estavel' sempre passa; 'quebrou' falha só no último."""
+    ids = []
+    with get_db_session() as session:
+        for i, status in enumerate(['passed', 'failed', 'passed']):
+            id_ciclo = _novo_ciclo(session)
+            gravar_testes_do_ciclo(session, id_ciclo, [
+                _teste("instavel", status),
+                _teste("estavel", 'passed'),
+                _teste("quebrou", 'failed' if i == 2 else 'passed'),
+            ])
+            ids.append(id_ciclo)
+    return ids
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestEstatisticasIncrementais:
+    """Testes da manutenção das estatísticas na ingestão."""
+
+    def test_contagem_de_transicoes(self, tres_ciclos):
+        with get_db_session() as session:
+            estatisticas = _estatisticas(session)
+
+        assert estatisticas["instavel"] == (3, 2, 1, 2, 1.0)
+        assert estatisticas["estavel"] == (3, 3, 0, 0, 0.0)
+        assert estatisticas["quebrou"] == (3, 2, 1, 1, 0.5)
+
+    def test_incremental_igual_ao_recalculo(self, tres_ciclos):
+        with get_db_session() as session:
+            incremental = _estatisticas(session)
+            recalcular_estatisticas_projeto(session, 1)
+            session.flush()
+            assert _estatisticas(session) == incremental
+
+    def test_reenvio_do_ultimo_ciclo_recalcula(self, tres_ciclos):
+        with get_db_session() as session:
+            gravar_testes_do_ciclo(session, tres_ciclos[-1], [_teste("instavel", 'failed')])
+
+        with get_db_session() as session:
+            estatisticas = _estatisticas(session)
+        assert estatisticas["instavel"] == (3, 1, 2, 1, 0.5)
+        assert estatisticas["estavel"] == (2, 2, 0, 0, 0.0)
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestAnaliseTestesService:
+    """Testes das consultas do AnaliseTestesService."""
+
+    def test_testes_instaveis_ordenados_por_score(self, tres_ciclos):
+        with AnaliseTestesService() as service:
+            instaveis = service.get_testes_instaveis(1)
+
+        assert [t['nome_teste'] for t in instaveis] == ["instavel", "quebrou"]
+
+    def test_novas_falhas_contra_ciclo_anterior(self, tres_ciclos):
+        with AnaliseTestesService() as service:
+            resultado = service.get_novas_falhas(tres_ciclos[-1])
+
+        assert resultado['id_homologacao_anterior'] == tres_ciclos[1]
+        assert [t['nome_teste'] for t in resultado['testes']] == ["quebrou"]
+
+    def test_historico_respeita_visibilidade(self, tres_ciclos):
+        with AnaliseTestesService() as service:
+            gerente = service.session.get(Usuario, 1)
+            membro = service.session.get(Usuario, 2)  # responsável apenas pelo projeto 2
+            id_definicao = service.get_testes_instaveis(1)[0]['id_definicao']
+
+            historico = service.get_historico_teste(id_definicao, gerente, limite=2)
+            historico_membro = service.get_historico_teste(id_definicao, membro)
+
+        assert [e['status'] for e in historico['execucoes']] == ['passed', 'failed']
+        assert historico_membro['execucoes'] == []
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestDiffCiclos:
+    """Testes do diff de resultados entre dois ciclos."""
+
+    @pytest.fixture
+    def dois_ciclos(self, isolated_app):
+        with get_db_session() as session:
+            anterior = _novo_ciclo(session)
+            gravar_testes_do_ciclo(session, anterior, [
+                _teste("a", 'passed'), _teste("b", 'failed'), _teste("c", 'failed'),
+                _teste("d", 'passed'), _teste("e", 'passed'),
+            ])
+            atual = _novo_ciclo(session)
+            gravar_testes_do_ciclo(session, atual, [
+                _teste("a", 'failed'), _teste("b", 'passed'), _teste("c", 'broken'),
+                _teste("d", 'passed'), _teste("f", 'passed'),
+            ])
+        return anterior, atual
+
+    def test_categorias_contra_ciclo_anterior(self, dois_ciclos):
+        anterior, atual = dois_ciclos
+        with AnaliseTestesService() as service:
+            diff = service.get_diff_ciclos(atual)
+
+        assert diff['id_homologacao_comparado'] == anterior
+        assert diff['contagens'] == {
+            'corrigidos': 1, 'novas_falhas': 1, 'continuam_falhando': 1,
+            'adicionados': 1, 'removidos': 1, 'inalterados': 1,
+        }
+        nomes = {c: [t['nome_teste'] for t in testes] for c, testes in diff['testes'].items()}
+        assert nomes == {
+            'corrigidos': ["b"], 'novas_falhas': ["a"], 'continuam_falhando': ["c"],
+            'adicionados': ["f"], 'removidos': ["e"],
+        }
+        assert diff['testes']['novas_falhas'][0]['status_anterior'] == 'passed'
+        assert diff['testes']['removidos'][0]['status'] is None
+
+    def test_paginacao_por_categoria(self, dois_ciclos):
+        anterior, atual = dois_ciclos
+        # Invertendo a comparação, o ciclo antigo tem 'e' adicionado e 'f' removido
+        with AnaliseTestesService() as service:
+            primeira = service.get_diff_ciclos(anterior, atual, categoria='corrigidos', limite=1)
+            vazia = service.get_diff_ciclos(anterior, atual, categoria='corrigidos', limite=1, offset=1)
+
+        assert list(primeira['testes']) == ['corrigidos']
+        assert [t['nome_teste'] for t in primeira['testes']['corrigidos']] == ["a"]
+        assert vazia['testes']['corrigidos'] == []
+
+    def test_sem_ciclo_anterior_tudo_adicionado(self, dois_ciclos):
+        anterior, _ = dois_ciclos
+        with AnaliseTestesService() as service:
+            diff = service.get_diff_ciclos(anterior)
+
+        assert diff['id_homologacao_comparado'] is None
+        assert diff['contagens']['adicionados'] == 5
+
+    def test_categoria_invalida(self, dois_ciclos):
+        with AnaliseTestesService() as service:
+            with pytest.raises(ValueError):
+                service.get_diff_ciclos(dois_ciclos[1], categoria='todas')
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestAgrupamentosFalha:
+    """Testes das assinaturas de falha gravadas na ingestão e dos agrupamentos."""
+
+    @pytest.fixture
+    def ciclos_com_falhas(self, isolated_app):
+        ids = []
+        with get_db_session() as session:
+            for id_projeto, deslocamento in ((1, 0), (1, 10), (2, 20)):
+                id_ciclo = _novo_ciclo(session, id_projeto)
+                gravar_testes_do_ciclo(session, id_ciclo, [
+                    {"history_id": f"p{id_projeto}-t{i}", "nome_teste": f"t{i}", "status": 'failed',
+                     "mensagem_erro": f"Timeout after {i + deslocamento}ms on /srv/app-{i}/login"}
+                    for i in range(3)
+                ] + [
+                    {"history_id": f"p{id_projeto}-x", "nome_teste": "x", "status": 'broken',
+                     "mensagem_erro": "NullPointerException in CheckoutService"},
+                    {"history_id": f"p{id_projeto}-ok", "nome_teste": "ok", "status": 'passed',
+                     "mensagem_erro": "ignorada"},
+                ])
+                ids.append(id_ciclo)
+        return ids
+
+    def test_agrupamento_do_ciclo(self, ciclos_com_falhas):
+        with AnaliseTestesService() as service:
+            grupos = service.get_agrupamentos_falha_ciclo(ciclos_com_falhas[0])
+
+        assert [(g['assinatura'], g['quantidade']) for g in grupos] == [
+            ("Timeout after <n>ms on <path>", 3),
+            ("NullPointerException in CheckoutService", 1),
+        ]
+
+    def test_agrupamento_entre_projetos_com_permissao(self, ciclos_com_falhas):
+        with AnaliseTestesService() as service:
+            gerente = service.session.get(Usuario, 1)
+            membro = service.session.get(Usuario, 2)
+            todos = service.get_agrupamentos_falha(gerente)
+            do_membro = service.get_agrupamentos_falha(membro)
+
+        assert (todos[0]['total_falhas'], todos[0]['ciclos'], todos[0]['projetos']) == (9, 3, 2)
+        assert do_membro[0]['total_falhas'] == 3
+
+    def test_busca_textual_nas_falhas(self, ciclos_com_falhas):
+        with AnaliseTestesService() as service:
+            gerente = service.session.get(Usuario, 1)
+            encontrados = service.get_agrupamentos_falha(gerente, termo="checkout")
+            nada = service.get_agrupamentos_falha(gerente, termo="inexistente")
+
+        assert [g['assinatura'] for g in encontrados] == ["NullPointerException in CheckoutService"]
+        assert nada == []
+
+    def test_filtro_de_testes_por_assinatura(self, ciclos_com_falhas):
+        with AnaliseTestesService() as service:
+            grupo = service.get_agrupamentos_falha_ciclo(ciclos_com_falhas[0])[0]
+        with HomologacaoService() as service:
+            pagina = service.get_testes_por_ciclo(ciclos_com_falhas[0], id_assinatura=grupo['id_assinatura'])
+
+        assert sorted(t['nome_teste'] for t in pagina['testes']) == ["t0", "t1", "t2"]
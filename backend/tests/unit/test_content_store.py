@@ -0,0 +1,169 @@
+# backend/tests/unit/test_content_store.py
+"""
+Testes unitários do armazenamento de uploads endereçado por conteúdo.
+"""
+
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from models import Homologacao, RelatorioArmazenado
+from services import homologacao_service
+from services.homologacao_service import HomologacaoService
+from utils import content_store
+from utils.database import get_db_session
+from tests.fixtures.allure import criar_zip_allure, resultado_allure
+
+
+def _criar_ciclos(quantidade):
+    with get_db_session() as session:
+        ciclos = [
+            Homologacao(id_projeto=1, data_inicio=f"2025-01-0{i + 1}T00:00:00", id_responsavel_teste=1,
+                        ambiente="HML", versao_testada=f"1.{i}")
+            for i in range(quantidade)
+        ]
+        session.add_all(ciclos)
+        session.flush()
+        return [c.id_homologacao for c in ciclos]
+
+
+def _arquivos_armazenados(upload_folder):
+    raiz = content_store.pasta_objetos(upload_folder)
+    return [os.path.join(d, f) for d, _, arquivos in os.walk(raiz) for f in arquivos]
+
+
+@pytest.mark.unit
+class TestSalvarStream:
+    """Testes da gravação com hash em streaming."""
+
+    def test_conteudo_identico_nao_duplica(self, tmp_path):
+        primeiro = content_store.salvar_stream(io.BytesIO(b"abc" * 1000), str(tmp_path), chunk_size=7)
+        segundo = content_store.salvar_stream(io.BytesIO(b"abc" * 1000), str(tmp_path))
+
+        assert primeiro.novo is True
+        assert segundo.novo is False
+        assert primeiro.sha256 == segundo.sha256
+        assert primeiro.caminho == segundo.caminho
+        assert primeiro.tamanho_bytes == 3000
+        assert len(_arquivos_armazenados(str(tmp_path))) == 1
+
+    def test_conteudos_diferentes_geram_objetos_diferentes(self, tmp_path):
+        a = content_store.salvar_stream(io.BytesIO(b"a"), str(tmp_path))
+        b = content_store.salvar_stream(io.BytesIO(b"b"), str(tmp_path))
+
+        assert a.caminho != b.caminho
+        assert a.caminho.endswith(f"{a.sha256}.xml")
+
+    def test_extensao_vem_do_conteudo(self, tmp_path):
+        allure = content_store.salvar_stream(io.BytesIO(criar_zip_allure([resultado_allure("login")])), str(tmp_path))
+        assert allure.caminho.endswith(f"{allure.sha256}.zip")
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestUploadDeduplicado:
+    """Testes da deduplicação e do cache de parsing no HomologacaoService."""
+
+    def test_upload_repetido_reutiliza_arquivo_e_parsing(self, isolated_app):
+        upload_folder = isolated_app.config['UPLOAD_FOLDER']
+        conteudo = criar_zip_allure([
+            resultado_allure("login"),
+            resultado_allure("checkout", status="failed", mensagem="Timeout"),
+        ])
+        id_a, id_b = _criar_ciclos(2)
+
+        with patch.object(homologacao_service, 'parse_relatorio',
+                          wraps=homologacao_service.parse_relatorio) as parser:
+            with HomologacaoService() as service:
+                ciclo_a = service.processar_upload_de_relatorio(id_a, io.BytesIO(conteudo), upload_folder)
+            with HomologacaoService() as service:
+                ciclo_b = service.processar_upload_de_relatorio(id_b, io.BytesIO(conteudo), upload_folder)
+
+        assert parser.call_count == 1
+        assert ciclo_a['caminho_relatorio_zip'] == ciclo_b['caminho_relatorio_zip']
+        assert ciclo_b['total_testes'] == 2
+        assert ciclo_b['testes_reprovados'] == 1
+        with HomologacaoService() as service:
+            assert service.get_testes_por_ciclo(id_b)['total'] == 2
+        assert len(_arquivos_armazenados(upload_folder)) == 1
+
+    def test_substituir_relatorio_remove_arquivo_sem_referencia(self, isolated_app):
+        upload_folder = isolated_app.config['UPLOAD_FOLDER']
+        (id_ciclo,) = _criar_ciclos(1)
+        antigo = criar_zip_allure([resultado_allure("antigo")])
+        novo = criar_zip_allure([resultado_allure("novo")])
+
+        with HomologacaoService() as service:
+            caminho_antigo = service.processar_upload_de_relatorio(id_ciclo, io.BytesIO(antigo), upload_folder)['caminho_relatorio_zip']
+        with HomologacaoService() as service:
+            caminho_novo = service.processar_upload_de_relatorio(id_ciclo, io.BytesIO(novo), upload_folder)['caminho_relatorio_zip']
+
+        assert not os.path.exists(caminho_antigo)
+        assert os.path.exists(caminho_novo)
+        with get_db_session() as session:
+            assert session.query(RelatorioArmazenado).count() == 1
+
+    def test_upload_invalido_nao_deixa_arquivo(self, isolated_app):
+        upload_folder = isolated_app.config['UPLOAD_FOLDER']
+        (id_ciclo,) = _criar_ciclos(1)
+
+        with pytest.raises(ValueError):
+            with HomologacaoService() as service:
+                service.processar_upload_de_relatorio(id_ciclo, io.BytesIO(b"nao e zip"), upload_folder)
+
+        assert _arquivos_armazenados(upload_folder) == []
+
+    def test_erro_depois_da_gravacao_nao_deixa_arquivo(self, isolated_app):
+        upload_folder = isolated_app.config['UPLOAD_FOLDER']
+        (id_ciclo,) = _criar_ciclos(1)
+        conteudo = criar_zip_allure([resultado_allure("login")])
+
+        with patch.object(homologacao_service, 'gravar_testes_do_ciclo', side_effect=RuntimeError("falha")):
+            with pytest.raises(RuntimeError):
+                with HomologacaoService() as service:
+                    service.processar_upload_de_relatorio(id_ciclo, io.BytesIO(conteudo), upload_folder)
+
+        assert _arquivos_armazenados(upload_folder) == []
+
+    def test_referencia_criada_antes_da_remocao_preserva_o_arquivo(self, isolated_app):
+        upload_folder = isolated_app.config['UPLOAD_FOLDER']
+        id_antigo, id_concorrente = _criar_ciclos(2)
+        with HomologacaoService() as service:
+            caminho = service.processar_upload_de_relatorio(
+                id_antigo, io.BytesIO(criar_zip_allure([resultado_allure("antigo")])), upload_folder
+            )['caminho_relatorio_zip']
+
+        def _upload_concorrente(sessao):
+            # Outro upload dos mesmos bytes termina entre o commit e a remoção
+            with get_db_session() as outra:
+                outra.get(Homologacao, id_concorrente).caminho_relatorio_zip = caminho
+
+        with HomologacaoService() as service:
+            event.listen(service.session, 'after_commit', _upload_concorrente, once=True)
+            service.processar_upload_de_relatorio(
+                id_antigo, io.BytesIO(criar_zip_allure([resultado_allure("novo")])), upload_folder)
+
+        assert os.path.exists(caminho)
+
+    def test_copia_de_objeto_guardado_com_outra_extensao_e_removida(self, isolated_app):
+        upload_folder = isolated_app.config['UPLOAD_FOLDER']
+        id_a, id_b = _criar_ciclos(2)
+        conteudo = criar_zip_allure([resultado_allure("login")])
+        with HomologacaoService() as service:
+            caminho = service.processar_upload_de_relatorio(id_a, io.BytesIO(conteudo), upload_folder)['caminho_relatorio_zip']
+
+        # Objeto gravado antes, quando a extensão vinha do nome enviado
+        legado = caminho[:-len('.zip')] + '.xml'
+        os.rename(caminho, legado)
+        with get_db_session() as session:
+            session.query(RelatorioArmazenado).update({'caminho_arquivo': legado})
+            session.get(Homologacao, id_a).caminho_relatorio_zip = legado
+
+        with HomologacaoService() as service:
+            ciclo_b = service.processar_upload_de_relatorio(id_b, io.BytesIO(conteudo), upload_folder)
+
+        assert ciclo_b['caminho_relatorio_zip'] == legado
+        assert _arquivos_armazenados(upload_folder) == [legado]
@@ -0,0 +1,38 @@
+# backend/tests/unit/test_failure_signature.py
+"""
+Testes unitários da normalização de mensagens de falha.
+"""
+
+import pytest
+
+from utils.failure_signature import normalizar_mensagem, hash_assinatura, TAMANHO_MAXIMO
+
+
+@pytest.mark.unit
+class TestNormalizarMensagem:
+    """Testes de normalizar_mensagem."""
+
+    @pytest.mark.parametrize("mensagem, esperado", [
+        ("Timeout after 30000ms waiting for /tmp/run-8731/page.html",
+         "Timeout after <n>ms waiting for <path>"),
+        ("expected 200 but got 500 at https://api.example.com/v1/users/123?x=1",
+         "expected <n> but got <n> at <url>"),
+        ("User 550e8400-e29b-41d4-a716-446655440000 not found",
+         "User <uuid> not found"),
+        ("Object 0x7ffe12 (hash 4f2a9c1e) is stale", "Object <hex> (hash <hex>) is stale"),
+        ("Falha  ao\n  salvar\tpedido", "Falha ao salvar pedido"),
+    ])
+    def test_remove_partes_variaveis(self, mensagem, esperado):
+        assert normalizar_mensagem(mensagem) == esperado
+
+    def test_mesma_causa_mesmo_hash(self):
+        a = normalizar_mensagem("Pedido 1234 não encontrado em C:\\dados\\lote-77\\pedidos.csv")
+        b = normalizar_mensagem("Pedido 98 não encontrado em C:\\dados\\lote-3\\pedidos.csv")
+
+        assert a == b
+        assert hash_assinatura(a) == hash_assinatura(b)
+
+    def test_mensagem_vazia_e_longa(self):
+        assert normalizar_mensagem(None) is None
+        assert normalizar_mensagem("   ") is None
+        assert len(normalizar_mensagem("erro " * 500)) == TAMANHO_MAXIMO
@@ -0,0 +1,128 @@
+# backend/tests/unit/test_ingestao_testes.py
+"""
+Testes unitários da gravação normalizada de testes executados e da migração
+dos dados no formato antigo.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from data_sources.migrations import aplicar_migracoes
+from models import Base, DefinicaoTeste, TesteExecutado
+from services.ingestao_testes import gravar_testes_do_ciclo
+from utils.database import get_db_session
+
+
+def _teste(nome, status='passed', mensagem=None, history_id=None):
+    return {
+        "uuid": f"uuid-{nome}", "history_id": history_id or f"hist-{nome}", "full_name": f"pkg.{nome}",
+        "nome_teste": nome, "status": status, "mensagem_erro": mensagem,
+        "feature": "Login", "severity": "critical",
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestGravarTestesDoCiclo:
+    """Testes da ingestão em dimensão + fato."""
+
+    def test_definicoes_reaproveitadas_entre_ciclos(self, isolated_app):
+        with get_db_session() as session:
+            gravar_testes_do_ciclo(session, 1, [_teste("a"), _teste("b", "failed", "Erro 1")])
+            gravar_testes_do_ciclo(session, 2, [_teste("a", "failed", "Erro 2"), _teste("b")])
+
+        with get_db_session() as session:
+            assert session.query(DefinicaoTeste).count() == 2
+            assert session.query(TesteExecutado).count() == 4
+            falha = session.query(TesteExecutado).filter_by(id_homologacao=2, status_codigo=1).one()
+            assert falha.status == 'failed'
+            assert falha.mensagem_erro == "Erro 2"
+            assert falha.para_dicionario()['nome_teste'] == "a"
+
+    def test_retentativas_viram_uma_execucao(self, isolated_app):
+        with get_db_session() as session:
+            gravados = gravar_testes_do_ciclo(session, 1, [
+                _teste("a", "failed", history_id="h1"),
+                _teste("a", "passed", history_id="h1"),
+            ])
+
+        assert gravados == 1
+        with get_db_session() as session:
+            assert session.query(TesteExecutado).one().status == 'passed'
+
+    def test_regravar_ciclo_substitui_execucoes(self, isolated_app):
+        with get_db_session() as session:
+            gravar_testes_do_ciclo(session, 1, [_teste("a"), _teste("b")])
+            gravar_testes_do_ciclo(session, 1, [_teste("c")])
+
+        with get_db_session() as session:
+            execucoes = session.query(TesteExecutado).filter_by(id_homologacao=1).all()
+            assert [t.definicao.nome_teste for t in execucoes] == ["c"]
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestMigracaoNormalizacao:
+    """Testes da migração do formato antigo de 'testes_executados'."""
+
+    @staticmethod
+    def _banco_legado(caminho, linhas):
+        conn = sqlite3.connect(caminho)
+        conn.execute("""
+            CREATE TABLE testes_executados (
+                id_execucao INTEGER PRIMARY KEY, id_homologacao INTEGER, uuid VARCHAR,
+                nome_teste VARCHAR, status VARCHAR, mensagem_erro TEXT, feature VARCHAR, severity VARCHAR,
+                CONSTRAINT _homologacao_uuid_uc UNIQUE (id_homologacao, uuid)
+            )
+        """)
+        conn.executemany("INSERT INTO testes_executados VALUES (?, ?, ?, ?, ?, ?, ?, ?)", linhas)
+        conn.commit()
+        conn.close()
+
+        engine = create_engine(f"sqlite:///{caminho}")
+        Base.metadata.create_all(engine)
+        return engine, aplicar_migracoes(engine)
+
+    def test_migra_dados_legados(self, tmp_path):
+        engine, versao = self._banco_legado(tmp_path / "legado.db", [
+            (1, 10, 'u1', 'login', 'passed', None, 'Auth', 'critical'),
+            (2, 11, 'u2', 'login', 'failed', 'Timeout', 'Auth', 'critical'),
+            (3, 11, 'u3', 'busca', 'broken', 'NPE', 'Busca', 'normal'),
+        ])
+
+        with engine.connect() as c:
+            colunas = [linha[1] for linha in c.exec_driver_sql("PRAGMA table_info(testes_executados)")]
+            definicoes = c.exec_driver_sql("SELECT COUNT(*) FROM definicoes_teste").scalar()
+            execucoes = c.exec_driver_sql(
+                "SELECT id_execucao, status_codigo FROM testes_executados ORDER BY id_execucao"
+            ).all()
+            falhas = c.exec_driver_sql(
+                "SELECT a.assinatura, f.quantidade FROM falhas_por_ciclo f "
+                "JOIN assinaturas_falha a ON a.id_assinatura = f.id_assinatura ORDER BY a.assinatura"
+            ).all()
+
+        assert versao >= 2
+        assert 'uuid' not in colunas
+        assert definicoes == 2
+        assert execucoes == [(1, 2), (2, 1), (3, 0)]
+        assert falhas == [("NPE", 1), ("Timeout", 1)]
+
+    def test_repetidos_no_ciclo_mantem_o_ultimo_e_sao_registrados(self, tmp_path, caplog):
+        with caplog.at_level("WARNING", logger="data_sources.migrations"):
+            engine, _ = self._banco_legado(tmp_path / "legado.db", [
+                (1, 10, 'u1', 'login[chrome]', 'passed', None, 'Auth', 'critical'),
+                (2, 10, 'u2', 'login[chrome]', 'failed', 'Timeout', 'Auth', 'critical'),
+                (3, 10, 'u3', None, 'broken', 'NPE', None, None),
+            ])
+
+        with engine.connect() as c:
+            execucoes = c.exec_driver_sql(
+                "SELECT t.id_execucao, d.chave_identidade, t.status_codigo FROM testes_executados t "
+                "JOIN definicoes_teste d ON d.id_definicao = t.id_definicao ORDER BY t.id_execucao"
+            ).all()
+
+        assert execucoes == [(2, 'login[chrome]', 1), (3, 'u3', 0)]
+        descartes = [r.getMessage() for r in caplog.records if 'não migrada' in r.getMessage()]
+        assert len(descartes) == 1 and descartes[0].startswith("Execução 1 (ciclo 10")
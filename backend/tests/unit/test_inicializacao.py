@@ -0,0 +1,127 @@
+# backend/tests/unit/test_inicializacao.py
+"""
+Orçamento de tempo da inicialização: import do app (python -X importtime) e
+create_app sobre um banco já existente, sem create_all nem migrações.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import create_app
+from data_sources.migrations import versao_esquema_atual
+from extensions import db
+
+PASTA_BACKEND = os.path.join(os.path.dirname(__file__), '..', '..')
+
+# Folgados o bastante para máquinas de CI lentas; a regressão que importa
+# (um import pesado de volta no caminho de inicialização) é verificada
+# pelos nomes dos módulos logo abaixo
+ORCAMENTO_IMPORT_APP = 1.0
+ORCAMENTO_CREATE_APP = 0.5
+
+# Só devem ser importados na primeira requisição que os usa
+MODULOS_SOB_DEMANDA = ('pydantic', 'schemas.projeto_schema', 'schemas.homologacao_schema',
+                       'schemas.usuario_schema', 'schemas.tarefa_schema', 'parsers')
+
+
+def _interpretador_novo(codigo: str):
+    """
+    Executa 'codigo' com -X importtime em um interpretador novo. Devolve o
+    tempo acumulado (s) de cada import e os módulos carregados ao final (o
+    importtime não registra os imports feitos via importlib).
+    """
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"{codigo}\nimport sys\nprint('\\n'.join(sys.modules))"],
+        cwd=PASTA_BACKEND, capture_output=True, text=True, check=True,
+    )
+    tempos = {}
+    for linha in resultado.stderr.splitlines():
+        if linha.startswith('import time:') and '|' in linha:
+            _, acumulado, modulo = linha.split('|')
+            if acumulado.strip().isdigit():
+                tempos[modulo.strip()] = int(acumulado) / 1_000_000
+    return tempos, set(resultado.stdout.split())
+
+
+def _criar_app(tmp_path):
+    return create_app('testing', config_overrides={
+        'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+    })
+
+
+class _Comandos:
+    """Coleta os comandos SQL executados por qualquer engine dentro do bloco."""
+
+    def __enter__(self):
+        self.sql = []
+        event.listen(Engine, 'before_cursor_execute', self._registrar)
+        return self
+
+    def _registrar(self, conn, cursor, sql, parametros, contexto, executemany):
+        self.sql.append(sql.strip().upper())
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self._registrar)
+
+    def ddl(self):
+        return [s for s in self.sql if s.startswith(('CREATE', 'ALTER', 'PRAGMA TABLE_INFO', 'PRAGMA MAIN.TABLE_INFO'))]
+
+
+@pytest.mark.unit
+class TestImportDoApp:
+    """Importar o app não deve carregar os módulos usados só pelas requisições."""
+
+    def test_import_dentro_do_orcamento_e_sem_modulos_pesados(self):
+        tempos, modulos = _interpretador_novo('import app')
+
+        assert tempos['app'] < ORCAMENTO_IMPORT_APP
+        assert not set(MODULOS_SOB_DEMANDA) & modulos
+
+    def test_preload_carrega_os_modulos_sob_demanda(self):
+        _, modulos = _interpretador_novo('import app; from utils.lazy_import import carregar_modulos_sob_demanda; '
+                                         'carregar_modulos_sob_demanda()')
+        assert set(MODULOS_SOB_DEMANDA) <= modulos
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestCreateAppComBancoExistente:
+    """create_app sobre um banco criado pelo mesmo esquema dispensa create_all e migrações."""
+
+    def test_segunda_inicializacao_nao_inspeciona_o_esquema(self, tmp_path):
+        _criar_app(tmp_path)
+
+        with _Comandos() as comandos:
+            inicio = time.perf_counter()
+            _criar_app(tmp_path)
+            duracao = time.perf_counter() - inicio
+
+        assert comandos.ddl() == []
+        assert duracao < ORCAMENTO_CREATE_APP
+
+    def test_impressao_diferente_refaz_create_all_e_migracoes(self, tmp_path):
+        _criar_app(tmp_path)
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("UPDATE esquema_impressao SET impressao = 'modelo antigo'")
+            conn.exec_driver_sql("DROP INDEX ix_testes_executados_ciclo_status")
+            conn.exec_driver_sql("PRAGMA user_version = 3")
+
+        with _Comandos() as comandos:
+            _criar_app(tmp_path)
+
+        assert comandos.ddl()
+        with db.engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA user_version").scalar() == versao_esquema_atual()
+            assert conn.exec_driver_sql(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'ix_testes_executados_ciclo_status'"
+            ).scalar() == 1
+        with _Comandos() as comandos:
+            _criar_app(tmp_path)
+        assert comandos.ddl() == []
@@ -0,0 +1,127 @@
+# backend/tests/unit/test_logging_estruturado.py
+"""
+Testes do logging estruturado (utils/structured_logging.py): fila não
+bloqueante, formato JSON, id de requisição e amostragem do log de acesso.
+"""
+
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from app import create_app
+from config import Config
+from tests.conftest import auth_headers_for
+from utils import structured_logging
+from utils.structured_logging import FormatadorJSON, HandlerFilaNaoBloqueante, id_requisicao, logger_acesso
+
+
+class _Coletor(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+
+@pytest.fixture
+def acessos():
+    coletor = _Coletor()
+    logger_acesso.addHandler(coletor)
+    yield coletor.registros
+    logger_acesso.removeHandler(coletor)
+
+
+@pytest.mark.unit
+class TestHandlerEFormatador:
+    """Testes para HandlerFilaNaoBloqueante e FormatadorJSON."""
+
+    def test_fila_cheia_descarta_sem_bloquear(self):
+        handler = HandlerFilaNaoBloqueante(queue.Queue(2))
+        logger = logging.getLogger('teste.fila')
+        for i in range(5):
+            handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 1, "registro %d", (i,), None))
+
+        assert handler.queue.qsize() == 2
+        assert handler.descartados == 3
+
+    def test_mensagem_resolvida_e_id_da_requisicao_capturado_na_thread_de_origem(self):
+        handler = HandlerFilaNaoBloqueante(queue.Queue())
+        argumentos = {'status': 'Em Homologação'}
+        token = id_requisicao.set('abc123')
+        try:
+            handler.handle(logging.makeLogRecord({'msg': "status %(status)s", 'args': argumentos}))
+        finally:
+            id_requisicao.reset(token)
+        argumentos['status'] = 'alterado depois'
+
+        registro = handler.queue.get_nowait()
+        assert (registro.getMessage(), registro.request_id) == ("status Em Homologação", 'abc123')
+
+    def test_json_com_campos_extras_e_excecao(self):
+        try:
+            raise ValueError("falhou")
+        except ValueError:
+            registro = logging.getLogger('teste.json').makeRecord(
+                'teste.json', logging.ERROR, __file__, 1, "erro no ciclo %s", (7,), sys.exc_info(),
+                extra={'http': {'status': 500}, 'request_id': 'r1'},
+            )
+
+        dados = json.loads(FormatadorJSON().format(registro))
+        assert dados['mensagem'] == "erro no ciclo 7"
+        assert (dados['nivel'], dados['logger'], dados['request_id']) == ('ERROR', 'teste.json', 'r1')
+        assert dados['http'] == {'status': 500}
+        assert 'ValueError: falhou' in dados['exc']
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestLogDeAcesso:
+    """Id de requisição e log de acesso registrados por create_app."""
+
+    def test_id_da_requisicao_no_cabecalho_e_no_log(self, isolated_app, acessos):
+        client = isolated_app.test_client()
+        resposta = client.get('/api/projetos', headers=auth_headers_for(isolated_app, 1))
+        repassado = client.get('/api/projetos', headers={**auth_headers_for(isolated_app, 1), 'X-Request-ID': 'lb-42'})
+
+        gerado = resposta.headers['X-Request-ID']
+        assert len(gerado) == 16
+        assert repassado.headers['X-Request-ID'] == 'lb-42'
+        assert [r.http['rota'] for r in acessos] == ['/api/projetos', '/api/projetos']
+        assert acessos[0].http['status'] == 200
+
+    def test_amostragem_por_rota_mantem_erros(self, tmp_path, acessos):
+        app = create_app('testing', config_overrides={
+            'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+            'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+            'LOG_AMOSTRAGEM': {'/api/projetos/<int:id_projeto>': 0.0},
+        })
+        client = app.test_client()
+        headers = auth_headers_for(app, 1)
+
+        client.get('/api/projetos', headers=headers)
+        client.get('/api/projetos/1', headers=headers)
+        client.get('/api/projetos/999', headers=headers)
+
+        assert [(r.http['caminho'], r.http['status']) for r in acessos] == [
+            ('/api/projetos', 200), ('/api/projetos/999', 404)
+        ]
+
+    def test_rotas_da_amostragem_padrao_existem(self, isolated_app):
+        rotas = {regra.rule for regra in isolated_app.url_map.iter_rules()}
+        assert Config.LOG_AMOSTRAGEM
+        assert set(Config.LOG_AMOSTRAGEM) <= rotas
+
+    def test_saida_json_escrita_pela_thread_do_listener(self, isolated_app, capsys):
+        isolated_app.config['LOG_FORMATO'] = 'json'
+        structured_logging.configurar_logging(isolated_app)
+        isolated_app.test_client().get('/api/projetos', headers=auth_headers_for(isolated_app, 1))
+        structured_logging._parar_listener()
+
+        linhas = [json.loads(linha) for linha in capsys.readouterr().err.splitlines() if linha.startswith('{')]
+        acesso = next(linha for linha in linhas if linha['logger'] == 'projectflow.acesso')
+        assert acesso['http']['status'] == 200
+        assert acesso['request_id'] != '-'
@@ -0,0 +1,104 @@
+# backend/tests/unit/test_metricas.py
+"""
+Testes das métricas no formato do Prometheus (utils/metrics.py e GET /metrics).
+"""
+
+import re
+
+import pytest
+
+from app import create_app
+from tests.conftest import auth_headers_for
+from utils.metrics import RegistroMetricas, requisicoes
+
+
+def _valor(texto: str, amostra: str) -> float:
+    """Valor da linha do /metrics que começa exatamente com 'amostra'."""
+    for linha in texto.splitlines():
+        if linha.startswith(amostra + ' '):
+            return float(linha.rsplit(' ', 1)[1])
+    return 0.0
+
+
+@pytest.mark.unit
+class TestRegistroMetricas:
+    """Testes do formato de exportação."""
+
+    def test_contador_e_histograma_no_formato_texto(self):
+        registro = RegistroMetricas()
+        contador = registro.contador('teste_total', 'Contador de teste.', ('rota',))
+        histograma = registro.histograma('teste_segundos', 'Histograma de teste.', limites=(0.1, 1))
+        contador.inc(rota='/api/x"y')
+        contador.inc(2, rota='/api/x"y')
+        for valor in (0.05, 0.5, 3):
+            histograma.observar(valor)
+
+        assert registro.exportar().splitlines() == [
+            '# HELP teste_segundos Histograma de teste.',
+            '# TYPE teste_segundos histogram',
+            'teste_segundos_bucket{le="0.1"} 1',
+            'teste_segundos_bucket{le="1"} 2',
+            'teste_segundos_bucket{le="+Inf"} 3',
+            'teste_segundos_sum 3.55',
+            'teste_segundos_count 3',
+            '# HELP teste_total Contador de teste.',
+            '# TYPE teste_total counter',
+            'teste_total{rota="/api/x\\"y"} 3',
+        ]
+
+    def test_metrica_coletada_le_o_estado_na_hora(self):
+        registro = RegistroMetricas()
+        estado = {'abertas': 1}
+        registro.coletada('teste_abertas', 'Conexões.', lambda: {(): estado['abertas']})
+        estado['abertas'] = 4
+        assert 'teste_abertas 4' in registro.exportar()
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestEndpointMetricas:
+    """Instrumentação das requisições e GET /metrics."""
+
+    def test_requisicoes_por_template_de_rota_com_consultas(self, isolated_app):
+        client = isolated_app.test_client()
+        headers = auth_headers_for(isolated_app, 1)
+        rota = '/api/projetos/<int:id_projeto>'
+        antes = requisicoes.valor(metodo='GET', rota=rota, status=200)
+
+        client.get('/api/projetos/1', headers=headers)
+        client.get('/api/projetos/2', headers=headers)
+        client.get('/nao/existe')
+        texto = client.get('/metrics').get_data(as_text=True)
+
+        assert requisicoes.valor(metodo='GET', rota=rota, status=200) == antes + 2
+        assert _valor(texto, 'projectflow_requisicoes_total{metodo="GET",rota="<sem rota>",status="404"}') >= 1
+        serie = f'{{metodo="GET",rota="{rota}"}}'
+        assert _valor(texto, f'projectflow_requisicao_consultas_sum{serie}') >= 2
+        assert _valor(texto, f'projectflow_requisicao_duracao_segundos_count{serie}') >= 2
+        assert _valor(texto, 'projectflow_banco_checkouts_total') > 0
+        # Nenhum caminho concreto vira rótulo
+        assert not re.search(r'rota="/api/projetos/\d', texto)
+
+    def test_acertos_do_cache_de_cronograma(self, isolated_app):
+        client = isolated_app.test_client()
+        headers = auth_headers_for(isolated_app, 1)
+        amostra = 'projectflow_cache_acessos_total{cache="cronograma",resultado="acerto"}'
+        antes = _valor(client.get('/metrics').get_data(as_text=True), amostra)
+
+        client.get('/api/projetos/1/cronograma', headers=headers)
+        client.get('/api/projetos/1/cronograma', headers=headers)
+
+        assert _valor(client.get('/metrics').get_data(as_text=True), amostra) > antes
+
+    def test_token_de_coleta(self, tmp_path):
+        app = create_app('testing', config_overrides={
+            'DATABASE_URL': str(tmp_path / 'projectflow_test.db'),
+            'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+            'METRICAS_TOKEN': 'coletor',
+        })
+        client = app.test_client()
+
+        assert client.get('/metrics').status_code == 401
+        resposta = client.get('/metrics', headers={'Authorization': 'Bearer coletor'})
+        assert resposta.status_code == 200
+        assert resposta.mimetype == 'text/plain'
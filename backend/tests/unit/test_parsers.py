@@ -0,0 +1,109 @@
+# backend/tests/unit/test_parsers.py
+"""
+Testes unitários dos parsers de relatório (Allure e JUnit) e da detecção de formato.
+"""
+
+import io
+
+import pytest
+
+from models import Homologacao, TesteExecutado
+from parsers import detectar_formato, parse_junit_xml, parse_relatorio
+from services.homologacao_service import HomologacaoService
+from utils.database import get_db_session
+from tests.fixtures.allure import criar_zip_allure, resultado_allure
+from tests.fixtures.junit import caso_junit, criar_xml_junit, criar_zip_junit
+
+CASOS = [
+    caso_junit("login"),
+    caso_junit("logout", status="failed", mensagem="expected 200"),
+    caso_junit("busca", classe="com.example.Busca", status="broken", mensagem="NPE"),
+    caso_junit("premium", status="skipped"),
+]
+
+
+def _gravar(tmp_path, nome, conteudo):
+    caminho = tmp_path / nome
+    caminho.write_bytes(conteudo)
+    return str(caminho)
+
+
+@pytest.mark.unit
+class TestParseJunit:
+    """Testes do parser JUnit XML."""
+
+    def test_xml_unico(self, tmp_path):
+        caminho = _gravar(tmp_path, "junit.xml", criar_xml_junit(CASOS, nome_suite="Autenticação"))
+
+        resultado = parse_junit_xml(caminho)
+
+        assert resultado['metricas'] == {
+            'total_testes': 4, 'testes_aprovados': 1, 'testes_reprovados': 2, 'testes_bloqueados': 1
+        }
+        logout = next(t for t in resultado['testes'] if t['nome_teste'] == "logout")
+        assert logout['status'] == 'failed'
+        assert logout['mensagem_erro'] == "expected 200"
+        assert logout['full_name'] == "com.example.Suite.logout"
+        assert logout['feature'] == "Autenticação"
+
+    def test_zip_com_varios_xml(self, tmp_path):
+        conteudo = criar_zip_junit({
+            "TEST-a.xml": criar_xml_junit(CASOS[:2]),
+            "TEST-b.xml": criar_xml_junit(CASOS[2:]),
+            "LEIAME.txt": b"ignorado",
+        })
+        caminho = _gravar(tmp_path, "junit.zip", conteudo)
+
+        resultado = parse_junit_xml(caminho)
+
+        assert resultado['metricas']['total_testes'] == 4
+        assert sorted(t['nome_teste'] for t in resultado['testes']) == ["busca", "login", "logout", "premium"]
+
+    def test_xml_malformado(self, tmp_path):
+        caminho = _gravar(tmp_path, "junit.xml", b"<testsuite><testcase name='x'>")
+        with pytest.raises(ValueError):
+            parse_junit_xml(caminho)
+
+
+@pytest.mark.unit
+class TestDeteccaoDeFormato:
+    """Testes de detectar_formato e parse_relatorio."""
+
+    def test_detecta_cada_formato(self, tmp_path):
+        allure = _gravar(tmp_path, "allure.zip", criar_zip_allure([resultado_allure("login")]))
+        xml = _gravar(tmp_path, "junit.xml", criar_xml_junit(CASOS))
+        zip_junit = _gravar(tmp_path, "junit.zip", criar_zip_junit({"TEST-a.xml": criar_xml_junit(CASOS)}))
+
+        assert detectar_formato(allure) == 'allure'
+        assert detectar_formato(xml) == 'junit'
+        assert detectar_formato(zip_junit) == 'junit'
+        assert parse_relatorio(xml)['metricas']['total_testes'] == 4
+
+    def test_formato_desconhecido(self, tmp_path):
+        caminho = _gravar(tmp_path, "notas.txt", b"nada de testes aqui")
+        with pytest.raises(ValueError):
+            detectar_formato(caminho)
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestUploadJunit:
+    """Upload de um XML JUnit pelo mesmo fluxo do Allure."""
+
+    def test_upload_xml_grava_testes(self, isolated_app):
+        with get_db_session() as session:
+            ciclo = Homologacao(id_projeto=1, data_inicio="2025-01-01T00:00:00", id_responsavel_teste=1,
+                                ambiente="HML", versao_testada="1.0")
+            session.add(ciclo)
+            session.flush()
+            id_ciclo = ciclo.id_homologacao
+
+        with HomologacaoService() as service:
+            dados = service.processar_upload_de_relatorio(
+                id_ciclo, io.BytesIO(criar_xml_junit(CASOS)), isolated_app.config['UPLOAD_FOLDER']
+            )
+
+        assert dados['caminho_relatorio_zip'].endswith('.xml')
+        assert dados['testes_reprovados'] == 2
+        with get_db_session() as session:
+            assert session.query(TesteExecutado).filter_by(id_homologacao=id_ciclo).count() == 4
@@ -0,0 +1,168 @@
+# backend/tests/unit/test_pubsub.py
+"""
+Testes unitários do barramento de eventos do canal de Server-Sent Events.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from data_sources.fila_eventos import FilaEventos
+from models import Projeto
+from utils.database import get_db_session
+from utils.pubsub import BarramentoEventos, LimiteAssinaturasError, barramento_eventos, formatar_sse
+
+
+def _ids(assinatura):
+    ids = []
+    while (evento := assinatura.proximo(timeout=0)) is not None:
+        ids.append(evento.get('id', evento['tipo']))
+    return ids
+
+
+@pytest.mark.unit
+class TestBarramentoEventos:
+    """Testes para utils/pubsub.py."""
+
+    def test_entrega_aplicando_o_filtro(self):
+        barramento = BarramentoEventos()
+        todos = barramento.assinar()
+        do_usuario = barramento.assinar(lambda e: 2 in e['responsaveis'])
+
+        barramento.publicar('status_projeto', responsaveis=[1])
+        barramento.publicar('status_projeto', responsaveis=[2])
+
+        assert _ids(todos) == [1, 2]
+        assert _ids(do_usuario) == [2]
+
+    def test_fila_cheia_descarta_os_mais_antigos_e_pede_resync(self):
+        barramento = BarramentoEventos()
+        assinatura = barramento.assinar(capacidade=2)
+
+        for _ in range(5):
+            barramento.publicar('tarefas_alteradas')
+
+        assert _ids(assinatura) == ['resync', 4, 5]
+
+    def test_reconexao_com_last_event_id(self):
+        barramento = BarramentoEventos(historico=3)
+        for _ in range(5):
+            barramento.publicar('tarefas_alteradas')
+
+        assert _ids(barramento.assinar(desde=3)) == [4, 5]
+        # O evento 2 já saiu do histórico; um id desconhecido também pede resync
+        assert _ids(barramento.assinar(desde=1)) == ['resync', 3, 4, 5]
+        assert _ids(barramento.assinar(desde=99)) == ['resync']
+
+    def test_limite_de_assinantes(self):
+        barramento = BarramentoEventos(max_assinantes=1)
+        assinatura = barramento.assinar()
+        with pytest.raises(LimiteAssinaturasError):
+            barramento.assinar()
+
+        barramento.cancelar(assinatura)
+        barramento.assinar()
+
+    def test_consumidor_em_outra_thread(self):
+        barramento = BarramentoEventos()
+        assinatura = barramento.assinar()
+        recebidos = []
+        consumidor = threading.Thread(target=lambda: recebidos.append(assinatura.proximo(timeout=5)))
+        consumidor.start()
+
+        barramento.publicar('homologacao', acao='iniciado')
+        consumidor.join(timeout=5)
+
+        assert recebidos[0]['acao'] == 'iniciado'
+
+    def test_consumidor_assincrono_acorda_com_a_publicacao(self):
+        barramento = BarramentoEventos()
+        assinatura = barramento.assinar()
+
+        async def consumir():
+            vazio = await assinatura.proximo_async(timeout=0.01)
+            threading.Timer(0.05, lambda: barramento.publicar('ingestao', etapa='concluido')).start()
+            return vazio, await assinatura.proximo_async(timeout=5)
+
+        vazio, evento = asyncio.run(consumir())
+        assert vazio is None
+        assert evento['etapa'] == 'concluido'
+
+    def test_formato_sse(self):
+        mensagem = formatar_sse({"id": 7, "tipo": "ingestao", "responsaveis": [1], "etapa": "concluido"})
+        assert mensagem == 'id: 7\nevent: ingestao\ndata: {"etapa":"concluido"}\n\n'
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestPublicacaoAposCommit:
+    """Eventos das escritas só são publicados quando a transação é confirmada."""
+
+    def test_commit_publica_e_rollback_descarta(self, isolated_app):
+        assinatura = barramento_eventos.assinar()
+        try:
+            with pytest.raises(RuntimeError):
+                with get_db_session() as session:
+                    session.get(Projeto, 1).mudar_status("Em Especificação", id_usuario=1)
+                    raise RuntimeError("falha depois da mudança")
+            assert assinatura.proximo(timeout=0) is None
+
+            with get_db_session() as session:
+                session.get(Projeto, 1).mudar_status("Em Especificação", id_usuario=1)
+                assert assinatura.proximo(timeout=0) is None
+
+            evento = assinatura.proximo(timeout=5)
+            assert (evento['tipo'], evento['id_projeto'], evento['status']) == ('status_projeto', 1, "Em Especificação")
+            assert evento['status_anterior'] == "Em Definição"
+        finally:
+            barramento_eventos.cancelar(assinatura)
+
+
+@pytest.fixture
+def outro_processo(isolated_app):
+    """Barramento com a sua própria conexão ao mesmo banco, como o de outro worker."""
+    engine = create_engine(f"sqlite:///{isolated_app.config['DATABASE_URL']}")
+    barramento = BarramentoEventos()
+    barramento.usar_fila(FilaEventos(engine), intervalo=0.01)
+    yield barramento
+    barramento.usar_fila(None)
+    engine.dispose()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestFilaNoBanco:
+    """Eventos publicados em um processo chegam aos clientes dos outros."""
+
+    def test_evento_de_outro_processo(self, outro_processo):
+        assinatura = barramento_eventos.assinar()
+        try:
+            publicado = outro_processo.publicar('ingestao', id_projeto=1, responsaveis=[1], etapa='concluido')
+
+            evento = assinatura.proximo(timeout=5)
+            assert evento == publicado
+        finally:
+            barramento_eventos.cancelar(assinatura)
+
+    def test_reconexao_em_outro_processo(self, outro_processo):
+        primeira = outro_processo.assinar()
+        for etapa in ('processando', 'concluido', 'processando'):
+            barramento_eventos.publicar('ingestao', etapa=etapa)
+        ids = [primeira.proximo(timeout=5)['id'] for _ in range(3)]
+        outro_processo.cancelar(primeira)
+
+        # O cliente reconecta neste processo com o id recebido do outro
+        assinatura = barramento_eventos.assinar(desde=ids[0])
+        try:
+            assert _ids(assinatura) == ids[1:]
+        finally:
+            barramento_eventos.cancelar(assinatura)
+
+    def test_eventos_antigos_descartados_da_tabela(self, isolated_app):
+        fila = FilaEventos(create_engine(f"sqlite:///{isolated_app.config['DATABASE_URL']}"))
+        ids = [fila.gravar_agora('tarefas_alteradas', {'id_projeto': 1}) for _ in range(3)]
+
+        assert fila.descartar_ate(ids[1]) == 2
+        assert [e['id'] for e in fila.ler(0)] == [ids[2]]
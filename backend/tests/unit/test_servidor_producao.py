@@ -0,0 +1,71 @@
+# backend/tests/unit/test_servidor_producao.py
+"""
+Testes unitários da configuração do gunicorn (gunicorn.conf.py) e da
+leitura de memória por processo usada para medir os workers.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.process_memory import memoria_do_processo, processos_filhos
+
+CAMINHO_CONF = os.path.join(os.path.dirname(__file__), '..', '..', 'gunicorn.conf.py')
+
+
+def _carregar_conf(monkeypatch, **ambiente):
+    for nome, valor in ambiente.items():
+        monkeypatch.setenv(nome, valor)
+    spec = importlib.util.spec_from_file_location('gunicorn_conf_teste', CAMINHO_CONF)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+@pytest.mark.unit
+class TestConfiguracaoGunicorn:
+    """Testes para gunicorn.conf.py."""
+
+    def test_perfil_de_desenvolvimento(self, monkeypatch):
+        conf = _carregar_conf(monkeypatch, FLASK_ENV='development')
+        assert (conf.worker_class, conf.workers, conf.threads) == ('gthread', 1, 4)
+        assert conf.wsgi_app == 'wsgi:app'
+        assert conf.preload_app and conf.congelar_gc
+
+    def test_perfil_de_producao_usa_o_app_asgi(self, monkeypatch):
+        conf = _carregar_conf(monkeypatch, FLASK_ENV='production')
+        assert conf.worker_class == 'uvicorn_worker.UvicornWorker'
+        assert conf.wsgi_app == 'asgi:create_asgi_app()'
+        assert conf.workers >= 3
+
+    def test_ambiente_sobrescreve_o_perfil(self, monkeypatch):
+        conf = _carregar_conf(monkeypatch, FLASK_ENV='development', GUNICORN_WORKER_CLASS='sync',
+                              GUNICORN_WORKERS='3', GUNICORN_PRELOAD='false')
+        assert (conf.worker_class, conf.workers) == ('sync', 3)
+        # Sem preload não há o que congelar antes do fork
+        assert not conf.preload_app and not conf.congelar_gc
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not os.path.exists('/proc/self/smaps_rollup'), reason="requer /proc (Linux)")
+class TestMemoriaDoProcesso:
+    """Testes para utils/process_memory.py."""
+
+    def test_memoria_e_filhos(self):
+        memoria = memoria_do_processo()
+        assert memoria['rss'] >= memoria['privada'] > 0
+        assert memoria['rss'] >= memoria['pss'] > 0
+
+        filho = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'])
+        try:
+            assert filho.pid in processos_filhos(os.getpid())
+            assert memoria_do_processo(filho.pid)['rss'] > 0
+        finally:
+            filho.kill()
+            filho.wait()
+
+    def test_processo_inexistente(self):
+        assert memoria_do_processo(2 ** 22 + 1) == {}
@@ -0,0 +1,151 @@
+# backend/tests/unit/test_task_graph.py
+"""
+Testes unitários do grafo de dependências de tarefas: parsing, ciclos,
+caminho crítico e propagação de deslocamentos.
+"""
+
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from data_sources.migrations import aplicar_migracoes
+from models import Base
+from utils.task_graph import (
+    CicloDependenciasError, DependenciaInvalidaError, GrafoTarefas,
+    formatar_dependencias, para_data, para_ordinal, parse_dependencias
+)
+
+
+def _grafo(periodos, arestas):
+    return GrafoTarefas(
+        {t: (para_ordinal(inicio), para_ordinal(fim)) for t, (inicio, fim) in periodos.items()}, arestas
+    )
+
+
+# 1 → 2 → 4 e 1 → 3 → 4, com 3 mais curta que 2
+PERIODOS = {
+    1: ("2025-01-01", "2025-01-05"),
+    2: ("2025-01-06", "2025-01-15"),
+    3: ("2025-01-06", "2025-01-08"),
+    4: ("2025-01-16", "2025-01-20"),
+}
+ARESTAS = [(1, 2), (1, 3), (2, 4), (3, 4)]
+
+
+@pytest.mark.unit
+class TestParseDependencias:
+    """Testes da leitura do texto livre de dependências."""
+
+    def test_aceita_separadores_variados_sem_repetir(self):
+        assert parse_dependencias(" 3, 5;7 3 ") == [3, 5, 7]
+        assert parse_dependencias(None) == []
+        assert formatar_dependencias([3, 5]) == "3, 5"
+        assert formatar_dependencias([]) is None
+
+    def test_rejeita_itens_nao_numericos(self):
+        with pytest.raises(DependenciaInvalidaError):
+            parse_dependencias("3, tarefa-5")
+
+
+@pytest.mark.unit
+class TestGrafoTarefas:
+    """Testes da ordenação, do caminho crítico e da propagação."""
+
+    def test_detecta_ciclo(self):
+        with pytest.raises(CicloDependenciasError) as erro:
+            _grafo(PERIODOS, ARESTAS + [(4, 1)])
+        assert erro.value.ciclo[0] == erro.value.ciclo[-1]
+        assert set(erro.value.ciclo) <= {1, 2, 4}
+
+    def test_criaria_ciclo(self):
+        grafo = _grafo(PERIODOS, ARESTAS)
+        assert grafo.criaria_ciclo(1, [4]) == [1, 2, 4, 1]
+        assert grafo.criaria_ciclo(3, [3]) == [3, 3]
+        assert grafo.criaria_ciclo(4, [1, 2]) is None
+
+    def test_caminho_critico_e_folgas(self):
+        analise = _grafo(PERIODOS, ARESTAS).caminho_critico()
+        folgas = dict(zip(analise['ids'], analise['folga']))
+
+        assert analise['ids'] == [1, 2, 3, 4]
+        assert analise['caminho_critico'] == [1, 2, 4]
+        assert folgas == {1: 0, 2: 0, 3: 7, 4: 0}
+        assert para_data(analise['fim']) == "2025-01-20"
+
+    def test_dependencia_atrasa_o_inicio_mais_cedo(self):
+        # A tarefa 2 foi planejada para começar antes do fim da 1
+        analise = _grafo({1: ("2025-01-01", "2025-01-10"), 2: ("2025-01-05", "2025-01-06")}, [(1, 2)]).caminho_critico()
+
+        assert [para_data(o) for o in analise['inicio_cedo']] == ["2025-01-01", "2025-01-11"]
+        assert para_data(analise['fim']) == "2025-01-12"
+
+    def test_propagar_empurra_apenas_o_necessario(self):
+        grafo = _grafo(PERIODOS, ARESTAS)
+        # A tarefa 3 passa a terminar em 13/01: a 4 ainda cabe (começa em 16/01)
+        assert set(grafo.propagar(3, para_ordinal("2025-01-09"), para_ordinal("2025-01-13"))) == {3}
+
+        # A tarefa 1 termina 3 dias depois: 2, 3 e 4 andam 3 dias
+        novos = grafo.propagar(1, para_ordinal("2025-01-01"), para_ordinal("2025-01-08"))
+        assert {t: (para_data(i), para_data(f)) for t, (i, f) in novos.items()} == {
+            1: ("2025-01-01", "2025-01-08"),
+            2: ("2025-01-09", "2025-01-18"),
+            3: ("2025-01-09", "2025-01-11"),
+            4: ("2025-01-19", "2025-01-23"),
+        }
+
+    def test_milhares_de_tarefas_em_milissegundos(self):
+        # Cadeias paralelas de 100 tarefas com ligações cruzadas entre cadeias
+        total, comprimento = 5000, 100
+        inicio = para_ordinal("2025-01-01")
+        periodos = {t: (inicio + (t % comprimento) * 3, inicio + (t % comprimento) * 3 + 1) for t in range(total)}
+        arestas = [(t - 1, t) for t in range(total) if t % comprimento]
+        arestas += [(t, t + comprimento + 1) for t in range(0, total - comprimento - 1, 7)]
+
+        decorrido = time.perf_counter()
+        grafo = GrafoTarefas(periodos, arestas)
+        analise = grafo.caminho_critico()
+        grafo.propagar(0, inicio, inicio + 10)
+        decorrido = time.perf_counter() - decorrido
+
+        assert len(analise['ids']) == total
+        assert decorrido < 1.0
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestMigracaoDependencias:
+    """Testes da conversão do texto de dependências em arestas."""
+
+    def test_converte_e_descarta_invalidas(self, tmp_path):
+        caminho = tmp_path / "tarefas.db"
+        engine = create_engine(f"sqlite:///{caminho}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("PRAGMA user_version = 6")
+
+        conn = sqlite3.connect(caminho)
+        conn.executescript("""
+            INSERT INTO tarefas (id_tarefa, id_projeto, nome_tarefa, data_inicio, data_fim, progresso, dependencias)
+            VALUES (1, 1, 'a', '2025-01-01', '2025-01-02', 0, NULL),
+                   (2, 1, 'b', '2025-01-03', '2025-01-04', 0, '1; 9, x'),
+                   (3, 1, 'c', '2025-01-05', '2025-01-06', 0, '2 1'),
+                   (4, 2, 'd', '2025-01-01', '2025-01-02', 0, '1'),
+                   (5, 1, 'e', '2025-01-01', '2025-01-02', 0, '3');
+            UPDATE tarefas SET dependencias = '5' WHERE id_tarefa = 1;
+        """)
+        conn.commit()
+        conn.close()
+
+        aplicar_migracoes(engine)
+
+        with engine.connect() as c:
+            arestas = c.exec_driver_sql(
+                "SELECT id_predecessora, id_tarefa FROM dependencias_tarefa ORDER BY id_tarefa, id_predecessora"
+            ).all()
+            textos = dict(c.exec_driver_sql("SELECT id_tarefa, dependencias FROM tarefas").all())
+
+        # 'x' invalida o texto da tarefa 2; a 4 é de outro projeto; 3 → 5 fecharia o ciclo 5 → 1 → 3
+        assert arestas == [(5, 1), (1, 3), (2, 3)]
+        assert textos == {1: "5", 2: None, 3: "2, 1", 4: None, 5: None}
@@ -0,0 +1,115 @@
+# backend/utils/content_store.py
+"""
+Armazenamento de uploads endereçado por conteúdo.
+
+Cada arquivo é gravado uma única vez em UPLOAD_FOLDER/objetos/<aa>/<sha256>.<ext>,
+onde <sha256> é o hash do conteúdo calculado durante a própria gravação e
+<ext> ('zip' ou 'xml') também vem do conteúdo, nunca do nome enviado: os
+mesmos bytes têm sempre o mesmo caminho. Uploads idênticos apontam para o
+mesmo arquivo; quem decide quando um arquivo pode ser removido é quem conta
+as referências (ver HomologacaoService).
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import zipfile
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+OBJETOS_DIRNAME = 'objetos'
+CHUNK_SIZE = 64 * 1024
+
+
+class ObjetoArmazenado(NamedTuple):
+    """Resultado da gravação de um stream no armazenamento."""
+    sha256: str
+    caminho: str
+    tamanho_bytes: int
+    novo: bool  # False quando um arquivo idêntico já existia
+
+
+def pasta_objetos(upload_folder: str) -> str:
+    """Retorna a pasta raiz dos objetos endereçados por conteúdo."""
+    return os.path.join(upload_folder, OBJETOS_DIRNAME)
+
+
+def extensao_do_conteudo(caminho: str) -> str:
+    """'zip' para arquivos ZIP e 'xml' para os demais (relatório JUnit solto)."""
+    return 'zip' if zipfile.is_zipfile(caminho) else 'xml'
+
+
+def caminho_objeto(upload_folder: str, sha256: str, extensao: str = 'zip') -> str:
+    """Monta o caminho final de um objeto a partir do seu hash."""
+    return os.path.join(pasta_objetos(upload_folder), sha256[:2], f"{sha256}.{extensao}")
+
+
+def salvar_stream(file_stream, upload_folder: str, chunk_size: int = CHUNK_SIZE) -> ObjetoArmazenado:
+    """
+    Grava o stream em disco calculando o SHA-256 em blocos, sem carregar o
+    arquivo inteiro em memória.
+
+    O conteúdo vai primeiro para um arquivo temporário na mesma pasta dos
+    objetos e só depois é movido (os.replace, atômico) para o caminho final.
+    Se o objeto já existir, o temporário é descartado e nada é duplicado.
+
+    Args:
+        file_stream: Objeto com método read() (ex: werkzeug FileStorage)
+        upload_folder: Pasta base de uploads da aplicação
+        chunk_size: Tamanho de cada bloco lido do stream
+
+    Returns:
+        ObjetoArmazenado com hash, caminho, tamanho e se o objeto é novo
+    """
+    raiz = pasta_objetos(upload_folder)
+    os.makedirs(raiz, exist_ok=True)
+
+    hasher = hashlib.sha256()
+    tamanho = 0
+    fd, caminho_temp = tempfile.mkstemp(dir=raiz, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as destino:
+            while True:
+                bloco = file_stream.read(chunk_size)
+                if not bloco:
+                    break
+                hasher.update(bloco)
+                destino.write(bloco)
+                tamanho += len(bloco)
+
+        sha256 = hasher.hexdigest()
+        caminho_final = caminho_objeto(upload_folder, sha256, extensao_do_conteudo(caminho_temp))
+
+        if os.path.exists(caminho_final):
+            os.remove(caminho_temp)
+            logger.info("Objeto %s já armazenado; upload deduplicado.", sha256)
+            return ObjetoArmazenado(sha256, caminho_final, tamanho, False)
+
+        os.makedirs(os.path.dirname(caminho_final), exist_ok=True)
+        os.replace(caminho_temp, caminho_final)
+        logger.info("Objeto %s armazenado em %s (%d bytes).", sha256, caminho_final, tamanho)
+        return ObjetoArmazenado(sha256, caminho_final, tamanho, True)
+    except Exception:
+        if os.path.exists(caminho_temp):
+            os.remove(caminho_temp)
+        raise
+
+
+def remover_arquivo(caminho: str) -> bool:
+    """
+    Remove um arquivo do disco, ignorando se ele já não existir.
+
+    Returns:
+        True se o arquivo foi removido, False caso contrário
+    """
+    try:
+        os.remove(caminho)
+        logger.info("Arquivo sem referências removido: %s", caminho)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.error("Erro ao remover arquivo %s: %s", caminho, e)
+        return False
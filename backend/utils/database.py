@@ -24,19 +24,19 @@ def get_db_session() -> Generator[Session, None, None]:
     """
     session = db.get_session()
     session_id = id(session)
-    logger.debug(f"Sessão DB {session_id} aberta")
+    logger.debug("Sessão DB %s aberta", session_id)
     
     try:
         yield session
         session.commit()
-        logger.debug(f"Sessão DB {session_id} commitada com sucesso")
+        logger.debug("Sessão DB %s commitada com sucesso", session_id)
     except Exception as e:
         session.rollback()
-        logger.error(f"Erro na sessão DB {session_id}, fazendo rollback: {e}")
+        logger.error("Erro na sessão DB %s, fazendo rollback: %s", session_id, e)
         raise
     finally:
         session.close()
-        logger.debug(f"Sessão DB {session_id} fechada")
+        logger.debug("Sessão DB %s fechada", session_id)
 
 
 @contextmanager
@@ -54,20 +54,20 @@ def get_db_session_with_savepoint() -> Generator[Session, None, None]:
     """
     session = db.get_session()
     session_id = id(session)
-    logger.debug(f"Sessão DB {session_id} com savepoint aberta")
+    logger.debug("Sessão DB %s com savepoint aberta", session_id)
     
     savepoint = session.begin_nested()
     try:
         yield session
         savepoint.commit()
-        logger.debug(f"Savepoint da sessão DB {session_id} commitado")
+        logger.debug("Savepoint da sessão DB %s commitado", session_id)
     except Exception as e:
         savepoint.rollback()
-        logger.error(f"Erro no savepoint da sessão DB {session_id}, fazendo rollback: {e}")
+        logger.error("Erro no savepoint da sessão DB %s, fazendo rollback: %s", session_id, e)
         raise
     finally:
         session.close()
-        logger.debug(f"Sessão DB {session_id} com savepoint fechada")
+        logger.debug("Sessão DB %s com savepoint fechada", session_id)
 
 
 def with_db_session(func: Callable) -> Callable:
@@ -112,11 +112,11 @@ def with_db_transaction(func: Callable) -> Callable:
                 result = func(session, *args, **kwargs)
                 if result is False:
                     session.rollback()
-                    logger.warning(f"Transação {func.__name__} retornou False, fazendo rollback")
+                    logger.warning("Transação %s retornou False, fazendo rollback", func.__name__)
                 return result
             except Exception as e:
                 session.rollback()
-                logger.error(f"Erro na transação {func.__name__}: {e}")
+                logger.error("Erro na transação %s: %s", func.__name__, e)
                 raise
     return wrapper
 
@@ -132,7 +132,7 @@ class DatabaseManager:
     
     def __enter__(self):
         self.session = db.get_session()
-        logger.debug(f"DatabaseManager: sessão {id(self.session)} aberta")
+        logger.debug("DatabaseManager: sessão %s aberta", id(self.session))
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -140,13 +140,13 @@ class DatabaseManager:
             try:
                 if exc_type:
                     self.session.rollback()
-                    logger.error(f"DatabaseManager: erro detectado, fazendo rollback da sessão {id(self.session)}")
+                    logger.error("DatabaseManager: erro detectado, fazendo rollback da sessão %s", id(self.session))
                 else:
                     self.session.commit()
-                    logger.debug(f"DatabaseManager: sessão {id(self.session)} commitada")
+                    logger.debug("DatabaseManager: sessão %s commitada", id(self.session))
             finally:
                 self.session.close()
-                logger.debug(f"DatabaseManager: sessão {id(self.session)} fechada")
+                logger.debug("DatabaseManager: sessão %s fechada", id(self.session))
     
     def execute_in_transaction(self, func: Callable, *args, **kwargs) -> Any:
         """
@@ -178,7 +178,7 @@ class DatabaseManager:
             raise RuntimeError("DatabaseManager não está em um contexto ativo")
         
         savepoint = self.session.begin_nested()
-        logger.debug(f"Savepoint '{name or 'unnamed'}' criado na sessão {id(self.session)}")
+        logger.debug("Savepoint '%s' criado na sessão %s", name or 'unnamed', id(self.session))
         return savepoint
 
 
@@ -197,7 +197,7 @@ def get_or_create_session() -> Session:
     # Cria uma nova sessão e armazena no contexto
     session = db.get_session()
     g.db_session = session
-    logger.debug(f"Nova sessão {id(session)} criada e armazenada no contexto da aplicação")
+    logger.debug("Nova sessão %s criada e armazenada no contexto da aplicação", id(session))
     return session
 
 
@@ -210,9 +210,9 @@ def close_session_on_teardown():
     if session:
         try:
             session.close()
-            logger.debug(f"Sessão {id(session)} fechada no teardown")
+            logger.debug("Sessão %s fechada no teardown", id(session))
         except Exception as e:
-            logger.error(f"Erro ao fechar sessão no teardown: {e}")
+            logger.error("Erro ao fechar sessão no teardown: %s", e)
 
 
 # Funções de conveniência para operações comuns
@@ -232,7 +232,7 @@ def safe_get_by_id(session: Session, model_class, entity_id: int):
     try:
         return session.query(model_class).get(entity_id)
     except SQLAlchemyError as e:
-        logger.error(f"Erro ao buscar {model_class.__name__} com ID {entity_id}: {e}")
+        logger.error("Erro ao buscar %s com ID %s: %s", model_class.__name__, entity_id, e)
         return None
 
 
@@ -253,7 +253,7 @@ def safe_create(session: Session, model_instance):
         session.flush()  # Para obter o ID sem fazer commit
         return model_instance
     except SQLAlchemyError as e:
-        logger.error(f"Erro ao criar {type(model_instance).__name__}: {e}")
+        logger.error("Erro ao criar %s: %s", type(model_instance).__name__, e)
         return None
 
 
@@ -278,7 +278,7 @@ def safe_update(session: Session, model_instance, **kwargs):
         session.flush()
         return True
     except SQLAlchemyError as e:
-        logger.error(f"Erro ao atualizar {type(model_instance).__name__}: {e}")
+        logger.error("Erro ao atualizar %s: %s", type(model_instance).__name__, e)
         return False
 
 
@@ -299,5 +299,5 @@ def safe_delete(session: Session, model_instance):
         session.flush()
         return True
     except SQLAlchemyError as e:
-        logger.error(f"Erro ao deletar {type(model_instance).__name__}: {e}")
+        logger.error("Erro ao deletar %s: %s", type(model_instance).__name__, e)
         return False
\ No newline at end of file
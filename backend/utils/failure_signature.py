@@ -0,0 +1,49 @@
+# backend/utils/failure_signature.py
+"""
+Assinatura de falhas: normaliza a mensagem de erro de um teste removendo as
+partes que mudam de uma execução para outra (números, ids, hashes, caminhos,
+URLs), para que falhas com a mesma causa raiz tenham o mesmo texto e o mesmo hash.
+
+Exemplo:
+    "Timeout after 30000ms waiting for /tmp/run-8731/page.html (id=4f2a9c1e)"
+    -> "Timeout after <n>ms waiting for <path> (id=<hex>)"
+
+A assinatura é cortada em TAMANHO_MAXIMO caracteres depois da normalização:
+mensagens que só diferem além desse ponto (em geral, no stack trace) caem
+no mesmo agrupamento, e a busca textual de falhas não vê o texto cortado.
+"""
+
+import hashlib
+import re
+from typing import Optional
+
+# Tamanho máximo da assinatura normalizada (mensagens longas costumam trazer stack trace)
+TAMANHO_MAXIMO = 300
+
+# Ordem importa: padrões mais específicos antes dos genéricos
+_SUBSTITUICOES = (
+    (re.compile(r'\b[a-z][a-z0-9+.-]*://\S+', re.IGNORECASE), '<url>'),
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'(?:\b[A-Za-z]:)?(?:[\\/][\w.@-]+){2,}[\\/]?'), '<path>'),
+    (re.compile(r'\b[\w.+-]+@[\w-]+\.[\w.-]+\b'), '<email>'),
+    (re.compile(r'\b0x[0-9a-f]+\b', re.IGNORECASE), '<hex>'),
+    (re.compile(r'\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{8,}\b', re.IGNORECASE), '<hex>'),
+    (re.compile(r'\d+(?:[.,]\d+)*'), '<n>'),
+)
+_ESPACOS = re.compile(r'\s+')
+
+
+def normalizar_mensagem(mensagem: Optional[str]) -> Optional[str]:
+    """Retorna a assinatura normalizada da mensagem (None se vazia)."""
+    if not mensagem or not mensagem.strip():
+        return None
+    texto = mensagem
+    for padrao, marcador in _SUBSTITUICOES:
+        texto = padrao.sub(marcador, texto)
+    texto = _ESPACOS.sub(' ', texto).strip()
+    return texto[:TAMANHO_MAXIMO]
+
+
+def hash_assinatura(assinatura: str) -> str:
+    """Hash estável da assinatura, usado como chave única."""
+    return hashlib.sha1(assinatura.encode('utf-8')).hexdigest()
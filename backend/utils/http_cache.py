@@ -0,0 +1,21 @@
+# backend/utils/http_cache.py
+"""
+Respostas JSON com validação condicional (ETag).
+
+O ETag é o hash do corpo serializado. O cliente reenvia o valor em
+'If-None-Match' e, se os dados não mudaram, recebe um 304 sem corpo. Como o
+conteúdo depende do usuário autenticado, a resposta é 'private' e varia com o
+cabeçalho 'Authorization'; 'no-cache' obriga a revalidar a cada uso.
+"""
+
+from flask import Response, jsonify, request
+
+
+def resposta_json_condicional(dados) -> Response:
+    """Serializa 'dados' em JSON, calcula o ETag e responde 304 quando possível."""
+    resposta = jsonify(dados)
+    resposta.add_etag()
+    resposta.cache_control.private = True
+    resposta.cache_control.no_cache = True
+    resposta.vary.add('Authorization')
+    return resposta.make_conditional(request)
@@ -0,0 +1,56 @@
+# backend/utils/lazy_import.py
+"""
+Importação sob demanda de módulos pesados.
+
+'sob_demanda("pydantic")' devolve um substituto do módulo que só o importa
+no primeiro acesso a um atributo. Processos que nunca chegam a validar um
+payload ou ler um relatório (comandos de CLI, workers de teste, scripts de
+manutenção) deixam de pagar esses imports na inicialização.
+
+O import real passa pelo importlib, que já serializa imports concorrentes
+do mesmo módulo entre threads; o substituto apenas guarda o resultado.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Dict, List
+
+_registrados: Dict[str, "ModuloSobDemanda"] = {}
+
+
+class ModuloSobDemanda:
+    """Substituto de um módulo que o importa no primeiro acesso a um atributo."""
+
+    __slots__ = ('_nome', '_modulo')
+
+    def __init__(self, nome: str):
+        self._nome = nome
+        self._modulo = None
+
+    def carregar(self) -> ModuleType:
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nome)
+        return self._modulo
+
+    def __getattr__(self, atributo: str):
+        return getattr(self.carregar(), atributo)
+
+    def __repr__(self) -> str:
+        estado = 'carregado' if self._modulo is not None else 'não carregado'
+        return f"<módulo sob demanda {self._nome!r} ({estado})>"
+
+
+def sob_demanda(nome: str) -> ModuloSobDemanda:
+    """Substituto (compartilhado por nome) do módulo 'nome'."""
+    if nome not in _registrados:
+        _registrados[nome] = ModuloSobDemanda(nome)
+    return _registrados[nome]
+
+
+def carregar_modulos_sob_demanda() -> List[ModuleType]:
+    """
+    Importa de uma vez todos os módulos registrados. Usado no master do
+    gunicorn com preload_app, para que os workers herdem os módulos já
+    carregados em vez de importá-los cada um na primeira requisição.
+    """
+    return [modulo.carregar() for modulo in list(_registrados.values())]
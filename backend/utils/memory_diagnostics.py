@@ -0,0 +1,212 @@
+# backend/utils/memory_diagnostics.py
+"""
+Diagnóstico de memória do worker que atende a requisição.
+
+- Memória do processo (utils/process_memory.py) e coletas do gc.
+- Sessões do SQLAlchemy vivas e o tamanho do identity map de cada uma, e
+  instâncias ORM vivas por modelo: uma sessão que não foi fechada, ou
+  objetos presos em algum lugar, aparecem aqui.
+- Itens (e, sob pedido, bytes aproximados) dos caches em memória.
+- Snapshots do tracemalloc: tirados sob demanda, guardados no próprio
+  processo (no máximo MEMORIA_MAX_SNAPSHOTS) e comparados entre si para
+  mostrar onde a memória cresceu.
+
+Cada worker tem seu próprio estado: o 'pid' da resposta diz qual deles
+respondeu. O tracemalloc só é ligado no primeiro snapshot (ele deixa as
+alocações mais lentas) e é desligado ao descartar os snapshots, a não ser
+que já estivesse ligado antes (PYTHONTRACEMALLOC, por exemplo).
+"""
+
+import datetime
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict
+from types import FunctionType, ModuleType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .process_memory import memoria_do_processo
+
+AGRUPAMENTOS = ('lineno', 'filename', 'traceback')
+
+# As próprias estruturas do tracemalloc e do import não interessam
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class SnapshotInexistenteError(LookupError):
+    """Id de snapshot que não está (ou não está mais) guardado neste processo."""
+
+
+def tamanho_profundo(objeto, limite_objetos: int = 200_000) -> int:
+    """
+    Bytes aproximados de 'objeto' e de tudo o que ele alcança (sem contar
+    módulos, classes e funções), parando em 'limite_objetos' objetos.
+    """
+    vistos = set()
+    pendentes = [objeto]
+    total = 0
+    while pendentes and len(vistos) < limite_objetos:
+        atual = pendentes.pop()
+        if id(atual) in vistos or isinstance(atual, (type, ModuleType, FunctionType)):
+            continue
+        vistos.add(id(atual))
+        total += sys.getsizeof(atual, 0)
+        pendentes.extend(gc.get_referents(atual))
+    return total
+
+
+def _estatistica(estatistica) -> Dict:
+    return {
+        'local': [f"{quadro.filename}:{quadro.lineno}" for quadro in estatistica.traceback],
+        'bytes': estatistica.size,
+        'blocos': estatistica.count,
+    }
+
+
+def _diferenca(estatistica) -> Dict:
+    return {
+        **_estatistica(estatistica),
+        'bytes_diferenca': estatistica.size_diff,
+        'blocos_diferenca': estatistica.count_diff,
+    }
+
+
+class DiagnosticoMemoria:
+    """Snapshots do tracemalloc e os caches monitorados deste processo."""
+
+    def __init__(self):
+        self.caches: Tuple[Tuple[str, object], ...] = ()
+        self.quadros = 10
+        self.max_snapshots = 5
+        self._snapshots: "OrderedDict[int, Tuple[str, tracemalloc.Snapshot]]" = OrderedDict()
+        self._proximo_id = 1
+        self._iniciou_tracemalloc = False
+        self._lock = threading.Lock()
+
+    # --- Estado geral ---
+
+    def sessoes(self) -> Dict:
+        """Sessões vivas (encontradas pelo gc) e instâncias ORM vivas por modelo."""
+        gc.collect()
+        tamanhos = []
+        instancias: Counter = Counter()
+        for objeto in gc.get_objects():
+            if isinstance(objeto, Session):
+                tamanhos.append(len(objeto.identity_map))
+            elif hasattr(type(objeto), '__mapper__') and not isinstance(objeto, type):
+                instancias[type(objeto).__name__] += 1
+        tamanhos.sort(reverse=True)
+        return {
+            'abertas': len(tamanhos),
+            'identity_map': {'total': sum(tamanhos), 'maiores': tamanhos[:10]},
+            'instancias_orm': dict(instancias.most_common()),
+        }
+
+    def caches_em_memoria(self, medir_bytes: bool = False) -> Dict[str, Dict]:
+        relatorio = {}
+        for nome, cache in self.caches:
+            dados = {
+                'itens': len(cache),
+                'capacidade': getattr(cache, 'capacidade', None),
+                'acertos': getattr(cache, 'acertos', None),
+                'falhas': getattr(cache, 'falhas', None),
+            }
+            if medir_bytes:
+                dados['bytes_aproximados'] = tamanho_profundo(cache)
+            relatorio[nome] = dados
+        return relatorio
+
+    def resumo(self, medir_bytes: bool = False) -> Dict:
+        atual, pico = tracemalloc.get_traced_memory()
+        return {
+            'pid': os.getpid(),
+            'processo': memoria_do_processo(),
+            'gc': {'objetos': len(gc.get_objects()), 'contagens': gc.get_count(), 'coletas': gc.get_stats()},
+            'sessoes': self.sessoes(),
+            'caches': self.caches_em_memoria(medir_bytes),
+            'tracemalloc': {
+                'ativo': tracemalloc.is_tracing(),
+                'quadros': tracemalloc.get_traceback_limit(),
+                'bytes_rastreados': atual,
+                'pico_bytes': pico,
+                'snapshots': self.listar_snapshots(),
+            },
+        }
+
+    # --- Snapshots do tracemalloc ---
+
+    def listar_snapshots(self) -> List[Dict]:
+        with self._lock:
+            return [{'id': id_snapshot, 'quando': quando} for id_snapshot, (quando, _) in self._snapshots.items()]
+
+    def tirar_snapshot(self) -> Tuple[int, Optional[int]]:
+        """
+        Liga o tracemalloc se preciso e guarda um snapshot. Devolve o id do
+        novo snapshot e o do anterior (None se este for o primeiro).
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.quadros)
+                self._iniciou_tracemalloc = True
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+        quando = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+        with self._lock:
+            anterior = next(reversed(self._snapshots), None)
+            id_snapshot = self._proximo_id
+            self._proximo_id += 1
+            self._snapshots[id_snapshot] = (quando, snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return id_snapshot, anterior
+
+    def _snapshot(self, id_snapshot: int) -> tracemalloc.Snapshot:
+        with self._lock:
+            if id_snapshot not in self._snapshots:
+                raise SnapshotInexistenteError(f"Snapshot {id_snapshot} não encontrado neste processo (pid {os.getpid()}).")
+            return self._snapshots[id_snapshot][1]
+
+    def maiores_alocacoes(self, id_snapshot: int, agrupar: str = 'lineno', limite: int = 20) -> Dict:
+        """Locais que mais retêm memória no snapshot."""
+        estatisticas = self._snapshot(id_snapshot).statistics(agrupar)
+        return {
+            'id': id_snapshot,
+            'bytes_total': sum(e.size for e in estatisticas),
+            'alocacoes': [_estatistica(e) for e in estatisticas[:limite]],
+        }
+
+    def comparar(self, id_snapshot: int, id_base: int, agrupar: str = 'lineno', limite: int = 20) -> Dict:
+        """Locais cuja memória mais cresceu de 'id_base' até 'id_snapshot'."""
+        diferencas = self._snapshot(id_snapshot).compare_to(self._snapshot(id_base), agrupar)
+        return {
+            'id': id_snapshot,
+            'base': id_base,
+            'bytes_diferenca': sum(d.size_diff for d in diferencas),
+            'alocacoes': [_diferenca(d) for d in diferencas[:limite]],
+        }
+
+    def descartar_snapshots(self):
+        """Apaga os snapshots e desliga o tracemalloc, se foi ligado aqui."""
+        with self._lock:
+            self._snapshots.clear()
+            if self._iniciou_tracemalloc:
+                tracemalloc.stop()
+                self._iniciou_tracemalloc = False
+
+
+diagnostico_memoria = DiagnosticoMemoria()
+
+
+def instalar_diagnostico_memoria(app, caches: Iterable[Tuple[str, object]] = ()):
+    """Caches monitorados e limites do tracemalloc vindos da configuração."""
+    diagnostico_memoria.caches = tuple(caches)
+    diagnostico_memoria.quadros = app.config.get('MEMORIA_TRACEMALLOC_QUADROS', 10)
+    diagnostico_memoria.max_snapshots = app.config.get('MEMORIA_MAX_SNAPSHOTS', 5)
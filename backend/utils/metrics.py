@@ -0,0 +1,316 @@
+# backend/utils/metrics.py
+"""
+Métricas do processo no formato texto do Prometheus (GET /metrics).
+
+Sem agente externo nem dependência: contadores e histogramas em memória,
+thread-safe, alimentados pelos sinais de requisição do Flask e pelos eventos
+de engine/pool do SQLAlchemy. Por rota (o template da regra, ex:
+'/api/projetos/<int:id_projeto>', nunca o caminho concreto) são medidos a
+latência, as respostas por status, as consultas e o tempo de banco de cada
+requisição. Também há totais de consultas e checkouts do pool, acertos dos
+caches em memória e a duração do parsing de relatórios enviados.
+
+Os valores são locais ao processo: com vários workers do gunicorn, cada
+coleta reflete o worker que a atendeu (o rótulo 'pid' as distingue).
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# Limites (s) dos histogramas de latência; o '+Inf' é implícito
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+ROTA_DESCONHECIDA = '<sem rota>'
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatar_rotulos(nomes: Sequence[str], valores: Sequence, extra: str = '') -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _formatar_numero(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+
+class Contador:
+    """Contador monotônico, opcionalmente com rótulos."""
+
+    tipo = 'counter'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, tuple(rotulos)
+        self._valores: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, quantidade: float = 1, **rotulos):
+        chave = tuple(rotulos[r] for r in self.rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + quantidade
+
+    def valor(self, **rotulos) -> float:
+        return self._valores.get(tuple(rotulos[r] for r in self.rotulos), 0)
+
+    def amostras(self) -> List[str]:
+        with self._lock:
+            itens = sorted(self._valores.items())
+        return [f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}"
+                for chave, valor in itens]
+
+
+class Histograma:
+    """Histograma com limites fixos (_bucket cumulativo, _sum e _count)."""
+
+    tipo = 'histogram'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (), limites: Sequence[float] = LIMITES_LATENCIA):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, tuple(rotulos)
+        self.limites = tuple(sorted(limites))
+        # Por combinação de rótulos: [contagem por faixa (+Inf no fim), soma, total]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, **rotulos):
+        chave = tuple(rotulos[r] for r in self.rotulos)
+        faixa = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.limites) + 1), 0.0, 0]
+            serie[0][faixa] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    @contextmanager
+    def cronometrar(self, **rotulos):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **rotulos)
+
+    def total(self, **rotulos) -> int:
+        serie = self._series.get(tuple(rotulos[r] for r in self.rotulos))
+        return serie[2] if serie else 0
+
+    def amostras(self) -> List[str]:
+        with self._lock:
+            itens = sorted((chave, ([*faixas], soma, total)) for chave, (faixas, soma, total) in self._series.items())
+        linhas = []
+        for chave, (faixas, soma, total) in itens:
+            acumulado = 0
+            for limite, quantidade in zip((*self.limites, float('inf')), faixas):
+                acumulado += quantidade
+                le = f'le="{_formatar_numero(limite)}"'
+                linhas.append(f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, chave, le)} {acumulado}")
+            linhas.append(f"{self.nome}_sum{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(soma)}")
+            linhas.append(f"{self.nome}_count{_formatar_rotulos(self.rotulos, chave)} {total}")
+        return linhas
+
+
+class Coletada:
+    """
+    Métrica lida na hora da coleta ('funcao' devolve {valores dos rótulos: valor}),
+    para estados que já existem em outros objetos (caches, assinantes do SSE).
+    """
+
+    def __init__(self, nome: str, ajuda: str, tipo: str, rotulos: Sequence[str],
+                 funcao: Callable[[], Dict[Tuple, float]]):
+        self.nome, self.ajuda, self.tipo, self.rotulos = nome, ajuda, tipo, tuple(rotulos)
+        self._funcao = funcao
+
+    def amostras(self) -> List[str]:
+        return [f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}"
+                for chave, valor in sorted(self._funcao().items())]
+
+
+class RegistroMetricas:
+    """Conjunto de métricas exportadas juntas."""
+
+    def __init__(self):
+        self._metricas: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, metrica):
+        with self._lock:
+            self._metricas[metrica.nome] = metrica
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        return self.registrar(Contador(nome, ajuda, rotulos))
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                   limites: Sequence[float] = LIMITES_LATENCIA) -> Histograma:
+        return self.registrar(Histograma(nome, ajuda, rotulos, limites))
+
+    def coletada(self, nome: str, ajuda: str, funcao: Callable[[], Dict[Tuple, float]],
+                 tipo: str = 'gauge', rotulos: Sequence[str] = ()) -> Coletada:
+        return self.registrar(Coletada(nome, ajuda, tipo, rotulos, funcao))
+
+    def exportar(self) -> str:
+        """Todas as métricas no formato texto do Prometheus (versão 0.0.4)."""
+        with self._lock:
+            metricas = sorted(self._metricas.values(), key=lambda m: m.nome)
+        linhas = []
+        for metrica in metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.amostras())
+        return '\n'.join(linhas) + '\n'
+
+
+metricas = RegistroMetricas()
+
+requisicoes = metricas.contador(
+    'projectflow_requisicoes_total', 'Requisições atendidas por rota e status.', ('metodo', 'rota', 'status'))
+duracao_requisicao = metricas.histograma(
+    'projectflow_requisicao_duracao_segundos', 'Latência das requisições por rota.', ('metodo', 'rota'))
+consultas_por_requisicao = metricas.histograma(
+    'projectflow_requisicao_consultas', 'Consultas SQL executadas por requisição.', ('metodo', 'rota'),
+    limites=LIMITES_CONSULTAS)
+tempo_banco_requisicao = metricas.histograma(
+    'projectflow_requisicao_banco_segundos', 'Tempo total em consultas SQL por requisição.', ('metodo', 'rota'))
+consultas = metricas.contador('projectflow_banco_consultas_total', 'Consultas SQL executadas.')
+tempo_banco = metricas.contador('projectflow_banco_segundos_total', 'Tempo total em consultas SQL.')
+checkouts = metricas.contador('projectflow_banco_checkouts_total', 'Conexões retiradas do pool.')
+uploads_relatorio = metricas.contador(
+    'projectflow_relatorio_uploads_total',
+    "Relatórios enviados por resultado ('cache': mesmo arquivo já processado, 'processado', 'invalido').",
+    ('resultado',))
+duracao_parse_relatorio = metricas.histograma(
+    'projectflow_relatorio_parse_segundos', 'Duração do parsing dos relatórios de teste enviados.')
+metricas.coletada('projectflow_processo_info', 'Identificação do processo que respondeu à coleta.',
+                  lambda: {(os.getpid(),): 1}, rotulos=('pid',))
+
+
+class EstatisticasRequisicao:
+    """Consultas e tempo de banco acumulados durante uma requisição."""
+
+    __slots__ = ('consultas', 'tempo_banco')
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo_banco = 0.0
+
+
+requisicao_atual: ContextVar[Optional[EstatisticasRequisicao]] = ContextVar('requisicao_atual', default=None)
+
+
+def registrar_requisicao(metodo: str, rota: str, status: int, duracao: float,
+                         estatisticas: Optional[EstatisticasRequisicao]):
+    requisicoes.inc(metodo=metodo, rota=rota, status=status)
+    duracao_requisicao.observar(duracao, metodo=metodo, rota=rota)
+    if estatisticas is not None:
+        consultas_por_requisicao.observar(estatisticas.consultas, metodo=metodo, rota=rota)
+        tempo_banco_requisicao.observar(estatisticas.tempo_banco, metodo=metodo, rota=rota)
+
+
+# --- EVENTOS DO SQLALCHEMY ---
+
+def _antes_da_consulta(conn, cursor, sql, parametros, contexto, executemany):
+    conn.info.setdefault('inicio_consultas', []).append(time.perf_counter())
+
+
+def _depois_da_consulta(conn, cursor, sql, parametros, contexto, executemany):
+    duracao = time.perf_counter() - conn.info['inicio_consultas'].pop()
+    consultas.inc()
+    tempo_banco.inc(duracao)
+    estatisticas = requisicao_atual.get()
+    if estatisticas is not None:
+        estatisticas.consultas += 1
+        estatisticas.tempo_banco += duracao
+
+
+def _erro_na_consulta(contexto_excecao):
+    inicios = contexto_excecao.connection.info.get('inicio_consultas') if contexto_excecao.connection else None
+    if inicios:
+        inicios.pop()
+
+
+def _checkout(conexao_dbapi, registro, proxy):
+    checkouts.inc()
+
+
+_instalado = False
+_lock_instalacao = threading.Lock()
+
+
+def instalar_eventos_banco():
+    """Registra os eventos de todas as engines e pools (uma vez por processo)."""
+    global _instalado
+    with _lock_instalacao:
+        if _instalado:
+            return
+        _instalado = True
+    event.listen(Engine, 'before_cursor_execute', _antes_da_consulta)
+    event.listen(Engine, 'after_cursor_execute', _depois_da_consulta)
+    event.listen(Engine, 'handle_error', _erro_na_consulta)
+    event.listen(Pool, 'checkout', _checkout)
+
+
+def registrar_caches(caches: Iterable[Tuple[str, object]]):
+    """Expõe os contadores 'acertos'/'falhas' de caches que já os mantêm."""
+    caches = tuple(caches)
+
+    def coletar():
+        valores = {}
+        for nome, cache in caches:
+            valores[(nome, 'acerto')] = cache.acertos
+            valores[(nome, 'falha')] = cache.falhas
+        return valores
+
+    metricas.coletada('projectflow_cache_acessos_total',
+                      'Acessos aos caches em memória do processo por resultado (acerto/falha).',
+                      coletar, tipo='counter', rotulos=('cache', 'resultado'))
+
+
+def instalar_metricas(app, caches: Iterable[Tuple[str, object]] = ()):
+    """
+    Mede cada requisição do app pelos sinais request_started/request_finished
+    do Flask e expõe os caches informados e o estado do canal de eventos e
+    da fila de logging.
+    """
+    from flask import g, request, request_finished, request_started
+    from utils.pubsub import barramento_eventos
+    from utils.structured_logging import registros_descartados
+
+    instalar_eventos_banco()
+    registrar_caches(caches)
+    metricas.coletada('projectflow_sse_assinantes', 'Conexões abertas no canal de eventos (/api/eventos).',
+                      lambda: {(): barramento_eventos.assinantes})
+    metricas.coletada('projectflow_log_descartados_total', 'Registros de log descartados com a fila cheia.',
+                      lambda: {(): registros_descartados()}, tipo='counter')
+
+    def ao_iniciar(sender, **extra):
+        g.inicio_metricas = time.perf_counter()
+        g.token_metricas = requisicao_atual.set(EstatisticasRequisicao())
+
+    def ao_finalizar(sender, response, **extra):
+        if 'token_metricas' not in g:
+            return
+        estatisticas = requisicao_atual.get()
+        requisicao_atual.reset(g.pop('token_metricas'))
+        rota = request.url_rule.rule if request.url_rule else ROTA_DESCONHECIDA
+        registrar_requisicao(request.method, rota, response.status_code,
+                             time.perf_counter() - g.inicio_metricas, estatisticas)
+
+    # weak=False: as funções locais seriam coletadas assim que esta função retornasse
+    request_started.connect(ao_iniciar, app, weak=False)
+    request_finished.connect(ao_finalizar, app, weak=False)
@@ -0,0 +1,55 @@
+# backend/utils/process_memory.py
+"""
+Memória de um processo lida de /proc (Linux), para medir quanto cada worker
+do servidor compartilha com o processo master (copy-on-write após o fork).
+
+- rss: páginas residentes, contando as compartilhadas integralmente
+- pss: RSS com cada página compartilhada dividida entre os processos que a usam
+- privada: páginas só deste processo (o custo real de mais um worker)
+- compartilhada: páginas residentes que outros processos também usam
+"""
+
+from typing import Dict, Union
+
+_CAMPOS = {
+    'Rss': 'rss',
+    'Pss': 'pss',
+    'Private_Clean': 'privada',
+    'Private_Dirty': 'privada',
+    'Shared_Clean': 'compartilhada',
+    'Shared_Dirty': 'compartilhada',
+}
+
+
+def memoria_do_processo(pid: Union[int, str] = 'self') -> Dict[str, int]:
+    """
+    Memória do processo em bytes ('rss', 'pss', 'privada', 'compartilhada').
+    Devolve um dicionário vazio onde /proc/<pid>/smaps_rollup não existe.
+    """
+    memoria = dict.fromkeys(set(_CAMPOS.values()), 0)
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', encoding='ascii') as arquivo:
+            for linha in arquivo:
+                nome, _, valor = linha.partition(':')
+                if nome in _CAMPOS:
+                    memoria[_CAMPOS[nome]] += int(valor.split()[0]) * 1024
+    except (OSError, ValueError):
+        return {}
+    return memoria
+
+
+def processos_filhos(pid: int) -> list:
+    """PIDs dos filhos diretos do processo (ex: os workers de um master)."""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children', encoding='ascii') as arquivo:
+            return [int(p) for p in arquivo.read().split()]
+    except OSError:
+        return []
+
+
+def formatar_memoria(memoria: Dict[str, int]) -> str:
+    if not memoria:
+        return "memória indisponível"
+    mib = 1024 * 1024
+    return (f"RSS {memoria['rss'] / mib:.1f} MiB, PSS {memoria['pss'] / mib:.1f} MiB, "
+            f"privada {memoria['privada'] / mib:.1f} MiB")
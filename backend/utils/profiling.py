@@ -0,0 +1,191 @@
+# backend/utils/profiling.py
+"""
+Perfil de uma requisição sob demanda.
+
+Um Admin envia 'X-Profile: 1' em qualquer chamada da API e a requisição é
+medida de duas formas ao mesmo tempo:
+
+- cProfile (determinístico): tempo por função, gravado em '<id>.prof'
+  (pstats/snakeviz) e resumido em '<id>.txt';
+- amostragem da pilha da thread da requisição a cada PERFIS_INTERVALO_MS,
+  gravada em '<id>.collapsed' ("a;b;c 12" por linha), o formato lido por
+  flamegraph.pl, speedscope e similares. Inclui o tempo parado em E/S.
+
+'X-Profile: amostragem' dispensa o cProfile, que distorce funções pequenas
+chamadas muitas vezes. Os arquivos ficam em PERFIS_PASTA (só os
+PERFIS_MAX mais recentes) e a resposta aponta para eles no cabeçalho Link.
+Sem o cabeçalho, o custo é só a leitura dele.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+FORMATOS_PERFIL = {'prof': 'application/octet-stream', 'collapsed': 'text/plain', 'txt': 'text/plain'}
+ID_PERFIL_VALIDO = re.compile(r'^\d+-[A-Za-z0-9._-]{1,64}$')
+
+
+def _nome_quadro(quadro) -> str:
+    codigo = quadro.f_code
+    modulo = quadro.f_globals.get('__name__') or os.path.basename(codigo.co_filename)
+    return f"{modulo}:{codigo.co_name}"
+
+
+class AmostradorPilhas(threading.Thread):
+    """Lê periodicamente a pilha de uma thread e conta as pilhas iguais."""
+
+    def __init__(self, id_thread: int, intervalo: float):
+        super().__init__(name='perfil-amostrador', daemon=True)
+        self.id_thread = id_thread
+        self.intervalo = intervalo
+        self.pilhas: Counter = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            quadro = sys._current_frames().get(self.id_thread)
+            nomes = []
+            while quadro is not None:
+                nomes.append(_nome_quadro(quadro))
+                quadro = quadro.f_back
+            if nomes:
+                self.pilhas[';'.join(reversed(nomes))] += 1
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+    def colapsado(self) -> str:
+        return ''.join(f"{pilha} {vezes}\n" for pilha, vezes in self.pilhas.most_common())
+
+
+class PerfilRequisicao:
+    """cProfile e/ou amostrador ligados durante uma requisição."""
+
+    def __init__(self, id_perfil: str, deterministico: bool, intervalo: float):
+        self.id_perfil = id_perfil
+        self.perfil = cProfile.Profile() if deterministico else None
+        self.amostrador = AmostradorPilhas(threading.get_ident(), intervalo)
+        self.inicio = 0.0
+        self.duracao = None
+
+    def iniciar(self):
+        self.inicio = time.perf_counter()
+        self.amostrador.start()
+        if self.perfil is not None:
+            self.perfil.enable()
+
+    def parar(self):
+        if self.duracao is not None:
+            return
+        if self.perfil is not None:
+            self.perfil.disable()
+        self.amostrador.parar()
+        self.duracao = time.perf_counter() - self.inicio
+
+    def gravar(self, pasta: str):
+        os.makedirs(pasta, exist_ok=True)
+        base = os.path.join(pasta, self.id_perfil)
+        with open(f"{base}.collapsed", 'w', encoding='utf-8') as arquivo:
+            arquivo.write(self.amostrador.colapsado())
+        resumo = io.StringIO()
+        resumo.write(f"{self.id_perfil}: {self.duracao * 1000:.1f}ms, "
+                     f"{sum(self.amostrador.pilhas.values())} amostras\n\n")
+        if self.perfil is not None:
+            self.perfil.dump_stats(f"{base}.prof")
+            pstats.Stats(self.perfil, stream=resumo).sort_stats('cumulative').print_stats(40)
+        with open(f"{base}.txt", 'w', encoding='utf-8') as arquivo:
+            arquivo.write(resumo.getvalue())
+
+
+def caminho_perfil(pasta: str, id_perfil: str, formato: str) -> Optional[str]:
+    """Arquivo de um perfil gravado, ou None se o id/formato for inválido ou não existir."""
+    if formato not in FORMATOS_PERFIL or not ID_PERFIL_VALIDO.match(id_perfil):
+        return None
+    caminho = os.path.join(pasta, f"{id_perfil}.{formato}")
+    return caminho if os.path.exists(caminho) else None
+
+
+def _descartar_antigos(pasta: str, manter: int):
+    if manter <= 0:
+        return
+    por_id = {}
+    for nome in os.listdir(pasta):
+        id_perfil, _, formato = nome.rpartition('.')
+        if formato in FORMATOS_PERFIL:
+            por_id.setdefault(id_perfil, []).append(os.path.join(pasta, nome))
+    # O id começa com o horário em ms (13 dígitos), então a ordem alfabética é a cronológica
+    for id_perfil in sorted(por_id)[:-manter]:
+        for caminho in por_id[id_perfil]:
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+
+
+def _autorizado() -> bool:
+    from flask_jwt_extended import verify_jwt_in_request
+    from security import Permissions, get_usuario_atual
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+    return Permissions.pode_ver_diagnosticos(get_usuario_atual())
+
+
+def instalar_perfis(app):
+    """Liga o perfil das requisições com 'X-Profile' enviadas por Admins."""
+    from flask import g, request
+
+    pasta = app.config['PERFIS_PASTA']
+    manter = app.config.get('PERFIS_MAX', 50)
+    intervalo = app.config.get('PERFIS_INTERVALO_MS', 1) / 1000
+
+    @app.before_request
+    def iniciar_perfil():
+        modo = request.headers.get('X-Profile')
+        if not modo or modo == '0' or not _autorizado():
+            return
+        id_perfil = f"{int(time.time() * 1000)}-{g.get('request_id') or os.getpid()}"
+        g.perfil_requisicao = PerfilRequisicao(id_perfil, deterministico=(modo != 'amostragem'), intervalo=intervalo)
+        g.perfil_requisicao.iniciar()
+
+    @app.after_request
+    def gravar_perfil(response):
+        perfil = g.pop('perfil_requisicao', None)
+        if perfil is None:
+            return response
+        perfil.parar()
+        try:
+            perfil.gravar(pasta)
+            _descartar_antigos(pasta, manter)
+        except OSError as e:
+            logger.error("Falha ao gravar o perfil %s em %s: %s", perfil.id_perfil, pasta, e)
+            return response
+
+        formatos = ['collapsed', 'txt'] + (['prof'] if perfil.perfil is not None else [])
+        response.headers['X-Profile-Id'] = perfil.id_perfil
+        response.headers['Link'] = ', '.join(
+            f'</api/admin/perfis/{perfil.id_perfil}/{formato}>; rel="profile"; type="{FORMATOS_PERFIL[formato]}"'
+            for formato in formatos
+        )
+        logger.info("Perfil %s gravado (%s %s, %.1fms)", perfil.id_perfil, request.method, request.path,
+                    perfil.duracao * 1000)
+        return response
+
+    @app.teardown_request
+    def encerrar_perfil(exception=None):
+        # Exceção sem after_request: só desliga, sem gravar
+        perfil = g.pop('perfil_requisicao', None)
+        if perfil is not None:
+            perfil.parar()
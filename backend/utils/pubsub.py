@@ -0,0 +1,322 @@
+# backend/utils/pubsub.py
+"""
+Barramento de eventos em memória (publicação/assinatura) para o canal de
+Server-Sent Events (GET /api/eventos).
+
+Cada assinante tem uma fila própria e limitada: a publicação nunca bloqueia
+quem escreve. Se um cliente lento enche a fila, os eventos mais antigos são
+descartados e ele recebe um evento 'resync', sinal para buscar o estado em
+/api/changes. Os últimos eventos ficam guardados para que um cliente que
+reconecte com Last-Event-ID receba o que perdeu.
+
+Com uma fila no banco (usar_fila, feito pelo create_app), a publicação só
+grava o evento, na mesma transação da escrita, e um retransmissor em cada
+processo lê os eventos novos a cada 'intervalo' segundos e os entrega aos
+clientes conectados ali. Assim um cliente recebe as escritas feitas em
+qualquer worker, e os ids do fluxo (o Last-Event-ID) valem em todos eles. O
+processo que fez a escrita acorda o seu retransmissor no commit, sem esperar
+o intervalo. Sem fila, o barramento entrega tudo em memória, só no próprio
+processo.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_CHAVE_PENDENTES = 'eventos_pendentes'
+
+EVENTO_RESYNC = 'resync'
+_LOTE_RETRANSMISSAO = 500
+
+
+class LimiteAssinaturasError(RuntimeError):
+    """Número máximo de assinantes simultâneos atingido."""
+
+
+class Assinatura:
+    """Fila limitada de um assinante, com o filtro dos eventos que ele pode receber."""
+
+    def __init__(self, filtro: Optional[Callable[[Dict], bool]], capacidade: int):
+        self.filtro = filtro
+        self._fila: "queue.Queue[Dict]" = queue.Queue(maxsize=max(capacidade, 1))
+        self._lock = threading.Lock()
+        self.descartados = 0
+        # Chamado a cada entrega; usado pelo consumidor assíncrono para acordar o laço de eventos
+        self._ao_entregar: Optional[Callable[[], None]] = None
+
+    def entregar(self, evento: Dict):
+        if self.filtro is not None and not self.filtro(evento):
+            return
+        with self._lock:
+            while True:
+                try:
+                    self._fila.put_nowait(evento)
+                    break
+                except queue.Full:
+                    # Descarta o mais antigo; o cliente será avisado para ressincronizar
+                    try:
+                        self._fila.get_nowait()
+                        self.descartados += 1
+                    except queue.Empty:
+                        pass
+        despertar = self._ao_entregar
+        if despertar is not None:
+            despertar()
+
+    def proximo(self, timeout: float) -> Optional[Dict]:
+        """
+        Próximo evento, ou None se nada chegar em 'timeout' segundos. Um
+        evento 'resync' precede os eventos entregues depois de um descarte.
+        """
+        with self._lock:
+            if self.descartados:
+                self.descartados = 0
+                return {"tipo": EVENTO_RESYNC}
+        try:
+            return self._fila.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def proximo_async(self, timeout: float) -> Optional[Dict]:
+        """
+        Versão de 'proximo' para servidores assíncronos: espera no laço de
+        eventos, sem ocupar uma thread por cliente conectado.
+        """
+        laco = asyncio.get_running_loop()
+        sinal = asyncio.Event()
+
+        def despertar():
+            try:
+                laco.call_soon_threadsafe(sinal.set)
+            except RuntimeError:
+                # Laço já encerrado (cliente desconectado durante o desligamento)
+                pass
+
+        self._ao_entregar = despertar
+        try:
+            evento = self.proximo(timeout=0)
+            if evento is None:
+                try:
+                    await asyncio.wait_for(sinal.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+                evento = self.proximo(timeout=0)
+            return evento
+        finally:
+            self._ao_entregar = None
+
+
+class BarramentoEventos:
+    """Distribui cada evento publicado para as filas dos assinantes."""
+
+    def __init__(self, historico: int = 256, max_assinantes: int = 500):
+        self.max_assinantes = max_assinantes
+        self.intervalo = 0.5
+        self.retencao = 10_000
+        self._assinaturas: List[Assinatura] = []
+        self._recentes: deque = deque(maxlen=historico)
+        self._sequencia = itertools.count(1)
+        # Id do último evento distribuído (com fila, None até o retransmissor começar)
+        self._ultimo: Optional[int] = 0
+        self._fila = None
+        self._retransmissor: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._acordar = threading.Event()
+        self._lock = threading.Lock()
+
+    def usar_fila(self, fila, intervalo: float = 0.5, retencao: int = 10_000):
+        """
+        Passa a publicar pela fila do banco (data_sources/fila_eventos.py). O
+        retransmissor deste processo é iniciado na primeira assinatura.
+        """
+        with self._lock:
+            self._fila = fila
+            self.intervalo = intervalo
+            self.retencao = retencao
+            self._recentes.clear()
+            self._ultimo = None if fila is not None else 0
+        self._acordar.set()
+
+    def assinar(self, filtro: Optional[Callable[[Dict], bool]] = None, capacidade: int = 100,
+                desde: Optional[int] = None) -> Assinatura:
+        """
+        Cria uma assinatura. Com 'desde' (último id recebido pelo cliente), os
+        eventos posteriores ainda guardados são reentregues; se algum já saiu
+        do histórico, a assinatura começa com um 'resync'.
+
+        Raises:
+            LimiteAssinaturasError: Se já houver 'max_assinantes' assinaturas
+        """
+        assinatura = Assinatura(filtro, capacidade)
+        if self._fila is not None:
+            self._iniciar_retransmissor()
+        with self._lock:
+            if len(self._assinaturas) >= self.max_assinantes:
+                raise LimiteAssinaturasError("Limite de conexões de eventos atingido.")
+            if desde is not None:
+                ultimo = self._ultimo or 0
+                primeiro = self._recentes[0]['id'] if self._recentes else ultimo + 1
+                # Eventos perdidos que já saíram do histórico (ou anteriores ao retransmissor)
+                if desde + 1 < primeiro:
+                    assinatura.descartados = 1
+                elif desde > ultimo:
+                    if self._fila is None:
+                        # Id de outro processo ou execução
+                        assinatura.descartados = 1
+                    else:
+                        # Outro processo já distribuiu eventos que este ainda vai ler
+                        assinatura.filtro = _depois_de(desde, assinatura.filtro)
+                for evento in self._recentes:
+                    if evento['id'] > desde:
+                        assinatura.entregar(evento)
+            self._assinaturas.append(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        with self._lock:
+            if assinatura in self._assinaturas:
+                self._assinaturas.remove(assinatura)
+
+    def publicar(self, tipo: str, **dados) -> Optional[Dict]:
+        """
+        Publica o evento agora e o devolve com seu 'id'. Com fila, ele é gravado
+        em uma transação própria e distribuído pelo retransmissor; se a gravação
+        falhar, o evento é perdido (os clientes ainda sincronizam por /api/changes)
+        e None é devolvido.
+        """
+        if self._fila is not None:
+            try:
+                id_evento = self._fila.gravar_agora(tipo, dados)
+            except Exception as e:
+                logger.warning("Evento '%s' não publicado: %s", tipo, e)
+                return None
+            self._acordar.set()
+            return {"id": id_evento, "tipo": tipo, **dados}
+        evento = {"id": next(self._sequencia), "tipo": tipo, **dados}
+        self._distribuir([evento])
+        return evento
+
+    def publicar_apos_commit(self, session, tipo: str, **dados):
+        """
+        Publica o evento quando a transação da sessão for confirmada; um
+        rollback o descarta. Sem sessão, publica imediatamente.
+        """
+        if session is None:
+            self.publicar(tipo, **dados)
+            return
+        if not event.contains(session, 'after_commit', self._ao_commit):
+            event.listen(session, 'before_commit', self._antes_do_commit)
+            event.listen(session, 'after_commit', self._ao_commit)
+            event.listen(session, 'after_rollback', _ao_rollback)
+        session.info.setdefault(_CHAVE_PENDENTES, []).append((tipo, dados))
+
+    def _antes_do_commit(self, session):
+        # Com fila, os eventos entram na própria transação da escrita (um único comando)
+        if self._fila is not None:
+            pendentes = session.info.pop(_CHAVE_PENDENTES, None)
+            if pendentes:
+                self._fila.gravar(session, pendentes)
+
+    def _ao_commit(self, session):
+        pendentes = session.info.pop(_CHAVE_PENDENTES, None) or []
+        for tipo, dados in pendentes:
+            self.publicar(tipo, **dados)
+        if self._fila is not None:
+            self._acordar.set()
+
+    def _distribuir(self, eventos: List[Dict], fila=None):
+        """Guarda os eventos no histórico e os entrega às assinaturas atuais."""
+        with self._lock:
+            if fila is not self._fila:
+                return  # Fila trocada durante a leitura
+            self._recentes.extend(eventos)
+            self._ultimo = eventos[-1]['id']
+            assinaturas = list(self._assinaturas)
+        for evento in eventos:
+            for assinatura in assinaturas:
+                assinatura.entregar(evento)
+
+    # --- Retransmissão a partir da fila ---
+
+    def _iniciar_retransmissor(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Processo filho (fork): as assinaturas e a thread eram do pai
+                self._pid = os.getpid()
+                self._assinaturas.clear()
+                self._retransmissor = None
+            if self._ultimo is None:
+                # O histórico começa com os últimos eventos da fila, para que um cliente
+                # que reconecte vindo de outro processo não precise ressincronizar
+                ultimo = self._fila.ultimo_id()
+                self._recentes.extend(self._fila.ler(max(ultimo - self._recentes.maxlen, 0), self._recentes.maxlen))
+                self._ultimo = self._recentes[-1]['id'] if self._recentes else ultimo
+            if self._retransmissor is not None and self._retransmissor.is_alive():
+                return
+            self._retransmissor = threading.Thread(target=self._retransmitir, name='eventos-retransmissor',
+                                                   daemon=True)
+            self._retransmissor.start()
+
+    def _retransmitir(self):
+        proxima_limpeza = time.monotonic() + 60
+        while True:
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            with self._lock:
+                fila, ultimo = self._fila, self._ultimo
+            if fila is None or ultimo is None:
+                continue
+            try:
+                eventos = fila.ler(ultimo, _LOTE_RETRANSMISSAO)
+                if eventos:
+                    self._distribuir(eventos, fila)
+                    if len(eventos) == _LOTE_RETRANSMISSAO:
+                        self._acordar.set()  # Pode haver mais; lê de novo sem esperar
+                if time.monotonic() >= proxima_limpeza:
+                    proxima_limpeza = time.monotonic() + 60
+                    fila.descartar_ate(ultimo - self.retencao)
+            except Exception as e:
+                logger.warning("Falha ao ler a fila de eventos: %s", e)
+
+    def limpar(self):
+        with self._lock:
+            self._assinaturas.clear()
+            self._recentes.clear()
+
+    @property
+    def assinantes(self) -> int:
+        return len(self._assinaturas)
+
+
+def _ao_rollback(session):
+    session.info.pop(_CHAVE_PENDENTES, None)
+
+
+def _depois_de(desde: int, filtro: Optional[Callable[[Dict], bool]]) -> Callable[[Dict], bool]:
+    """Filtro que ignora os eventos que o cliente já recebeu de outro processo."""
+    return lambda evento: evento.get('id', desde + 1) > desde and (filtro is None or filtro(evento))
+
+
+def formatar_sse(evento: Dict) -> str:
+    """
+    Mensagem no formato text/event-stream. O 'id' vira o Last-Event-ID da
+    reconexão; 'responsaveis' serve só ao filtro e não é enviado.
+    """
+    dados = {k: v for k, v in evento.items() if k not in ('id', 'tipo', 'responsaveis')}
+    linhas = [f"id: {evento['id']}"] if 'id' in evento else []
+    linhas += [f"event: {evento['tipo']}", f"data: {json.dumps(dados, separators=(',', ':'))}"]
+    return '\n'.join(linhas) + '\n\n'
+
+
+barramento_eventos = BarramentoEventos()
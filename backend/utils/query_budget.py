@@ -0,0 +1,165 @@
+# backend/utils/query_budget.py
+"""
+Contagem de consultas SQL por trecho de código, para detectar N+1.
+
+'monitorar_consultas()' registra (pelo evento before_cursor_execute de
+todas as engines) cada comando executado na thread/contexto corrente;
+comandos idênticos repetidos muitas vezes em um mesmo trecho são a marca de
+um relacionamento carregado sob demanda dentro de um laço (para_dicionario).
+
+- Testes: 'orcamento_consultas(maximo)' falha com a lista dos comandos
+  repetidos quando o trecho (ou a função decorada) passa do limite.
+- Produção: com ORCAMENTO_CONSULTAS definido, uma fração das requisições
+  (ORCAMENTO_CONSULTAS_AMOSTRAGEM) é monitorada, e as que passam do limite
+  são registradas no log com os comandos repetidos.
+"""
+
+import logging
+import random
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Listas de parâmetros de tamanhos diferentes ('IN (?, ?, ?)') contam como o mesmo comando
+_LISTA_PARAMETROS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_ESPACOS = re.compile(r'\s+')
+
+
+def normalizar_sql(sql: str) -> str:
+    return _LISTA_PARAMETROS.sub('(?, ...)', _ESPACOS.sub(' ', sql).strip())
+
+
+class OrcamentoConsultasExcedido(AssertionError):
+    """Um trecho monitorado executou mais consultas do que o permitido."""
+
+
+class MonitorConsultas:
+    """Consultas executadas enquanto o monitor está ativo (inclusive em monitores aninhados)."""
+
+    def __init__(self, pai: Optional["MonitorConsultas"] = None):
+        self.pai = pai
+        self.total = 0
+        self.comandos: Counter = Counter()
+
+    def registrar(self, sql: str):
+        self.total += 1
+        self.comandos[normalizar_sql(sql)] += 1
+
+    def repetidas(self, minimo: int = 2) -> List[Tuple[str, int]]:
+        """Comandos executados 'minimo' ou mais vezes, do mais repetido ao menos."""
+        return [(sql, vezes) for sql, vezes in self.comandos.most_common() if vezes >= minimo]
+
+    def relatorio(self, limite: int = 5) -> str:
+        linhas = [f"{self.total} consultas"]
+        for sql, vezes in self.repetidas()[:limite]:
+            linhas.append(f"  {vezes}x {sql[:300]}")
+        return '\n'.join(linhas)
+
+
+_monitor_atual: ContextVar[Optional[MonitorConsultas]] = ContextVar('monitor_consultas', default=None)
+
+
+def _ao_executar(conn, cursor, sql, parametros, contexto, executemany):
+    monitor = _monitor_atual.get()
+    while monitor is not None:
+        monitor.registrar(sql)
+        monitor = monitor.pai
+
+
+_instalado = False
+_lock_instalacao = threading.Lock()
+
+
+def instalar():
+    """Registra o evento em todas as engines (uma vez por processo)."""
+    global _instalado
+    with _lock_instalacao:
+        if _instalado:
+            return
+        _instalado = True
+    event.listen(Engine, 'before_cursor_execute', _ao_executar)
+
+
+@contextmanager
+def monitorar_consultas():
+    """Conta as consultas executadas dentro do bloco."""
+    instalar()
+    monitor = MonitorConsultas(_monitor_atual.get())
+    token = _monitor_atual.set(monitor)
+    try:
+        yield monitor
+    finally:
+        _monitor_atual.reset(token)
+
+
+@contextmanager
+def orcamento_consultas(maximo: int):
+    """
+    Falha (OrcamentoConsultasExcedido) se o bloco executar mais de 'maximo'
+    consultas. Também serve de decorador: '@orcamento_consultas(5)'.
+    """
+    with monitorar_consultas() as monitor:
+        yield monitor
+    if monitor.total > maximo:
+        raise OrcamentoConsultasExcedido(f"Orçamento de {maximo} consultas excedido: {monitor.relatorio()}")
+
+
+def amostrar_requisicao(app) -> bool:
+    """Se a requisição deve ter as consultas contadas (ORCAMENTO_CONSULTAS_AMOSTRAGEM)."""
+    taxa = app.config.get('ORCAMENTO_CONSULTAS_AMOSTRAGEM', 0.05)
+    return bool(app.config.get('ORCAMENTO_CONSULTAS')) and (taxa >= 1.0 or random.random() < taxa)
+
+
+def verificar_orcamento_requisicao(app, monitor: MonitorConsultas, metodo: str, caminho: str, rota: str):
+    """Registra no log a requisição que passou do orçamento (ORCAMENTO_CONSULTAS)."""
+    maximo = app.config.get('ORCAMENTO_CONSULTAS')
+    if not maximo or monitor.total <= maximo:
+        return
+    repetidas = monitor.repetidas()
+    logger.warning(
+        "%s %s executou %d consultas (orçamento %d); %d comando(s) repetido(s)",
+        metodo, caminho, monitor.total, maximo, len(repetidas),
+        extra={'consultas': {
+            'rota': rota,
+            'total': monitor.total,
+            'orcamento': maximo,
+            'repetidas': [{'sql': sql[:500], 'vezes': vezes} for sql, vezes in repetidas[:5]],
+        }},
+    )
+
+
+def instalar_orcamento_requisicoes(app):
+    """Modo de produção: registra no log as requisições amostradas que passam do orçamento."""
+    from flask import g, request
+
+    if not app.config.get('ORCAMENTO_CONSULTAS'):
+        return
+    instalar()
+
+    @app.before_request
+    def iniciar_monitor():
+        if amostrar_requisicao(app):
+            g.monitor_consultas = MonitorConsultas(_monitor_atual.get())
+            g.token_monitor_consultas = _monitor_atual.set(g.monitor_consultas)
+
+    @app.after_request
+    def verificar_orcamento(response):
+        monitor = g.get('monitor_consultas')
+        if monitor is not None:
+            verificar_orcamento_requisicao(app, monitor, request.method, request.path,
+                                           request.url_rule.rule if request.url_rule else request.path)
+        return response
+
+    @app.teardown_request
+    def encerrar_monitor(exception=None):
+        token = g.pop('token_monitor_consultas', None)
+        if token is not None:
+            _monitor_atual.reset(token)
@@ -63,7 +63,7 @@ def validate_file_content(file_path: str, expected_extensions: set = None) -> bo
         return bool(set(allowed_extensions_for_mime) & expected_extensions)
         
     except Exception as e:
-        current_app.logger.error(f"Erro ao validar conteúdo do arquivo {file_path}: {e}")
+        current_app.logger.error("Erro ao validar conteúdo do arquivo %s: %s", file_path, e)
         return False
 
 
@@ -220,5 +220,5 @@ class FileUploadValidator:
             return True, "Arquivo salvo com sucesso", file_path
             
         except Exception as e:
-            current_app.logger.error(f"Erro ao salvar arquivo: {e}")
+            current_app.logger.error("Erro ao salvar arquivo: %s", e)
             return False, "Erro interno ao salvar arquivo", None
\ No newline at end of file
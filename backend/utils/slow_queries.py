@@ -0,0 +1,233 @@
+# backend/utils/slow_queries.py
+"""
+Registro de consultas lentas com o plano de execução.
+
+Com CONSULTAS_LENTAS_MS definido, toda consulta que passar do limite é
+gravada (em JSON, uma por linha) em um arquivo local com rotação por
+tamanho: o comando, os parâmetros com os textos ocultados, a duração, a rota
+que a executou e a saída de 'EXPLAIN QUERY PLAN', obtida na hora, na mesma
+conexão. GET /api/admin/consultas-lentas agrupa os registros por comando e
+lista os que mais somaram tempo.
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .metrics import metricas
+from .query_budget import normalizar_sql
+from .structured_logging import id_requisicao
+
+logger = logging.getLogger(__name__)
+
+consultas_lentas = metricas.contador(
+    'projectflow_banco_consultas_lentas_total', 'Consultas SQL acima de CONSULTAS_LENTAS_MS.'
+)
+
+# Só comandos que o SQLite aceita depois de 'EXPLAIN QUERY PLAN'
+_COM_PLANO = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+def redigir_parametros(parametros):
+    """
+    Parâmetros seguros para o registro: números, booleanos e None (ids, em
+    geral) ficam; textos e binários viram só o tipo e o tamanho.
+    """
+    if isinstance(parametros, dict):
+        return {chave: redigir_parametros(valor) for chave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [redigir_parametros(valor) for valor in parametros]
+    if parametros is None or isinstance(parametros, (bool, int, float)):
+        return parametros
+    if isinstance(parametros, (str, bytes)):
+        return f"<{type(parametros).__name__}:{len(parametros)}>"
+    return f"<{type(parametros).__name__}>"
+
+
+def plano_de_execucao(conexao_dbapi, sql: str, parametros) -> Optional[List[str]]:
+    """
+    Saída de EXPLAIN QUERY PLAN, uma linha por passo, indentada pela
+    hierarquia do plano. None se o comando não tiver plano.
+    """
+    if not sql.lstrip().upper().startswith(_COM_PLANO):
+        return None
+    cursor = conexao_dbapi.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros or ())
+        passos = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    profundidade: Dict[int, int] = {0: -1}
+    linhas = []
+    for id_passo, pai, _, detalhe in passos:
+        profundidade[id_passo] = profundidade.get(pai, -1) + 1
+        linhas.append('  ' * profundidade[id_passo] + detalhe)
+    return linhas
+
+
+class ArmazemConsultasLentas:
+    """
+    Arquivo JSON Lines com rotação por tamanho (arquivo.1, arquivo.2, ...),
+    como o RotatingFileHandler do log.
+    """
+
+    def __init__(self, caminho: str, max_bytes: int = 5 * 1024 * 1024, backups: int = 3):
+        self.caminho = caminho
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+
+    def _arquivos(self) -> List[str]:
+        """Do mais antigo ao mais recente."""
+        antigos = [f"{self.caminho}.{i}" for i in range(self.backups, 0, -1)]
+        return [c for c in antigos + [self.caminho] if os.path.exists(c)]
+
+    def _rotacionar(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.caminho}.{i}"):
+                os.replace(f"{self.caminho}.{i}", f"{self.caminho}.{i + 1}")
+        if self.backups:
+            os.replace(self.caminho, f"{self.caminho}.1")
+        else:
+            os.remove(self.caminho)
+
+    def gravar(self, registro: Dict):
+        linha = json.dumps(registro, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            try:
+                if os.path.getsize(self.caminho) + len(linha) > self.max_bytes:
+                    self._rotacionar()
+            except FileNotFoundError:
+                pass
+            with open(self.caminho, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(linha)
+
+    def registros(self) -> Iterator[Dict]:
+        for caminho in self._arquivos():
+            with open(caminho, encoding='utf-8') as arquivo:
+                for linha in arquivo:
+                    try:
+                        yield json.loads(linha)
+                    except ValueError:
+                        # Linha cortada por uma gravação interrompida
+                        continue
+
+    def maiores_ofensores(self, limite: int = 20) -> List[Dict]:
+        """Registros agrupados por comando, do maior tempo somado ao menor."""
+        grupos: Dict[str, Dict] = {}
+        for registro in self.registros():
+            grupo = grupos.setdefault(registro['sql'], {'ocorrencias': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rotas': set()})
+            grupo['ocorrencias'] += 1
+            grupo['total_ms'] += registro['duracao_ms']
+            grupo['max_ms'] = max(grupo['max_ms'], registro['duracao_ms'])
+            if registro.get('rota'):
+                grupo['rotas'].add(registro['rota'])
+            grupo['ultimo'] = registro
+
+        ofensores = []
+        for sql, grupo in grupos.items():
+            ultimo = grupo['ultimo']
+            ofensores.append({
+                'sql': sql,
+                'ocorrencias': grupo['ocorrencias'],
+                'total_ms': round(grupo['total_ms'], 1),
+                'medio_ms': round(grupo['total_ms'] / grupo['ocorrencias'], 1),
+                'max_ms': grupo['max_ms'],
+                'rotas': sorted(grupo['rotas']),
+                'ultimo': {campo: ultimo.get(campo) for campo in ('quando', 'duracao_ms', 'parametros', 'plano', 'request_id')},
+            })
+        ofensores.sort(key=lambda o: o['total_ms'], reverse=True)
+        return ofensores[:limite]
+
+
+_armazem: Optional[ArmazemConsultasLentas] = None
+_limite_s = 0.0
+_instalado = False
+_lock_instalacao = threading.Lock()
+
+
+def armazem_atual() -> Optional[ArmazemConsultasLentas]:
+    """Armazém em uso, ou None com o registro desligado."""
+    return _armazem
+
+
+def _rota_atual() -> Optional[str]:
+    from flask import has_request_context, request
+    if has_request_context():
+        return request.url_rule.rule if request.url_rule else request.path
+    return None
+
+
+def _antes(conn, cursor, sql, parametros, contexto, executemany):
+    if _armazem is not None and contexto is not None:
+        contexto._inicio_consulta_lenta = time.perf_counter()
+
+
+def _depois(conn, cursor, sql, parametros, contexto, executemany):
+    inicio = getattr(contexto, '_inicio_consulta_lenta', None)
+    armazem = _armazem
+    if inicio is None or armazem is None:
+        return
+    duracao = time.perf_counter() - inicio
+    if duracao < _limite_s:
+        return
+
+    plano, erro_plano = None, None
+    if conn.dialect.name == 'sqlite' and not executemany:
+        try:
+            plano = plano_de_execucao(conn.connection.dbapi_connection, sql, parametros)
+        except Exception as e:
+            erro_plano = str(e)
+
+    registro = {
+        'quando': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+        'sql': normalizar_sql(sql),
+        'duracao_ms': round(duracao * 1000, 2),
+        # Em executemany, só o primeiro conjunto (e quantos eram)
+        'parametros': redigir_parametros(parametros[0] if executemany and parametros else parametros),
+        'lote': len(parametros) if executemany else None,
+        'plano': plano,
+        'erro_plano': erro_plano,
+        'rota': _rota_atual(),
+        'request_id': id_requisicao.get(),
+    }
+    consultas_lentas.inc()
+    logger.warning("Consulta lenta (%.1fms): %s", registro['duracao_ms'], registro['sql'][:200],
+                   extra={'consulta_lenta': {k: registro[k] for k in ('duracao_ms', 'rota', 'plano')}})
+    try:
+        armazem.gravar(registro)
+    except OSError as e:
+        logger.error("Falha ao gravar consulta lenta em %s: %s", armazem.caminho, e)
+
+
+def configurar_consultas_lentas(app):
+    """
+    Liga (CONSULTAS_LENTAS_MS > 0) ou desliga o registro para o processo.
+    Como o logging, a última configuração vale para todas as engines.
+    """
+    global _armazem, _limite_s, _instalado
+    limite_ms = app.config.get('CONSULTAS_LENTAS_MS') or 0
+    if limite_ms <= 0:
+        _armazem = None
+        return
+
+    with _lock_instalacao:
+        if not _instalado:
+            event.listen(Engine, 'before_cursor_execute', _antes)
+            event.listen(Engine, 'after_cursor_execute', _depois)
+            _instalado = True
+    _limite_s = limite_ms / 1000
+    _armazem = ArmazemConsultasLentas(
+        app.config['CONSULTAS_LENTAS_ARQUIVO'],
+        max_bytes=app.config.get('CONSULTAS_LENTAS_MAX_BYTES', 5 * 1024 * 1024),
+        backups=app.config.get('CONSULTAS_LENTAS_BACKUPS', 3),
+    )
@@ -0,0 +1,224 @@
+# backend/utils/structured_logging.py
+"""
+Logging estruturado e não bloqueante.
+
+As threads das requisições só colocam o registro em uma fila (QueueHandler);
+a formatação final e a escrita (stderr, arquivo) acontecem em uma única
+thread de fundo (QueueListener). Se a fila encher, os registros excedentes
+são descartados e contados, em vez de travar a requisição.
+
+Cada registro recebe o id da requisição corrente ('request_id'), que também
+volta ao cliente no cabeçalho X-Request-ID. Com LOG_FORMATO=json cada linha
+é um objeto JSON, com os campos passados em 'extra' incluídos.
+
+O log de acesso (uma linha por requisição) pode ser amostrado por rota
+(LOG_AMOSTRAGEM); erros e requisições lentas são sempre registrados.
+"""
+
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+id_requisicao: ContextVar[Optional[str]] = ContextVar('id_requisicao', default=None)
+
+logger_acesso = logging.getLogger('projectflow.acesso')
+
+# Atributos de todo LogRecord; o que vier além disso veio de 'extra'
+_ATRIBUTOS_PADRAO = set(logging.makeLogRecord({}).__dict__) | {'message', 'asctime', 'request_id'}
+_ID_VALIDO = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+_listener: Optional[QueueListener] = None
+_handler_fila: Optional["HandlerFilaNaoBloqueante"] = None
+
+
+class HandlerFilaNaoBloqueante(QueueHandler):
+    """
+    QueueHandler que nunca bloqueia: com a fila cheia o registro é descartado.
+
+    Na thread de quem registrou só são feitos o 'getMessage' (os argumentos
+    podem mudar depois) e a captura do id da requisição; a formatação da
+    linha e do traceback fica para a thread do listener.
+    """
+
+    def __init__(self, fila: queue.Queue):
+        super().__init__(fila)
+        self.descartados = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        record.request_id = id_requisicao.get() or '-'
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro, com os campos de 'extra' no próprio objeto."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensagem': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for nome, valor in record.__dict__.items():
+            if nome not in _ATRIBUTOS_PADRAO:
+                dados[nome] = valor
+        if record.exc_info:
+            dados['exc'] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str, separators=(',', ':'))
+
+
+class _SaidaDeErro(logging.StreamHandler):
+    """StreamHandler que escreve no sys.stderr corrente, mesmo se ele for trocado depois."""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+
+def _formatador(formato: str) -> logging.Formatter:
+    if formato == 'json':
+        return FormatadorJSON()
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s')
+
+
+def _parar_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _reiniciar_no_filho():
+    # A thread do listener não sobrevive ao fork (ex: gunicorn com preload_app),
+    # e o lock da fila herdada pode ter sido copiado em uso: o filho recomeça
+    # com fila e thread próprias
+    global _listener
+    if _listener is not None:
+        _handler_fila.queue = queue.Queue(_handler_fila.queue.maxsize)
+        _listener = QueueListener(_handler_fila.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def configurar_logging(app):
+    """
+    Instala a fila de logging no logger raiz, com o listener escrevendo no
+    stderr e, se LOG_ARQUIVO estiver definido, em um arquivo rotativo.
+    Chamadas seguintes (um create_app por teste) substituem a anterior.
+    """
+    global _listener, _handler_fila
+    from flask.logging import default_handler
+
+    _parar_listener()
+    raiz = logging.getLogger()
+    if _handler_fila is not None:
+        raiz.removeHandler(_handler_fila)
+
+    formatador = _formatador(app.config.get('LOG_FORMATO', 'texto'))
+    destinos = [_SaidaDeErro()]
+    arquivo = app.config.get('LOG_ARQUIVO')
+    if arquivo:
+        os.makedirs(os.path.dirname(os.path.abspath(arquivo)), exist_ok=True)
+        destinos.append(RotatingFileHandler(arquivo, maxBytes=10 * 1024 * 1024, backupCount=10))
+    for destino in destinos:
+        destino.setFormatter(formatador)
+
+    _handler_fila = HandlerFilaNaoBloqueante(queue.Queue(app.config.get('LOG_FILA_MAX', 10000)))
+    raiz.addHandler(_handler_fila)
+    raiz.setLevel(getattr(logging, app.config.get('LOG_LEVEL', 'INFO')))
+    # O handler padrão do Flask escreveria no stderr na thread da requisição
+    app.logger.removeHandler(default_handler)
+
+    _listener = QueueListener(_handler_fila.queue, *destinos, respect_handler_level=True)
+    _listener.start()
+
+
+def registros_descartados() -> int:
+    """Registros perdidos por fila cheia desde a configuração."""
+    return _handler_fila.descartados if _handler_fila is not None else 0
+
+
+def _deve_registrar(taxas: Dict[str, float], rota: str, status: int, duracao_ms: float, lenta_ms: float) -> bool:
+    if status >= 400 or duracao_ms >= lenta_ms:
+        return True
+    taxa = taxas.get(rota, 1.0)
+    return taxa >= 1.0 or random.random() < taxa
+
+
+def novo_id_requisicao(recebido: str = '') -> str:
+    """O X-Request-ID recebido, se for válido, ou um id novo."""
+    return recebido if _ID_VALIDO.match(recebido or '') else uuid.uuid4().hex[:16]
+
+
+def registrar_acesso(app, metodo: str, caminho: str, rota: str, status: int, duracao_ms: float,
+                     origem: Optional[str] = None):
+    """Linha do log de acesso, respeitando a amostragem (LOG_AMOSTRAGEM) da rota."""
+    if not logger_acesso.isEnabledFor(logging.INFO) or not _deve_registrar(
+            app.config.get('LOG_AMOSTRAGEM', {}), rota, status, duracao_ms,
+            app.config.get('LOG_REQUISICAO_LENTA_MS', 1000)):
+        return
+    logger_acesso.info(
+        "%s %s %s %.1fms", metodo, caminho, status, duracao_ms,
+        extra={'http': {
+            'metodo': metodo,
+            'caminho': caminho,
+            'rota': rota,
+            'status': status,
+            'duracao_ms': round(duracao_ms, 1),
+            'origem': origem,
+        }},
+    )
+
+
+def instalar_log_de_requisicoes(app):
+    """Id de requisição (X-Request-ID) e uma linha de log de acesso por requisição."""
+    from flask import g, request
+
+    @app.before_request
+    def iniciar_requisicao():
+        g.request_id = novo_id_requisicao(request.headers.get('X-Request-ID', ''))
+        g.token_request_id = id_requisicao.set(g.request_id)
+        g.inicio_requisicao = time.perf_counter()
+
+    @app.after_request
+    def registrar_requisicao(response):
+        if 'request_id' not in g:
+            return response
+        response.headers['X-Request-ID'] = g.request_id
+        duracao_ms = (time.perf_counter() - g.inicio_requisicao) * 1000
+        registrar_acesso(app, request.method, request.path,
+                         request.url_rule.rule if request.url_rule else request.path,
+                         response.status_code, duracao_ms, request.headers.get('Origin'))
+        return response
+
+    @app.teardown_request
+    def encerrar_requisicao(exception=None):
+        token = g.pop('token_request_id', None)
+        if token is not None:
+            id_requisicao.reset(token)
+
+
+os.register_at_fork(after_in_child=_reiniciar_no_filho)
+atexit.register(_parar_listener)
@@ -0,0 +1,26 @@
+# backend/utils/table_versions.py
+"""
+Versão de cada tabela, incrementada a cada escrita que a altera.
+
+Serve para invalidar caches em memória: quem guarda um valor anota a versão
+das tabelas de que ele depende e o descarta quando alguma delas mudar. As
+versões ficam no próprio banco ('versoes_tabelas'), mantidas por triggers
+(data_sources/versoes_tabelas.py), então uma escrita feita por qualquer
+processo invalida os caches de todos. Ler as versões custa uma consulta a uma
+tabela de poucas linhas.
+"""
+
+from typing import Dict, Iterable
+
+from sqlalchemy import select
+
+from models import VersaoTabela
+
+
+def ler_versoes(session, tabelas: Iterable[str]) -> Dict[str, int]:
+    """Versão atual de cada tabela pedida (0 se ela ainda não recebeu escritas)."""
+    tabelas = list(tabelas)
+    versoes = dict(session.execute(
+        select(VersaoTabela.tabela, VersaoTabela.versao).where(VersaoTabela.tabela.in_(tabelas))
+    ).all())
+    return {tabela: versoes.get(tabela, 0) for tabela in tabelas}
@@ -0,0 +1,234 @@
+# backend/utils/task_graph.py
+"""
+Grafo de dependências entre tarefas (término-início).
+
+Uma tarefa só pode começar no dia seguinte ao término de todas as suas
+predecessoras. As datas são tratadas como ordinais de dia (date.toordinal) e
+os períodos são inclusivos: uma tarefa de 1 dia começa e termina no mesmo dia.
+
+Tudo aqui é O(V + E): a ordenação topológica (Kahn), o caminho crítico
+(passagens para frente e para trás) e a propagação de deslocamentos, que
+visita apenas as sucessoras efetivamente empurradas.
+"""
+
+import datetime
+import heapq
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_SEPARADORES = re.compile(r'[\s,;]+')
+
+
+class DependenciaInvalidaError(ValueError):
+    """Dependências ou datas de tarefa que não formam um cronograma válido."""
+
+
+class CicloDependenciasError(DependenciaInvalidaError):
+    """As dependências formam um ciclo; 'ciclo' lista as tarefas envolvidas, em ordem."""
+
+    def __init__(self, ciclo: List[int]):
+        self.ciclo = ciclo
+        super().__init__("Dependência circular entre as tarefas: " + " → ".join(map(str, ciclo)))
+
+
+def parse_dependencias(texto: Optional[str]) -> List[int]:
+    """
+    Converte o texto livre de 'Tarefa.dependencias' ("3, 5", "3;5", "3 5") na
+    lista de ids das predecessoras, sem repetições e na ordem informada.
+
+    Raises:
+        DependenciaInvalidaError: Se algum item não for um id numérico
+    """
+    ids = []
+    for item in _SEPARADORES.split((texto or '').strip()):
+        if not item:
+            continue
+        if not item.isdigit():
+            raise DependenciaInvalidaError(f"Dependência inválida: '{item}' (informe os ids das tarefas separados por vírgula).")
+        if int(item) not in ids:
+            ids.append(int(item))
+    return ids
+
+
+def formatar_dependencias(ids: Iterable[int]) -> Optional[str]:
+    """Formato canônico gravado em 'Tarefa.dependencias' (o mesmo lido pelo Frappe Gantt)."""
+    texto = ', '.join(str(i) for i in ids)
+    return texto or None
+
+
+def para_ordinal(data: str) -> int:
+    return datetime.date.fromisoformat(data[:10]).toordinal()
+
+
+def para_data(ordinal: int) -> str:
+    return datetime.date.fromordinal(ordinal).isoformat()
+
+
+def alcanca(sucessores: Dict[int, List[int]], origem: int, destinos: Set[int]) -> Optional[List[int]]:
+    """
+    Busca em largura a partir de 'origem'. Retorna o caminho até o primeiro
+    destino alcançado (origem incluída) ou None.
+    """
+    anterior = {origem: None}
+    fila = deque([origem])
+    while fila:
+        atual = fila.popleft()
+        if atual in destinos:
+            caminho = []
+            while atual is not None:
+                caminho.append(atual)
+                atual = anterior[atual]
+            return caminho[::-1]
+        for proxima in sucessores.get(atual, ()):
+            if proxima not in anterior:
+                anterior[proxima] = atual
+                fila.append(proxima)
+    return None
+
+
+class GrafoTarefas:
+    """
+    Grafo imutável das tarefas de um projeto.
+
+    Args:
+        periodos: {id_tarefa: (inicio, fim)} em ordinais de dia
+        arestas: pares (id_predecessora, id_tarefa)
+
+    Raises:
+        CicloDependenciasError: Se as arestas formarem um ciclo
+    """
+
+    def __init__(self, periodos: Dict[int, Tuple[int, int]], arestas: Iterable[Tuple[int, int]]):
+        self.periodos = dict(periodos)
+        self.sucessores: Dict[int, List[int]] = {t: [] for t in self.periodos}
+        self.predecessoras: Dict[int, List[int]] = {t: [] for t in self.periodos}
+        for predecessora, tarefa in arestas:
+            if predecessora in self.periodos and tarefa in self.periodos:
+                self.sucessores[predecessora].append(tarefa)
+                self.predecessoras[tarefa].append(predecessora)
+
+        self.ordem = self._ordenar()
+        self.posicao = {tarefa: i for i, tarefa in enumerate(self.ordem)}
+
+    def _ordenar(self) -> List[int]:
+        """Ordenação topológica de Kahn (desempate pelo id, para ser determinística)."""
+        grau = {t: len(p) for t, p in self.predecessoras.items()}
+        prontas = [t for t, g in grau.items() if g == 0]
+        heapq.heapify(prontas)
+        ordem = []
+        while prontas:
+            tarefa = heapq.heappop(prontas)
+            ordem.append(tarefa)
+            for sucessora in self.sucessores[tarefa]:
+                grau[sucessora] -= 1
+                if grau[sucessora] == 0:
+                    heapq.heappush(prontas, sucessora)
+
+        if len(ordem) < len(self.periodos):
+            raise CicloDependenciasError(self._encontrar_ciclo({t for t, g in grau.items() if g > 0}))
+        return ordem
+
+    def _encontrar_ciclo(self, restantes: Set[int]) -> List[int]:
+        # Todo nó que sobrou no Kahn tem uma predecessora também restante:
+        # voltando pelas predecessoras, algum nó se repete e fecha o ciclo.
+        atual = min(restantes)
+        visitados: Dict[int, int] = {}
+        caminho = []
+        while atual not in visitados:
+            visitados[atual] = len(caminho)
+            caminho.append(atual)
+            atual = next(p for p in self.predecessoras[atual] if p in restantes)
+        ciclo = caminho[visitados[atual]:][::-1]
+        return ciclo + [ciclo[0]]
+
+    def criaria_ciclo(self, id_tarefa: int, predecessoras: Iterable[int]) -> Optional[List[int]]:
+        """
+        Verifica se trocar as predecessoras de 'id_tarefa' por 'predecessoras'
+        fecharia um ciclo. Retorna o ciclo resultante ou None.
+        """
+        predecessoras = set(predecessoras)
+        if id_tarefa in predecessoras:
+            return [id_tarefa, id_tarefa]
+        caminho = alcanca(self.sucessores, id_tarefa, predecessoras)
+        return caminho + [id_tarefa] if caminho else None
+
+    def caminho_critico(self) -> Dict:
+        """
+        Método do caminho crítico. A data de início planejada de cada tarefa
+        funciona como restrição "não antes de"; a duração é a do período atual.
+
+        Returns:
+            Dicionário com 'inicio', 'fim', os vetores por tarefa na ordem
+            topológica ('ids', 'inicio_cedo', 'fim_cedo', 'inicio_tarde',
+            'fim_tarde', 'folga', em ordinais/dias) e 'caminho_critico'
+        """
+        if not self.ordem:
+            return {"inicio": None, "fim": None, "ids": [], "inicio_cedo": [], "fim_cedo": [],
+                    "inicio_tarde": [], "fim_tarde": [], "folga": [], "caminho_critico": []}
+
+        duracao = {t: fim - inicio + 1 for t, (inicio, fim) in self.periodos.items()}
+        inicio_cedo, fim_cedo = {}, {}
+        for tarefa in self.ordem:
+            inicio = max([self.periodos[tarefa][0]] + [fim_cedo[p] + 1 for p in self.predecessoras[tarefa]])
+            inicio_cedo[tarefa] = inicio
+            fim_cedo[tarefa] = inicio + duracao[tarefa] - 1
+
+        fim_projeto = max(fim_cedo.values())
+        inicio_tarde, fim_tarde = {}, {}
+        for tarefa in reversed(self.ordem):
+            fim = min([fim_projeto] + [inicio_tarde[s] - 1 for s in self.sucessores[tarefa]])
+            fim_tarde[tarefa] = fim
+            inicio_tarde[tarefa] = fim - duracao[tarefa] + 1
+
+        folga = {t: inicio_tarde[t] - inicio_cedo[t] for t in self.ordem}
+        return {
+            "inicio": min(inicio_cedo.values()),
+            "fim": fim_projeto,
+            "ids": list(self.ordem),
+            "inicio_cedo": [inicio_cedo[t] for t in self.ordem],
+            "fim_cedo": [fim_cedo[t] for t in self.ordem],
+            "inicio_tarde": [inicio_tarde[t] for t in self.ordem],
+            "fim_tarde": [fim_tarde[t] for t in self.ordem],
+            "folga": [folga[t] for t in self.ordem],
+            "caminho_critico": [t for t in self.ordem if folga[t] == 0],
+        }
+
+    def propagar(self, id_tarefa: int, inicio: int, fim: int) -> Dict[int, Tuple[int, int]]:
+        """
+        Aplica o novo período de 'id_tarefa' e empurra para frente as
+        sucessoras que passariam a começar antes do término de uma
+        predecessora, preservando a duração de cada uma.
+
+        Só as tarefas efetivamente deslocadas são visitadas; a fila é ordenada
+        pela posição topológica, então cada tarefa é recalculada uma única vez.
+
+        Returns:
+            {id_tarefa: (inicio, fim)} de todas as tarefas alteradas (incluindo a movida)
+        """
+        return self.propagar_varios({id_tarefa: (inicio, fim)})
+
+    def propagar_varios(self, movidas: Dict[int, Tuple[int, int]]) -> Dict[int, Tuple[int, int]]:
+        """
+        Como 'propagar', para várias tarefas movidas de uma vez (um lote de
+        alterações do Gantt): cada sucessora é recalculada uma única vez,
+        considerando todos os novos períodos.
+        """
+        novos = dict(movidas)
+        enfileiradas = {s for t in movidas for s in self.sucessores[t]} | set(movidas)
+        fila = [(self.posicao[s], s) for s in enfileiradas if s not in movidas]
+        heapq.heapify(fila)
+
+        while fila:
+            _, tarefa = heapq.heappop(fila)
+            inicio_atual, fim_atual = novos.get(tarefa, self.periodos[tarefa])
+            minimo = max(novos.get(p, self.periodos[p])[1] + 1 for p in self.predecessoras[tarefa])
+            if inicio_atual >= minimo:
+                continue
+            deslocamento = minimo - inicio_atual
+            novos[tarefa] = (inicio_atual + deslocamento, fim_atual + deslocamento)
+            for sucessora in self.sucessores[tarefa]:
+                if sucessora not in enfileiradas:
+                    enfileiradas.add(sucessora)
+                    heapq.heappush(fila, (self.posicao[sucessora], sucessora))
+        return novos
@@ -0,0 +1,178 @@
+# backend/utils/zip_index.py
+"""
+Leitura de membros individuais de arquivos ZIP armazenados, sem extração em disco.
+
+O diretório central de cada ZIP é lido uma vez e mantido em um cache LRU
+(chave: caminho + mtime + tamanho), de modo que servir um anexo não exige
+reprocessar o índice do arquivo a cada requisição.
+"""
+
+import logging
+import mimetypes
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+from flask import Response, request
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Tipos que o navegador pode exibir direto: nenhum deles executa script.
+# HTML, SVG, XML e o resto vêm de ZIPs enviados por usuários e, abertos na
+# origem do app, poderiam rodar código com a sessão de quem os abrisse
+# (XSS armazenado); esses são sempre enviados como download.
+TIPOS_EXIBIVEIS = frozenset({
+    'image/png', 'image/jpeg', 'image/gif', 'image/webp', 'image/bmp',
+    'text/plain', 'text/csv', 'application/json', 'video/mp4', 'video/webm',
+})
+
+
+class IndiceZip:
+    """Índice em memória dos membros de um ZIP (nome completo e nome base)."""
+
+    def __init__(self, caminho: str, membros: Dict[str, zipfile.ZipInfo]):
+        self.caminho = caminho
+        self.membros = membros
+        # Os anexos do Allure são referenciados só pelo nome do arquivo,
+        # mas o ZIP pode ter sido gerado a partir de uma subpasta.
+        self.por_nome_base = {}
+        for nome, info in membros.items():
+            self.por_nome_base.setdefault(os.path.basename(nome), info)
+
+    def localizar(self, nome: str) -> Optional[zipfile.ZipInfo]:
+        return self.membros.get(nome) or self.por_nome_base.get(os.path.basename(nome))
+
+
+class CacheIndicesZip:
+    """Cache LRU e thread-safe de índices de ZIP."""
+
+    def __init__(self, capacidade: int = 64):
+        self.capacidade = capacidade
+        self._indices: "OrderedDict[tuple, IndiceZip]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, caminho: str) -> IndiceZip:
+        """
+        Retorna o índice do ZIP, lendo o diretório central apenas se o
+        arquivo ainda não estiver em cache (ou tiver sido alterado).
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir
+            zipfile.BadZipFile: Se o arquivo não for um ZIP válido
+        """
+        stat = os.stat(caminho)
+        chave = (caminho, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            indice = self._indices.get(chave)
+            if indice is not None:
+                self._indices.move_to_end(chave)
+                self.acertos += 1
+                return indice
+
+        with zipfile.ZipFile(caminho, 'r') as zip_ref:
+            membros = {info.filename: info for info in zip_ref.infolist() if not info.is_dir()}
+        indice = IndiceZip(caminho, membros)
+
+        with self._lock:
+            self.falhas += 1
+            self._indices[chave] = indice
+            self._indices.move_to_end(chave)
+            while len(self._indices) > self.capacidade:
+                self._indices.popitem(last=False)
+        logger.debug("Índice do ZIP %s carregado (%d membros).", caminho, len(membros))
+        return indice
+
+    def limpar(self):
+        with self._lock:
+            self._indices.clear()
+
+    def __len__(self):
+        return len(self._indices)
+
+
+def ler_membro(caminho: str, info: zipfile.ZipInfo, inicio: int = 0,
+               fim: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Gera os bytes do membro no intervalo [inicio, fim), descompactando em blocos.
+
+    Membros armazenados sem compressão são posicionados diretamente no
+    deslocamento pedido; membros comprimidos são descompactados e descartados
+    até o início do intervalo (o formato DEFLATE não permite salto).
+    """
+    fim = info.file_size if fim is None else min(fim, info.file_size)
+    restante = max(fim - inicio, 0)
+
+    with zipfile.ZipFile(caminho, 'r') as zip_ref:
+        with zip_ref.open(info, 'r') as membro:
+            if inicio:
+                membro.seek(inicio)
+            while restante > 0:
+                bloco = membro.read(min(chunk_size, restante))
+                if not bloco:
+                    break
+                restante -= len(bloco)
+                yield bloco
+
+
+def resposta_membro_zip(caminho: str, info: zipfile.ZipInfo, cache_max_age: int = 3600) -> Response:
+    """
+    Monta a resposta HTTP que transmite um membro do ZIP em streaming.
+
+    Suporta requisições condicionais (If-None-Match) e de intervalo (Range
+    com um único intervalo de bytes, respeitando If-Range). O ETag combina o
+    nome do arquivo armazenado (o SHA-256 do relatório) com o CRC do membro.
+
+    Só os TIPOS_EXIBIVEIS são servidos inline; os demais vão como anexo
+    (Content-Disposition: attachment). Em todos os casos, 'nosniff' e a
+    CSP 'sandbox' impedem que o conteúdo rode como página do app.
+    """
+    etag = f"{os.path.basename(caminho)}-{info.CRC:08x}-{info.file_size}"
+    tamanho = info.file_size
+
+    if request.if_none_match.contains(etag):
+        resposta = Response(status=304)
+        resposta.set_etag(etag)
+        return resposta
+
+    mimetype = mimetypes.guess_type(info.filename)[0] or 'application/octet-stream'
+    inicio, fim, status = 0, tamanho, 200
+
+    intervalo = request.range
+    # Múltiplos intervalos não são suportados: nesse caso o membro é enviado inteiro
+    intervalo_valido = (
+        intervalo is not None and intervalo.units == 'bytes' and len(intervalo.ranges) == 1
+        and ('If-Range' not in request.headers or request.if_range.etag == etag)
+    )
+    if intervalo_valido:
+        limites = intervalo.range_for_length(tamanho)
+        if limites is None:
+            resposta = Response(status=416)
+            resposta.headers['Content-Range'] = f"bytes */{tamanho}"
+            return resposta
+        inicio, fim = limites
+        status = 206
+
+    resposta = Response(ler_membro(caminho, info, inicio, fim), status=status, mimetype=mimetype,
+                        direct_passthrough=True)
+    resposta.content_length = fim - inicio
+    if status == 206:
+        resposta.headers['Content-Range'] = f"bytes {inicio}-{fim - 1}/{tamanho}"
+    resposta.headers['Accept-Ranges'] = 'bytes'
+    resposta.headers['X-Content-Type-Options'] = 'nosniff'
+    resposta.headers['Content-Security-Policy'] = 'sandbox'
+    if mimetype not in TIPOS_EXIBIVEIS:
+        resposta.headers.set('Content-Disposition', 'attachment', filename=os.path.basename(info.filename))
+    resposta.cache_control.private = True
+    resposta.cache_control.max_age = cache_max_age
+    resposta.set_etag(etag)
+    return resposta
+
+
+# Instância compartilhada pelo processo
+indices_zip = CacheIndicesZip()
@@ -0,0 +1,12 @@
+# backend/wsgi.py
+"""
+Ponto de entrada WSGI para servidores de produção (ver gunicorn.conf.py).
+
+Com preload_app, este módulo é importado uma vez no processo master: o
+esquema do banco, as migrações, os dados iniciais e a pasta de uploads são
+preparados antes do fork, e os workers herdam o app já pronto.
+"""
+
+from app import create_app
+
+app = create_app()
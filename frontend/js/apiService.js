@@ -99,6 +99,32 @@ async function _request(endpoint, options = {}) {
     }
 }
 
+// --- CACHE DAS LISTAS AUXILIARES (/usuarios, /areas, /objetivos) ---
+// O /bootstrap informa a versão de cada lista; a cópia guardada na sessão do
+// navegador é reutilizada enquanto a versão não mudar.
+const CHAVE_VERSOES_LOOKUP = 'lookupVersoes';
+
+function _lerLookup(endpoint) {
+    try {
+        const versoes = JSON.parse(sessionStorage.getItem(CHAVE_VERSOES_LOOKUP) || '{}');
+        const guardado = JSON.parse(sessionStorage.getItem(`lookup:${endpoint}`) || 'null');
+        const versao = versoes[endpoint.replace(/^\//, '')];
+        return versao && guardado && guardado.versao === versao ? guardado : null;
+    } catch (e) {
+        return null;
+    }
+}
+
+async function _getLookup(endpoint) {
+    const guardado = _lerLookup(endpoint);
+    if (guardado) return guardado.dados;
+    const dados = await _request(endpoint);
+    const versoes = JSON.parse(sessionStorage.getItem(CHAVE_VERSOES_LOOKUP) || '{}');
+    const versao = versoes[endpoint.replace(/^\//, '')];
+    if (versao) sessionStorage.setItem(`lookup:${endpoint}`, JSON.stringify({ versao, dados }));
+    return dados;
+}
+
 /**
  * Objeto que centraliza todas as funções de chamada à API.
  */
@@ -113,10 +139,47 @@ export const api = {
     // Adicione register aqui se precisar no futuro
 
     // --- MÉTODOS GENÉRICOS E DE PROJETO ---
-    getGeneric: (endpoint) => _request(endpoint),
+    getGeneric: (endpoint) => (['/usuarios', '/areas', '/objetivos'].includes(endpoint)
+        ? _getLookup(endpoint)
+        : _request(endpoint)),
+    /**
+     * Dados da primeira tela em uma requisição (usuário, projetos, minhas tarefas,
+     * meus projetos, contagem por status e versões das listas auxiliares).
+     * @param {string[]} [secoes] - Limita as seções retornadas.
+     */
+    getBootstrap: async (secoes) => {
+        const query = secoes && secoes.length ? `?secoes=${encodeURIComponent(secoes.join(','))}` : '';
+        const dados = await _request(`/bootstrap${query}`);
+        if (dados.versoes) sessionStorage.setItem(CHAVE_VERSOES_LOOKUP, JSON.stringify(dados.versoes));
+        return dados;
+    },
     getProjetoSchema: () => _request('/projetos/schema'),
     getTodosProjetos: () => _request('/projetos'),
+    /**
+     * Busca textual de projetos no servidor (ranqueada e com destaques).
+     * @param {string} termo - O texto digitado.
+     * @param {object} [opcoes] - status, limite e offset.
+     */
+    buscarProjetos: (termo, opcoes = {}) => {
+        const params = new URLSearchParams({ q: termo });
+        Object.entries(opcoes).forEach(([chave, valor]) => {
+            if (valor !== undefined && valor !== null && valor !== '') params.set(chave, valor);
+        });
+        return _request(`/busca?${params.toString()}`);
+    },
     getProjetoPorId: (id) => _request(`/projetos/${id}`),
+    /**
+     * Dados colunares de projetos/tarefas para o roadmap e o Gantt.
+     * @param {object} [filtros] - inicio, fim (AAAA-MM-DD), id_projeto e incluir ('projetos,tarefas').
+     */
+    getTimeline: (filtros = {}) => {
+        const params = new URLSearchParams();
+        Object.entries(filtros).forEach(([chave, valor]) => {
+            if (valor !== undefined && valor !== null && valor !== '') params.set(chave, valor);
+        });
+        const query = params.toString();
+        return _request(`/timeline${query ? `?${query}` : ''}`);
+    },
     createProjeto: (data) => _request('/projetos', {
         method: 'POST',
         body: JSON.stringify(data)
@@ -196,6 +259,53 @@ export const api = {
             method: 'DELETE'
         });
     },
+    /**
+     * Aplica várias operações sobre as tarefas do projeto em uma única requisição.
+     * @param {number} idProjeto - O ID do projeto.
+     * @param {Array} operacoes - Itens { op: 'create'|'update'|'delete', id, dados }.
+     */
+    aplicarLoteTarefas: (idProjeto, operacoes) => _request(`/projetos/${idProjeto}/tarefas/batch`, {
+        method: 'POST',
+        body: JSON.stringify({ operacoes })
+    }),
+    /**
+     * Alterações de projetos e tarefas desde o cursor (sem cursor, só o cursor atual).
+     * @param {number} [desde] - Cursor devolvido pelo /bootstrap ou pela chamada anterior.
+     * @param {object} [opcoes] - dados (inclui os cartões atuais) e limite.
+     */
+    getAlteracoes: (desde, { dados = false, limite } = {}) => {
+        const params = new URLSearchParams();
+        if (desde !== undefined && desde !== null) params.set('since', desde);
+        if (dados) params.set('dados', '1');
+        if (limite) params.set('limite', limite);
+        const query = params.toString();
+        return _request(`/changes${query ? `?${query}` : ''}`);
+    },
+    /**
+     * Abre o canal de eventos do servidor (Server-Sent Events). O EventSource
+     * não envia cabeçalhos, então o token vai na query; a reconexão é automática.
+     * @param {string[]} tipos - Eventos de interesse ('status_projeto', 'homologacao',
+     *   'ingestao', 'tarefas_alteradas'); 'resync' é sempre entregue.
+     * @param {function(string, object): void} aoReceber - Chamada com o tipo e os dados.
+     * @returns {EventSource|null} null se o navegador não suportar ou não houver token.
+     */
+    abrirEventos: (tipos, aoReceber) => {
+        const token = localStorage.getItem('accessToken');
+        if (!token || typeof EventSource === 'undefined') return null;
+        const fonte = new EventSource(`${API_BASE_URL}/eventos?jwt=${encodeURIComponent(token)}`);
+        for (const tipo of [...tipos, 'resync']) {
+            fonte.addEventListener(tipo, (event) => aoReceber(tipo, JSON.parse(event.data)));
+        }
+        window.addEventListener('pagehide', () => fonte.close(), { once: true });
+        return fonte;
+    },
+    /** Muda o status e/ou edita vários projetos; devolve { aplicados, falhas }. */
+    aplicarLoteProjetos: (ids, { status, observacao, dados } = {}) => _request('/projetos/batch', {
+        method: 'POST',
+        body: JSON.stringify({ ids, status, observacao, dados })
+    }),
+    /** Caminho crítico e folgas das tarefas, calculados no servidor. */
+    getCronograma: (idProjeto) => _request(`/projetos/${idProjeto}/cronograma`),
     // Em apiService.js
     getMinhasTarefas: () => {
         return _request('/me/tarefas');
@@ -216,11 +326,33 @@ export const api = {
             method: 'POST'
         });
     },
-    getTestesDoCiclo: (idHomologacao) => {
-        return _request(`/homologacoes/${idHomologacao}/testes`);
+    /**
+     * Busca uma página dos testes de um ciclo.
+     * @param {object} [filtros] - status (ex: 'failed,broken'), feature, severity, q, limite e cursor.
+     * @returns {Promise<{testes: Array, total: number, proximo_cursor: string|null}>}
+     */
+    getTestesDoCiclo: (idHomologacao, filtros = {}) => {
+        const params = new URLSearchParams();
+        Object.entries(filtros).forEach(([chave, valor]) => {
+            if (valor !== undefined && valor !== null && valor !== '') params.set(chave, valor);
+        });
+        const query = params.toString();
+        return _request(`/homologacoes/${idHomologacao}/testes${query ? `?${query}` : ''}`);
     },
     // Em apiService.js
     getRelatorioQa: () => {
         return _request('/relatorios/qa');
     },
+    /**
+     * Principais causas de falha (agrupadas por assinatura) entre ciclos e projetos.
+     * @param {object} [filtros] - id_projeto, q (busca textual) e limite.
+     */
+    getAgrupamentosFalha: (filtros = {}) => {
+        const params = new URLSearchParams();
+        Object.entries(filtros).forEach(([chave, valor]) => {
+            if (valor !== undefined && valor !== null && valor !== '') params.set(chave, valor);
+        });
+        const query = params.toString();
+        return _request(`/relatorios/qa/falhas${query ? `?${query}` : ''}`);
+    },
 };
@@ -3,22 +3,31 @@ import { api } from './apiService.js';
 
 // Objeto que manterá os dados do usuário em memória
 let currentUser = null;
+// Dados da primeira tela, quando o usuário foi carregado pelo /api/bootstrap
+let bootstrapData = null;
 
 const authService = {
     /**
      * Busca os dados do usuário da API (/api/auth/me) e os armazena.
      * Deve ser chamado no início da aplicação.
+     * @param {object} [opcoes]
+     * @param {boolean} [opcoes.bootstrap] - Usa /api/bootstrap, trazendo junto os
+     *        dados da primeira tela (lidos depois com takeBootstrap()).
      * @returns {Promise<object|null>}
      */
-    async fetchUser() {
+    async fetchUser({ bootstrap = false } = {}) {
         const token = localStorage.getItem('accessToken');
         if (!token) {
             currentUser = null;
             return null;
         }
         try {
-            // api.getMe() será adicionado ao apiService.js
-            currentUser = await api.getMe();
+            if (bootstrap) {
+                bootstrapData = await api.getBootstrap();
+                currentUser = bootstrapData.usuario;
+            } else {
+                currentUser = await api.getMe();
+            }
             console.log("[authService] Dados do usuário carregados:", currentUser);
             return currentUser;
         } catch (error) {
@@ -28,6 +37,16 @@ const authService = {
         }
     },
 
+    /**
+     * Entrega (uma única vez) os dados do bootstrap carregados com o usuário.
+     * @returns {object|null}
+     */
+    takeBootstrap() {
+        const dados = bootstrapData;
+        bootstrapData = null;
+        return dados;
+    },
+
     /**
      * Retorna os dados do usuário atualmente logado.
      * @returns {object|null}
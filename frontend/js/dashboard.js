@@ -9,13 +9,22 @@ let filtrosAtivos = {
     busca: '',
     status: 'Todos'
 };
+// Dados do /api/bootstrap: usados só na primeira carga de cada visão
+let projetosIniciais = null;
+let painelInicial = null;
+// Cursor do /api/changes: as listas acima refletem tudo até ele
+let cursorAlteracoes = null;
+let sincronizando = false;
+// Identifica a busca mais recente, para descartar respostas que chegarem fora de ordem
+let buscaAtual = 0;
+const TAMANHO_PAGINA_BUSCA = 24;
 
 // --- FUNÇÕES DE RENDERIZAÇÃO (Visão Geral) ---
 
-function renderGeralProjectCards(projetos, dependencies) {
+function renderGeralProjectCards(projetos, dependencies, { anexar = false } = {}) {
     const projectGrid = document.getElementById('project-grid');
     if (!projectGrid) return;
-    projectGrid.innerHTML = '';
+    if (!anexar) projectGrid.innerHTML = '';
 
     if (projetos.length === 0) {
         const termoBusca = filtrosAtivos.busca.trim();
@@ -35,7 +44,10 @@ function renderGeralProjectCards(projetos, dependencies) {
             dependencies.navigate(`projeto.html?id=${projeto.id_projeto}`, state);
         });
         const saude = calcularSaudeProjeto(projeto);
-        card.innerHTML = `<div class="card-header"><div class="health-indicator ${saude.health}" title="${saude.description}"></div><h3>${projeto.nome_projeto}</h3><span class="priority-tag" data-priority="${projeto.prioridade}">${projeto.prioridade}</span></div><p class="card-description">${projeto.descricao}</p><div class="card-meta"><span><i class="fas fa-user-tie"></i> ${projeto.responsavel?.nome_completo || 'N/D'}</span><span><i class="fas fa-ticket-alt"></i> ${projeto.numero_topdesk}</span></div><div class="status-info"><span>Status Atual</span><span class="status-tag" data-status="${projeto.status_atual}">${projeto.status_atual}</span></div>`;
+        // Resultados da busca trazem nome e trecho já escapados, com os termos em <mark>
+        const titulo = projeto.destaques?.nome_projeto ?? projeto.nome_projeto;
+        const descricao = projeto.destaques?.trecho ?? projeto.descricao;
+        card.innerHTML = `<div class="card-header"><div class="health-indicator ${saude.health}" title="${saude.description}"></div><h3>${titulo}</h3><span class="priority-tag" data-priority="${projeto.prioridade}">${projeto.prioridade}</span></div><p class="card-description">${descricao}</p><div class="card-meta"><span><i class="fas fa-user-tie"></i> ${projeto.responsavel?.nome_completo || 'N/D'}</span><span><i class="fas fa-ticket-alt"></i> ${projeto.numero_topdesk}</span></div><div class="status-info"><span>Status Atual</span><span class="status-tag" data-status="${projeto.status_atual}">${projeto.status_atual}</span></div>`;
         projectGrid.appendChild(card);
         card.style.animation = `fadeInCard 0.5s ease-out ${index * 0.07}s forwards`;
     });
@@ -132,19 +144,68 @@ function renderMeusProjetosCards(projetos, dependencies) {
 // --- FUNÇÕES DE LÓGICA ---
 
 function aplicarFiltros(dependencies) {
-    const projetosFiltrados = todosOsProjetos.filter(projeto => {
-        const busca = filtrosAtivos.busca.toLowerCase().trim();
-        const correspondeBusca = !busca || (projeto.nome_projeto && projeto.nome_projeto.toLowerCase().includes(busca)) || (projeto.numero_topdesk && projeto.numero_topdesk.toLowerCase().includes(busca));
-        const correspondeStatus = filtrosAtivos.status === 'Todos' || projeto.status_atual === filtrosAtivos.status;
-        return correspondeBusca && correspondeStatus;
-    });
+    const busca = filtrosAtivos.busca.trim();
+    if (busca) {
+        // A busca textual é feita no servidor (índice FTS), não na lista baixada
+        buscarNoServidor(busca, dependencies);
+        return;
+    }
+    buscaAtual++;
+    const projetosFiltrados = todosOsProjetos.filter(projeto =>
+        filtrosAtivos.status === 'Todos' || projeto.status_atual === filtrosAtivos.status
+    );
     renderGeralProjectCards(projetosFiltrados, dependencies);
 }
 
+/**
+ * Executa a busca no servidor e renderiza os resultados, com "Carregar mais"
+ * enquanto houver páginas restantes.
+ */
+async function buscarNoServidor(termo, dependencies, offset = 0) {
+    const idBusca = offset === 0 ? ++buscaAtual : buscaAtual;
+    if (offset === 0) renderSkeletonLoader('project-grid');
+    try {
+        const pagina = await api.buscarProjetos(termo, {
+            status: filtrosAtivos.status !== 'Todos' ? filtrosAtivos.status : undefined,
+            limite: TAMANHO_PAGINA_BUSCA,
+            offset
+        });
+        if (idBusca !== buscaAtual) return; // Uma busca mais nova já foi disparada
+
+        document.getElementById('load-more-search-btn')?.remove();
+        renderGeralProjectCards(pagina.resultados, dependencies, { anexar: offset > 0 });
+
+        const proximoOffset = offset + pagina.resultados.length;
+        const projectGrid = document.getElementById('project-grid');
+        if (projectGrid && proximoOffset < pagina.total) {
+            const botao = document.createElement('button');
+            botao.id = 'load-more-search-btn';
+            botao.className = 'btn-secondary';
+            botao.textContent = `Carregar mais (${pagina.total - proximoOffset} restantes)`;
+            botao.addEventListener('click', () => {
+                botao.disabled = true;
+                buscarNoServidor(termo, dependencies, proximoOffset);
+            });
+            projectGrid.appendChild(botao);
+        }
+    } catch (error) {
+        if (idBusca !== buscaAtual) return;
+        renderEmptyState(document.getElementById('project-grid'), { icon: 'fa-exclamation-triangle', title: 'Erro na Busca', message: `Não foi possível buscar os projetos. (Erro: ${error.message})` });
+    }
+}
+
 async function carregarVisaoGeral(dependencies) {
     renderSkeletonLoader('project-grid');
     try {
-        todosOsProjetos = await api.getTodosProjetos();
+        if (projetosIniciais) {
+            todosOsProjetos = projetosIniciais;
+        } else {
+            // O cursor é lido antes da lista, para não perder alterações feitas entre as duas chamadas
+            const { cursor } = await api.getAlteracoes();
+            todosOsProjetos = await api.getTodosProjetos();
+            cursorAlteracoes = cursor;
+        }
+        projetosIniciais = null;
         if (todosOsProjetos.length === 0) {
             renderEmptyState(document.getElementById('project-grid'), { icon: 'fa-folder-open', title: 'Bem-vindo!', message: 'Crie seu primeiro projeto para começar.', action: { text: 'Criar Novo Projeto', onClick: () => dependencies.navigate('novo_projeto.html') } });
         } else {
@@ -160,10 +221,10 @@ async function carregarMeuPainel(dependencies) {
     renderSkeletonLoader('minhas-tarefas-lista');
     renderSkeletonLoader('meus-projetos-grid');
     try {
-        const [tarefas, projetos] = await Promise.all([
-            api.getMinhasTarefas(),
-            api.getMeusProjetos()
-        ]);
+        const [tarefas, projetos] = painelInicial
+            ? [painelInicial.minhas_tarefas, painelInicial.meus_projetos]
+            : await Promise.all([api.getMinhasTarefas(), api.getMeusProjetos()]);
+        painelInicial = null;
         renderMinhasTarefas(tarefas, dependencies);
         renderMeusProjetosCards(projetos, dependencies);
     } catch (error) {
@@ -175,10 +236,70 @@ async function carregarMeuPainel(dependencies) {
     }
 }
 
+// --- SINCRONIZAÇÃO INCREMENTAL ---
+
+/**
+ * Busca no servidor só o que mudou desde o último cursor e aplica na lista
+ * de projetos em memória, em vez de baixá-la inteira de novo.
+ */
+async function sincronizarAlteracoes(dependencies) {
+    if (cursorAlteracoes === null || sincronizando) return;
+    sincronizando = true;
+    try {
+        let houveMudanca = false;
+        let pagina;
+        do {
+            pagina = await api.getAlteracoes(cursorAlteracoes, { dados: true });
+            const { projetos, tarefas, dados } = pagina;
+            const removidos = new Set(projetos.excluidos);
+            const recebidos = new Map(dados.projetos.map(p => [p.id_projeto, p]));
+            todosOsProjetos = todosOsProjetos
+                .filter(p => !removidos.has(p.id_projeto))
+                .map(p => recebidos.get(p.id_projeto) ?? p);
+            const conhecidos = new Set(todosOsProjetos.map(p => p.id_projeto));
+            todosOsProjetos.push(...dados.projetos.filter(p => !conhecidos.has(p.id_projeto)));
+            houveMudanca ||= removidos.size > 0 || recebidos.size > 0
+                || Object.values(tarefas).some(ids => ids.length > 0);
+            cursorAlteracoes = pagina.cursor;
+        } while (pagina.mais);
+
+        if (!houveMudanca) return;
+        // Os dados do bootstrap para o "Meu Painel" ainda não exibido já não valem
+        painelInicial = null;
+        renderStatusFilters(dependencies);
+        // Com uma busca textual ativa, os resultados do servidor continuam valendo
+        if (!filtrosAtivos.busca.trim()) aplicarFiltros(dependencies);
+        const meuPainelContainer = document.getElementById('meu-painel-container');
+        if (meuPainelContainer?.dataset.loaded) carregarMeuPainel(dependencies);
+    } catch (error) {
+        console.warn('[dashboard.js] Falha na sincronização incremental:', error);
+    } finally {
+        sincronizando = false;
+    }
+}
+
 // --- FUNÇÃO DE INICIALIZAÇÃO ---
 
 export function initializePage(dependencies) {
     console.log("[dashboard.js] Inicializando o dashboard unificado...");
+    painelInicial = dependencies.auth.takeBootstrap();
+    projetosIniciais = painelInicial?.projetos ?? null;
+    cursorAlteracoes = painelInicial?.cursor ?? null;
+
+    // Ao voltar para a aba ou para a página (histórico), busca apenas as alterações
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') sincronizarAlteracoes(dependencies);
+    });
+    window.addEventListener('pageshow', (event) => {
+        if (event.persisted) sincronizarAlteracoes(dependencies);
+    });
+    // Com o canal de eventos aberto, as alterações chegam sem esperar a volta à aba;
+    // eventos próximos (ex: um lote) são agrupados em uma sincronização
+    let sincronizacaoAgendada = null;
+    api.abrirEventos(['status_projeto', 'homologacao', 'tarefas_alteradas'], () => {
+        clearTimeout(sincronizacaoAgendada);
+        sincronizacaoAgendada = setTimeout(() => sincronizarAlteracoes(dependencies), 300);
+    });
     
     const toggle = document.getElementById('dashboard-toggle');
     const visaoGeralContainer = document.getElementById('visao-geral-container');
@@ -1,9 +1,28 @@
+/**
+ * Converte o bloco colunar de tarefas de /api/timeline no formato do Frappe Gantt.
+ * @param {object} tarefas - Os vetores 'ids', 'nomes', 'inicios', 'fins', 'progresso', 'dependencias' e 'id_responsavel'.
+ * @returns {Array} - A lista de tarefas para renderGanttChart.
+ */
+export function tarefasDaTimeline(tarefas) {
+    return tarefas.ids.map((id, i) => ({
+        id: String(id),
+        name: tarefas.nomes[i],
+        start: tarefas.inicios[i],
+        end: tarefas.fins[i],
+        progress: tarefas.progresso[i],
+        dependencies: tarefas.dependencias[i],
+        responsavel: tarefas.id_responsavel[i] ? { id_usuario: tarefas.id_responsavel[i] } : null,
+        id_projeto: tarefas.id_projeto[i]
+    }));
+}
+
 /**
  * Renderiza ou atualiza o gráfico de Gantt com opções de customização.
  * @param {Array} tarefas - A lista de tarefas do projeto.
  * @param {object} handlers - Um objeto contendo as funções de callback para eventos (ex: onTaskClick).
+ * @param {Array} [caminhoCritico] - Ids das tarefas sem folga, destacadas no gráfico.
  */
-export function renderGanttChart(tarefas, handlers) {
+export function renderGanttChart(tarefas, handlers, caminhoCritico = []) {
     const container = document.getElementById('gantt-chart-container');
     if (!container) {
         console.error("[Gantt] Container #gantt-chart-container não encontrado.");
@@ -16,9 +35,22 @@ export function renderGanttChart(tarefas, handlers) {
         return;
     }
 
+    const criticas = new Set(caminhoCritico.map(String));
+
+    // Alterações de datas feitas por arraste são agrupadas e enviadas juntas
+    const datasPendentes = new Map();
+    let temporizador = null;
+    const formatarData = (data) => [data.getFullYear(), String(data.getMonth() + 1).padStart(2, '0'), String(data.getDate()).padStart(2, '0')].join('-');
+    const enviarDatasPendentes = () => {
+        const alteracoes = Array.from(datasPendentes.entries()).map(([id, datas]) => ({ id: Number(id), ...datas }));
+        datasPendentes.clear();
+        if (alteracoes.length && handlers && handlers.onDatesChange) {
+            handlers.onDatesChange(alteracoes);
+        }
+    };
     const tarefasProcessadas = tarefas.map(t => ({
         ...t,
-        custom_class: t.progress === 100 ? 'bar-milestone' : ''
+        custom_class: t.progress === 100 ? 'bar-milestone' : (criticas.has(String(t.id)) ? 'bar-critical' : '')
     }));
 
     // Adia a inicialização para garantir que a biblioteca esteja 100% pronta
@@ -58,8 +90,9 @@ export function renderGanttChart(tarefas, handlers) {
                 },
                 on_date_change: (task, start, end) => {
                     console.log(`Tarefa ${task.id} movida. Novo início: ${start}, Novo fim: ${end}`);
-                    showToast(`Tarefa "${task.name}" teve seu prazo alterado.`, 'info');
-                    // TODO: Chamar a API para salvar as novas datas da tarefa
+                    datasPendentes.set(task.id, { data_inicio: formatarData(start), data_fim: formatarData(end) });
+                    clearTimeout(temporizador);
+                    temporizador = setTimeout(enviarDatasPendentes, 400);
                 },
                 on_progress_change: (task, progress) => {
                     console.log(`Progresso da tarefa ${task.id} alterado para ${progress}%`);
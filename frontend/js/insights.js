@@ -31,16 +31,14 @@ function processarDadosAgrupados(projetos, chave) {
 }
 
 function formatarProjetosParaGantt(projetos) {
-    return projetos
-        .filter(p => p.data_inicio_prevista && p.data_fim_prevista)
-        .map(p => ({
-            id: `proj_${p.id_projeto}`,
-            name: p.nome_projeto,
-            start: p.data_inicio_prevista.split('T')[0],
-            end: p.data_fim_prevista.split('T')[0],
-            progress: 100,
-            custom_class: `bar-status-${p.status_atual.toLowerCase().replace(/ /g, '-')}`
-        }));
+    return projetos.ids.map((id, i) => ({
+        id: `proj_${id}`,
+        name: projetos.nomes[i],
+        start: projetos.inicios[i],
+        end: projetos.fins[i],
+        progress: 100,
+        custom_class: `bar-status-${projetos.status[i].toLowerCase().replace(/ /g, '-')}`
+    }));
 }
 
 // --- FUNÇÕES DE RENDERIZAÇÃO ---
@@ -321,7 +319,46 @@ function carregarPortfolio(dependencies) {
 function carregarRoadmap() {
     const container = document.querySelector('#view-roadmap .gantt-container');
     if (container) container.innerHTML = '<div class="skeleton-card"></div>';
-    api.getTodosProjetos().then(renderRoadmap);
+    api.getTimeline({ incluir: 'projetos' }).then(({ projetos }) => {
+        dadosRoadmap = projetos;
+        renderRoadmap(projetos);
+    });
+}
+
+/** Escapa texto vindo da API antes de inseri-lo como HTML (as assinaturas contêm '<n>', '<path>'...). */
+function escaparHtml(texto) {
+    const div = document.createElement('div');
+    div.textContent = texto ?? '';
+    return div.innerHTML;
+}
+
+/**
+ * Renderiza a lista das principais causas de falha (agrupamentos pré-calculados na ingestão).
+ */
+function renderCausasDeFalha(container, grupos) {
+    if (!container) return;
+    if (!grupos || grupos.length === 0) {
+        container.innerHTML = '<h2>Principais Causas de Falha</h2><p class="empty-text">Nenhuma falha registrada nos ciclos.</p>';
+        return;
+    }
+    container.innerHTML = `
+        <h2>Principais Causas de Falha</h2>
+        <div class="table-wrapper">
+            <table class="data-table compact">
+                <thead><tr><th>Falhas</th><th>Ciclos</th><th>Projetos</th><th>Causa</th></tr></thead>
+                <tbody>
+                    ${grupos.map(g => `
+                        <tr>
+                            <td>${g.total_falhas}</td>
+                            <td>${g.ciclos}</td>
+                            <td>${g.projetos}</td>
+                            <td title="${escaparHtml(g.exemplo_mensagem)}">${escaparHtml(g.assinatura)}</td>
+                        </tr>
+                    `).join('')}
+                </tbody>
+            </table>
+        </div>
+    `;
 }
 
 function carregarVisaoQualidade() {
@@ -337,7 +374,11 @@ function carregarVisaoQualidade() {
                 chartsGrid.innerHTML = `
                     <div class="chart-container"><h2>Taxa de Sucesso Histórica (%)</h2><div class="chart-canvas-wrapper"><canvas id="qa-taxa-sucesso-chart"></canvas></div></div>
                     <div class="chart-container"><h2>Distribuição de Testes por Projeto</h2><div class="chart-canvas-wrapper"><canvas id="qa-distribuicao-chart"></canvas></div></div>
+                    <div class="chart-container" id="qa-causas-falha"><h2>Principais Causas de Falha</h2><p class="loading-text">Carregando...</p></div>
                 `;
+                api.getAgrupamentosFalha({ limite: 10 })
+                    .then(grupos => renderCausasDeFalha(document.getElementById('qa-causas-falha'), grupos))
+                    .catch(error => showToast(`Erro ao carregar causas de falha: ${error.message}`, 'error'));
             }
             
             if (qaData && qaData.taxa_sucesso_historica && qaData.distribuicao_por_projeto) {
@@ -186,7 +186,8 @@ async function main() {
     // 2. Se existe um token, TENTA buscar os dados do usuário.
     if (token) {
         try {
-            await authService.fetchUser();
+            // No dashboard, o usuário e os dados da primeira tela vêm em uma só requisição
+            await authService.fetchUser({ bootstrap: currentPage === 'index.html' });
         } catch (error) {
             // Se fetchUser falhar (token inválido), o próprio authService já redireciona.
             // A execução aqui será interrompida, o que está correto.
@@ -11,7 +11,7 @@ import {
 } from './uiHelpers.js';
 import { showToast } from './toast.js';
 // Importa a função de renderização do Gantt
-import { renderGanttChart } from './gantt-handler.js';
+import { renderGanttChart, tarefasDaTimeline } from './gantt-handler.js';
 import { api } from './apiService.js';
 
 
@@ -183,8 +183,9 @@ function renderMiniHomologationChart(ciclo) {
  * @param {number} idCiclo - O ID do ciclo para encontrar o container correto.
  * @param {Array} testesReprovados - A lista de testes com status 'failed' ou 'broken'.
  * @param {object} handlers - O objeto com as funções de callback para eventos.
+ * @param {number} [total] - Total de reprovados no ciclo (pode ser maior que a página recebida).
  */
-function renderFailedTestsTable(idCiclo, testesReprovados, handlers) {
+function renderFailedTestsTable(idCiclo, testesReprovados, handlers, total = testesReprovados?.length) {
     const container = document.getElementById(`failed-tests-${idCiclo}`);
     if (!container) {
         console.error(`[Renderer] Container para testes reprovados do ciclo ${idCiclo} não encontrado.`);
@@ -201,7 +202,7 @@ function renderFailedTestsTable(idCiclo, testesReprovados, handlers) {
     const detailsHtml = `
         <details class="failed-tests-details">
             <summary class="details-summary">
-                Ver ${testesReprovados.length} Teste(s) Reprovado(s)
+                Ver ${total} Teste(s) Reprovado(s)${total > testesReprovados.length ? ` (exibindo ${testesReprovados.length})` : ''}
             </summary>
             <div class="table-wrapper" style="margin-top: 1rem;">
                 <table class="data-table compact">
@@ -337,10 +338,10 @@ function renderHomologationHistory(ciclos, handlers) {
         if (ciclo.resultado && ciclo.testes_reprovados > 0) {
             const failedContainer = document.getElementById(`failed-tests-${ciclo.id_homologacao}`);
             if (failedContainer) failedContainer.innerHTML = '<p class="loading-text">Carregando...</p>';
-            api.getTestesDoCiclo(ciclo.id_homologacao)
-                .then(testesExecutados => {
-                    const testesReprovados = testesExecutados.filter(t => t.status === 'failed' || t.status === 'broken');
-                    renderFailedTestsTable(ciclo.id_homologacao, testesReprovados, handlers);
+            // O servidor já filtra os reprovados; o payload do ciclo não traz mais os testes
+            api.getTestesDoCiclo(ciclo.id_homologacao, { status: 'failed,broken', limite: 200 })
+                .then(pagina => {
+                    renderFailedTestsTable(ciclo.id_homologacao, pagina.testes, handlers, pagina.total);
                 });
         }
     });
@@ -520,8 +521,15 @@ function renderTabGantt(projeto, dependencies, handlers) {
         }
     }
 
-    // Passa as tarefas e os handlers para a função de renderização do gráfico
-    renderGanttChart(projeto.tarefas, handlers);
+    // As barras vêm do bloco colunar da timeline (só tarefas com datas) e o
+    // caminho crítico do cronograma; se este falhar, o gráfico é desenhado sem destaque.
+    const caminhoCritico = api.getCronograma(projeto.id_projeto)
+        .then(cronograma => cronograma.caminho_critico)
+        .catch(() => []);
+    api.getTimeline({ id_projeto: projeto.id_projeto, incluir: 'tarefas' })
+        .then(({ tarefas }) => tarefasDaTimeline(tarefas))
+        .catch(() => projeto.tarefas)
+        .then(tarefas => caminhoCritico.then(criticas => renderGanttChart(tarefas, handlers, criticas)));
 }
 
 // --- FUNÇÃO PRINCIPAL DE RENDERIZAÇÃO (EXPORTADA) ---
@@ -88,7 +88,7 @@ async function handleStatusChange(id, novoStatus, event, dependencies) {
             <p style="margin-top: 1.5rem; text-align: left; font-weight: 600;">Como deseja evidenciar o resultado?</p>
             <div class="input-type-toggle">
                 <button class="toggle-btn active" data-type="manual">Inserir Métricas Manuais</button>
-                <button class="toggle-btn" data-type="upload">Anexar Relatório (.zip)</button>
+                <button class="toggle-btn" data-type="upload">Anexar Relatório (.zip ou .xml)</button>
             </div>
             <hr style="margin: 1rem 0; border-color: var(--border-color);">
             
@@ -102,8 +102,8 @@ async function handleStatusChange(id, novoStatus, event, dependencies) {
             </div>
             <div id="upload-section" style="display: none;">
                 <div class="form-group" style="text-align: left;">
-                    <label for="reportFile">Relatório de Testes (.zip)</label>
-                    <input type="file" id="reportFile" class="modal-input" accept=".zip">
+                    <label for="reportFile">Relatório de Testes (Allure .zip ou JUnit .xml)</label>
+                    <input type="file" id="reportFile" class="modal-input" accept=".zip,.xml">
                 </div>
             </div>
             <div class="form-group" style="text-align: left; margin-top: 1rem;">
@@ -236,23 +236,64 @@ async function handleEditTask(task, dependencies) {
     if (result.confirmed) { const { modalContainer } = result; const data = { nome_tarefa: modalContainer.querySelector('#task-name').value, progresso: parseInt(modalContainer.querySelector('#task-progress').value), id_responsavel_tarefa: modalContainer.querySelector('#id_responsavel_tarefa').value }; if (data.id_responsavel_tarefa) { data.id_responsavel_tarefa = parseInt(data.id_responsavel_tarefa); } else { data.id_responsavel_tarefa = null; } if (!data.nome_tarefa || isNaN(data.progresso)) { showToast("Preencha os campos corretamente.", "error"); return; } try { await api.updateTarefa(task.id, data); showToast('Tarefa atualizada!', 'success'); window.location.reload(); } catch (error) { showToast(`Erro: ${error.message}`, 'error'); } }
 }
 
+/**
+ * Salva, em uma única requisição, as novas datas das tarefas arrastadas no Gantt.
+ * @param {number} idProjeto - O ID do projeto.
+ * @param {Array} alteracoes - Itens { id, data_inicio, data_fim }.
+ */
+async function handleTaskDatesChange(idProjeto, alteracoes) {
+    const operacoes = alteracoes.map(({ id, ...dados }) => ({ op: 'update', id, dados }));
+    try {
+        const resultado = await api.aplicarLoteTarefas(idProjeto, operacoes);
+        if (resultado.tarefas_reprogramadas.length) {
+            showToast(`Prazo salvo. ${resultado.tarefas_reprogramadas.length} tarefa(s) dependente(s) reprogramada(s).`, 'info');
+            window.location.reload();
+        } else {
+            showToast('Prazo da tarefa salvo.', 'success');
+        }
+    } catch (error) {
+        showToast(`Erro ao salvar o prazo: ${error.message}`, 'error');
+        window.location.reload();
+    }
+}
+
 // Em frontend/js/projeto.js
 
 // --- NOVO HANDLER PARA VER OS TESTES ---
+/**
+ * Gera as linhas da tabela de testes do modal "Ver Testes".
+ * @param {Array} testes - Uma página de testes retornada pela API.
+ */
+function renderTestRows(testes) {
+    return testes.map(teste => `
+        <tr>
+            <td><span class="status-tag" data-status="${teste.status}">${teste.status}</span></td>
+            <td title="${teste.nome_teste}">${teste.nome_teste}</td>
+            <td>${teste.feature || 'N/A'}</td>
+            <td>${teste.severity || 'N/A'}</td>
+        </tr>
+    `).join('');
+}
+
 /**
  * Lida com o clique no botão "Ver Testes" de um ciclo de homologação.
- * Busca os detalhes dos testes e os exibe em um modal.
+ * Busca a primeira página dos testes e os exibe em um modal; as páginas
+ * seguintes são carregadas sob demanda pelo botão "Carregar mais".
  * @param {string} idCiclo - O ID do ciclo de homologação.
  * @param {object} dependencies - As dependências globais (modal).
  */
 async function handleViewTests(idCiclo, dependencies) {
+    const TAMANHO_PAGINA = 200;
     showToast("Buscando detalhes dos testes...", "info");
     try {
-        // 1. Chama a nova API para buscar os testes do ciclo específico
-        const testes = await api.getTestesDoCiclo(idCiclo);
-        
+        // 1. Busca a primeira página dos testes do ciclo
+        const pagina = await api.getTestesDoCiclo(idCiclo, { limite: TAMANHO_PAGINA });
+        let proximoCursor = pagina.proximo_cursor;
+        let exibidos = pagina.testes.length;
+
         // 2. Gera o HTML da tabela de testes
         const tableHtml = `
+            <p class="test-count-info">Exibindo <span id="tests-shown">${exibidos}</span> de ${pagina.total} teste(s).</p>
             <div class="table-wrapper" style="max-height: 60vh; overflow-y: auto;">
                 <table class="data-table compact">
                     <thead>
@@ -263,28 +304,45 @@ async function handleViewTests(idCiclo, dependencies) {
                             <th>Severidade</th>
                         </tr>
                     </thead>
-                    <tbody>
-                        ${testes.length > 0 ? testes.map(teste => `
-                            <tr>
-                                <td><span class="status-tag" data-status="${teste.status}">${teste.status}</span></td>
-                                <td title="${teste.nome_teste}">${teste.nome_teste}</td>
-                                <td>${teste.feature || 'N/A'}</td>
-                                <td>${teste.severity || 'N/A'}</td>
-                            </tr>
-                        `).join('') : '<tr><td colspan="4">Nenhum teste detalhado encontrado para este ciclo.</td></tr>'}
+                    <tbody id="tests-table-body">
+                        ${exibidos > 0 ? renderTestRows(pagina.testes) : '<tr><td colspan="4">Nenhum teste detalhado encontrado para este ciclo.</td></tr>'}
                     </tbody>
                 </table>
             </div>
+            ${proximoCursor ? '<button type="button" class="btn-secondary small" id="load-more-tests-btn" style="margin-top: 1rem;">Carregar mais</button>' : ''}
         `;
 
-        // 3. Mostra a tabela dentro de um modal
-        await dependencies.modal.show({
+        // 3. Mostra a tabela dentro de um modal (o conteúdo já está no DOM após o show)
+        const fechado = dependencies.modal.show({
             title: `Testes Executados no Ciclo #${idCiclo}`,
             htmlContent: tableHtml,
             confirmText: 'Fechar',
             cancelText: '' // Esconde o botão de cancelar para um modal informativo
         });
 
+        const modalBody = dependencies.modal.modalBody;
+        const loadMoreBtn = modalBody?.querySelector('#load-more-tests-btn');
+        loadMoreBtn?.addEventListener('click', async () => {
+            loadMoreBtn.disabled = true;
+            try {
+                const proxima = await api.getTestesDoCiclo(idCiclo, { limite: TAMANHO_PAGINA, cursor: proximoCursor });
+                modalBody.querySelector('#tests-table-body').insertAdjacentHTML('beforeend', renderTestRows(proxima.testes));
+                exibidos += proxima.testes.length;
+                modalBody.querySelector('#tests-shown').textContent = exibidos;
+                proximoCursor = proxima.proximo_cursor;
+                if (proximoCursor) {
+                    loadMoreBtn.disabled = false;
+                } else {
+                    loadMoreBtn.remove();
+                }
+            } catch (error) {
+                loadMoreBtn.disabled = false;
+                showToast(`Erro ao carregar mais testes: ${error.message}`, 'error');
+            }
+        });
+
+        await fechado;
+
     } catch (error) {
         showToast(`Erro ao buscar detalhes dos testes: ${error.message}`, 'error');
     }
@@ -426,6 +484,7 @@ async function carregarDetalhesProjeto(dependencies) {
                 onDelete: (id, nome) => handleDeleteProject(id, nome, dependencies),
                 onNewTask: () => handleNewTask(projeto.id_projeto, dependencies),
                 onTaskClick: (task) => handleEditTask(task, dependencies),
+                onDatesChange: (alteracoes) => handleTaskDatesChange(projeto.id_projeto, alteracoes),
                 onCreateTaskFromFailure: (teste) => handleCreateTaskFromFailure(teste, projeto.id_projeto, dependencies)
             };
             
@@ -478,4 +537,17 @@ export function initializePage(dependencies) {
         return;
     }
     carregarDetalhesProjeto(dependencies);
+
+    // Atualiza a página quando o projeto muda em outra sessão ou o relatório termina de ser processado
+    const idDoProjeto = Number(new URLSearchParams(window.location.search).get('id'));
+    let recarga = null;
+    api.abrirEventos(['status_projeto', 'homologacao', 'ingestao', 'tarefas_alteradas'], (tipo, dados) => {
+        if (tipo !== 'resync' && dados.id_projeto !== idDoProjeto) return;
+        if (tipo === 'ingestao' && dados.etapa === 'processando') {
+            showToast('Processando o relatório de testes...', 'info');
+            return;
+        }
+        clearTimeout(recarga);
+        recarga = setTimeout(() => carregarDetalhesProjeto(dependencies), 300);
+    });
 }
\ No newline at end of file
@@ -3,22 +3,20 @@ import { showToast } from './toast.js';
 import { statusColors } from './colors.js'; // Reutiliza nosso mapa de cores
 
 /**
- * Formata os dados dos projetos para o formato esperado pelo Frappe Gantt.
- * @param {Array} projetos - A lista de projetos da API.
+ * Formata o bloco colunar de projetos da timeline para o formato do Frappe Gantt.
+ * A API já devolve apenas projetos com datas previstas, no formato YYYY-MM-DD.
+ * @param {object} projetos - Os vetores 'ids', 'nomes', 'inicios', 'fins' e 'status'.
  * @returns {Array} - A lista de tarefas formatada para o Gantt.
  */
 function formatarProjetosParaGantt(projetos) {
-    return projetos
-        // Filtra apenas projetos que têm datas de início e fim previstas
-        .filter(p => p.data_inicio_prevista && p.data_fim_prevista)
-        .map(p => ({
-            id: `proj_${p.id_projeto}`, // Adiciona um prefixo para evitar conflito de ID com tarefas
-            name: p.nome_projeto,
-            start: p.data_inicio_prevista.split('T')[0], // Formato YYYY-MM-DD
-            end: p.data_fim_prevista.split('T')[0],     // Formato YYYY-MM-DD
-            progress: 100, // Usamos 100 para que a cor seja sólida
-            custom_class: `bar-status-${p.status_atual.toLowerCase().replace(/ /g, '-')}` // Classe CSS customizada
-        }));
+    return projetos.ids.map((id, i) => ({
+        id: `proj_${id}`, // Adiciona um prefixo para evitar conflito de ID com tarefas
+        name: projetos.nomes[i],
+        start: projetos.inicios[i],
+        end: projetos.fins[i],
+        progress: 100, // Usamos 100 para que a cor seja sólida
+        custom_class: `bar-status-${projetos.status[i].toLowerCase().replace(/ /g, '-')}` // Classe CSS customizada
+    }));
 }
 
 /**
@@ -81,8 +79,8 @@ export function initializePage(dependencies) {
     const mainContent = document.querySelector('.main-content');
     if (mainContent) mainContent.style.opacity = '0';
 
-    api.getTodosProjetos()
-        .then(projetos => {
+    api.getTimeline({ incluir: 'projetos' })
+        .then(({ projetos }) => {
             const projetosFormatados = formatarProjetosParaGantt(projetos);
             renderRoadmap(projetosFormatados);
         })